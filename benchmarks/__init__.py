@@ -0,0 +1 @@
+"""Benchmark scripts for the WikiScraper project (not part of the package)."""
@@ -0,0 +1,92 @@
+"""
+Benchmark: word selection and reference lookups of
+`analyze_relative_word_frequency`.
+
+Builds word counts of `--vocabulary` words (the words of the fixture pages
+and wordfreq's English top list, plus junk tokens) and, for several
+`--count` values, times the article-mode work the command does in a fresh
+process:
+
+- before: a full sort of all counts, then one `wordfreq.word_frequency` call
+  per selected word (wordfreq's in-process cache cleared first),
+- after: `top_indices` (partial selection) and one `lookup` gather in the
+  cached reference table (`reference.py`).
+
+Both must select the same words with the same frequencies. The one-time cost
+of building the table and of reading it from the disk cache is reported
+separately.
+
+Run:
+    python -m benchmarks.bench_analyze [--vocabulary 500000]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import wordfreq
+
+from wikiscraper import config, reference
+from wikiscraper.reference import ReferenceFrequencies, get_reference, top_indices
+
+
+def word_counts(size: int) -> dict[str, int]:
+    """Synthetic counts: real English words first, then junk tokens."""
+    rng = np.random.default_rng(0)
+    words = wordfreq.top_n_list("en", 20_000)
+    words += [f"junk{i}" for i in range(size - len(words))]
+    counts = rng.zipf(1.5, len(words))
+    return dict(zip(words, counts.tolist()))
+
+
+def before(data: dict[str, int], count: int) -> list[tuple[str, float]]:
+    """The original selection and per-word lookups."""
+    wordfreq._wf_cache.clear()
+    sorted_freqs = sorted(data.items(), key=lambda item: item[1], reverse=True)
+    words = [k for k, _ in sorted_freqs[:count]]
+    return [(w, wordfreq.word_frequency(w, "en", wordlist="small") or 0) for w in words]
+
+
+def after(data: dict[str, int], count: int) -> list[tuple[str, float]]:
+    """Partial selection and one gather."""
+    keys = list(data)
+    counts = np.fromiter(data.values(), dtype=np.int64, count=len(keys))
+    words = [keys[i] for i in top_indices(counts, count)]
+    return list(zip(words, get_reference("en", "small").lookup(words).tolist()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--vocabulary", type=int, default=500_000)
+    parser.add_argument("--counts", type=int, nargs="+", default=[20, 1000, 5000, 20000])
+    args = parser.parse_args()
+    data = word_counts(args.vocabulary)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(config, "REFERENCE_CACHE_DIR", Path(tmp)):
+        start = time.perf_counter()
+        ReferenceFrequencies.build("en", "small").save()
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        get_reference("en", "small")
+        load = time.perf_counter() - start
+        print(f"{len(data)} counted words; en/small table: built in {build:.2f} s (once), "
+              f"read from cache in {load * 1000:.0f} ms")
+        print(f"{'count':>6} {'before ms':>10} {'after ms':>9} {'same':>5}")
+        for count in args.counts:
+            start = time.perf_counter()
+            old = before(data, count)
+            old_time = time.perf_counter() - start
+            start = time.perf_counter()
+            new = after(data, count)
+            new_time = time.perf_counter() - start
+            print(f"{count:>6} {old_time * 1000:>10.1f} {new_time * 1000:>9.1f} "
+                  f"{str(old == new):>5}")
+        reference._references.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: request count and bytes per page of the "html" and "api" backends.
+
+Runs the same `auto_count_words` crawl against the local stand-in wiki with
+both page sources and reports the number of HTTP requests, the bytes
+downloaded and the wall-clock time.
+
+Run:
+    python -m benchmarks.bench_api_backend [--pages 400] [--depth 3] [--latency 0.05]
+"""
+
+import argparse
+import time
+
+from wikiscraper.controller import Controller
+
+from benchmarks.common import isolated_data_dir, read_word_counts
+from benchmarks.stand_in_wiki import StandInWiki
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'backend':<8} {'pages':>6} {'requests':>9} {'KiB':>9} "
+          f"{'KiB/page':>9} {'seconds':>8}")
+    with StandInWiki(num_pages=args.pages, latency=args.latency) as wiki:
+        for backend in ("html", "api"):
+            with isolated_data_dir():
+                controller = Controller(wiki_base_url=wiki.base_url)
+                controller.configure(backend=backend)
+                served, sent = wiki.requests_served, wiki.bytes_served
+                start = time.perf_counter()
+                controller.auto_count_words("Page_0", depth=args.depth, wait=0)
+                elapsed = time.perf_counter() - start
+                pages = len(controller.cache)
+                requests = wiki.requests_served - served
+                kib = (wiki.bytes_served - sent) / 1024
+                words = sum(read_word_counts().values())
+            print(f"{backend:<8} {pages:>6} {requests:>9} {kib:>9.0f} "
+                  f"{kib / pages:>9.1f} {elapsed:>8.2f}   ({words} words counted)")
+
+
+if __name__ == "__main__":
+    main()
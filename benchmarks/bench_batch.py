@@ -0,0 +1,126 @@
+"""
+Benchmark: `main.py`'s workload run command by command against one batch.
+
+Runs the cases of `main.py` against a local stand-in wiki with a fixed
+per-request latency that serves the fixture pages (Team Rocket for article
+pages, the Type page, with its tables, for Squirtle), each run in a fresh
+data directory (cold page cache):
+
+- sequential: every case parsed and run with `Controller.run_func`, with
+  the 0.2 s pause between cases that `main.py` used to make,
+- sequential, no pause: the same without the pauses,
+- batch: all cases with `BatchRunner` (every page fetched and parsed once,
+  pages worked on concurrently).
+
+The `auto_count_words` case (a serial crawl of the 535 pages Team Rocket
+links to, the same in every mode) is left out unless `--with-crawl` is given.
+Charts are written to a temporary directory.
+
+Run:
+    python -m benchmarks.bench_batch [--latency 0.1] [--repeat 3] [--with-crawl]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper import config
+from wikiscraper.batch import BatchRunner
+from wikiscraper.controller import Controller
+from wikiscraper.parser import Parser
+
+from benchmarks.common import isolated_data_dir
+from benchmarks.stand_in_wiki import StandInWiki, make_article
+
+FIXTURES = {"Team_Rocket": "team_rocket.html", "Pikachu": "team_rocket.html",
+            "Bulbasaur": "team_rocket.html", "Squirtle": "type.html"}
+"""dict[str, str]: Fixture file served for every page of the workload."""
+
+
+class FixtureWiki(StandInWiki):
+    """Stand-in wiki serving fixture pages, and a synthetic page for any other title."""
+
+    def article(self, title: str) -> str | None:
+        name = FIXTURES.get(title.replace(" ", "_"))
+        if name is not None:
+            return (config.TESTS_DATA_DIR / name).read_text(encoding="utf-8")
+        return make_article(zlib.crc32(title.encode()) % self.num_pages, self.num_pages)
+
+
+def workload(chart_dir: Path, with_crawl: bool) -> list[list[str]]:
+    """The cases of main.py, with charts saved to `chart_dir`."""
+    cases = [
+        ["summary", "Team Rocket"],
+        ["summary", "Pikachu"],
+        ["count_words", "Pikachu"],
+        ["count_words", "Bulbasaur"],
+        ["table", "Squirtle", "--number", "1", "--first-row-is-header"],
+        ["table", "Squirtle", "--number", "2"],
+        ["table", "Squirtle", "--number", "3"],
+        ["table", "Squirtle", "--number", "4"],
+        ["analyze_relative_word_frequency", "--mode", "article", "--count", "5",
+         "--chart", str(chart_dir / "chart_article.png")],
+        ["analyze_relative_word_frequency", "--mode", "language", "--count", "5",
+         "--chart", str(chart_dir / "chart_language.png")],
+    ]
+    if with_crawl:
+        cases.append(["auto_count_words", "Team Rocket", "--depth", "1", "--wait", "0"])
+    return cases
+
+
+def run_sequential(base_url: str, cases: list[list[str]], pause: float) -> float:
+    """Run the cases one by one in a fresh data directory; return seconds."""
+    with isolated_data_dir(), contextlib.redirect_stdout(io.StringIO()):
+        parser, controller = Parser(), Controller(wiki_base_url=base_url)
+        start = time.perf_counter()
+        for case in cases:
+            controller.run_func(parser.parse_args(case))
+            time.sleep(pause)
+        return time.perf_counter() - start
+
+
+def run_batch(base_url: str, cases: list[list[str]], concurrency: int) -> float:
+    """Run the cases as one batch in a fresh data directory; return seconds."""
+    with isolated_data_dir(), contextlib.redirect_stdout(io.StringIO()):
+        controller = Controller(wiki_base_url=base_url)
+        start = time.perf_counter()
+        results = BatchRunner(controller, concurrency=concurrency).run(cases)
+        elapsed = time.perf_counter() - start
+    failed = [r.argv for r in results if r.exit_code != 0]
+    if failed:
+        raise RuntimeError(f"Failed cases: {failed}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--with-crawl", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(config, "REFERENCE_CACHE_DIR", Path(tmp)), \
+            FixtureWiki(num_pages=1000, latency=args.latency) as wiki:
+        cases = workload(Path(tmp), args.with_crawl)
+        runs = {
+            "sequential": lambda: run_sequential(wiki.base_url, cases, 0.2),
+            "sequential, no pause": lambda: run_sequential(wiki.base_url, cases, 0.0),
+            "batch": lambda: run_batch(wiki.base_url, cases, args.concurrency),
+        }
+        print(f"{len(cases)} cases, latency {args.latency * 1000:.0f} ms, "
+              f"median of {args.repeat} runs")
+        for name, run in runs.items():
+            seconds = statistics.median(run() for _ in range(args.repeat))
+            print(f"{name:>22} {seconds:>7.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: disk usage and read latency of the cache codecs.
+
+Stores the fixture pages (and smaller pages cut from them, standing in for
+short articles) with every codec and reports the size on disk and the time
+of a cache read including decompression.
+
+For "zdict" the dictionary is trained on `team_rocket.html` only, so the
+numbers for `type.html` show how well it transfers to unseen pages.
+
+Run:
+    python -m benchmarks.bench_cache_compression [--repeat 20]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from wikiscraper import config
+from wikiscraper.cache import PageCache
+
+
+def sample_pages() -> dict[str, bytes]:
+    """Return the pages to store, keyed by cache key."""
+    pages = {}
+    for name in ("team_rocket", "type"):
+        html = (config.TESTS_DATA_DIR / f"{name}.html").read_bytes()
+        pages[name] = html
+        # A short article keeps the page chrome but has a small body.
+        pages[f"{name}_short"] = html[:25_000] + html[-15_000:]
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = sample_pages()
+    training = [pages["team_rocket"]]
+    print(f"{'codec':<6} {'page':<18} {'raw KiB':>8} {'disk KiB':>9} "
+          f"{'ratio':>6} {'read ms':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in ("raw", "gzip", "zdict"):
+            cache = PageCache(Path(tmp) / codec, compression=codec)
+            if codec == "zdict":
+                cache.train_dictionary(training)
+            for key, html in pages.items():
+                cache.put(key, html)
+
+            for key, html in pages.items():
+                size = cache.path_for(key).stat().st_size
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    cache.get(key).decode("utf-8")
+                read_ms = (time.perf_counter() - start) * 1000 / args.repeat
+                print(f"{codec:<6} {key:<18} {len(html) / 1024:>8.1f} "
+                      f"{size / 1024:>9.1f} {len(html) / size:>6.1f} {read_ms:>8.3f}")
+
+            stats = cache.stats()
+            print(f"{codec:<6} {'TOTAL':<18} {stats['raw_bytes'] / 1024:>8.1f} "
+                  f"{stats['bytes'] / 1024:>9.1f} "
+                  f"{stats['raw_bytes'] / stats['bytes']:>6.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: write volume of counting a crawl, per page vs. in checkpoints.
+
+Counts `--pages` synthetic pages (`--page-words` distinct words each, a
+quarter of them new to the crawl) three ways, in an isolated data dir:
+
+- the original per-page JSON rewrite (only `--json-pages` pages, scaled
+  up linearly; a lower bound, as the file keeps growing),
+- one store transaction per page (`merge_word_counts` outside a run),
+- a checkpointed run (`checkpointed`, `config.CHECKPOINT_EVERY_PAGES` pages
+  per checkpoint),
+
+each followed by the JSON export, and reports the time, the bytes written,
+the write calls of the process (`wchar`/`syscw` of /proc/self/io) and the
+SQLite commits (each one a WAL append, and the unit a crash can lose).
+
+Run:
+    python -m benchmarks.bench_checkpoints [--pages 5000] [--page-words 500]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from benchmarks.common import isolated_data_dir
+from wikiscraper import config
+from wikiscraper.word_counts import (
+    checkpointed,
+    export_word_counts,
+    get_store,
+    merge_word_counts,
+    remove_word_counts,
+)
+
+
+def io_counters() -> dict[str, int]:
+    """Return the write counters of this process (zeros where unavailable)."""
+    try:
+        lines = Path("/proc/self/io").read_text().splitlines()
+    except OSError:
+        return {"wchar": 0, "syscw": 0}
+    values = dict(line.split(": ") for line in lines)
+    return {key: int(values[key]) for key in ("wchar", "syscw")}
+
+
+def json_rewrite_merge(path: Path, words: dict[str, int]) -> None:
+    """The original `merge_word_counts`: read, merge and rewrite the file."""
+    raw = path.read_text(encoding="utf-8").strip() if path.exists() else ""
+    data = json.loads(raw) if raw else {}
+    for word, count in words.items():
+        data[word] = data.get(word, 0) + count
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def pages(count: int, size: int) -> list[tuple[str, dict[str, int]]]:
+    """Synthetic pages: three quarters shared words, one quarter new ones."""
+    shared = size * 3 // 4
+    return [
+        (f"Page {p}",
+         {**{f"w{(p * 7 + i) % (size * 4)}": 2 for i in range(shared)},
+          **{f"new{p}_{i}": 1 for i in range(size - shared)}})
+        for p in range(count)
+    ]
+
+
+def measure(label: str, run) -> None:
+    """Run `run()` and print its time and write volume."""
+    commits = 0
+    store = get_store()
+
+    def trace(sql: str) -> None:
+        nonlocal commits
+        if sql.startswith("COMMIT"):
+            commits += 1
+
+    store._db.set_trace_callback(trace)
+    before = io_counters()
+    start = time.perf_counter()
+    run()
+    export_word_counts()
+    elapsed = time.perf_counter() - start
+    after = io_counters()
+    store._db.set_trace_callback(None)
+    written = (after["wchar"] - before["wchar"]) / 1e6
+    calls = after["syscw"] - before["syscw"]
+    print(f"{label:<22} {elapsed:>8.2f} {written:>10.1f} {calls:>10} {commits:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--page-words", type=int, default=500)
+    parser.add_argument("--json-pages", type=int, default=500,
+                        help="pages of the (slow) JSON rewrite variant, scaled up")
+    args = parser.parse_args()
+    crawl = pages(args.pages, args.page_words)
+
+    print(f"{args.pages} pages, {args.page_words} words each, "
+          f"{config.CHECKPOINT_EVERY_PAGES} pages per checkpoint")
+    print(f"{'variant':<22} {'s':>8} {'MB written':>10} {'writes':>10} {'commits':>8}")
+
+    with isolated_data_dir():
+        path = Path(config.WORD_COUNTS_JSON)
+        before = io_counters()
+        start = time.perf_counter()
+        for _, words in crawl[:args.json_pages]:
+            json_rewrite_merge(path, words)
+        elapsed = time.perf_counter() - start
+        after = io_counters()
+        scale = args.pages / args.json_pages
+        print(f"{'JSON rewrite (x%.0f)' % scale:<22} {elapsed * scale:>8.2f} "
+              f"{(after['wchar'] - before['wchar']) * scale / 1e6:>10.1f} "
+              f"{(after['syscw'] - before['syscw']) * scale:>10.0f} {'-':>8}")
+
+    with isolated_data_dir():
+        measure("store, per page", lambda: [merge_word_counts(w, page=t) for t, w in crawl])
+        remove_word_counts()
+
+    with isolated_data_dir():
+        def checkpointed_crawl():
+            with checkpointed("bench"):
+                for title, words in crawl:
+                    merge_word_counts(words, page=title)
+        measure("checkpointed", checkpointed_crawl)
+        remove_word_counts()
+
+
+if __name__ == "__main__":
+    main()
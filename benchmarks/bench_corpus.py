@@ -0,0 +1,110 @@
+"""
+Benchmark: corpus queries on the term-document matrix vs. nested dicts.
+
+Records `--pages` synthetic pages (`--page-words` distinct words each, Zipf
+distributed over a `--vocabulary`-word vocabulary) in a `Corpus`, and times
+the queries against the same data kept as `{title: {word: count}}`:
+
+- corpus totals (every page once),
+- the top 20 words of a range of `--range` pages,
+- the pages a word occurs in,
+
+and reports the memory of both representations and the saved file size.
+
+Run:
+    python -m benchmarks.bench_corpus [--pages 5000] [--page-words 500]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from wikiscraper.corpus import Corpus
+
+
+def synthetic_pages(count: int, size: int, vocabulary: int) -> dict[str, dict[str, int]]:
+    """Pages with Zipf-distributed words."""
+    rng = np.random.default_rng(0)
+    pages = {}
+    for p in range(count):
+        ids = np.unique(rng.zipf(1.3, size * 2) % vocabulary)[:size]
+        counts = rng.integers(1, 20, len(ids))
+        pages[f"Page {p}"] = {f"w{i}": int(c) for i, c in zip(ids, counts)}
+    return pages
+
+
+def dict_size(pages: dict[str, dict[str, int]]) -> int:
+    """Approximate memory of nested dicts (containers, not shared strings)."""
+    return sys.getsizeof(pages) + sum(sys.getsizeof(words) for words in pages.values())
+
+
+def timed(function, repeat: int) -> tuple[float, object]:
+    """Return the mean seconds of `function()` and its result."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--page-words", type=int, default=500)
+    parser.add_argument("--vocabulary", type=int, default=100_000)
+    parser.add_argument("--range", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = synthetic_pages(args.pages, args.page_words, args.vocabulary)
+    titles = list(pages)[:args.range]
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = Corpus(Path(tmp) / "corpus.npz")
+        start = time.perf_counter()
+        for title, words in pages.items():
+            corpus.add(title, title, words)
+        corpus.matrix()
+        record = time.perf_counter() - start
+        corpus.save()
+        file_size = corpus.path.stat().st_size
+
+        def dict_totals():
+            totals = Counter()
+            for words in pages.values():
+                totals.update(words)
+            return totals
+
+        def dict_top():
+            totals = Counter()
+            for title in titles:
+                totals.update(pages[title])
+            return totals.most_common(20)
+
+        def dict_pages_with():
+            return {t: words["w5"] for t, words in pages.items() if "w5" in words}
+
+        queries = [
+            ("totals", dict_totals, corpus.totals),
+            (f"top 20 of {len(titles)} pages", dict_top,
+             lambda: corpus.top_words(20, titles=titles)),
+            ("pages with a word", dict_pages_with, lambda: corpus.pages_with("w5")),
+        ]
+        indptr, indices, data = corpus.matrix()
+        matrix_bytes = indptr.nbytes + indices.nbytes + data.nbytes
+        print(f"{args.pages} pages, {indices.size} entries, {len(corpus.words)} words; "
+              f"recorded in {record:.2f} s")
+        print(f"memory: nested dicts {dict_size(pages) / 1e6:.1f} MB, "
+              f"CSR arrays {matrix_bytes / 1e6:.1f} MB; file {file_size / 1e6:.1f} MB")
+        print(f"{'query':<24} {'dicts ms':>10} {'matrix ms':>10}")
+        for label, reference, query in queries:
+            dict_time, _ = timed(reference, args.repeat)
+            matrix_time, _ = timed(query, args.repeat)
+            print(f"{label:<24} {dict_time * 1000:>10.1f} {matrix_time * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
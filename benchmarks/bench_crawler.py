@@ -0,0 +1,55 @@
+"""
+Benchmark: serial vs. asyncio crawl in `Controller.auto_count_words`.
+
+Runs the same depth-limited crawl against a local stand-in wiki with a fixed
+per-request latency, once serially and then with increasing concurrency, and
+checks that every run produces identical word counts.
+
+Run:
+    python -m benchmarks.bench_crawler [--pages 300] [--depth 2] [--latency 0.05]
+"""
+
+import argparse
+import time
+
+from wikiscraper.controller import Controller
+
+from benchmarks.common import isolated_data_dir, read_word_counts
+from benchmarks.stand_in_wiki import StandInWiki
+
+
+def run_crawl(base_url: str, depth: int, concurrency: int):
+    """Run one crawl in a fresh data directory; return (seconds, counts)."""
+    with isolated_data_dir():
+        controller = Controller(wiki_base_url=base_url)
+        start = time.perf_counter()
+        controller.auto_count_words(
+            "Page_0", depth=depth, wait=0, concurrency=concurrency
+        )
+        elapsed = time.perf_counter() - start
+        return elapsed, read_word_counts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with StandInWiki(num_pages=args.pages, latency=args.latency) as wiki:
+        serial_time, serial_counts = run_crawl(wiki.base_url, args.depth, 1)
+        fetched = wiki.requests_served
+        print(f"pages fetched: {fetched}, latency: {args.latency * 1000:.0f} ms")
+        print(f"{'concurrency':>12} {'seconds':>9} {'speedup':>8}  counts")
+        print(f"{1:>12} {serial_time:>9.2f} {1.0:>8.2f}  reference")
+
+        for concurrency in (2, 4, 8, 16):
+            elapsed, counts = run_crawl(wiki.base_url, args.depth, concurrency)
+            same = "identical" if counts == serial_counts else "DIFFERENT"
+            print(f"{concurrency:>12} {elapsed:>9.2f} "
+                  f"{serial_time / elapsed:>8.2f}  {same}")
+
+
+if __name__ == "__main__":
+    main()
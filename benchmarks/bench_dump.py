@@ -0,0 +1,73 @@
+"""
+Benchmark: throughput and memory of offline XML dump ingestion.
+
+Writes synthetic bz2-compressed dumps of increasing size (pages rendered with
+the stand-in wiki's wikitext generator) and ingests each one in a fresh
+process, reporting pages per second and the peak resident memory. Peak memory
+should stay flat as the dump grows, since pages are streamed.
+
+Run:
+    python -m benchmarks.bench_dump [--sizes 1000 4000 16000]
+"""
+
+import argparse
+import bz2
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from benchmarks.common import isolated_data_dir
+from benchmarks.stand_in_wiki import make_wikitext
+
+
+def write_dump(path: Path, num_pages: int) -> None:
+    """Write a bz2-compressed MediaWiki export with `num_pages` articles."""
+    with bz2.open(path, "wt", encoding="utf-8") as file:
+        file.write('<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/">\n')
+        for i in range(num_pages):
+            text = escape(make_wikitext(i, num_pages))
+            file.write(f"<page><title>Page {i}</title><ns>0</ns><id>{i}</id>"
+                       f"<revision><text>{text}</text></revision></page>\n")
+        file.write("</mediawiki>\n")
+
+
+def ingest(path: str) -> None:
+    """Ingest one dump (child process) and print pages/s and peak RSS."""
+    from wikiscraper.dump import ingest_dump
+
+    with isolated_data_dir():
+        stats = ingest_dump(path)
+    peak_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"RESULT {stats['pages']} {stats['pages_per_second']:.1f} {peak_mib:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000])
+    parser.add_argument("--ingest", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.ingest:
+        ingest(args.ingest)
+        return
+
+    print(f"{'pages':>7} {'MiB (bz2)':>10} {'pages/s':>9} {'peak RSS MiB':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            path = Path(tmp) / f"dump-{size}.xml.bz2"
+            write_dump(path, size)
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_dump", "--ingest", str(path)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = next(line for line in out.splitlines() if line.startswith("RESULT"))
+            pages, rate, peak = result.split()[1:]
+            mib = path.stat().st_size / 2**20
+            print(f"{pages:>7} {mib:>10.2f} {rate:>9} {peak:>13}")
+
+
+if __name__ == "__main__":
+    main()
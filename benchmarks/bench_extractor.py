@@ -0,0 +1,58 @@
+"""
+Benchmark: BeautifulSoup engine vs. single-pass streaming extractor.
+
+Measures the time per page of what a crawl does with every page
+(`get_dict` + `links`) and of extracting one table, for both engines on the
+test fixtures.
+
+Run:
+    python -m benchmarks.bench_extractor [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from unittest.mock import patch
+
+from wikiscraper import config
+from wikiscraper.page import Page
+
+
+def time_ms(func, repeat: int) -> float:
+    """Return the mean duration of `func()` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = [f"{'page':<18} {'engine':<7} {'crawl ms':>9} {'table ms':>9}"]
+    with tempfile.TemporaryDirectory() as tmp, \
+            contextlib.redirect_stdout(io.StringIO()):
+        for path in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+            html = path.read_text(encoding="utf-8")
+            for engine in ("soup", "stream"):
+                with patch.object(Page, "engine", engine):
+                    def crawl():
+                        page = Page(path.stem, html)
+                        page.get_dict()
+                        page.links()
+
+                    crawl_ms = time_ms(crawl, args.repeat)
+                    table_ms = time_ms(
+                        lambda: Page(path.stem, html).table(1, output_dir=tmp),
+                        args.repeat,
+                    )
+                rows.append(f"{path.name:<18} {engine:<7} {crawl_ms:>9.0f} {table_ms:>9.0f}")
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: cost of the persisted frontier of resumable crawls.
+
+Crawls the synthetic pages of a local stand-in wiki (no latency, pages
+cached by a warm-up crawl, so the time is page processing, not waiting)
+with `Controller.auto_count_words`:
+
+- in-memory: the crawl without a crawl ID (frontier only in memory),
+- resumable: with a crawl ID, state saved at the default checkpoint cadence
+  (`config.CHECKPOINT_EVERY_PAGES`),
+- resumable, every page: a checkpoint after every page (worst case),
+
+and reports the time, the time spent in checkpoint transactions, and the
+time to load the saved state of the finished crawl (as a resume does).
+
+Run:
+    python -m benchmarks.bench_frontier [--pages 2000] [--depth 4] [--repeat 3]
+"""
+
+import argparse
+import contextlib
+import io
+import statistics
+import time
+from unittest.mock import patch
+
+from wikiscraper import config
+from wikiscraper.controller import Controller
+from wikiscraper.frontier import Frontier
+from wikiscraper.word_counts import WordCountStore, get_store, remove_word_counts
+
+from benchmarks.common import isolated_data_dir, read_word_counts
+from benchmarks.stand_in_wiki import StandInWiki
+
+
+def run_crawl(controller: Controller, depth: int, **options) -> tuple[float, float, dict]:
+    """Run one crawl on fresh word counts; return (seconds, checkpoint seconds, counts)."""
+    remove_word_counts()
+    config.WORD_COUNTS_JSON.write_text("")
+    in_checkpoints = 0.0
+    checkpoint = WordCountStore.checkpoint
+
+    def timed(store, *args):
+        nonlocal in_checkpoints
+        start = time.perf_counter()
+        try:
+            return checkpoint(store, *args)
+        finally:
+            in_checkpoints += time.perf_counter() - start
+
+    with patch.object(WordCountStore, "checkpoint", timed), \
+            contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        controller.auto_count_words("Page_0", depth=depth, wait=0, **options)
+        elapsed = time.perf_counter() - start
+    return elapsed, in_checkpoints, read_word_counts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with StandInWiki(num_pages=args.pages, latency=0) as wiki, isolated_data_dir():
+        controller = Controller(wiki_base_url=wiki.base_url)
+        with contextlib.redirect_stdout(io.StringIO()):
+            controller.auto_count_words("Page_0", depth=args.depth, wait=0)
+        variants = {
+            "in-memory": ({}, config.CHECKPOINT_EVERY_PAGES),
+            "resumable": ({"crawl_id": "bench"}, config.CHECKPOINT_EVERY_PAGES),
+            "resumable, every page": ({"crawl_id": "bench"}, 1),
+        }
+        expected = None
+        print(f"depth {args.depth} of {args.pages} pages, median of {args.repeat} runs")
+        print(f"{'variant':<22} {'s':>7} {'checkpoints s':>14}")
+        for name, (options, every_pages) in variants.items():
+            runs = []
+            with patch.object(config, "CHECKPOINT_EVERY_PAGES", every_pages):
+                for _ in range(args.repeat):
+                    elapsed, in_checkpoints, counts = run_crawl(controller, args.depth,
+                                                                **options)
+                    expected = expected or counts
+                    if counts != expected:
+                        raise RuntimeError(f"{name}: word counts differ")
+                    runs.append((elapsed, in_checkpoints))
+            elapsed = statistics.median(run[0] for run in runs)
+            in_checkpoints = statistics.median(run[1] for run in runs)
+            print(f"{name:<22} {elapsed:>7.2f} {in_checkpoints:>14.3f}")
+
+        start = time.perf_counter()
+        saved = get_store().load_crawl("bench")
+        frontier = Frontier.load(saved)
+        print(f"loading the state of {len(saved[1])} pages ({frontier.pages} counted): "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        remove_word_counts()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: cost of repeated operations on one `Page`.
+
+Runs the operations of the notebook's random walk and of the CLI commands
+(`get_dict`, `links`, `summary`, `table`) on `tests/test_data/team_rocket.html`
+and reports the number of HTML parses and the time taken, first with a new
+`Page` for every operation (one parse each, as before memoization) and then
+with a single memoized `Page`.
+
+Run:
+    python -m benchmarks.bench_page_parse [--repeat 5]
+"""
+
+import argparse
+import contextlib
+import io
+import tempfile
+import time
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from wikiscraper import config
+from wikiscraper.page import Page
+
+OPERATIONS = ("get_dict", "links", "links", "summary", "table")
+"""tuple[str]: Page operations run per round."""
+
+
+def run(html: str, shared: bool, output_dir: str) -> None:
+    """Run OPERATIONS on one shared Page or on a fresh Page each time."""
+    page = Page("Team_Rocket", html)
+    for name in OPERATIONS:
+        if not shared:
+            page = Page("Team_Rocket", html)
+        if name == "table":
+            page.table(1, output_dir=output_dir)
+        else:
+            getattr(page, name)()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = (config.TESTS_DATA_DIR / "team_rocket.html").read_text(encoding="utf-8")
+    print(f"operations per round: {', '.join(OPERATIONS)}")
+    print(f"{'variant':<18} {'parses/round':>13} {'ms/round':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for shared, label in ((False, "page per operation"), (True, "memoized page")):
+            with patch("wikiscraper.page.BeautifulSoup", wraps=BeautifulSoup) as parse, \
+                    contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    run(html, shared, tmp)
+                elapsed = time.perf_counter() - start
+            print(f"{label:<18} {parse.call_count / args.repeat:>13.0f} "
+                  f"{elapsed / args.repeat * 1000:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark: counting pages in several processes into one word count store.
+
+Every worker process counts `--pages` pages (the fixture pages, tokenized
+from their text like `Page.get_dict`) into the shared store of an isolated
+data dir, as parallel CLI invocations or crawls would, either one store
+transaction per page or in a checkpointed run. Reports the wall-clock pages
+per second for 1..`--max-workers` workers and checks that the final totals
+equal the expected ones exactly.
+
+Run:
+    python -m benchmarks.bench_parallel_counts [--pages 200] [--max-workers 4]
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from benchmarks.common import isolated_data_dir
+from wikiscraper import config
+from wikiscraper.tokenizer import Tokenizer
+from wikiscraper.word_counts import (
+    checkpointed,
+    export_word_counts,
+    load_word_counts,
+    merge_word_counts,
+    remove_word_counts,
+)
+
+
+def fixture_texts() -> list[str]:
+    """Text of every fixture page."""
+    return [
+        BeautifulSoup(f.read_text(encoding="utf-8"), "lxml").get_text(separator="\n")
+        for f in sorted(config.TESTS_DATA_DIR.glob("*.html"))
+    ]
+
+
+def count_pages(json_path: str, worker: int, pages: int, mode: str, texts: list[str]) -> None:
+    """Worker: tokenize and count `pages` pages."""
+    config.WORD_COUNTS_JSON = Path(json_path)
+    tokenizer = Tokenizer()
+
+    def run():
+        for p in range(pages):
+            words = tokenizer.count(texts[p % len(texts)])
+            merge_word_counts(words, page=f"{worker}/{p}")
+
+    if mode == "checkpointed":
+        with checkpointed(f"bench{worker}"):
+            run()
+    else:
+        run()
+    export_word_counts()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200, help="pages per worker")
+    parser.add_argument("--max-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    texts = fixture_texts()
+    tokenizer = Tokenizer()
+    context = multiprocessing.get_context("fork")
+    single: Counter = Counter()
+    for p in range(args.pages):
+        single.update(tokenizer.count(texts[p % len(texts)]))
+    print(f"{os.cpu_count()} CPU(s), {args.pages} pages per worker")
+    print(f"{'mode':<13} {'workers':>7} {'s':>7} {'pages/s':>8} {'exact':>6}")
+    for mode in ("per page", "checkpointed"):
+        for workers in range(1, args.max_workers + 1):
+            expected = {word: count * workers for word, count in single.items()}
+            with isolated_data_dir():
+                json_path = str(config.WORD_COUNTS_JSON)
+                processes = [
+                    context.Process(target=count_pages,
+                                    args=(json_path, w, args.pages, mode, texts))
+                    for w in range(workers)
+                ]
+                start = time.perf_counter()
+                for process in processes:
+                    process.start()
+                for process in processes:
+                    process.join()
+                elapsed = time.perf_counter() - start
+                exact = load_word_counts() == expected
+                remove_word_counts()
+            rate = workers * args.pages / elapsed
+            print(f"{mode:<13} {workers:>7} {elapsed:>7.2f} {rate:>8.0f} {str(exact):>6}")
+
+
+if __name__ == "__main__":
+    main()
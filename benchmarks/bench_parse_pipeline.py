@@ -0,0 +1,82 @@
+"""
+Benchmark: crawl throughput with the process-pool parse stage.
+
+Two measurements:
+    1. Parse stage alone: `parse_page` over copies of the test fixtures with
+       1, 2, 4, ... worker processes (up to the number of CPUs), in pages/s.
+    2. End to end: `auto_count_words` against the stand-in wiki with
+       `parse_workers` 0 (parse in the crawl process) and the CPU count.
+
+Parse throughput should scale with the number of cores; on a single-core
+machine both variants are expected to be equal.
+
+Run:
+    python -m benchmarks.bench_parse_pipeline [--copies 40] [--pages 300]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from wikiscraper import config
+from wikiscraper.controller import Controller
+from wikiscraper.crawler import parse_page
+
+from benchmarks.common import isolated_data_dir
+from benchmarks.stand_in_wiki import StandInWiki
+
+
+def parse_stage(copies: int) -> None:
+    """Print parse throughput of the fixtures for growing worker counts."""
+    fixtures = sorted(config.TESTS_DATA_DIR.glob("*.html"))
+    htmls = [f.read_text(encoding="utf-8") for f in fixtures] * copies
+    cpus = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cpus:
+        workers.append(workers[-1] * 2)
+
+    print(f"parse stage: {len(htmls)} fixture pages, {cpus} CPUs")
+    print(f"{'workers':>8} {'pages/s':>8}")
+    for n in workers:
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            list(pool.map(parse_page, ["warm-up"] * n, htmls[:n]))
+            start = time.perf_counter()
+            list(pool.map(parse_page, ["page"] * len(htmls), htmls))
+            elapsed = time.perf_counter() - start
+        print(f"{n:>8} {len(htmls) / elapsed:>8.1f}")
+
+
+def crawl(pages: int, latency: float, concurrency: int) -> None:
+    """Print end-to-end crawl throughput with and without parse workers."""
+    cpus = os.cpu_count() or 1
+    print(f"\ncrawl: stand-in wiki, latency {latency * 1000:.0f} ms, "
+          f"concurrency {concurrency}")
+    print(f"{'parse_workers':>13} {'pages':>6} {'pages/s':>8}")
+    with StandInWiki(num_pages=pages, latency=latency) as wiki:
+        for workers in sorted({0, cpus}):
+            with isolated_data_dir():
+                controller = Controller(wiki_base_url=wiki.base_url)
+                start = time.perf_counter()
+                controller.auto_count_words("Page_0", depth=3, wait=0,
+                                            concurrency=concurrency,
+                                            parse_workers=workers)
+                elapsed = time.perf_counter() - start
+                crawled = len(controller.cache)
+            print(f"{workers:>13} {crawled:>6} {crawled / elapsed:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    parse_stage(args.copies)
+    crawl(args.pages, args.latency, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: worst-page search by random walks, the notebook's serial walk
+against `RandomWalkSampler` with increasing walker counts.
+
+Runs against a local stand-in wiki with a fixed per-request latency, each
+run in a fresh data directory (cold page cache):
+
+- notebook: `get_worst_page` of analysis.ipynb, one walk of `--steps` pages
+  through `Controller.next_page` (wait 0), scored with
+  `lang_confidence_score` and the notebook's `lang_refs`,
+- sampler: `--steps` pages per walker, with and without prefetch.
+
+For every run the report shows pages scored, wall-clock time and pages
+scored per second. A walk must give the same trace with and without
+prefetch. `--engine stream` parses pages with the single-pass extractor.
+
+Run:
+    python -m benchmarks.bench_sampler [--steps 50] [--latency 0.05] [--engine stream]
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import wordfreq
+
+from wikiscraper import config
+from wikiscraper.controller import Controller
+from wikiscraper.sampler import RandomWalkSampler
+from wikiscraper.scoring import lang_confidence_score
+
+from benchmarks.common import isolated_data_dir
+from benchmarks.stand_in_wiki import StandInWiki
+
+
+def notebook_walk(base_url: str, steps: int, lang_ref: dict, engine: str) -> tuple[float, int]:
+    """The notebook's serial worst-page search; return (seconds, pages)."""
+    with isolated_data_dir():
+        cl = Controller(wiki_base_url=base_url)
+        cl.configure(engine=engine)
+        start = time.perf_counter()
+        curr_page = cl._get_page("Page_0")
+        worst_score = float("inf")
+        scored = 0
+        for _ in range(steps):
+            score = lang_confidence_score(curr_page.get_dict(), lang_ref)
+            scored += 1
+            worst_score = min(worst_score, score)
+            curr_page = cl.next_page(curr_page, wait=0)
+            if curr_page is None:
+                break
+        return time.perf_counter() - start, scored
+
+
+def sampler_walk(base_url: str, walkers: int, steps: int, prefetch: bool, wordlist: str,
+                 engine: str):
+    """Run the sampler in a fresh data directory; return (seconds, result)."""
+    with isolated_data_dir():
+        controller = Controller(wiki_base_url=base_url)
+        controller.configure(engine=engine)
+        sampler = RandomWalkSampler(controller, walkers=walkers, steps=steps,
+                                    wordlist=wordlist, prefetch=prefetch)
+        start = time.perf_counter()
+        result = sampler.sample("Page_0")
+        return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--steps", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--walkers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--wordlist", default="small")
+    parser.add_argument("--engine", choices=["soup", "stream"], default="soup")
+    args = parser.parse_args()
+
+    freq_dict = wordfreq.get_frequency_dict("en", wordlist=args.wordlist)
+    sorted_items = sorted(freq_dict.items(), key=lambda x: x[1], reverse=True)
+    lang_ref = dict(sorted_items[:config.SCORING_K_VALUES[-1]])
+    random.seed(0)
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(config, "REFERENCE_CACHE_DIR", Path(tmp)), \
+            StandInWiki(num_pages=args.pages, latency=args.latency) as wiki:
+        elapsed, scored = notebook_walk(wiki.base_url, args.steps, lang_ref, args.engine)
+        print(f"latency {args.latency * 1000:.0f} ms, {args.steps} steps per walk, "
+              f"{args.engine} engine")
+        print(f"{'run':>20} {'pages':>6} {'s':>7} {'pages/s':>8}")
+        print(f"{'notebook':>20} {scored:>6} {elapsed:>7.2f} {scored / elapsed:>8.1f}")
+        traces = {}
+        for walkers in args.walkers:
+            for prefetch in (False, True):
+                elapsed, result = sampler_walk(wiki.base_url, walkers, args.steps,
+                                               prefetch, args.wordlist, args.engine)
+                name = f"{walkers} walkers{' prefetch' if prefetch else ''}"
+                scored = len(result.trace)
+                print(f"{name:>20} {scored:>6} {elapsed:>7.2f} {scored / elapsed:>8.1f}")
+                traces.setdefault(walkers, []).append(result.trace)
+        same = all(first == second for first, second in traces.values())
+        print(f"same trace with and without prefetch: {same}")
+
+
+if __name__ == "__main__":
+    main()
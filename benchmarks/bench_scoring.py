@@ -0,0 +1,118 @@
+"""
+Benchmark: language confidence scores of many pages, the notebook's loop
+against the batched scores of `scoring.py`.
+
+Builds `--pages` synthetic pages (words drawn from the fixture pages and from
+wordfreq's Spanish and Danish top lists, plus junk tokens) and scores them
+for every language and k of `config.SCORING_LANGUAGES` and
+`config.SCORING_K_VALUES` with the "best" wordlists:
+
+- notebook: `lang_refs` built by sorting every frequency dict, then
+  `lang_confidence_score` per page, language and k (`compute_scores_table`),
+- batched: `score_pages` with the reference tables read from the disk cache
+  (built once beforehand, reported separately),
+- corpus: `score_matrix` of the same pages recorded in a corpus store (what
+  the `score_pages` command does without titles), which skips converting
+  the dicts.
+
+All must give the same scores (relative difference below 1e-12).
+
+Run:
+    python -m benchmarks.bench_scoring [--pages 2000]
+"""
+
+import argparse
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import wordfreq
+from bs4 import BeautifulSoup
+
+from wikiscraper import config, reference
+from wikiscraper.corpus import Corpus
+from wikiscraper.reference import ReferenceFrequencies
+from wikiscraper.scoring import lang_confidence_score, score_matrix, score_pages
+from wikiscraper.tokenizer import Tokenizer
+
+
+def sample_pages(pages: int, seed: int = 0) -> dict[str, dict[str, int]]:
+    """Pages of 800 words, mostly one language, with junk tokens."""
+    rng = np.random.default_rng(seed)
+    fixture: Counter = Counter()
+    for path in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+        soup = BeautifulSoup(path.read_text(encoding="utf-8"), "lxml")
+        fixture.update(Tokenizer().count(soup.get_text(separator="\n")))
+    sources = [list(fixture), wordfreq.top_n_list("es", 5000), wordfreq.top_n_list("da", 5000)]
+    result = {}
+    for i in range(pages):
+        words = sources[i % len(sources)]
+        ids = rng.zipf(1.3, 800) % len(words)
+        counts = Counter(words[j] for j in ids.tolist())
+        counts.update(f"junk{j}" for j in rng.integers(0, 10**6, 50).tolist())
+        result[f"page {i}"] = dict(counts)
+    return result
+
+
+def notebook(pages, languages, k_values) -> np.ndarray:
+    """`lang_refs` and `compute_scores_table` of analysis.ipynb."""
+    lang_refs = {}
+    for lang in languages:
+        full_freq_dict = wordfreq.get_frequency_dict(lang, wordlist="best")
+        sorted_items = sorted(full_freq_dict.items(), key=lambda x: x[1], reverse=True)
+        lang_refs[lang] = {k: dict(sorted_items[:k]) for k in k_values}
+    return np.array([
+        [[lang_confidence_score(words, lang_refs[lang][k]) for k in k_values]
+         for lang in languages]
+        for words in pages.values()
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=2000)
+    args = parser.parse_args()
+    languages, k_values = list(config.SCORING_LANGUAGES), list(config.SCORING_K_VALUES)
+    pages = sample_pages(args.pages)
+    entries = sum(len(words) for words in pages.values())
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(config, "REFERENCE_CACHE_DIR", Path(tmp)):
+        start = time.perf_counter()
+        for language in languages:
+            ReferenceFrequencies.build(language, "best").save()
+        build = time.perf_counter() - start
+        print(f"{args.pages} pages, {entries} page-word entries, "
+              f"{len(languages)} languages x {len(k_values)} k; "
+              f"reference tables built in {build:.1f} s (once)")
+
+        start = time.perf_counter()
+        old = notebook(pages, languages, k_values)
+        old_time = time.perf_counter() - start
+        reference._references.clear()
+        start = time.perf_counter()
+        new = score_pages(pages, languages, k_values, wordlist="best")
+        new_time = time.perf_counter() - start
+        reference._references.clear()
+
+        corpus = Corpus(Path(tmp) / "corpus.npz")
+        for title, words in pages.items():
+            corpus.add(title, title, words)
+        indptr, indices, data = corpus.matrix()
+        start = time.perf_counter()
+        stored = score_matrix(indptr, indices, data, corpus.words, languages, k_values, "best")
+        corpus_time = time.perf_counter() - start
+        reference._references.clear()
+
+    print(f"{'method':>8} {'s':>6} {'speedup':>7} {'same':>5}")
+    for name, scores, elapsed in (("notebook", old, old_time), ("batched", new, new_time),
+                                  ("corpus", stored, corpus_time)):
+        same = np.allclose(scores, old, rtol=1e-12, atol=0)
+        print(f"{name:>8} {elapsed:>6.2f} {old_time / elapsed:>6.1f}x {str(same):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: latency of CLI commands run by a new process each time against
+the same commands sent to the `serve` daemon.
+
+Pages come from the fixture files, stored in the page cache of a temporary
+data directory. Every command is run as `python wiki_scraper.py ...` would
+run it (the data directory redirected), in three ways:
+
+- cold: no daemon, every command starts Python, imports its dependencies,
+  reads and parses the page,
+- client: the same processes while a daemon serves the data directory, so
+  each only starts Python and forwards the command (`client.py`),
+- daemon: the daemon's own latency for the request (no process start), as
+  reported in its responses, also with `--concurrency` requests at once.
+
+Run:
+    python -m benchmarks.bench_serve [--repeat 5] [--concurrency 8]
+"""
+
+import argparse
+import json
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+COMMANDS = {
+    "summary": ["summary", "Team Rocket"],
+    "count_words": ["count_words", "Team Rocket"],
+    "table": ["table", "Type", "--number", "1"],
+    "analyze": ["analyze_relative_word_frequency", "--mode", "article", "--count", "5"],
+}
+"""dict[str, list[str]]: Measured commands and their CLI arguments."""
+
+REDIRECT = """
+import sys
+from pathlib import Path
+
+from wikiscraper import config
+
+root = Path(sys.argv[1])
+config.DATA_DIR = root
+config.CACHE_DIR = root / "cache"
+config.REFERENCE_CACHE_DIR = root / "cache" / "wordfreq"
+config.WORD_COUNTS_JSON = root / "word-counts.json"
+config.CORPUS_NPZ = root / "corpus.npz"
+config.SKETCH_NPZ = root / "word-counts.sketch.npz"
+config.SERVE_SOCKET = root / "wikiscraper.sock"
+"""
+"""str: Start of every script: use the data directory given as first argument."""
+
+SEED = REDIRECT + """
+from wikiscraper.cache import cache_key, get_cache
+
+for phrase in ("Team Rocket", "Type"):
+    path = config.TESTS_DATA_DIR / (phrase.lower().replace(" ", "_") + ".html")
+    get_cache().put(cache_key(phrase), path.read_bytes())
+"""
+"""str: Store the fixture pages in the page cache."""
+
+CLI = REDIRECT + """
+import runpy
+
+sys.argv = ["wiki_scraper.py", *sys.argv[2:]]
+runpy.run_path("wiki_scraper.py", run_name="__main__")
+"""
+"""str: Run `wiki_scraper.py` with the remaining arguments."""
+
+DAEMON = REDIRECT + """
+from wikiscraper.controller import Controller
+
+Controller().serve()
+"""
+"""str: Run the `serve` daemon."""
+
+
+def run_cli(root: Path, argv: list[str]) -> float:
+    """Run one command in a new process; return its wall time in seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", CLI, str(root), *argv], cwd=REPO_ROOT,
+                   check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def request(root: Path, argv: list[str]) -> float:
+    """Send one command to the daemon; return its latency in seconds."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(str(root / "wikiscraper.sock"))
+        connection.sendall(json.dumps({"argv": argv, "cwd": str(REPO_ROOT)}).encode() + b"\n")
+        with connection.makefile("rb") as reader:
+            response = json.loads(reader.readline())
+    if response.get("exit_code") != 0:
+        raise RuntimeError(f"{argv} failed: {response}")
+    return response["latency_ms"] / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        subprocess.run([sys.executable, "-c", SEED, tmp], cwd=REPO_ROOT, check=True)
+        cold = {name: [run_cli(root, argv) for _ in range(args.repeat)]
+                for name, argv in COMMANDS.items()}
+
+        daemon = subprocess.Popen([sys.executable, "-c", DAEMON, tmp], cwd=REPO_ROOT,
+                                  stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        try:
+            daemon.stdout.readline()  # "Serving on ..."
+            for argv in COMMANDS.values():
+                request(root, argv)  # warm up: imports, first parse
+            client = {name: [run_cli(root, argv) for _ in range(args.repeat)]
+                      for name, argv in COMMANDS.items()}
+            served = {name: [request(root, argv) for _ in range(args.repeat)]
+                      for name, argv in COMMANDS.items()}
+            with ThreadPoolExecutor(args.concurrency) as pool:
+                argvs = [argv for argv in COMMANDS.values()] * args.repeat * 2
+                start = time.perf_counter()
+                parallel = list(pool.map(lambda argv: request(root, argv), argvs))
+                elapsed = time.perf_counter() - start
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    print(f"median of {args.repeat} runs, ms")
+    print(f"{'command':>12} {'cold':>7} {'client':>7} {'daemon':>7}")
+    for name in COMMANDS:
+        print(f"{name:>12} {statistics.median(cold[name]) * 1000:>7.0f} "
+              f"{statistics.median(client[name]) * 1000:>7.0f} "
+              f"{statistics.median(served[name]) * 1000:>7.1f}")
+    print(f"{len(argvs)} mixed requests, {args.concurrency} at once: {elapsed:.2f} s, "
+          f"median latency {statistics.median(parallel) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
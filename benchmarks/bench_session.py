@@ -0,0 +1,69 @@
+"""
+Benchmark: per-page fetch latency of `Scraper.scrape`.
+
+Compares three ways of downloading the same pages from a local stand-in wiki:
+
+* ``requests.get`` per page (new connection every time, the old path),
+* a shared keep-alive session (warm pooled connection),
+* a shared session revalidating cached pages (``304 Not Modified``).
+
+Run:
+    python -m benchmarks.bench_session [--pages 200]
+"""
+
+import argparse
+import statistics
+import time
+
+from wikiscraper.cache import PageCache
+from wikiscraper.scraper import Scraper
+from wikiscraper.session import make_session
+
+from benchmarks.common import isolated_data_dir
+from benchmarks.stand_in_wiki import StandInWiki
+
+
+def fetch_all(base_url: str, titles: list[str], cache: PageCache,
+              session=None) -> list[float]:
+    """Scrape every title over the network; return per-page latencies in ms."""
+    latencies = []
+    for title in titles:
+        start = time.perf_counter()
+        Scraper(title, wiki_base_url=base_url, session=session,
+                cache=cache).scrape()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def report(name: str, latencies: list[float], bytes_sent: int, connections: int):
+    """Print one result row."""
+    print(f"{name:<24} {statistics.median(latencies):>9.2f} "
+          f"{statistics.mean(latencies):>9.2f} {bytes_sent / 1024:>10.0f} "
+          f"{connections:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    args = parser.parse_args()
+
+    titles = [f"Page_{i}" for i in range(args.pages)]
+    with StandInWiki(num_pages=args.pages, latency=0) as wiki:
+        print(f"{'path':<24} {'median ms':>9} {'mean ms':>9} "
+              f"{'KiB sent':>10} {'conns':>6}")
+        with isolated_data_dir() as tmp:
+            runs = [
+                ("requests.get per page", None, "cold"),
+                ("shared session, 200", make_session(), "warm"),
+                # Reuses the cache (and ETags) written by the run before.
+                ("shared session, 304", make_session(), "warm"),
+            ]
+            for name, session, cache_name in runs:
+                cache = PageCache(tmp / cache_name, max_entries=args.pages)
+                sent, conns = wiki.bytes_served, wiki.connections
+                latencies = fetch_all(wiki.base_url, titles, cache, session)
+                report(name, latencies, wiki.bytes_served - sent,
+                       wiki.connections - conns)
+
+if __name__ == "__main__":
+    main()
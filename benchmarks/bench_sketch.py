@@ -0,0 +1,97 @@
+"""
+Benchmark: accuracy and memory of approximate counting (count-min sketch
+plus top-K) against exact counts.
+
+Builds a sample crawl of `--pages` pages: the words of the fixture pages
+with their real frequencies, plus a long tail of junk tokens (Zipf
+distributed ids, mostly seen once or twice), as broad crawls produce. The
+pages are counted exactly (a dict) and with `SketchCounter` at several
+memory budgets, and for each budget the report shows:
+
+- precision of the top 20/100/500 words (share of the sketch's top-N that
+  are in the exact top-N),
+- the largest relative overestimate among the exact top 100,
+- the memory ceiling of the counter and the exact dict's size,
+- the time to count all pages.
+
+Run:
+    python -m benchmarks.bench_sketch [--pages 5000] [--budgets 1 4 16]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+from wikiscraper import config
+from wikiscraper.sketch import SketchCounter
+from wikiscraper.tokenizer import Tokenizer
+
+
+def sample_crawl(pages: int, seed: int = 0) -> list[dict[str, int]]:
+    """Pages mixing fixture-page words and a long junk tail."""
+    rng = np.random.default_rng(seed)
+    real: Counter = Counter()
+    for fixture in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+        soup = BeautifulSoup(fixture.read_text(encoding="utf-8"), "lxml")
+        real.update(Tokenizer().count(soup.get_text(separator="\n")))
+    words = list(real)
+    weights = np.array([real[w] for w in words], dtype=float)
+    weights /= weights.sum()
+    crawl = []
+    for _ in range(pages):
+        page = Counter(rng.choice(len(words), 600, p=weights).tolist())
+        counts = {words[i]: c for i, c in page.items()}
+        junk = rng.zipf(1.1, 300) + rng.integers(0, 5_000_000)
+        counts.update(Counter(f"x{j}" for j in junk.tolist()))
+        crawl.append(counts)
+    return crawl
+
+
+def dict_bytes(counts: dict[str, int]) -> int:
+    """Approximate memory of a word count dict (dict, keys and values)."""
+    return sys.getsizeof(counts) + sum(sys.getsizeof(w) + 28 for w in counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--budgets", type=float, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--k", type=int, default=config.SKETCH_TOP_K)
+    args = parser.parse_args()
+
+    crawl = sample_crawl(args.pages)
+    start = time.perf_counter()
+    exact: Counter = Counter()
+    for words in crawl:
+        exact.update(words)
+    exact_time = time.perf_counter() - start
+    ranked = [w for w, _ in exact.most_common()]
+    print(f"{args.pages} pages, {sum(exact.values())} words, {len(exact)} distinct; "
+          f"exact dict {dict_bytes(exact) / 1e6:.0f} MB, {exact_time:.1f} s")
+    print(f"{'budget MB':>9} {'width x depth':>14} {'memory MB':>9} {'s':>6} "
+          f"{'p@20':>5} {'p@100':>5} {'p@500':>5} {'max err top100':>14}")
+    for budget in args.budgets:
+        counter = SketchCounter.from_budget(memory_mb=budget, k=args.k)
+        start = time.perf_counter()
+        for words in crawl:
+            counter.add(words)
+        elapsed = time.perf_counter() - start
+        precision = []
+        for n in (20, 100, 500):
+            top = {w for w, _ in counter.top(n)}
+            precision.append(len(top & set(ranked[:n])) / n)
+        truth = np.array([exact[w] for w in ranked[:100]])
+        estimates = counter.sketch.estimate(ranked[:100])
+        error = float(((estimates - truth) / truth).max())
+        shape = f"{counter.sketch.width}x{counter.sketch.depth}"
+        print(f"{budget:>9g} {shape:>14} {counter.memory_bytes / 1e6:>9.1f} {elapsed:>6.1f} "
+              f"{precision[0]:>5.2f} {precision[1]:>5.2f} {precision[2]:>5.2f} "
+              f"{error:>13.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: startup cost of CLI subcommands (`python -X importtime`).
+
+Runs every subcommand the way `wiki_scraper.py` does (parse the arguments,
+then create a `Controller` and run the command) in a fresh interpreter with
+`-X importtime`, in a temporary data directory, with pages read from the
+fixture files instead of the wiki. For every command the report shows:
+
+- import time: the summed cumulative time of the top-level imports,
+- wall time of the whole process,
+- which of the heavy dependencies (numpy, pandas, matplotlib, wordfreq) it
+  loaded.
+
+`--tree` runs the commands against another checkout of the repository
+(e.g. an older commit exported with `git archive`) for comparison.
+
+Run:
+    python -m benchmarks.bench_startup [--repeat 3] [--tree /path/to/checkout]
+"""
+
+import argparse
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "wordfreq")
+"""tuple[str, ...]: Dependencies that short commands should not import."""
+
+COMMANDS = {
+    "--help": ["--help"],
+    "summary": ["summary", "Team Rocket"],
+    "count_words": ["count_words", "Team Rocket"],
+    "table": ["table", "Type", "--number", "1"],
+    "analyze": ["analyze_relative_word_frequency", "--mode", "article", "--count", "5"],
+    "top_words": ["--corpus", "top_words"],
+}
+"""dict[str, list[str]]: Measured commands and their CLI arguments."""
+
+RUNNER = """
+import sys
+from pathlib import Path
+
+from wikiscraper import config
+
+root = Path(sys.argv[1])
+config.DATA_DIR = root
+config.CACHE_DIR = root / "cache"
+config.REFERENCE_CACHE_DIR = root / "cache" / "wordfreq"
+config.WORD_COUNTS_JSON = root / "word-counts.json"
+config.CORPUS_NPZ = root / "corpus.npz"
+config.SKETCH_NPZ = root / "word-counts.sketch.npz"
+sys.argv = ["wiki_scraper.py", *sys.argv[2:]]
+
+from wikiscraper.parser import Parser
+
+args = Parser().parse_args()
+
+from wikiscraper.controller import Controller
+from wikiscraper.page import Page
+
+
+def local_page(self, phrase, wait=0):
+    path = config.TESTS_DATA_DIR / (phrase.lower().replace(" ", "_") + ".html")
+    return Page(phrase, path.read_text(encoding="utf-8"))
+
+
+Controller._get_page = local_page
+Controller().run_func(args)
+"""
+"""str: Script run in the measured interpreter (data dir, then CLI arguments)."""
+
+
+def measure(argv: list[str], tree: Path = REPO_ROOT) -> tuple[float, float, set[str]]:
+    """
+    Run one command in a fresh interpreter with `-X importtime`.
+
+    Args:
+        argv (list[str]): CLI arguments of the command.
+        tree (Path): Checkout of the repository to run.
+
+    Returns:
+        tuple[float, float, set[str]]: Import time and wall time in seconds,
+            and the names of all imported modules.
+
+    Raises:
+        RuntimeError: If the command fails.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", RUNNER, tmp, *argv],
+            cwd=tree, capture_output=True, text=True,
+        )
+        wall = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"{argv} failed:\n{process.stderr[-2000:]}")
+    modules, total_us = set(), 0
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            total_us += int(cumulative)
+    return total_us / 1e6, wall, modules
+
+
+def heavy(modules: set[str]) -> list[str]:
+    """Return the heavy dependencies among imported modules."""
+    return [name for name in HEAVY_MODULES if name in modules]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tree", type=Path, default=REPO_ROOT)
+    args = parser.parse_args()
+    # Trees that import the controller with the package bind its default
+    # output directory before the runner redirects the data directory.
+    (args.tree / "data").mkdir(exist_ok=True)
+
+    print(f"{'command':>12} {'import ms':>9} {'wall ms':>8}  heavy modules")
+    for name, argv in COMMANDS.items():
+        runs = [measure(argv, args.tree) for _ in range(args.repeat)]
+        imports = min(run[0] for run in runs)
+        wall = min(run[1] for run in runs)
+        print(f"{name:>12} {imports * 1000:>9.0f} {wall * 1000:>8.0f}  "
+              f"{', '.join(heavy(runs[0][2])) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
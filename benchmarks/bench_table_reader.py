@@ -0,0 +1,73 @@
+"""
+Benchmark: native table reader vs `pd.read_html`.
+
+Reads the real tables of `tests/test_data/type.html` (the type charts are the
+largest tables of the fixtures) from the already-parsed page, once with
+`pd.read_html(str(table))` as `Page.table` used to, and once with
+`tables.read_table`, and reports the time per table. The value counts are
+timed the same way: the old list comprehension vs `tables.value_counts`.
+
+Run:
+    python -m benchmarks.bench_table_reader [--repeat 20]
+"""
+
+import argparse
+import io
+import time
+
+import pandas as pd
+
+from wikiscraper import config
+from wikiscraper.page import Page
+from wikiscraper.tables import read_table, value_counts
+
+
+def read_html(tag) -> pd.DataFrame:
+    """The previous reader: serialize the tag and parse it again."""
+    return pd.read_html(io.StringIO(str(tag)))[0]
+
+
+def list_value_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """The previous value counts."""
+    all_values = df.to_numpy().flatten()
+    all_values = [v for v in all_values if pd.notna(v)]
+    counts = pd.Series(all_values).value_counts().reset_index()
+    counts.columns = ["Wartość", "Liczba wystąpień"]
+    return counts
+
+
+def timed(func, arg, repeat: int) -> float:
+    """Return the mean time of `func(arg)` in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(arg)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    html = (config.TESTS_DATA_DIR / "type.html").read_text(encoding="utf-8")
+    page = Page("Type", html)
+    print(f"{'table':>5} {'shape':>9} {'read_html ms':>13} {'native ms':>10} "
+          f"{'counts ms':>10} {'vector ms':>10}")
+    totals = [0.0, 0.0]
+    for info, tag in zip(page.table_catalog(), page._real_tables()):
+        try:
+            df = read_html(tag)
+        except ValueError:
+            continue
+        old = timed(read_html, tag, args.repeat)
+        new = timed(read_table, tag, args.repeat)
+        totals[0] += old
+        totals[1] += new
+        print(f"{info.index:>5} {'x'.join(map(str, df.shape)):>9} {old:>13.1f} "
+              f"{new:>10.1f} {timed(list_value_counts, df, args.repeat):>10.2f} "
+              f"{timed(value_counts, df, args.repeat):>10.2f}")
+    print(f"{'all':>5} {'':>9} {totals[0]:>13.1f} {totals[1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: sustained throughput of the adaptive throttle against a
+rate-limited wiki.
+
+The stand-in wiki answers requests above its rate limit with `429` and
+`Retry-After`. For several limits, a concurrent `auto_count_words` crawl is
+run and the achieved pages per second, the number of `429` responses and the
+throttle's final rate are reported. Without the throttle the first `429`
+would have ended the crawl.
+
+Run:
+    python -m benchmarks.bench_throttle [--pages 300] [--depth 3] [--limits 10 25 50]
+"""
+
+import argparse
+import time
+
+from wikiscraper.controller import Controller
+
+from benchmarks.common import isolated_data_dir
+from benchmarks.stand_in_wiki import StandInWiki
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--limits", type=float, nargs="+", default=[10, 25, 50])
+    args = parser.parse_args()
+
+    print(f"{'limit/s':>8} {'pages':>6} {'pages/s':>8} {'429s':>6} "
+          f"{'backoffs':>9} {'final rate':>11} {'failed':>7}")
+    for limit in args.limits:
+        with StandInWiki(num_pages=args.pages, latency=args.latency,
+                         rate_limit=limit) as wiki, isolated_data_dir():
+            controller = Controller(wiki_base_url=wiki.base_url)
+            start = time.perf_counter()
+            controller.auto_count_words("Page_0", depth=args.depth, wait=0,
+                                        concurrency=args.concurrency)
+            elapsed = time.perf_counter() - start
+            pages = len(controller.cache)
+            stats = controller.throttle.stats()
+            print(f"{limit:>8.0f} {pages:>6} {pages / elapsed:>8.1f} "
+                  f"{wiki.throttled:>6} {stats['backoffs']:>9} "
+                  f"{stats['rate']:>11.1f} {stats['failures']:>7}")
+
+
+if __name__ == "__main__":
+    main()
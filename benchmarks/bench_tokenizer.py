@@ -0,0 +1,65 @@
+"""
+Benchmark: word tokenizer throughput.
+
+Counts the words of the text of the fixture pages (`get_text` of each page)
+with the original per-token loop of `Page.get_dict` and with `Tokenizer`,
+without and with the optional normalizers, and reports tokens per second:
+once page by page (what a crawl does) and once over all pages concatenated
+`--copies` times into one large text.
+
+Run:
+    python -m benchmarks.bench_tokenizer [--copies 20] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from wikiscraper import config
+from wikiscraper.tokenizer import Tokenizer
+
+
+def loop_count(text: str) -> dict[str, int]:
+    """The original per-token loop of `Page.get_dict`."""
+    words_found: dict[str, int] = {}
+    for word in text.split():
+        word = word.lower()
+        if word.isalpha():
+            words_found[word] = words_found.get(word, 0) + 1
+    return words_found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = [
+        BeautifulSoup(f.read_text(encoding="utf-8"), "lxml").get_text(separator="\n")
+        for f in sorted(config.TESTS_DATA_DIR.glob("*.html"))
+    ]
+    text = "\n".join(texts) * args.copies
+    variants = [
+        ("per-token loop", loop_count),
+        ("Tokenizer()", Tokenizer().count),
+        ("+ casefold", Tokenizer(["casefold"]).count),
+        ("+ all normalizers", Tokenizer(["casefold", "apostrophes", "digits"]).count),
+    ]
+    for title, inputs in (("page by page", texts), ("one large text", [text])):
+        tokens = sum(len(t.split()) for t in inputs)
+        size = sum(len(t) for t in inputs) / 1e6
+        print(f"{title}: {len(inputs)} text(s), {size:.1f} M characters, {tokens} tokens")
+        print(f"  {'variant':<18} {'ms':>8} {'Mtokens/s':>10}")
+        for label, count in variants:
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                for t in inputs:
+                    count(t)
+            elapsed = (time.perf_counter() - start) / args.repeat
+            print(f"  {label:<18} {elapsed * 1000:>8.1f} {tokens / elapsed / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
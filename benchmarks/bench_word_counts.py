@@ -0,0 +1,78 @@
+"""
+Benchmark: cost of adding one page's word counts as the vocabulary grows.
+
+For several vocabulary sizes, the cumulative counts are first filled with
+that many distinct words; then the counts of `--pages` synthetic pages
+(`--page-words` distinct words each, half of them new) are added one page at
+a time, once with the previous whole-file JSON rewrite and once with the
+SQLite store (`merge_word_counts`), and the time per page is reported. The
+store's final JSON export is timed separately.
+
+Run:
+    python -m benchmarks.bench_word_counts [--pages 50] [--page-words 2000]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from benchmarks.common import isolated_data_dir
+from wikiscraper import config
+from wikiscraper.word_counts import export_word_counts, merge_word_counts, remove_word_counts
+
+
+def json_rewrite_merge(path: Path, words: dict[str, int]) -> None:
+    """The previous `merge_word_counts`: read, merge and rewrite the file."""
+    raw = path.read_text(encoding="utf-8").strip()
+    data = json.loads(raw) if raw else {}
+    for word, count in words.items():
+        data[word] = data.get(word, 0) + count
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def pages(vocabulary: int, count: int, size: int) -> list[dict[str, int]]:
+    """Synthetic pages: half known words, half new ones."""
+    return [
+        {**{f"w{(p * size + i) % vocabulary}": 2 for i in range(size // 2)},
+         **{f"new{p}_{i}": 1 for i in range(size // 2)}}
+        for p in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--page-words", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'vocabulary':>10} {'JSON ms/page':>13} {'store ms/page':>14} {'export ms':>10}")
+    for vocabulary in (10_000, 100_000, 500_000):
+        base = {f"w{i}": 1 for i in range(vocabulary)}
+        batch = pages(vocabulary, args.pages, args.page_words)
+        with isolated_data_dir():
+            path = Path(config.WORD_COUNTS_JSON)
+
+            path.write_text(json.dumps(base, indent=2), encoding="utf-8")
+            start = time.perf_counter()
+            for words in batch:
+                json_rewrite_merge(path, words)
+            rewrite = (time.perf_counter() - start) / args.pages
+
+            path.write_text(json.dumps(base, indent=2), encoding="utf-8")
+            merge_word_counts({})
+            start = time.perf_counter()
+            for words in batch:
+                merge_word_counts(words)
+            store = (time.perf_counter() - start) / args.pages
+
+            start = time.perf_counter()
+            export_word_counts()
+            export = time.perf_counter() - start
+            remove_word_counts()
+        print(f"{vocabulary:>10} {rewrite * 1000:>13.1f} {store * 1000:>14.1f} "
+              f"{export * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Shared helpers for the benchmark scripts."""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from wikiscraper import config
+from wikiscraper.word_counts import load_word_counts
+
+
+@contextmanager
+def isolated_data_dir():
+    """
+    Point the data, cache and word-count paths of `config` to a temporary
+    directory for the duration of the block.
+
+    Yields:
+        Path: The temporary data directory.
+    """
+    saved = (config.DATA_DIR, config.CACHE_DIR, config.WORD_COUNTS_JSON)
+    with tempfile.TemporaryDirectory() as tmp:
+        config.DATA_DIR = Path(tmp)
+        config.CACHE_DIR = Path(tmp) / "cache"
+        config.WORD_COUNTS_JSON = Path(tmp) / "word-counts.json"
+        try:
+            yield Path(tmp)
+        finally:
+            config.DATA_DIR, config.CACHE_DIR, config.WORD_COUNTS_JSON = saved
+
+
+def read_word_counts() -> dict[str, int]:
+    """Return the word counts of the store of `config.WORD_COUNTS_JSON`."""
+    return load_word_counts()
@@ -0,0 +1,327 @@
+"""
+Module: stand_in_wiki.py
+
+A small local HTTP server that imitates a wiki for benchmarks and tests.
+
+It serves a deterministic graph of synthetic articles under `/wiki/<title>`
+and delays every response by a fixed latency, so crawls can be measured
+without touching the real wiki. Responses carry an ETag and conditional
+requests with a matching `If-None-Match` are answered with `304`.
+
+A minimal MediaWiki API is served at `/w/api.php`: `action=parse` returns
+the rendered article content and `action=query&prop=revisions` returns the
+wikitext of several titles at once (`prop=links` adds their links).
+
+With `navbox` set, the `{{Infobox}}` template of every article renders a
+link to the next article, like a navbox: it is in the rendered pages and
+in `prop=links`, but not in the wikitext.
+
+With `rate_limit` set, the server enforces a token bucket and answers
+requests above the limit with `429 Too Many Requests` and a `Retry-After`
+header, like a wiki protecting itself from aggressive crawlers.
+
+Usage Example:
+    with StandInWiki(num_pages=200, latency=0.05) as wiki:
+        controller = Controller(wiki_base_url=wiki.base_url)
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+WORDS = (
+    "pokemon", "trainer", "rocket", "team", "battle", "gym", "badge",
+    "region", "kanto", "johto", "evolution", "type", "move", "ability",
+    "item", "route", "city", "league", "champion", "wild",
+)
+
+
+CHROME = "".join(
+    f'<li><a href="/wiki/Special:Page_{i}">Navigation entry {i}</a></li>\n'
+    for i in range(300)
+)
+"""str: Skin markup (menus, sidebars) repeated on every rendered page."""
+
+
+def make_wikitext(index: int, num_pages: int, links_per_page: int = 5) -> str:
+    """
+    Build the wikitext of synthetic article number `index`.
+
+    Args:
+        index (int): Article number.
+        num_pages (int): Total number of articles in the stand-in wiki.
+        links_per_page (int): Number of outgoing article links.
+
+    Returns:
+        str: Wikitext with one paragraph and a list of links.
+    """
+    rng = random.Random(index)
+    words = " ".join(rng.choice(WORDS) for _ in range(300))
+    links = "\n".join(
+        f"* [[Page_{rng.randrange(num_pages)}|link]]" for _ in range(links_per_page)
+    )
+    return f"{{{{Infobox|number={index}}}}}\nPage {index} {words}\n\n{links}\n"
+
+
+def make_content(
+    index: int, num_pages: int, links_per_page: int = 5, navbox: bool = False
+) -> str:
+    """Build the rendered article content (as returned by `action=parse`)."""
+    rng = random.Random(index)
+    words = " ".join(rng.choice(WORDS) for _ in range(300))
+    links = "".join(
+        f'<ul><li><a href="/wiki/Page_{rng.randrange(num_pages)}">link</a></li></ul>\n'
+        for _ in range(links_per_page)
+    )
+    template = (
+        f'<div class="navbox"><a href="/wiki/Page_{(index + 1) % num_pages}">next</a></div>'
+        if navbox else ""
+    )
+    return (
+        '<div class="mw-content-ltr mw-parser-output">'
+        f"{template}<p>Page {index} {words}</p>\n{links}</div>"
+    )
+
+
+def make_links(
+    index: int, num_pages: int, links_per_page: int = 5, navbox: bool = False
+) -> list[str]:
+    """Return the titles an article links to (as listed by `prop=links`)."""
+    rng = random.Random(index)
+    for _ in range(300):
+        rng.choice(WORDS)
+    targets = [rng.randrange(num_pages) for _ in range(links_per_page)]
+    if navbox:
+        targets.append((index + 1) % num_pages)
+    return sorted({f"Page {target}" for target in targets})
+
+
+def make_article(
+    index: int, num_pages: int, links_per_page: int = 5, navbox: bool = False
+) -> str:
+    """
+    Build the full skin-rendered HTML page of synthetic article `index`.
+
+    Args:
+        index (int): Article number.
+        num_pages (int): Total number of articles in the stand-in wiki.
+        links_per_page (int): Number of outgoing article links.
+        navbox (bool): Whether the infobox renders a link to the next article.
+
+    Returns:
+        str: HTML document with page chrome and a Bulbapedia-like content div.
+    """
+    content = make_content(index, num_pages, links_per_page, navbox)
+    return (
+        "<html><head><title>Page</title></head><body>"
+        f'<div id="mw-navigation"><ul>{CHROME}</ul></div>'
+        f"{content}</body></html>"
+    )
+
+
+class StandInWiki:
+    """
+    Threaded local wiki server with configurable latency.
+
+    Attributes:
+        num_pages (int): Number of synthetic articles.
+        latency (float): Delay in seconds added to every response.
+        requests_served (int): Number of requests handled so far.
+        bytes_served (int): Number of response body bytes sent so far.
+        connections (int): Number of TCP connections accepted so far.
+        rate_limit (float | None): Requests per second allowed before
+            answering `429`; None disables the limit.
+        retry_after (int): `Retry-After` value (seconds) sent with `429`.
+        throttled (int): Number of `429` responses sent so far.
+        navbox (bool): Whether templates render a link to the next article.
+    """
+
+    def __init__(
+        self,
+        num_pages: int = 100,
+        latency: float = 0.05,
+        rate_limit: float | None = None,
+        retry_after: int = 1,
+        navbox: bool = False,
+    ):
+        """
+        Initialize the server (it is started by `start` or `__enter__`).
+
+        Args:
+            num_pages (int): Number of synthetic articles.
+            latency (float): Delay in seconds added to every response.
+            rate_limit (float, optional): Requests per second allowed (token
+                bucket holding one second of requests).
+            retry_after (int): `Retry-After` value sent with `429` responses.
+            navbox (bool): Render a template link to the next article.
+        """
+        self.num_pages = num_pages
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.navbox = navbox
+        self.requests_served = 0
+        self.bytes_served = 0
+        self.connections = 0
+        self.throttled = 0
+        self._tokens = rate_limit or 0.0
+        self._refilled_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        )
+
+    @property
+    def base_url(self) -> str:
+        """str: Base URL to pass as `wiki_base_url`."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/wiki/Main_Page"
+
+    def index_of(self, title: str) -> int | None:
+        """Return the article number of `title`, or None if it does not exist."""
+        title = title.replace(" ", "_")
+        if not title.startswith("Page_"):
+            return None
+        try:
+            index = int(title.removeprefix("Page_"))
+        except ValueError:
+            return None
+        return index if 0 <= index < self.num_pages else None
+
+    def take_token(self) -> bool:
+        """Take one request from the rate-limit bucket; False if it is empty."""
+        if self.rate_limit is None:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.rate_limit,
+                self._tokens + (now - self._refilled_at) * self.rate_limit,
+            )
+            self._refilled_at = now
+            if self._tokens < 1:
+                self.throttled += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def article(self, title: str) -> str | None:
+        """Return the HTML of article `title`, or None if it does not exist."""
+        index = self.index_of(title)
+        if index is None:
+            return None
+        return make_article(index, self.num_pages, navbox=self.navbox)
+
+    def api(self, params: dict[str, str]) -> dict:
+        """Answer a MediaWiki API request (formatversion=2 JSON)."""
+        if params.get("action") == "parse":
+            index = self.index_of(params.get("page", ""))
+            if index is None:
+                return {"error": {"code": "missingtitle", "info": "missing"}}
+            return {"parse": {
+                "title": f"Page {index}",
+                "text": make_content(index, self.num_pages, navbox=self.navbox),
+            }}
+
+        normalized, pages = [], []
+        for title in params.get("titles", "").split("|"):
+            canonical = title.replace("_", " ")
+            if canonical != title:
+                normalized.append({"from": title, "to": canonical})
+            index = self.index_of(title)
+            if index is None:
+                pages.append({"title": canonical, "missing": True})
+                continue
+            content = make_wikitext(index, self.num_pages)
+            page = {
+                "title": canonical,
+                "revisions": [{"slots": {"main": {"content": content}}}],
+            }
+            if "links" in params.get("prop", "").split("|"):
+                page["links"] = [
+                    {"ns": 0, "title": link}
+                    for link in make_links(index, self.num_pages, navbox=self.navbox)
+                ]
+            pages.append(page)
+        return {"batchcomplete": True,
+                "query": {"normalized": normalized, "pages": pages}}
+
+    def _handler(self):
+        """Create the request handler class bound to this server."""
+        wiki = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                with wiki._lock:
+                    wiki.connections += 1
+
+            def do_GET(self):
+                time.sleep(wiki.latency)
+                with wiki._lock:
+                    wiki.requests_served += 1
+                if not wiki.take_token():
+                    self.send_response(429)
+                    self.send_header("Retry-After", str(wiki.retry_after))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                url = urlsplit(self.path)
+                path = url.path
+                if path == "/w/api.php":
+                    params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                    body = json.dumps(wiki.api(params)).encode("utf-8")
+                    self.send_body(body, "application/json")
+                    return
+                html = wiki.article(unquote(path.removeprefix("/wiki/")))
+                if html is None:
+                    self.send_error(404)
+                    return
+                self.send_body(html.encode("utf-8"), "text/html; charset=utf-8")
+
+            def send_body(self, body: bytes, content_type: str):
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                with wiki._lock:
+                    wiki.bytes_served += len(body)
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StandInWiki":
+        """Start serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and release its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInWiki":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -1,17 +1,20 @@
 """
 Run all WikiScraper functionalities in a batch, simulating CLI usage.
 
-This script iterates through multiple command/argument combinations:
+This script runs multiple command/argument combinations:
 - summary
 - count_words
 - table (with multiple table numbers)
 - analyze_relative_word_frequency (with chart)
 - auto_count_words
+
+The cases run as one batch (see `wikiscraper/batch.py`): every page is
+fetched and parsed once, pages are worked on concurrently, and the output
+is printed in the order of the cases.
 """
 
+from wikiscraper.batch import BatchRunner
 from wikiscraper.controller import Controller
-from wikiscraper.parser import Parser
-import time
 
 # Define all test cases
 test_cases = [
@@ -37,14 +40,16 @@ test_cases = [
     ["auto_count_words", "Team Rocket", "--depth", "1", "--wait", "0"],
 ]
 
-# Initialize parser and controller
-pr = Parser()
+# Initialize controller
 cl = Controller()
 
-# Run each test case
-for case in test_cases:
-    print(f"\n--- Running CLI case: {case} ---")
-    args = pr.parser.parse_args(case)
-    print(f"Parsed arguments: {args}")
-    cl.run_func(args)
-    time.sleep(0.2)  # short delay between cases
+
+def show(result):
+    """Print the output of a CLI case."""
+    print(f"\n--- Running CLI case: {result.argv} ---")
+    print(result.stdout, end="")
+    print(result.stderr, end="")
+
+
+# Run all cases
+BatchRunner(cl).run(test_cases, on_result=show)
@@ -4,7 +4,7 @@ setup(
     name="wikiscraper",
     version="0.1.0",
     description="WikiScraper project",
-    packages=find_packages(exclude=("tests",)),
+    packages=find_packages(exclude=("tests", "benchmarks")),
     include_package_data=True,
     python_requires=">=3.10",
 )
@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures of the unit tests.
+
+Every data path of `wikiscraper.config` (the data directory and everything
+below it: page cache, reference tables, word counts, corpus, sketch and the
+`serve` socket) points to a temporary directory for the whole test session,
+so test runs never read or write the repository's `data/` tree.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from wikiscraper import config
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_data_paths(tmp_path_factory):
+    """Point every `config` path below `config.DATA_DIR` to a temp directory."""
+    data_dir = tmp_path_factory.mktemp("data")
+    original = config.DATA_DIR
+    with pytest.MonkeyPatch.context() as patcher:
+        for name, value in vars(config).copy().items():
+            if name.isupper() and isinstance(value, Path) and value.is_relative_to(original):
+                patcher.setattr(config, name, data_dir / value.relative_to(original))
+        yield data_dir
+        from wikiscraper.word_counts import remove_word_counts
+        remove_word_counts()
@@ -6,13 +6,19 @@ Tests include:
 - Scraper class: reading local HTML, downloading HTML, error handling
 - Controller class: cache logic, clearing cache, analyzing word frequency
 
-Uses unittest and mocking to isolate components where needed.
+Uses unittest and mocking to isolate components where needed. Data files
+(page cache, word counts, CSV tables) go to the temp dir of `conftest.py`,
+not to `data/`.
 """
 
+import tempfile
 import unittest
-from pathlib import Path
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 
+import numpy as np
+from bs4 import BeautifulSoup
+
+from wikiscraper.cache import PageCache, cache_key
 from wikiscraper.page import Page
 from wikiscraper import config
 from wikiscraper.controller import Controller
@@ -47,7 +53,7 @@ class TestPage(unittest.TestCase):
     def test_table(self):
         """Test table extraction returns correct DataFrame structure."""
         print("\n--- Table Test ---")
-        df = self.page.table(1, first_row_is_header=True)
+        df = self.page.table(1, first_row_is_header=True, output_dir=config.DATA_DIR)
         self.assertEqual(list(df.columns), ["Pokemon", "Type"])
         self.assertEqual(len(df), 2)
 
@@ -65,17 +71,56 @@ class TestPage(unittest.TestCase):
         self.assertIn("Bulbasaur", links)
         self.assertIn("Charmander", links)
 
+    def test_html_is_parsed_once(self):
+        """Test that all operations share one memoized parse."""
+        with patch("wikiscraper.page.BeautifulSoup", wraps=BeautifulSoup) as parse, \
+                patch("builtins.print"), tempfile.TemporaryDirectory() as tmp:
+            page = Page("Team Rocket", HTML_SAMPLE)
+            page.summary()
+            page.links()
+            page.get_dict()
+            page.table(1, output_dir=tmp)
+            page.links()
+            self.assertEqual(parse.call_count, 1)
+
+    def test_release_frees_tree_and_keeps_results(self):
+        """Test that release drops the tree but not memoized results."""
+        with patch("wikiscraper.page.BeautifulSoup", wraps=BeautifulSoup) as parse:
+            page = Page("Team Rocket", HTML_SAMPLE)
+            links = page.links()
+            words = page.get_dict()
+            page.release()
+            self.assertEqual(page.links(), links)
+            self.assertEqual(page.get_dict(), words)
+            self.assertEqual(parse.call_count, 1)
+            self.assertIn("Team Rocket", page.get_content().get_text())
+            self.assertEqual(parse.call_count, 2)
+
+    def test_memoized_results_are_copies(self):
+        """Test that callers cannot corrupt the memoized results."""
+        self.page.get_dict()["team"] = 100
+        self.page.links().clear()
+        self.assertEqual(self.page.get_dict()["team"], 1)
+        self.assertEqual(len(self.page.links()), 2)
+
+    def test_assigning_html_resets_memo(self):
+        """Test that new HTML is parsed instead of reusing the old results."""
+        self.page.links()
+        self.page.html = '<div class="mw-content-ltr"><a href="/wiki/Onix">O</a></div>'
+        self.assertEqual(self.page.links(), ["Onix"])
+
 
 class TestScraper(unittest.TestCase):
     """Tests for the Scraper class."""
 
-    @patch("builtins.open", new_callable=mock_open, read_data="<html>Test</html>")
-    @patch("os.path.exists")
-    def test_scrape_reads_local_file(self, mock_exists, mock_file):
-        """Test Scraper returns correct Page when reading a local HTML file."""
-        mock_exists.return_value = True
-        scraper = Scraper("TestPhrase", use_local_html_file_instead=True)
-        page = scraper.scrape()
+    def test_scrape_reads_local_file(self):
+        """Test Scraper returns correct Page when reading a cached HTML file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(tmp)
+            cache.put("TestPhrase", b"<html>Test</html>")
+            scraper = Scraper("TestPhrase", use_local_html_file_instead=True,
+                              cache=cache)
+            page = scraper.scrape()
         self.assertIsInstance(page, Page)
         self.assertEqual(page.html, "<html>Test</html>")
 
@@ -96,6 +141,25 @@ class TestScraper(unittest.TestCase):
         self.assertIsInstance(page, Page)
         self.assertEqual(page.html, "<html>Downloaded</html>")
 
+    def test_scrape_uses_session_and_revalidates_cache(self):
+        """Test that a cached page is revalidated with a conditional GET."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(tmp)
+            session = MagicMock()
+            first = MagicMock(status_code=200, content=b"<html>v1</html>",
+                              headers={"ETag": '"v1"'})
+            session.get.return_value = first
+            Scraper("Cached", session=session, cache=cache).scrape()
+            self.assertEqual(session.get.call_args.kwargs["headers"], {})
+            self.assertEqual(session.get.call_args.kwargs["timeout"],
+                             config.DEFAULT_TIMEOUT_S)
+
+            session.get.return_value = MagicMock(status_code=304, headers={})
+            page = Scraper("Cached", session=session, cache=cache).scrape()
+            self.assertEqual(session.get.call_args.kwargs["headers"],
+                             {"If-None-Match": '"v1"'})
+            self.assertEqual(page.html, "<html>v1</html>")
+
     @patch("os.path.exists")
     def test_scrape_fails_if_file_missing(self, mock_exists):
         """Test Scraper exits if local HTML file missing and download not allowed."""
@@ -112,14 +176,14 @@ class TestController(unittest.TestCase):
         """Initialize Controller instance for tests."""
         self.controller = Controller()
 
-    @patch("os.path.exists")
-    @patch("wikiscraper.config.CACHE_DIR", Path("/mock/cache"))
-    def test_is_html_in_cache(self, mock_exists):
-        """Test that cached HTML detection works correctly."""
-        mock_exists.return_value = True
-        result = self.controller.is_html_in_cache("test_phrase")
-        self.assertTrue(result)
-        mock_exists.assert_called_once_with(Path("/mock/cache/test_phrase"))
+    def test_is_html_in_cache(self):
+        """Test that cache lookups use the same key as the Scraper stores."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.controller.cache = PageCache(tmp)
+            self.controller.cache.put(cache_key("Team Rocket"), b"<html></html>")
+            self.assertTrue(self.controller.is_html_in_cache("Team Rocket"))
+            self.assertTrue(self.controller.is_html_in_cache("Team_Rocket#History"))
+            self.assertFalse(self.controller.is_html_in_cache("Pikachu"))
 
     @patch("os.listdir")
     @patch("os.path.isfile")
@@ -131,22 +195,23 @@ class TestController(unittest.TestCase):
         self.controller.clear_cache()
         mock_unlink.assert_called_once()
 
-    @patch("wordfreq.word_frequency")
+    @patch("wikiscraper.reference.get_reference")
     @patch("wordfreq.top_n_list")
     @patch("json.loads")
     @patch("pathlib.Path.read_text")
     def test_analyze_relative_word_frequency_article_mode(
-        self, mock_read, mock_json, mock_top_n, mock_word_freq
+        self, mock_read, mock_json, mock_top_n, mock_reference
     ):
         """
         Test relative word frequency analysis in article mode.
         """
         mock_read.return_value = '{"hello": 10}'
         mock_json.return_value = {"hello": 10}
-        mock_word_freq.return_value = 0.01
+        mock_reference.return_value.lookup.return_value = np.array([0.01])
         with patch("pandas.DataFrame.info"):
             self.controller.analyze_relative_word_frequency(mode="article", count=1)
-        mock_word_freq.assert_called_with("hello", "en", wordlist="small")
+        mock_reference.assert_called_with("en", "small")
+        mock_reference.return_value.lookup.assert_called_with(["hello"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,165 @@
+"""
+Unit tests for batches of commands (wikiscraper.batch).
+
+Pages are read from the fixture files through the page cache of a temp data
+dir, so no network access is needed.
+"""
+
+import io
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper import config
+from wikiscraper.batch import BatchRunner, read_commands
+from wikiscraper.cache import cache_key
+from wikiscraper.controller import Controller
+from wikiscraper.page import Page
+from wikiscraper.parser import Parser
+from wikiscraper.runner import OutputCapture, run_command
+from wikiscraper.scraper import Scraper
+from wikiscraper.word_counts import load_word_counts, remove_word_counts
+
+FIXTURES = {"Team Rocket": "team_rocket.html", "Type": "type.html",
+            "Rocket Copy": "team_rocket.html", "Type Copy": "type.html"}
+"""dict[str, str]: Cached pages and their fixture files."""
+
+COMMANDS = [
+    ["summary", "Team Rocket"],
+    ["table", "Type", "--list"],
+    ["count_words", "Team Rocket"],
+    ["table", "Type", "--number", "99"],
+    ["count_words", "Type"],
+    ["summary", "Rocket Copy"],
+    ["count_words", "Team_Rocket"],
+]
+"""list[list[str]]: A batch of page commands, several of them on the same page."""
+
+
+class TestBatch(unittest.TestCase):
+    """Tests for planning and running batches."""
+
+    def setUp(self):
+        """Cache the fixture pages in a temp data dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        for name, value in (("DATA_DIR", root), ("CACHE_DIR", root / "cache"),
+                            ("WORD_COUNTS_JSON", root / "word-counts.json"),
+                            ("SKETCH_NPZ", root / "sketch.npz")):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+        self.controller = Controller()
+        for phrase, name in FIXTURES.items():
+            path = config.TESTS_DATA_DIR / name
+            self.controller.cache.put(cache_key(phrase), path.read_bytes())
+
+    def sequential(self, commands: list[list[str]]) -> list[tuple[int, str]]:
+        """Run commands one by one on a new controller; return exit codes and output."""
+        controller, parser, output = Controller(), Parser(), OutputCapture()
+        results = []
+        output.install()
+        try:
+            for argv in commands:
+                with output.capture() as (stdout, _):
+                    code = run_command(controller, parser.parse_args(argv))
+                results.append((code, stdout.getvalue()))
+        finally:
+            output.uninstall()
+        return results
+
+    def test_read_commands(self):
+        """Test both line formats, blank lines and invalid lines."""
+        lines = ['["summary", "Pikachu"]', "", '{"argv": ["count_words", "Pikachu"]}\n']
+        self.assertEqual(read_commands(lines),
+                         [["summary", "Pikachu"], ["count_words", "Pikachu"]])
+        for line in ("[summary", '{"phrase": "Pikachu"}', "[]", '"summary"'):
+            with self.assertRaises(ValueError):
+                read_commands([line])
+
+    def test_plan_groups_pages_between_barriers(self):
+        """Test that page commands are grouped by page, other commands run alone."""
+        parser = Parser()
+        commands = COMMANDS[:3] + [["top_words"], ["summary", "Type"],
+                                   ["--engine", "stream", "summary", "Type"], ["summary", "Type"]]
+        stages = BatchRunner(self.controller).plan([parser.parse_args(a) for a in commands])
+        self.assertEqual(stages, [[[0, 2], [1]], [[3]], [[4]], [[5]], [[6]]])
+
+    def test_same_results_as_sequential(self):
+        """Test that a batch gives the same output, exit codes and counts, in order."""
+        expected = self.sequential(COMMANDS)
+        counts = load_word_counts()
+        remove_word_counts()
+        config.WORD_COUNTS_JSON.write_text("")
+
+        reported = []
+        with patch.object(Scraper, "scrape", autospec=True, side_effect=Scraper.scrape) as scrape:
+            results = BatchRunner(self.controller, concurrency=3).run(
+                COMMANDS, on_result=lambda result: reported.append(result.index))
+        self.assertEqual(scrape.call_count, 3)  # Team Rocket, Type, Rocket Copy
+        self.assertEqual([(r.exit_code, r.stdout) for r in results], expected)
+        self.assertEqual(reported, list(range(len(COMMANDS))))
+        self.assertEqual(load_word_counts(), counts)
+        self.assertEqual(self.controller.page_memory, 0)
+
+    def test_pages_run_concurrently(self):
+        """Test that commands on different pages overlap their slow fetches."""
+        def slow_scrape(scraper):
+            time.sleep(0.3)
+            return scrape(scraper)
+
+        scrape = Scraper.scrape
+        commands = [["summary", phrase] for phrase in FIXTURES]
+        elapsed = {}
+        with patch.object(Scraper, "scrape", autospec=True, side_effect=slow_scrape):
+            for concurrency in (1, 4):
+                start = time.perf_counter()
+                BatchRunner(self.controller, concurrency=concurrency).run(commands)
+                elapsed[concurrency] = time.perf_counter() - start
+        # Four fetches overlap: about 0.9 s of the 1.2 s of waiting is saved.
+        self.assertLess(elapsed[4], elapsed[1] - 0.5)
+
+    def test_run_options_apply_to_their_command_only(self):
+        """Test that run options are undone after their command, as in separate runs."""
+        from wikiscraper.sketch import remove_sketch
+
+        self.addCleanup(remove_sketch)
+        engine = Page.engine
+        commands = [["--approximate", "--engine", "stream", "count_words", "Team Rocket"],
+                    ["count_words", "Type"]]
+        results = BatchRunner(self.controller).run(commands)
+        self.assertEqual([r.exit_code for r in results], [0, 0])
+        self.assertIsNone(self.controller.sketch)
+        self.assertEqual(Page.engine, engine)
+        expected = Controller()._get_page("Type").get_dict()
+        self.assertEqual(load_word_counts(), expected)
+
+    def test_invalid_commands_and_cli(self):
+        """Test failing commands, and the batch command's output and exit code."""
+        commands = [["summary"], ["batch"], ["summary", "Team Rocket"]]
+        results = BatchRunner(self.controller).run(commands)
+        self.assertEqual([r.exit_code for r in results], [2, 2, 0])
+        self.assertIn("usage", results[0].stderr)
+        self.assertIn("cannot be run in a batch", results[1].stderr)
+
+        path = Path(self.tmp.name) / "commands.jsonl"
+        path.write_text("\n".join(json.dumps(argv) for argv in COMMANDS[:3]))
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.controller.batch(str(path), jsonl=True)
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([line["argv"] for line in lines], COMMANDS[:3])
+        self.assertTrue(lines[0]["stdout"].startswith("Team Rocket"))
+        path.write_text(json.dumps(COMMANDS[3]))
+        with patch("sys.stdout", new_callable=io.StringIO), \
+                patch("sys.stderr", new_callable=io.StringIO), \
+                self.assertRaises(SystemExit):
+            self.controller.batch(str(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
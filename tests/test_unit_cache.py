@@ -0,0 +1,181 @@
+"""
+Unit tests for the disk page cache (wikiscraper.cache).
+
+Each test works in its own temporary directory.
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from wikiscraper import config
+from wikiscraper.cache import PageCache, cache_key
+
+
+class TestCacheKey(unittest.TestCase):
+    """Tests for the canonical cache key."""
+
+    def test_equivalent_phrases_share_a_key(self):
+        """Test that spaces, quoting and anchors map to the same key."""
+        self.assertEqual(cache_key("Team Rocket"), "Team_Rocket")
+        self.assertEqual(cache_key("Team_Rocket#History"), "Team_Rocket")
+        self.assertEqual(cache_key("Team%20Rocket"), "Team_Rocket")
+
+    def test_key_is_a_safe_file_name(self):
+        """Test that forbidden characters are replaced and long keys shortened."""
+        self.assertEqual(cache_key('Type: "Null"/Silvally'), "Type___Null_-Silvally")
+        self.assertLessEqual(len(cache_key("x" * 500).encode("utf-8")), 200)
+
+
+class TestPageCache(unittest.TestCase):
+    """Tests for LRU eviction, counters and index persistence."""
+
+    def setUp(self):
+        """Create an empty cache directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+
+    def test_hit_miss_counters(self):
+        """Test that lookups are counted as hits and misses."""
+        cache = PageCache(self.dir)
+        cache.put("A", b"aaa")
+        self.assertEqual(cache.get("A"), b"aaa")
+        self.assertIsNone(cache.get("B"))
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual((stats["entries"], stats["bytes"]), (1, 3))
+
+    def test_entry_budget_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = PageCache(self.dir, max_entries=2)
+        cache.put("A", b"a")
+        cache.put("B", b"b")
+        cache.get("A")
+        cache.put("C", b"c")
+        self.assertIn("A", cache)
+        self.assertNotIn("B", cache)
+        self.assertFalse((self.dir / "B.html").exists())
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_byte_budget(self):
+        """Test that the byte budget is respected and oversized pages are skipped."""
+        cache = PageCache(self.dir, max_bytes=10)
+        cache.put("A", b"x" * 6)
+        cache.put("B", b"y" * 6)
+        stats = cache.stats()
+        self.assertEqual((stats["evictions"], stats["entries"], stats["bytes"]), (1, 1, 6))
+        self.assertFalse(cache.put("C", b"z" * 11))
+        self.assertNotIn("C", cache)
+
+    def test_index_survives_restart(self):
+        """Test that entries, LRU order and validators are reloaded."""
+        cache = PageCache(self.dir, max_entries=2)
+        cache.put("A", b"a", etag='"1"')
+        cache.put("B", b"b")
+        cache.get("A")
+        cache.flush()
+
+        reloaded = PageCache(self.dir, max_entries=2)
+        self.assertEqual(reloaded.validators("A"), {"etag": '"1"'})
+        reloaded.put("C", b"c")
+        self.assertIn("A", reloaded)
+        self.assertNotIn("B", reloaded)
+
+    def test_hits_are_written_in_bulk(self):
+        """Test that hits leave the journal alone until the next write or flush."""
+        cache = PageCache(self.dir, max_entries=3)
+        for key in "ABC":
+            cache.put(key, key.encode())
+        journal = (self.dir / "index.jsonl").read_bytes()
+        for key in "BAB":
+            cache.get(key)
+        self.assertEqual((self.dir / "index.jsonl").read_bytes(), journal)
+
+        cache.put("D", b"d")  # evicts C and writes the hits first
+        self.assertEqual(list(cache._entries), ["A", "B", "D"])
+        self.assertEqual(list(PageCache(self.dir, max_entries=3)._entries), ["A", "B", "D"])
+
+    def test_legacy_files_are_indexed(self):
+        """Test that pages cached before the index existed are adopted."""
+        (self.dir / "Pikachu.html").write_bytes(b"<html></html>")
+        (self.dir / "Pikachu.meta.json").write_text('{"etag": "\\"p\\""}')
+        cache = PageCache(self.dir)
+        self.assertIn("Pikachu", cache)
+        self.assertEqual(cache.validators("Pikachu"), {"etag": '"p"'})
+        self.assertFalse(os.path.exists(self.dir / "Pikachu.meta.json"))
+
+    def test_processes_sharing_the_index(self):
+        """Test that compactions keep the records other caches appended."""
+        first, second = PageCache(self.dir), PageCache(self.dir)
+        first.put("A", b"a")
+        second.put("B", b"b")
+        first.save()
+        self.assertIn("B", first)
+        self.assertIn("B", PageCache(self.dir))
+        second.put("C", b"c")
+        self.assertIn("A", second)
+        second.save()
+        first.get("C")
+        first.save()
+        reloaded = PageCache(self.dir)
+        self.assertEqual(sorted(reloaded._entries), ["A", "B", "C"])
+        self.assertEqual(len((self.dir / "index.jsonl").read_text().splitlines()), 3)
+        self.assertEqual(list(self.dir.glob("*.tmp")), [])
+        self.assertEqual(reloaded.get("C"), b"c")
+
+    def test_torn_journal_line(self):
+        """Test that a torn last line after a crash is dropped."""
+        cache = PageCache(self.dir)
+        cache.put("A", b"a")
+        with open(self.dir / "index.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "key": "B", "si')
+        reloaded = PageCache(self.dir)
+        self.assertEqual(sorted(reloaded._entries), ["A"])
+        reloaded.put("B", b"b")
+        self.assertEqual(sorted(PageCache(self.dir)._entries), ["A", "B"])
+
+
+class TestCompressedCache(unittest.TestCase):
+    """Tests for compressed cache entries."""
+
+    def setUp(self):
+        """Create an empty cache directory and load a fixture page."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+        self.html = (config.TESTS_DATA_DIR / "team_rocket.html").read_bytes()
+
+    def test_round_trip_and_savings(self):
+        """Test that compressed pages read back unchanged and use less disk."""
+        for codec in ("gzip", "zdict"):
+            cache = PageCache(self.dir / codec, compression=codec)
+            cache.put("Team_Rocket", self.html)
+            self.assertEqual(cache.get("Team_Rocket"), self.html)
+            stats = cache.stats()
+            self.assertEqual(stats["raw_bytes"], len(self.html))
+            self.assertLess(stats["bytes"], len(self.html) // 4)
+
+    def test_mixed_formats_stay_readable(self):
+        """Test that raw pages remain readable after switching codecs."""
+        PageCache(self.dir).put("Old", b"<html>old</html>")
+        cache = PageCache(self.dir, compression="zdict")
+        cache.put("New", self.html)
+        cache.train_dictionary([self.html[:1000]])
+        cache.put("Newer", b"<html>newer</html>")
+
+        reloaded = PageCache(self.dir)
+        self.assertEqual(reloaded.get("Old"), b"<html>old</html>")
+        self.assertEqual(reloaded.get("New"), self.html)
+        self.assertEqual(reloaded.get("Newer"), b"<html>newer</html>")
+
+    def test_compressed_files_are_adopted_without_index(self):
+        """Test that compressed files are indexed when the index is missing."""
+        PageCache(self.dir, compression="gzip").put("Page", self.html)
+        (self.dir / "index.jsonl").unlink()
+        self.assertEqual(PageCache(self.dir).get("Page"), self.html)
+
+
+if __name__ == "__main__":
+    unittest.main()
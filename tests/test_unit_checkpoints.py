@@ -0,0 +1,151 @@
+"""
+Unit tests for checkpointed crawl counting (wikiscraper.word_counts).
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper import config, word_counts
+from wikiscraper.controller import Controller
+from wikiscraper.page import Page
+from wikiscraper.word_counts import (
+    CheckpointBuffer,
+    checkpointed,
+    export_word_counts,
+    get_store,
+    load_word_counts,
+    merge_word_counts,
+    remove_word_counts,
+)
+
+PAGES = {f"Page{i}": {"common": 1, f"only{i}": i + 1} for i in range(7)}
+"""dict[str, dict[str, int]]: Word counts of a few pages, by title."""
+
+
+class Crash(Exception):
+    """Raised to interrupt a crawl."""
+
+
+class TestCheckpoints(unittest.TestCase):
+    """Tests for in-memory aggregation and resumable checkpoints."""
+
+    def setUp(self):
+        """Point the word count file to a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = Path(self.tmp.name) / "word-counts.json"
+        patcher = patch("wikiscraper.config.WORD_COUNTS_JSON", self.json_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def crawl(self, titles, crash_after=None, every_pages=3):
+        """Count `titles` in one run, optionally crashing after some pages."""
+        with checkpointed("crawl", every_pages=every_pages, every_s=3600):
+            for n, title in enumerate(titles):
+                if n == crash_after:
+                    raise Crash()
+                merge_word_counts(PAGES[title], page=title)
+
+    def expected(self, titles):
+        """Counts of `titles`, each counted once."""
+        totals: dict[str, int] = {}
+        for title in titles:
+            for word, count in PAGES[title].items():
+                totals[word] = totals.get(word, 0) + count
+        return totals
+
+    def test_flushes_every_n_pages(self):
+        """Test that counts reach the store only at checkpoints."""
+        with checkpointed("crawl", every_pages=3, every_s=3600) as buffer:
+            for title in list(PAGES)[:5]:
+                merge_word_counts(PAGES[title], page=title)
+            self.assertEqual(buffer.checkpoints, 1)
+            self.assertEqual(load_word_counts(), self.expected(list(PAGES)[:3]))
+        self.assertEqual(load_word_counts(), self.expected(list(PAGES)[:5]))
+        self.assertEqual([c[1] for c in get_store().run_checkpoints("crawl")], [3, 2])
+
+    def test_flushes_after_interval(self):
+        """Test the time interval between checkpoints."""
+        with checkpointed("crawl", every_pages=100, every_s=0) as buffer:
+            merge_word_counts(PAGES["Page0"], page="Page0")
+            self.assertEqual(buffer.checkpoints, 1)
+
+    def test_resume_neither_loses_nor_double_counts(self):
+        """Test that a crashed run is resumed from its checkpoints."""
+        titles = list(PAGES)
+        with self.assertRaises(Crash):
+            self.crawl(titles, crash_after=5)
+        # Pages 0-4 were written on the crash (checkpoint of 3, then 2).
+        self.assertEqual(load_word_counts(), self.expected(titles[:5]))
+        self.crawl(titles)
+        self.assertEqual(load_word_counts(), self.expected(titles))
+
+    def test_killed_run_recounts_unwritten_pages(self):
+        """Test that pages after the last checkpoint are counted on resume."""
+        titles = list(PAGES)
+        buffer = CheckpointBuffer(get_store(), "crawl", every_pages=3, every_s=3600)
+        for title in titles[:5]:
+            buffer.add(PAGES[title], page=title)
+        # Killed: the buffer is never flushed, pages 3 and 4 are lost.
+        self.assertEqual(load_word_counts(), self.expected(titles[:3]))
+        self.crawl(titles)
+        self.assertEqual(load_word_counts(), self.expected(titles))
+
+    def test_finished_run_counts_again(self):
+        """Test that repeating a finished crawl adds its counts again."""
+        self.crawl(["Page1"])
+        self.crawl(["Page1"])
+        self.assertEqual(load_word_counts(), {"common": 2, "only1": 4})
+
+    def test_skipped_page_returns_false(self):
+        """Test that a page counted twice in one run is counted once."""
+        with checkpointed("crawl"):
+            self.assertTrue(merge_word_counts(PAGES["Page0"], page="Page0"))
+            self.assertFalse(merge_word_counts(PAGES["Page0"], page="Page0"))
+        self.assertEqual(load_word_counts(), PAGES["Page0"])
+
+    def test_export_is_atomic(self):
+        """Test that the export leaves no temporary file behind."""
+        self.crawl(["Page0"])
+        export_word_counts()
+        self.assertEqual(json.loads(self.json_path.read_text(encoding="utf-8")), PAGES["Page0"])
+        self.assertEqual([p.name for p in self.json_path.parent.glob("*.tmp")], [])
+
+    def test_dirty_survives_restart(self):
+        """Test that counts written before a crash are still exported."""
+        merge_word_counts({"a": 1})
+        get_store().close()
+        word_counts._stores.clear()
+        self.assertTrue(get_store().dirty)
+
+    def test_auto_count_words_is_checkpointed(self):
+        """Test that the serial crawl counts through a checkpointed run."""
+        html = (config.TESTS_DATA_DIR / "team_rocket.html").read_text(encoding="utf-8")
+        controller = Controller()
+        with patch.object(Controller, "_get_page", lambda self, phrase, wait=0: Page(phrase, html)), \
+                patch.object(Page, "links", lambda self: []):
+            controller.auto_count_words("Team_Rocket", depth=1, wait=0)
+        self.assertEqual(load_word_counts(), Page("Team_Rocket", html).get_dict())
+        self.assertEqual(len(get_store().run_checkpoints("auto_count_words:Team_Rocket:1")), 1)
+
+    def test_analyze_keeps_counts_on_corrupt_json(self):
+        """Test that analyze falls back to the store for an undecodable file."""
+        merge_word_counts({"pikachu": 3})
+        export_word_counts()
+        self.json_path.write_text('{"pika', encoding="utf-8")
+        with patch("builtins.print") as printed, \
+                patch.object(config, "REFERENCE_CACHE_DIR", Path(self.tmp.name)):
+            Controller().analyze_relative_word_frequency("article", 1)
+        self.assertIn("pikachu", str(printed.call_args))
+        self.assertEqual(load_word_counts(), {"pikachu": 3})
+
+
+if __name__ == "__main__":
+    unittest.main()
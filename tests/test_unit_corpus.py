@@ -0,0 +1,163 @@
+"""
+Unit tests for the per-page corpus store (wikiscraper.corpus).
+"""
+
+import random
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper import config
+from wikiscraper.corpus import Corpus, get_corpus, remove_corpus, save_corpus
+from wikiscraper.page import Page
+from wikiscraper.word_counts import remove_word_counts
+
+PAGES = {
+    "Pikachu": {"pikachu": 3, "electric": 1, "mouse": 1},
+    "Raichu": {"raichu": 2, "electric": 2, "pikachu": 1},
+    "Squirtle": {"water": 4, "turtle": 1},
+}
+"""dict[str, dict[str, int]]: Word counts of a few pages, by title."""
+
+
+class TestCorpus(unittest.TestCase):
+    """Tests for recording, replacing and querying per-page counts."""
+
+    def setUp(self):
+        """Create a corpus in a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "corpus.npz"
+        self.corpus = Corpus(self.path)
+        for title, words in PAGES.items():
+            self.corpus.add(title, f"hash-{title}", words)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def test_totals_and_vectors(self):
+        """Test corpus totals and the vector of one page."""
+        self.assertEqual(self.corpus.word_counts(), {
+            "pikachu": 4, "electric": 3, "mouse": 1, "raichu": 2, "water": 4, "turtle": 1,
+        })
+        self.assertEqual(self.corpus.vector("Raichu"), PAGES["Raichu"])
+        self.assertEqual(self.corpus.pages_with("electric"), {"Pikachu": 1, "Raichu": 2})
+
+    def test_same_content_is_not_counted_twice(self):
+        """Test that an unchanged page is not recorded again."""
+        self.assertFalse(self.corpus.add("Pikachu", "hash-Pikachu", PAGES["Pikachu"]))
+        self.assertEqual(self.corpus.word_counts()["pikachu"], 4)
+
+    def test_recount_replaces_contribution(self):
+        """Test that a changed page replaces its earlier counts."""
+        self.assertTrue(self.corpus.add("Pikachu", "new", {"pikachu": 10, "yellow": 1}))
+        self.assertEqual(len(self.corpus), 3)
+        self.assertEqual(self.corpus.vector("Pikachu"), {"pikachu": 10, "yellow": 1})
+        counts = self.corpus.word_counts()
+        self.assertEqual(counts["pikachu"], 11)
+        self.assertNotIn("mouse", counts)
+
+    def test_top_words_of_some_pages(self):
+        """Test top words over a subset of pages, ties by first appearance."""
+        self.assertEqual(self.corpus.top_words(2), [("pikachu", 4), ("water", 4)])
+        self.assertEqual(self.corpus.top_words(10, titles=["Pikachu", "Raichu"]),
+                         [("pikachu", 4), ("electric", 3), ("raichu", 2), ("mouse", 1)])
+        with self.assertRaisesRegex(ValueError, "'Mew' is not in the corpus"):
+            self.corpus.top_words(3, titles=["Mew"])
+
+    def test_save_and_load(self):
+        """Test that a saved corpus loads with the same content."""
+        self.corpus.add("Pikachu", "new", {"yellow": 2})
+        self.corpus.save()
+        loaded = Corpus(self.path)
+        self.assertEqual(loaded.titles, ["Raichu", "Squirtle", "Pikachu"])
+        self.assertEqual(loaded.word_counts(), self.corpus.word_counts())
+        self.assertFalse(loaded.add("Pikachu", "new", {"yellow": 2}))
+        self.assertEqual(list(self.path.parent.glob("*.tmp")), [])
+
+    def test_concurrent_saves_merge(self):
+        """Test that two processes' saves of one file keep the pages of both."""
+        self.corpus.save()
+        other = Corpus(self.path)
+        self.corpus.add("Pikachu", "new", {"yellow": 2})
+        self.corpus.add("Mew", "hash-Mew", {"mew": 5})
+        other.add("Raichu", "newer", {"raichu": 7})
+        other.add("Eevee", "hash-Eevee", {"eevee": 1, "pikachu": 1})
+        self.corpus.save()
+        other.save()
+        loaded = Corpus(self.path)
+        self.assertEqual(sorted(loaded.titles), ["Eevee", "Mew", "Pikachu", "Raichu", "Squirtle"])
+        self.assertEqual(loaded.vector("Pikachu"), {"yellow": 2})
+        self.assertEqual(loaded.vector("Raichu"), {"raichu": 7})
+        self.assertEqual(loaded.word_counts(), other.word_counts())
+        self.corpus.add("Squirtle", "new", {"water": 1})
+        self.corpus.save()
+        self.assertEqual(Corpus(self.path).vector("Eevee"), {"eevee": 1, "pikachu": 1})
+
+    def test_matches_dict_reference(self):
+        """Test random pages and replacements against nested dicts."""
+        rng = random.Random(7)
+        corpus = Corpus(self.path)
+        reference: dict[str, dict[str, int]] = {}
+        for step in range(300):
+            title = f"Page{rng.randrange(40)}"
+            words = {f"w{rng.randrange(200)}": rng.randrange(1, 5) for _ in range(20)}
+            corpus.add(title, str(step), words)
+            reference[title] = words
+            if step % 50 == 0:
+                corpus.save()
+                corpus = Corpus(self.path)
+        totals = Counter()
+        for words in reference.values():
+            totals.update(words)
+        self.assertEqual(corpus.word_counts(), dict(totals))
+        titles = sorted(reference)[:5]
+        subset = Counter()
+        for title in titles:
+            subset.update(reference[title])
+        top = corpus.top_words(10, titles=titles)
+        self.assertEqual([c for _, c in top], sorted(subset.values(), reverse=True)[:10])
+        for word, count in top:
+            self.assertEqual(subset[word], count)
+
+
+class TestPageCorpus(unittest.TestCase):
+    """Tests for recording counted pages."""
+
+    def setUp(self):
+        """Point the data files to a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        for name, value in (("WORD_COUNTS_JSON", root / "word-counts.json"),
+                            ("CORPUS_NPZ", root / "corpus.npz")):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+        self.addCleanup(remove_corpus)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def test_count_words_records_page_once(self):
+        """Test that counting a page twice leaves one row in the corpus."""
+        html = (config.TESTS_DATA_DIR / "team_rocket.html").read_text(encoding="utf-8")
+        with patch.object(Page, "corpus", True):
+            Page("Team_Rocket", html).count_words()
+            Page("Team_Rocket", html).count_words()
+        save_corpus()
+        corpus = Corpus(config.CORPUS_NPZ)
+        self.assertEqual(corpus.titles, ["Team_Rocket"])
+        self.assertEqual(corpus.word_counts(), Page("Team_Rocket", html).get_dict())
+
+    def test_disabled_by_default(self):
+        """Test that pages are only recorded with the corpus option."""
+        Page("Mew", "<p>mew mew</p>").count_words()
+        self.assertEqual(len(get_corpus()), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
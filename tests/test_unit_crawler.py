@@ -0,0 +1,124 @@
+"""
+Unit tests for the asyncio crawl engine (wikiscraper.crawler).
+
+The crawl runs against an in-memory page graph, so no network access is
+needed. The concurrent crawl must visit exactly the pages the serial
+`Controller.auto_count_words` visits.
+"""
+
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from wikiscraper.controller import Controller
+from wikiscraper.crawler import AsyncCrawler, HostPoliteness, ParsedPage, parse_page
+from wikiscraper.page import Page
+
+GRAPH = {
+    "A": ["B", "C"],
+    "B": ["C", "D"],
+    "C": ["A", "E"],
+    "D": ["F"],
+    "E": ["F", "G"],
+    "F": ["H"],
+    "G": [],
+    "H": [],
+}
+
+
+def fake_page(phrase: str, wait: float = 0) -> Page:
+    """Return a Page whose content links to the neighbours in GRAPH."""
+    links = "".join(f'<a href="/wiki/{link}">{link}</a>' for link in GRAPH[phrase])
+    html = f'<div class="mw-content-ltr"><p>{phrase} page</p>{links}</div>'
+    return Page(phrase, html)
+
+
+class TestAsyncCrawler(unittest.TestCase):
+    """Tests for AsyncCrawler and its use in Controller.auto_count_words."""
+
+    def setUp(self):
+        """Create a Controller that serves pages from GRAPH."""
+        self.controller = Controller()
+        patcher_get = patch.object(self.controller, "_get_page", side_effect=fake_page)
+        patcher_cache = patch.object(self.controller, "is_html_in_cache", return_value=False)
+        patcher_get.start()
+        patcher_cache.start()
+        self.addCleanup(patcher_get.stop)
+        self.addCleanup(patcher_cache.stop)
+
+    def crawl_phrases(self, depth: int, concurrency: int) -> list[str]:
+        """Run auto_count_words and return the phrases whose words were counted."""
+        seen = []
+        with patch.object(Page, "count_words", autospec=True,
+                          side_effect=lambda page: seen.append(page.phrase)):
+            self.controller.auto_count_words("A", depth=depth, wait=0,
+                                             concurrency=concurrency)
+        return seen
+
+    def test_same_pages_as_serial_crawl(self):
+        """Test that every depth visits the same pages once, serial or async."""
+        for depth in range(0, 5):
+            serial = self.crawl_phrases(depth, concurrency=1)
+            concurrent = self.crawl_phrases(depth, concurrency=4)
+            self.assertEqual(sorted(serial), sorted(concurrent))
+            self.assertEqual(len(concurrent), len(set(concurrent)))
+
+    def test_crawl_returns_page_count(self):
+        """Test that crawl reports the number of processed pages."""
+        crawler = AsyncCrawler(self.controller, concurrency=3)
+        self.assertEqual(crawler.crawl("A", depth=1, on_page=lambda page: None), 3)
+
+    def test_parse_workers_visit_same_pages(self):
+        """Test that the process-pool parse stage crawls the same pages."""
+        for depth in range(1, 4):
+            serial = self.crawl_phrases(depth, concurrency=1)
+            parsed = []
+            crawler = AsyncCrawler(self.controller, concurrency=2, parse_workers=2,
+                                   parse_queue=1)
+            crawler.crawl("A", depth, on_page=parsed.append)
+            self.assertTrue(all(isinstance(p, ParsedPage) for p in parsed))
+            self.assertEqual(sorted(serial), sorted(p.phrase for p in parsed))
+            for p in parsed:
+                page = fake_page(p.phrase)
+                self.assertEqual(p.get_dict(), page.get_dict())
+                self.assertEqual(sorted(p.links()), sorted(page.links()))
+
+    def test_parse_page_is_compact(self):
+        """Test that parse results carry only counts and links."""
+        result = parse_page("B", fake_page("B").html)
+        self.assertEqual(result.get_dict(), {"b": 1, "page": 1, "c": 1, "d": 1})
+        self.assertFalse(hasattr(result, "html"))
+
+    def test_invalid_concurrency(self):
+        """Test that a concurrency below 1 is rejected."""
+        with self.assertRaises(ValueError):
+            AsyncCrawler(self.controller, concurrency=0)
+
+
+class TestHostPoliteness(unittest.TestCase):
+    """Tests for per-host request pacing."""
+
+    def test_requests_to_same_host_are_spaced(self):
+        """Test that request starts to one host are min_interval apart."""
+        politeness = HostPoliteness(min_interval=0.1)
+
+        async def run():
+            # Starts are scheduled from the first one, so a late wake-up
+            # shortens the next gap but never moves a start before its slot.
+            starts = [time.perf_counter()]
+            for _ in range(3):
+                await politeness.acquire("wiki")
+                starts.append(time.perf_counter())
+            await politeness.acquire("other")
+            starts.append(time.perf_counter())
+            return starts
+
+        starts = asyncio.run(run())
+        self.assertGreaterEqual(starts[2] - starts[0], 0.095)
+        self.assertGreaterEqual(starts[3] - starts[0], 0.195)
+        self.assertLess(starts[4] - starts[3], 0.08)
+
+
+if __name__ == "__main__":
+    unittest.main()
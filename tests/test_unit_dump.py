@@ -0,0 +1,132 @@
+"""
+Unit tests for offline MediaWiki XML dump ingestion (wikiscraper.dump).
+"""
+
+import bz2
+import gzip
+import json
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper.cache import PageCache, cache_key
+from wikiscraper.dump import ingest_dump, iter_dump_pages, open_dump
+from wikiscraper.mediawiki_api import ApiBackend
+from wikiscraper.page import Page
+from wikiscraper.wikitext import to_html
+from wikiscraper.word_counts import load_word_counts
+
+PIKACHU = "'''Pikachu''' is an [[Electric (type)|Electric]]-type Pokémon."
+RAICHU = "'''Raichu''' evolves from [[Pikachu]].\n\n== Biology ==\nRaichu is fast."
+
+DUMP = f"""<mediawiki xmlns="http://www.mediawiki.org/xml/export-0.10/" xml:lang="en">
+  <siteinfo><sitename>Bulbapedia</sitename></siteinfo>
+  <page>
+    <title>Pikachu</title><ns>0</ns><id>1</id>
+    <revision><id>10</id><text>old revision</text></revision>
+    <revision><id>11</id><text>{PIKACHU}</text></revision>
+  </page>
+  <page>
+    <title>Pika</title><ns>0</ns><id>2</id>
+    <redirect title="Pikachu" />
+    <revision><id>20</id><text>#REDIRECT [[Pikachu]]</text></revision>
+  </page>
+  <page>
+    <title>Talk:Pikachu</title><ns>1</ns><id>3</id>
+    <revision><id>30</id><text>talk page text</text></revision>
+  </page>
+  <page>
+    <title>Raichu</title><ns>0</ns><id>4</id>
+    <revision><id>40</id><text>{RAICHU}</text></revision>
+  </page>
+</mediawiki>
+"""
+
+
+class TestDumpIngestion(unittest.TestCase):
+    """Tests for streaming pages and word counts out of XML dumps."""
+
+    def setUp(self):
+        """Write the sample dump in every supported format to a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        data = DUMP.encode("utf-8")
+        (self.root / "dump.xml").write_bytes(data)
+        (self.root / "dump.xml.bz2").write_bytes(bz2.compress(data))
+        (self.root / "dump.xml.gz").write_bytes(gzip.compress(data))
+
+        self.word_counts = self.root / "word-counts.json"
+        patcher = patch("wikiscraper.config.WORD_COUNTS_JSON", self.word_counts)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def test_iter_dump_pages_skips_redirects_and_other_namespaces(self):
+        """Test that only articles are streamed, with their last revision."""
+        for name in ("dump.xml", "dump.xml.bz2", "dump.xml.gz"):
+            with open_dump(self.root / name) as stream:
+                pages = list(iter_dump_pages(stream))
+            self.assertEqual(pages, [("Pikachu", PIKACHU), ("Raichu", RAICHU)], name)
+
+    def test_counts_match_rendered_pages(self):
+        """Test that the merged counts equal the counts of the rendered pages."""
+        self.word_counts.write_text(json.dumps({"pikachu": 5}), encoding="utf-8")
+        stats = ingest_dump(self.root / "dump.xml.bz2")
+
+        expected = Counter({"pikachu": 5})
+        for title, text in (("Pikachu", PIKACHU), ("Raichu", RAICHU)):
+            expected.update(Page(title, to_html(text)).get_dict())
+        counts = json.loads(self.word_counts.read_text(encoding="utf-8"))
+        self.assertEqual(counts, dict(expected))
+        self.assertEqual(stats["pages"], 2)
+
+    def test_limit(self):
+        """Test that ingestion stops after `limit` pages."""
+        stats = ingest_dump(self.root / "dump.xml.gz", limit=1)
+        counts = json.loads(self.word_counts.read_text(encoding="utf-8"))
+        self.assertEqual(stats["pages"], 1)
+        self.assertNotIn("raichu", counts)
+
+    def test_interrupted_ingestion_resumes(self):
+        """Test that checkpointed pages survive a crash and are not counted twice."""
+        def render(wikitext, links=None):
+            if wikitext == RAICHU:
+                raise KeyboardInterrupt
+            return to_html(wikitext, links)
+
+        with patch("wikiscraper.config.CHECKPOINT_EVERY_PAGES", 1), \
+                patch("wikiscraper.dump.to_html", side_effect=render):
+            with self.assertRaises(KeyboardInterrupt):
+                ingest_dump(self.root / "dump.xml")
+        self.assertEqual(load_word_counts()["pikachu"], 1)
+
+        stats = ingest_dump(self.root / "dump.xml")
+        expected = Counter()
+        for title, text in (("Pikachu", PIKACHU), ("Raichu", RAICHU)):
+            expected.update(Page(title, to_html(text)).get_dict())
+        self.assertEqual(load_word_counts(), dict(expected))
+        self.assertEqual(stats["pages"], 2)
+
+    def test_seed_cache(self):
+        """Test that `seed_cache` stores pages where the api backend reads them."""
+        cache = PageCache(self.root / "cache")
+        ingest_dump(self.root / "dump.xml", seed_cache=True, cache=cache)
+        self.assertEqual(cache.get(f"{cache_key('Raichu')}@wikitext"),
+                         RAICHU.encode("utf-8"))
+        self.assertNotIn(f"{cache_key('Pika')}@wikitext", cache)
+
+        api = ApiBackend("http://127.0.0.1:9/w/api.php", cache=cache)
+        self.assertFalse(api.needs_download(["Raichu", "Pikachu"], batched=False))
+        self.assertFalse(api.needs_download(["Raichu", "Pikachu"], batched=True))
+        self.assertEqual(api.fetch("Raichu").get_dict(),
+                         Page("Raichu", to_html(RAICHU)).get_dict())
+        self.assertEqual(sorted(api.fetch_many(["Raichu"])["Raichu"].links()), ["Pikachu"])
+        self.assertEqual(api.requests_made, 0)
+
+if __name__ == "__main__":
+    unittest.main()
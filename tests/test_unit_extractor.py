@@ -0,0 +1,119 @@
+"""
+Unit tests for the single-pass streaming extractor (wikiscraper.extractor).
+
+Every result of the "stream" engine must equal the result of the
+BeautifulSoup ("soup") engine on the test fixtures.
+"""
+
+import contextlib
+import io
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from wikiscraper import config
+from wikiscraper.extractor import extract
+from wikiscraper.page import Page
+from wikiscraper.wikitext import to_html
+
+TRICKY_HTML = """<html><head><title>Title words</title>
+<script>var hidden = "script words";</script><style>p { color: red }</style>
+</head><body>
+<div id="mw-content-text"><a href="/wiki/Outside_root">x</a>
+<div class="mw-parser-output mw-content-ltr">
+  <template><p>template paragraph</p><a href="/wiki/In_template">t</a></template>
+  <p>   </p>
+  <p>First <b>real</b><!-- hidden -->paragraph with <ruby>漢<rt>kan</rt></ruby> text</p>
+  <p>Second paragraph</p>
+  <table class="navbox"><tr><td>a</td><td>b</td></tr><tr><td>c</td><td>d</td></tr></table>
+  <table><tr><td>only</td></tr><tr><td><table><tr><td>x</td><td>y</td></tr></table></td></tr></table>
+  <table><tr><th>Col</th><th>Val</th></tr><tr><td>A</td><td>1</td></tr></table>
+  <a href="/wiki/File:Pic.png">f</a><a href="/wiki/Special:Random">s</a>
+  <a href="/wiki/Pikachu">p</a><a href="/wiki/Pikachu">p</a><a href="https://x.org/">e</a>
+</div></div>
+<p>Footer words</p>
+</body></html>
+"""
+
+
+class TestStreamEngine(unittest.TestCase):
+    """Tests that the stream engine matches the soup engine."""
+
+    def documents(self) -> dict[str, str]:
+        """Return the HTML documents both engines are compared on."""
+        docs = {f.name: f.read_text(encoding="utf-8")
+                for f in sorted(config.TESTS_DATA_DIR.glob("*.html"))}
+        docs["tricky"] = TRICKY_HTML
+        docs["wikitext"] = to_html(
+            "'''Pikachu''' is an [[Electric (type)|Electric]]-type.\n"
+            "{|\n! Move !! Type\n|-\n| [[Thunder Shock]] || Electric\n|}\n"
+        )
+        return docs
+
+    def results(self, html: str, engine: str, tmp: str) -> dict:
+        """Run every Page operation with `engine`."""
+        with patch.object(Page, "engine", engine), \
+                contextlib.redirect_stdout(io.StringIO()):
+            page = Page("Doc", html)
+            tables = []
+            n = 1
+            while True:
+                try:
+                    tables.append(page.table(n, output_dir=tmp))
+                except ValueError as e:
+                    if "real tables" in str(e):
+                        break
+                    tables.append(str(e))
+                n += 1
+            return {
+                "words": page.get_dict(),
+                "links": sorted(page.links()),
+                "summary": page.summary(),
+                "tables": tables,
+            }
+
+    def test_same_output_as_soup(self):
+        """Test words, links, summary and tables on every document."""
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, html in self.documents().items():
+                soup = self.results(html, "soup", tmp)
+                stream = self.results(html, "stream", tmp)
+                for key in ("words", "links", "summary"):
+                    self.assertEqual(soup[key], stream[key], f"{name}: {key}")
+                self.assertEqual(len(soup["tables"]), len(stream["tables"]), name)
+                for a, b in zip(soup["tables"], stream["tables"]):
+                    if isinstance(a, str):
+                        self.assertEqual(a, b, name)
+                    else:
+                        self.assertTrue(a.equals(b), name)
+
+    def test_skipped_text_and_links(self):
+        """Test the get_text and link rules on the tricky document."""
+        result = extract(TRICKY_HTML)
+        self.assertNotIn("script", result.words)
+        self.assertNotIn("kan", result.words)
+        self.assertNotIn("hidden", result.words)
+        self.assertEqual(result.words["words"], 2)
+        self.assertEqual(result.summary, "First real paragraph with 漢 text")
+        self.assertEqual(sorted(result.links), ["In_template", "Pikachu"])
+        self.assertEqual(result.table_count, 2)
+
+    def test_table_offsets_slice_tables(self):
+        """Test that table offsets point at the table markup in the source."""
+        result = extract(TRICKY_HTML)
+        data = TRICKY_HTML.encode("utf-8")
+        start, end = result.table_offsets[1]
+        self.assertTrue(data[start:end].startswith(b"<table><tr><th>Col"))
+        self.assertTrue(data[start:end].endswith(b"</table>"))
+
+    def test_unreliable_offsets_fall_back(self):
+        """Test that tables that cannot be located have no offsets."""
+        html = ('<div class="mw-content-ltr"><textarea><table></textarea>'
+                "<table><tr><td>a</td><td>b</td></tr><tr><td>c</td></tr></table></div>")
+        result = extract(html)
+        self.assertEqual(result.table_count, 1)
+        self.assertIsNone(result.table_offsets)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+"""
+Unit tests for resumable crawls (wikiscraper.frontier).
+
+Pages are served from a small link graph, so no network access is needed.
+"""
+
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper.controller import Controller
+from wikiscraper.frontier import COUNTED, FAILED, QUEUED, Frontier
+from wikiscraper.page import Page
+from wikiscraper.throttle import FetchError
+from wikiscraper.word_counts import get_store, load_word_counts, remove_word_counts
+
+GRAPH = {
+    "A": ["B", "C"],
+    "B": ["C", "D"],
+    "C": ["A", "E"],
+    "D": ["F"],
+    "E": ["F", "G"],
+    "F": ["H"],
+    "G": [],
+    "H": [],
+}
+"""dict[str, list[str]]: Links of every page."""
+
+count_words = Page.count_words
+
+
+def fake_page(phrase: str, wait: float = 0) -> Page:
+    """Return a Page whose content links to the neighbours in GRAPH."""
+    if phrase not in GRAPH:
+        raise FetchError(f"{phrase} not found")
+    links = "".join(f'<a href="/wiki/{link}">{link}</a>' for link in GRAPH[phrase])
+    html = f'<div class="mw-content-ltr"><p>{phrase} page {phrase.lower()}</p>{links}</div>'
+    return Page(phrase, html)
+
+
+class Crash(Exception):
+    """Raised to interrupt a crawl."""
+
+
+class TestFrontier(unittest.TestCase):
+    """Tests for the frontier orderings and change tracking."""
+
+    def frontier(self, ordering: str) -> Frontier:
+        """A frontier that counted A and found B, C (twice) and D."""
+        frontier = Frontier("test", "A", depth=3, ordering=ordering)
+        self.assertEqual(frontier.pop(), ("A", 0))
+        for page in ("B", "C", "D", "C"):
+            frontier.add(page, 1)
+        frontier.done("A", 10)
+        return frontier
+
+    def pops(self, frontier: Frontier) -> list[str]:
+        """Pop the whole frontier."""
+        pages = []
+        while (entry := frontier.pop()) is not None:
+            pages.append(entry[0])
+        return pages
+
+    def test_orderings(self):
+        """Test the pop order of every ordering."""
+        self.assertEqual(self.pops(self.frontier("bfs")), ["B", "C", "D"])
+        self.assertEqual(self.pops(self.frontier("depth")), ["D", "C", "B"])
+        self.assertEqual(self.pops(self.frontier("inlinks")), ["C", "B", "D"])
+        with self.assertRaises(ValueError):
+            Frontier("test", "A", depth=3, ordering="random")
+
+    def test_shorter_path_lowers_depth(self):
+        """Test that a queued page keeps the smallest depth it was found at."""
+        frontier = self.frontier("bfs")
+        frontier.add("X", 3)
+        frontier.add("X", 2)
+        frontier.add("A", 1)  # counted already: ignored
+        self.assertEqual(self.pops(frontier), ["B", "C", "D", "X"])
+        self.assertEqual(len(frontier), 0)
+
+    def test_changes_and_load(self):
+        """Test that only changed pages are saved, popped pages as queued."""
+        frontier = self.frontier("bfs")
+        crawl, rows = frontier.take_changes()
+        self.assertEqual(crawl, ("test", "A", 3, "bfs", "running", 1, 10))
+        self.assertEqual(sorted((row[0], row[4]) for row in rows),
+                         [("A", COUNTED), ("B", QUEUED), ("C", QUEUED), ("D", QUEUED)])
+        self.assertEqual(frontier.pop(), ("B", 1))
+        frontier.done("B", None)
+        frontier.pop()  # C, in flight
+        _, rows = frontier.take_changes()
+        self.assertEqual(sorted((row[0], row[4]) for row in rows), [("B", FAILED)])
+
+        all_rows = [("A", 0, 0, 0, COUNTED), ("B", 1, 1, 1, FAILED),
+                    ("C", 1, 2, 2, QUEUED), ("D", 1, 3, 1, QUEUED)]
+        loaded = Frontier.load((crawl, all_rows), ordering="inlinks")
+        self.assertEqual((loaded.ordering, loaded.pages, len(loaded)), ("inlinks", 1, 2))
+        self.assertEqual(self.pops(loaded), ["C", "D"])
+
+
+class TestFrontierCrawl(unittest.TestCase):
+    """Tests for resumable crawls of Controller.auto_count_words."""
+
+    def setUp(self):
+        """Serve pages from GRAPH and point the word counts to a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patchers = [
+            patch("wikiscraper.config.WORD_COUNTS_JSON", Path(self.tmp.name) / "wc.json"),
+            patch("wikiscraper.config.CHECKPOINT_EVERY_PAGES", 2),
+            patch("sys.stdout", new_callable=io.StringIO),
+        ]
+        self.controller = Controller()
+        patchers += [
+            patch.object(self.controller, "_get_page", side_effect=fake_page),
+            patch.object(self.controller, "is_html_in_cache", return_value=False),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+        self.seen: list[str] = []
+
+    def crawl(self, crash_after: int | None = None, **options) -> None:
+        """Run a resumable crawl from A, recording the pages counted."""
+        def counting(page):
+            count_words(page)
+            self.seen.append(page.phrase)
+            if len(self.seen) == crash_after:
+                raise Crash()
+
+        options.setdefault("crawl_id", "A")
+        with patch.object(Page, "count_words", autospec=True, side_effect=counting):
+            self.controller.auto_count_words("A", depth=3, wait=0, **options)
+
+    def full_counts(self) -> dict[str, int]:
+        """Counts of one uninterrupted crawl, in a fresh store."""
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch("wikiscraper.config.WORD_COUNTS_JSON", Path(tmp) / "wc.json"):
+            try:
+                self.crawl(crawl_id="full")
+                return load_word_counts()
+            finally:
+                remove_word_counts()
+                self.seen = []
+
+    def test_crawls_every_page_once(self):
+        """Test that every ordering counts the pages within depth once."""
+        for order in ("bfs", "depth", "inlinks"):
+            self.seen = []
+            self.crawl(crawl_id=order, order=order, concurrency=2)
+            self.assertEqual(sorted(self.seen), list("ABCDEFG"))  # H is at depth 4
+        self.assertEqual(get_store().load_crawl("bfs")[0][4], "finished")
+
+    def test_resume_after_interruption(self):
+        """Test that a resumed crawl neither revisits nor double counts pages."""
+        expected = self.full_counts()
+        with self.assertRaises(Crash):
+            self.crawl(crash_after=3)
+        state, rows = get_store().load_crawl("A")
+        self.assertEqual(state[4], "running")
+        # The saved state never records a page whose counts were not saved.
+        counted = {row[0] for row in rows if row[4] == COUNTED}
+        _, recorded = get_store().start_run("auto_count_words:A")
+        self.assertLessEqual(counted, recorded)
+
+        first = list(self.seen)
+        self.seen = []
+        self.crawl()
+        self.assertFalse(counted & set(self.seen))
+        self.assertEqual(sorted(set(first) | set(self.seen)), list("ABCDEFG"))
+        self.assertEqual(load_word_counts(), expected)
+
+    def test_budgets_stop_and_resume(self):
+        """Test that budgets stop a crawl that a later run finishes."""
+        expected = self.full_counts()
+        self.crawl(max_pages=3)
+        self.assertEqual(len(self.seen), 3)
+        self.assertEqual(get_store().load_crawl("A")[0][4:6], ("stopped: max pages", 3))
+        spent = get_store().load_crawl("A")[0][6]
+        self.crawl(max_bytes=spent)  # budgets apply to the whole crawl
+        self.assertEqual(len(self.seen), 3)
+        self.crawl(max_bytes=spent + 1)
+        self.assertEqual(len(self.seen), 4)
+        self.crawl(deadline=1e-9)
+        self.assertEqual(len(self.seen), 4)
+        self.assertEqual(get_store().load_crawl("A")[0][4], "stopped: deadline")
+        self.crawl(max_pages=100)
+        self.assertEqual(sorted(self.seen), list("ABCDEFG"))
+        self.assertEqual(load_word_counts(), expected)
+        self.assertIn("Crawl A: finished, 7 pages", sys.stdout.getvalue())
+
+    def test_failed_pages_and_invalid_crawls(self):
+        """Test skipped pages, and crawls that cannot be started."""
+        with patch.dict(GRAPH, {"E": ["F", "G", "Missing"]}):
+            self.crawl(crawl_id="missing", order="bfs")
+        rows = dict((row[0], row[4]) for row in get_store().load_crawl("missing")[1])
+        self.assertEqual(rows["Missing"], FAILED)
+
+        self.crawl(max_pages=1)
+        with self.assertRaises(SystemExit):
+            self.controller.auto_count_words("B", depth=3, wait=0, crawl_id="A")
+        with self.assertRaises(SystemExit):
+            self.crawl(parse_workers=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
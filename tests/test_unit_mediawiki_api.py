@@ -0,0 +1,158 @@
+"""
+Unit tests for the MediaWiki API backend (wikiscraper.mediawiki_api) and the
+wikitext renderer (wikiscraper.wikitext).
+
+The API tests run against the local stand-in wiki server from
+`benchmarks/stand_in_wiki.py`, which serves a mock `api.php` on 127.0.0.1.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks.stand_in_wiki import StandInWiki
+from wikiscraper.batch import BatchRunner
+from wikiscraper.cache import PageCache
+from wikiscraper.controller import Controller
+from wikiscraper.mediawiki_api import ApiBackend
+from wikiscraper.page import Page
+from wikiscraper.wikitext import to_html
+
+
+class TestWikitext(unittest.TestCase):
+    """Tests for rendering wikitext into Page-compatible HTML."""
+
+    WIKITEXT = """{{Infobox|name=Pikachu|x={{nested}}}}
+'''Pikachu''' is an [[Electric (type)|Electric]]-type [[Pokémon]].<ref>Source</ref>
+[[File:Pikachu.png|thumb|A [[Pikachu]]]]
+== Moves ==
+{| class="wikitable"
+! Move !! Type
+|-
+| [[Thunder Shock]] || Electric
+|-
+| style="color: red" | Quick Attack || Normal
+|}
+[[Category:Pokémon]]
+"""
+
+    def setUp(self):
+        """Render the sample wikitext."""
+        self.page = Page("Pikachu", to_html(self.WIKITEXT))
+
+    def test_summary_drops_templates_and_references(self):
+        """Test that the first paragraph contains only article text."""
+        self.assertEqual(self.page.summary(),
+                         "Pikachu is an Electric -type Pokémon .")
+
+    def test_links_match_rendered_hrefs(self):
+        """Test that links are rendered like wiki hrefs, without files/categories."""
+        self.assertEqual(sorted(self.page.links()),
+                         ["Electric_(type)", "Pok%C3%A9mon", "Thunder_Shock"])
+
+    def test_table(self):
+        """Test that simple wikitext tables are rendered as HTML tables."""
+        with tempfile.TemporaryDirectory() as tmp:
+            df = self.page.table(1, output_dir=tmp, first_row_is_header=True)
+        self.assertEqual(list(df.columns), ["Move", "Type"])
+        self.assertEqual(df["Move"].tolist(), ["Thunder Shock", "Quick Attack"])
+
+    def test_text_is_escaped(self):
+        """Test that markup characters stay text and HTML tags are dropped."""
+        page = Page("X", to_html("A <b>bold</b> <script>x</script> & [[Tom & Jerry|T&J]] <3"))
+        self.assertEqual(page.summary(), "A bold x & T&J <3")
+        self.assertEqual(page.links(), ["Tom_%26_Jerry"])
+
+    def test_known_links_are_added(self):
+        """Test that links passed from the API are added without words."""
+        page = Page("Pikachu", to_html(self.WIKITEXT, links=["Pikachu (anime)", "Pokémon"]))
+        self.assertEqual(sorted(page.links()), [
+            "Electric_(type)", "Pikachu_(anime)", "Pok%C3%A9mon", "Thunder_Shock",
+        ])
+        self.assertEqual(page.get_dict(), self.page.get_dict())
+
+
+class TestApiBackend(unittest.TestCase):
+    """Tests for ApiBackend against a mock api.php."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the stand-in wiki."""
+        cls.wiki = StandInWiki(num_pages=40, latency=0, navbox=True).start()
+        cls.api_url = cls.wiki.base_url.replace("/wiki/Main_Page", "/w/api.php")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the stand-in wiki."""
+        cls.wiki.stop()
+
+    def setUp(self):
+        """Create a backend with an empty cache."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.backend = ApiBackend(self.api_url, cache=PageCache(self.tmp.name),
+                                  batch_size=10)
+
+    def test_fetch_many_batches_titles(self):
+        """Test that titles are fetched in batches and missing pages skipped."""
+        phrases = [f"Page_{i}" for i in range(25)] + ["No_such_page"]
+        pages = self.backend.fetch_many(phrases)
+        self.assertEqual(self.backend.requests_made, 3)
+        self.assertEqual(sorted(pages), sorted(phrases[:-1]))
+        self.assertTrue(pages["Page_3"].summary().startswith("Page 3"))
+
+    def test_batched_and_parsed_links_match(self):
+        """Test that batched pages keep the links templates add, like action=parse."""
+        batched = self.backend.fetch_many(["Page_3", "Page_7"])
+        for phrase in ("Page_3", "Page_7"):
+            self.assertEqual(sorted(batched[phrase].links()),
+                             sorted(self.backend.fetch(phrase).links()))
+        self.assertIn("Page_4", batched["Page_3"].links())
+
+    def test_cached_pages_need_no_request(self):
+        """Test that a second fetch is served from the cache."""
+        self.backend.fetch_many(["Page_1", "Page_2"])
+        self.assertFalse(self.backend.needs_download(["Page_1", "Page_2"]))
+        self.backend.fetch_many(["Page_1", "Page_2"])
+        self.assertEqual(self.backend.requests_made, 1)
+
+    def test_fetch_parses_single_page(self):
+        """Test that action=parse returns the article content only."""
+        page = self.backend.fetch("Page 5")
+        self.assertTrue(page.summary().startswith("Page 5"))
+        self.assertNotIn("Navigation entry", page.html)
+
+    def test_batch_commands_share_one_parse(self):
+        """Test that batched commands on one page share one parsed API page."""
+        commands = [["summary", "Page_3"], ["count_words", "Page_3"],
+                    ["summary", "Page_5"], ["table", "Page_3", "--list"]]
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch("wikiscraper.config.CACHE_DIR", Path(tmp)), \
+                patch.object(ApiBackend, "fetch", autospec=True,
+                             side_effect=ApiBackend.fetch) as fetch:
+            controller = Controller(wiki_base_url=self.wiki.base_url)
+            controller.configure(backend="api")
+            results = BatchRunner(controller, concurrency=2).run(commands)
+        self.assertEqual([r.exit_code for r in results], [0, 0, 0, 0])
+        self.assertEqual(fetch.call_count, 2)  # Page_3, Page_5
+        self.assertEqual(controller.api.requests_made, 2)
+
+    def test_crawl_visits_same_pages_as_html_backend(self):
+        """Test that auto_count_words reaches the same pages with both backends."""
+        visited = {}
+        for backend in ("html", "api"):
+            seen = []
+            with tempfile.TemporaryDirectory() as tmp, \
+                    patch("wikiscraper.config.CACHE_DIR", Path(tmp)), \
+                    patch.object(Page, "count_words", autospec=True,
+                                 side_effect=lambda page: seen.append(page.phrase)):
+                controller = Controller(wiki_base_url=self.wiki.base_url)
+                controller.configure(backend=backend)
+                controller.auto_count_words("Page_0", depth=2, wait=0)
+            visited[backend] = sorted(seen)
+        self.assertEqual(visited["html"], visited["api"])
+
+
+if __name__ == "__main__":
+    unittest.main()
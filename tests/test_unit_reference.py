@@ -0,0 +1,103 @@
+"""
+Unit tests for the cached reference frequencies (wikiscraper.reference).
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import wordfreq
+from bs4 import BeautifulSoup
+
+from wikiscraper import config, reference
+from wikiscraper.controller import Controller
+from wikiscraper.reference import ReferenceFrequencies, get_reference, top_indices
+from wikiscraper.tokenizer import Tokenizer
+
+ODD_WORDS = ["The", "don't", "New York", "1996", "gen3", "pokémon", "Straße", "", "zzzqx", "東京"]
+"""list[str]: Words wordfreq tokenizes or normalizes before the lookup."""
+
+
+class TestReferenceFrequencies(unittest.TestCase):
+    """Tests that table lookups equal `wordfreq.word_frequency`."""
+
+    def setUp(self):
+        """Use an empty cache dir and no tables in memory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(config, "REFERENCE_CACHE_DIR", Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.dict(reference._references, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def assert_identical(self, language: str, words: list[str]):
+        """Compare a lookup with one `word_frequency` call per word."""
+        expected = [wordfreq.word_frequency(w, language, wordlist="small") for w in words]
+        self.assertEqual(get_reference(language, "small").lookup(words).tolist(), expected)
+
+    def test_fixture_words(self):
+        """Test the words of the fixture pages and wordfreq's top words."""
+        words = set(wordfreq.top_n_list("en", 500)) | set(ODD_WORDS)
+        for fixture in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+            soup = BeautifulSoup(fixture.read_text(encoding="utf-8"), "lxml")
+            words |= set(Tokenizer().count(soup.get_text(separator="\n")))
+        self.assert_identical("en", sorted(words))
+
+    def test_other_language(self):
+        """Test a second language."""
+        self.assert_identical("pl", wordfreq.top_n_list("pl", 200) + ODD_WORDS)
+
+    def test_cached_on_disk(self):
+        """Test that a table is built once and then read from disk."""
+        get_reference("en", "small")
+        reference._references.clear()
+        with patch.object(ReferenceFrequencies, "build") as build:
+            table = get_reference("en", "small")
+        build.assert_not_called()
+        self.assertEqual(table.lookup(["the"]).tolist(),
+                         [wordfreq.word_frequency("the", "en", wordlist="small")])
+        self.assertEqual(len(list(Path(self.tmp.name).glob("en_small_*.npz"))), 1)
+
+    def test_unknown_language(self):
+        """Test that an unknown language is rejected."""
+        with self.assertRaisesRegex(ValueError, "No 'small' wordlist"):
+            get_reference("xx", "small")
+
+    def test_multiple_languages(self):
+        """Test one column per reference language."""
+        with tempfile.TemporaryDirectory() as data:
+            json_path = Path(data) / "word-counts.json"
+            json_path.write_text('{"the": 5, "nie": 3, "pikachu": 2}', encoding="utf-8")
+            with patch.object(config, "WORD_COUNTS_JSON", json_path), \
+                    patch("builtins.print") as printed:
+                Controller().analyze_relative_word_frequency(
+                    "article", 3, languages=["en", "pl"]
+                )
+        df = printed.call_args_list[-1].args[0]
+        self.assertEqual(list(df.columns),
+                         ["Word", "Language_Freq_en", "Language_Freq_pl", "Article_Freq"])
+        self.assertEqual(list(df["Word"]), ["pikachu", "nie", "the"])
+
+
+class TestTopIndices(unittest.TestCase):
+    """Tests for the partial top-N selection."""
+
+    def test_matches_stable_sort(self):
+        """Test against a stable descending sort, with many ties."""
+        rng = np.random.default_rng(1)
+        for size in (0, 1, 5, 100, 1000):
+            values = rng.integers(0, 10, size)
+            expected = sorted(range(size), key=lambda i: values[i], reverse=True)
+            for n in (0, 1, 3, 10, size, size + 5):
+                self.assertEqual(top_indices(values, n).tolist(), expected[:n])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Unit tests for the random-walk sampler (wikiscraper.sampler).
+
+Walks run over an in-memory page graph, so no network access is needed.
+"""
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper import config, reference
+from wikiscraper.controller import Controller
+from wikiscraper.page import Page
+from wikiscraper.sampler import RandomWalkSampler
+from wikiscraper.scoring import score_pages
+from wikiscraper.throttle import FetchError
+
+WORDS = ["the", "of", "and", "el", "de", "que", "pikachu", "xyzzy"]
+
+GRAPH = {f"P{i}": [f"P{(i * 3 + j) % 30}" for j in range(1, 4)] for i in range(30)}
+GRAPH["P7"] = []
+GRAPH["P11"] = ["Broken"]
+
+
+def fake_page(phrase: str, wait: float = 0) -> Page:
+    """Return a Page with a few words and links to its neighbours in GRAPH."""
+    if phrase == "Broken":
+        raise FetchError("Broken: 500")
+    number = int(phrase[1:])
+    text = " ".join(WORDS[(number + i) % len(WORDS)] for i in range(number % 5 + 2))
+    links = "".join(f'<a href="/wiki/{link}">{link}</a>' for link in GRAPH[phrase])
+    return Page(phrase, f'<div class="mw-content-ltr"><p>{text}</p>{links}</div>')
+
+
+class TestRandomWalkSampler(unittest.TestCase):
+    """Tests for the walks, their trace and the sample_pages command."""
+
+    def setUp(self):
+        """Serve pages from GRAPH and cache reference tables in a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(config, "REFERENCE_CACHE_DIR", Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(reference._references.clear)
+        self.controller = Controller()
+        self.fetched = []
+        for name, value in (("_get_page", self.get_page), ("needs_download", lambda p: False)):
+            patcher = patch.object(self.controller, name, side_effect=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get_page(self, phrase: str, wait: float = 0) -> Page:
+        """Record and serve a page."""
+        self.fetched.append(phrase)
+        return fake_page(phrase)
+
+    def sample(self, **options):
+        """Sample from P1 with the small English wordlist."""
+        options = {"walkers": 6, "steps": 12, "wordlist": "small", **options}
+        with patch("builtins.print"):
+            return RandomWalkSampler(self.controller, **options).sample("P1")
+
+    def test_seeded_walks_are_reproducible(self):
+        """Test that a seed gives the same trace, with or without prefetch."""
+        first = self.sample(seed=3)
+        self.assertEqual(self.sample(seed=3).trace, first.trace)
+        self.assertEqual(self.sample(seed=3, prefetch=False, concurrency=1).trace, first.trace)
+        self.assertNotEqual(self.sample(seed=4).trace, first.trace)
+        links = Page.links
+        with patch.object(Page, "links", lambda page: links(page)[::-1]):
+            self.assertEqual(self.sample(seed=3).trace, first.trace)
+        walks = {s.walker for s in first.trace}
+        self.assertEqual(walks, set(range(6)))
+
+    def test_trace_follows_links_and_scores(self):
+        """Test that walks follow links, stop at dead ends and score correctly."""
+        result = self.sample(seed=1, language="es", k=100)
+        by_walker: dict[int, list] = {}
+        for step in result.trace:
+            by_walker.setdefault(step.walker, []).append(step)
+        for steps in by_walker.values():
+            self.assertEqual(steps[0].phrase, "P1")
+            self.assertEqual([s.step for s in steps], list(range(len(steps))))
+            for current, following in zip(steps, steps[1:]):
+                self.assertIn(following.phrase, GRAPH[current.phrase])
+            if len(steps) < 12:
+                self.assertIn(GRAPH[steps[-1].phrase], ([], ["Broken"]))
+        for step in result.trace:
+            words = fake_page(step.phrase).get_dict()
+            expected = score_pages({step.phrase: words}, ["es"], [100], "small")[0, 0, 0]
+            self.assertEqual(step.score, expected)
+        self.assertEqual(result.worst.score, min(s.score for s in result.trace))
+        self.assertEqual(result.best.score, max(s.score for s in result.trace))
+
+    def test_pages_fetched_once(self):
+        """Test that walkers share downloads of the same page."""
+        result = self.sample(walkers=10, steps=20)
+        self.assertEqual(len(self.fetched), len(set(self.fetched)))
+        self.assertEqual(result.pages_fetched, len(self.fetched))
+
+    def test_walkers_run_concurrently(self):
+        """Test that more walkers take about as long as one with slow fetches."""
+        def slow_page(phrase: str, wait: float = 0) -> Page:
+            time.sleep(0.02)
+            return fake_page(phrase)
+
+        self.controller._get_page.side_effect = slow_page
+        start = time.perf_counter()
+        self.sample(walkers=1, steps=10)
+        one = time.perf_counter() - start
+        start = time.perf_counter()
+        result = self.sample(walkers=8, steps=10)
+        eight = time.perf_counter() - start
+        self.assertGreater(len(result.trace), 20)
+        self.assertLess(eight, one * 3)
+
+    def test_prefetch_overlaps_scoring(self):
+        """Test that the next page's fetch starts before the current score ends."""
+        events = []
+
+        def slow_page(phrase: str, wait: float = 0) -> Page:
+            events.append(("fetch", phrase, time.perf_counter()))
+            time.sleep(0.1)
+            return fake_page(phrase)
+
+        def slow_score(sampler, phrase, words):
+            time.sleep(0.1)
+            events.append(("scored", phrase, time.perf_counter()))
+            return compute_score(sampler, phrase, words)
+
+        compute_score = RandomWalkSampler._compute_score
+        self.controller._get_page.side_effect = slow_page
+        with patch.object(RandomWalkSampler, "_compute_score", slow_score):
+            result = self.sample(walkers=1, steps=4, seed=2)
+        fetches = [t for kind, _, t in events if kind == "fetch"]
+        scored = [t for kind, _, t in events if kind == "scored"]
+        self.assertEqual(len(result.trace), 4)
+        for step in range(3):
+            self.assertLess(fetches[step + 1], scored[step])
+
+    def test_command_and_errors(self):
+        """Test the sample_pages command and invalid arguments."""
+        output = Path(self.tmp.name) / "trace.csv"
+        with patch("builtins.print") as printed:
+            result = self.controller.sample_pages("P1", walkers=3, steps=5, wordlist="small",
+                                                  trace_output=str(output))
+        self.assertIn("Worst: ", str(printed.call_args_list))
+        self.assertEqual(len(output.read_text().splitlines()), len(result.trace) + 1)
+        with self.assertRaises(ValueError):
+            RandomWalkSampler(self.controller, walkers=0)
+        with patch("builtins.print"), self.assertRaises(SystemExit):
+            self.controller.sample_pages("P1", language="xx-nope", wordlist="small")
+
+
+if __name__ == "__main__":
+    unittest.main()
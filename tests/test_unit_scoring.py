@@ -0,0 +1,130 @@
+"""
+Unit tests for language confidence scores (wikiscraper.scoring).
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import wordfreq
+from bs4 import BeautifulSoup
+
+from wikiscraper import config, reference, scoring
+from wikiscraper.controller import Controller
+from wikiscraper.corpus import get_corpus, remove_corpus
+from wikiscraper.scoring import lang_confidence_score, score_pages, scores_frame
+from wikiscraper.tokenizer import Tokenizer
+
+
+def notebook_scores(pages, languages, k_values, wordlist="small"):
+    """The scores as `analysis.ipynb` computes them (`compute_scores_table`)."""
+    lang_refs = {}
+    for lang in languages:
+        full_freq_dict = wordfreq.get_frequency_dict(lang, wordlist=wordlist)
+        sorted_items = sorted(full_freq_dict.items(), key=lambda x: x[1], reverse=True)
+        lang_refs[lang] = {k: dict(sorted_items[:k]) for k in k_values}
+    return np.array([
+        [[lang_confidence_score(words, lang_refs[lang][k]) for k in k_values]
+         for lang in languages]
+        for words in pages.values()
+    ])
+
+
+def fixture_pages() -> dict[str, dict[str, int]]:
+    """Word counts of the test pages, plus edge cases."""
+    pages = {}
+    for path in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+        soup = BeautifulSoup(path.read_text(encoding="utf-8"), "lxml")
+        pages[path.stem] = Tokenizer().count(soup.get_text(separator="\n"))
+    pages["spanish"] = {"el": 4, "de": 3, "que": 2, "pokémon": 1}
+    pages["empty"] = {}
+    pages["unknown"] = {"xyzzy": 3, "qwxz": 1}
+    pages["zero"] = {"the": 0}
+    return pages
+
+
+class TestScoring(unittest.TestCase):
+    """Tests for the batched scores."""
+
+    def setUp(self):
+        """Cache the reference tables in a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = patch.object(config, "REFERENCE_CACHE_DIR", Path(self.tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(reference._references.clear)
+        reference._references.clear()
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def test_matches_notebook(self):
+        """Test that the scores equal the notebook's for every page, language and k."""
+        pages = fixture_pages()
+        languages, k_values = ["en", "es"], [1, 3, 10, 100, 1000, 10**6]
+        scores = score_pages(pages, languages, k_values, wordlist="small")
+        expected = notebook_scores(pages, languages, k_values)
+        self.assertEqual(scores.shape, (len(pages), 2, 6))
+        np.testing.assert_allclose(scores, expected, rtol=1e-12, atol=0)
+        self.assertTrue((scores[-3:] == 0).all())
+        self.assertGreater(scores[0, 0, -1], scores[0, 1, -1])
+
+    def test_pages_split_across_blocks(self):
+        """Test that pages whose entries span several blocks score the same."""
+        pages = fixture_pages()
+        scores = score_pages(pages, ["en"], [10, 1000], wordlist="small")
+        with patch.object(scoring, "BLOCK_ENTRIES", 7):
+            blocked = score_pages(pages, ["en"], [10, 1000], wordlist="small")
+        np.testing.assert_allclose(blocked, scores, rtol=1e-12, atol=0)
+
+    def test_ties_at_k(self):
+        """Test that words tied at the k-th frequency are cut like the notebook's sort."""
+        freq_dict = wordfreq.get_frequency_dict("en", wordlist="small")
+        items = list(freq_dict.items())
+        tied = [w for w, f in items if f == items[300][1]]
+        self.assertGreater(len(tied), 1)
+        k = sorted(freq_dict.values(), reverse=True).index(items[300][1]) + 1
+        pages = {"tied": {w: 1 for w in tied}}
+        scores = score_pages(pages, ["en"], [k], wordlist="small")
+        self.assertEqual(scores[0, 0, 0], notebook_scores(pages, ["en"], [k])[0, 0, 0])
+        self.assertNotEqual(scores[0, 0, 0], 0)
+
+    def test_frame_and_errors(self):
+        """Test the DataFrame layout and invalid arguments."""
+        pages = {"a": {"the": 2}, "b": {"el": 1}}
+        frame = scores_frame(score_pages(pages, ["en", "es"], [3, 10], wordlist="small"),
+                             list(pages), ["en", "es"], [3, 10])
+        self.assertEqual(list(frame.columns), ["en@3", "en@10", "es@3", "es@10"])
+        self.assertEqual(list(frame.index), ["a", "b"])
+        with self.assertRaises(ValueError):
+            score_pages(pages, ["en"], [0])
+        with self.assertRaises(ValueError):
+            score_pages(pages, ["xx-nope"], [3])
+
+    def test_command_scores_corpus(self):
+        """Test that the command scores the corpus store's pages."""
+        pages = fixture_pages()
+        root = Path(self.tmp.name)
+        for name, value in (("WORD_COUNTS_JSON", root / "word-counts.json"),
+                            ("CORPUS_NPZ", root / "corpus.npz")):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(remove_corpus)
+        for title, words in pages.items():
+            get_corpus().add(title, title, words)
+        output = root / "scores.csv"
+        with patch("builtins.print"):
+            frame = Controller().score_pages(languages=["en"], k_values=[10, 1000],
+                                             wordlist="small", output=str(output))
+        self.assertTrue(output.exists())
+        expected = notebook_scores(pages, ["en"], [10, 1000]).reshape(len(pages), -1)
+        self.assertEqual(list(frame.index), list(pages))
+        np.testing.assert_allclose(frame.to_numpy(), expected, rtol=1e-12, atol=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Unit tests for the `serve` daemon (wikiscraper.server) and its client
+(wikiscraper.client).
+
+The daemon runs in a thread on a socket in a temp dir, with pages read from
+the fixture files through the page cache, so no network access is needed.
+"""
+
+import io
+import json
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from wikiscraper import client, config
+from wikiscraper.cache import cache_key
+from wikiscraper.controller import Controller
+from wikiscraper.page import Page
+from wikiscraper.scraper import Scraper
+from wikiscraper.server import CommandServer
+from wikiscraper.word_counts import load_word_counts, remove_word_counts
+
+
+class TestCommandServer(unittest.TestCase):
+    """Tests for concurrent requests, output capture, page memory and the client."""
+
+    def setUp(self):
+        """Cache the fixture pages in a temp data dir and start a daemon."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        for name, value in (("DATA_DIR", root), ("CACHE_DIR", root / "cache"),
+                            ("WORD_COUNTS_JSON", root / "word-counts.json")):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+        self.controller = Controller()
+        self.controller.page_memory = 4
+        for phrase in ("Team Rocket", "Type"):
+            path = config.TESTS_DATA_DIR / (phrase.lower().replace(" ", "_") + ".html")
+            self.controller.cache.put(cache_key(phrase), path.read_bytes())
+
+        self.socket = root / "test.sock"
+        self.server = CommandServer(self.controller, self.socket)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def remote(self, argv: list[str]) -> tuple[int | None, str, str]:
+        """Run a command through the client; return its exit code and output."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch.object(client, "sys", Mock(stdout=stdout, stderr=stderr)):
+            exit_code = client.run_remote(argv, self.socket)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    def request(self, argv: list[str]) -> dict:
+        """Send a request to the daemon directly (thread-safe, unlike `remote`)."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(str(self.socket))
+            connection.sendall(json.dumps({"argv": argv}).encode("utf-8") + b"\n")
+            with connection.makefile("rb") as reader:
+                return json.loads(reader.readline())
+
+    def test_commands_return_their_own_output(self):
+        """Test that concurrent requests each get their own output and exit code."""
+        commands = [["summary", "Team Rocket"], ["table", "Type", "--list"],
+                    ["table", "Type", "--number", "99"], ["summary", "Team Rocket"]] * 3
+        results: list = [None] * len(commands)
+
+        def run(n: int) -> None:
+            response = self.request(commands[n])
+            results[n] = (response["exit_code"], response["stdout"], response["stderr"])
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(len(commands))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        summary = Page("Team Rocket", (config.TESTS_DATA_DIR / "team_rocket.html").read_text())
+        with patch("builtins.print") as printed:
+            summary.summary()
+        expected = printed.call_args.args[0]
+        for argv, (exit_code, stdout, stderr) in zip(commands, results):
+            if argv[0] == "summary":
+                self.assertEqual((exit_code, stdout.strip(), stderr), (0, expected, ""))
+            elif "--list" in argv:
+                self.assertEqual(exit_code, 0)
+                self.assertTrue(stdout.startswith("1\t"), stdout)
+                self.assertNotIn("Team Rocket", stdout)
+            else:
+                self.assertEqual(exit_code, 1)
+        self.assertEqual(len(self.server.latencies), len(commands))
+
+    def test_count_words_and_page_memory(self):
+        """Test that served counts match local ones and repeated pages are not parsed again."""
+        with patch.object(Scraper, "scrape", autospec=True, side_effect=Scraper.scrape) as scrape:
+            for _ in range(3):
+                self.assertEqual(self.remote(["count_words", "Team Rocket"])[0], 0)
+        self.assertEqual(scrape.call_count, 1)
+        page = Page("Team Rocket", (config.TESTS_DATA_DIR / "team_rocket.html").read_text())
+        self.assertEqual(load_word_counts(),
+                         {word: count * 3 for word, count in page.get_dict().items()})
+        page = self.controller._get_page("Team Rocket")
+        page.release()
+        self.assertIsNotNone(page._soup)
+
+    def test_run_options_are_restored(self):
+        """Test that run options apply to their request only."""
+        exit_code, stdout, _ = self.remote(["--engine", "stream", "summary", "Team Rocket"])
+        self.assertEqual(exit_code, 0)
+        self.assertTrue(stdout)
+        self.assertEqual(Page.engine, config.PARSE_ENGINE)
+
+    def test_fallback_to_local(self):
+        """Test that the client runs nothing without a daemon or for unserved commands."""
+        self.assertIsNone(self.remote(["ingest_dump", "dump.xml"])[0])
+        self.assertIsNone(client.run_remote(["summary", "x"], Path(self.tmp.name) / "none.sock"))
+        with patch.object(client, "os", Mock(getcwd=Mock(return_value=self.tmp.name))):
+            self.assertIsNone(self.remote(["summary", "Team Rocket"])[0])
+        exit_code, _, stderr = self.remote(["summary"])
+        self.assertEqual(exit_code, 2)
+        self.assertIn("usage", stderr)
+
+    def test_stale_socket(self):
+        """Test that a second daemon refuses a live socket and replaces a stale one."""
+        with self.assertRaises(OSError):
+            CommandServer(self.controller, self.socket)
+        stale = Path(self.tmp.name) / "stale.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(stale))
+        server = CommandServer(self.controller, stale)
+        server.server_close()
+        self.assertFalse(stale.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
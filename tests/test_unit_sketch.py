@@ -0,0 +1,169 @@
+"""
+Unit tests for approximate word counting (wikiscraper.sketch).
+"""
+
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from wikiscraper import config
+from wikiscraper.controller import Controller
+from wikiscraper.sketch import CountMinSketch, SketchCounter, remove_sketch
+from wikiscraper.word_counts import (
+    checkpointed, load_word_counts, merge_word_counts, remove_word_counts, set_sketch,
+)
+
+
+def zipf_pages(pages: int, seed: int = 0) -> list[dict[str, int]]:
+    """Pages of Zipf-distributed words with a long tail."""
+    rng = np.random.default_rng(seed)
+    result = []
+    for _ in range(pages):
+        ids = rng.zipf(1.2, 400) % 50_000
+        result.append(dict(Counter(f"w{i}" for i in ids.tolist())))
+    return result
+
+
+class TestCountMinSketch(unittest.TestCase):
+    """Tests for the sketch's guarantees."""
+
+    def test_estimates_within_bounds(self):
+        """Test that estimates never undercount and stay within epsilon."""
+        counter = SketchCounter.from_budget(epsilon=1e-3, delta=1e-3, k=50)
+        exact: Counter = Counter()
+        for words in zipf_pages(300):
+            counter.add(words)
+            exact.update(words)
+        words = list(exact)
+        estimates = counter.sketch.estimate(words)
+        truth = np.array([exact[w] for w in words])
+        self.assertTrue((estimates >= truth).all())
+        bound = counter.sketch.epsilon * counter.sketch.total
+        self.assertLessEqual(np.mean(estimates - truth > bound), counter.sketch.delta)
+
+    def test_top_k_matches_exact(self):
+        """Test that the top words are the exact top words on skewed data."""
+        counter = SketchCounter.from_budget(memory_mb=2, k=100)
+        exact: Counter = Counter()
+        for words in zipf_pages(300):
+            counter.add(words)
+            exact.update(words)
+        top = counter.top(20)
+        self.assertEqual([w for w, _ in top], [w for w, _ in exact.most_common(20)])
+        for word, estimate in top:
+            self.assertGreaterEqual(estimate, exact[word])
+
+    def test_memory_budget(self):
+        """Test the memory ceiling and a too small budget."""
+        counter = SketchCounter.from_budget(memory_mb=4, k=1000)
+        self.assertLessEqual(counter.memory_bytes, 4e6)
+        self.assertGreater(counter.memory_bytes, 3.9e6)
+        with self.assertRaisesRegex(ValueError, "too small"):
+            SketchCounter.from_budget(memory_mb=0.01, k=1000)
+        with self.assertRaises(ValueError):
+            CountMinSketch(0, 3)
+
+    def test_save_and_load(self):
+        """Test that a saved counter continues where it stopped."""
+        counter = SketchCounter.from_budget(memory_mb=0.5, k=10)
+        pages = zipf_pages(20)
+        for words in pages[:10]:
+            counter.add(words)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sketch.npz"
+            counter.save(path)
+            loaded = SketchCounter.load(path)
+        for words in pages[10:]:
+            counter.add(words)
+            loaded.add(words)
+        self.assertEqual(loaded.top(10), counter.top(10))
+        self.assertEqual(loaded.sketch.total, counter.sketch.total)
+
+    def test_concurrent_saves_merge(self):
+        """Test that two counters saving to one file keep the counts of both."""
+        pages = zipf_pages(30)
+        exact: Counter = Counter()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sketch.npz"
+            base = SketchCounter.from_budget(memory_mb=0.5, k=10)
+            for words in pages[:10]:
+                base.add(words)
+                exact.update(words)
+            base.save(path)
+            first, second = SketchCounter.load(path), SketchCounter.load(path)
+            for counter, part in ((first, pages[10:20]), (second, pages[20:])):
+                for words in part:
+                    counter.add(words)
+                    exact.update(words)
+            first.save(path)
+            second.save(path)
+            merged = SketchCounter.load(path)
+            self.assertEqual(sorted(p.name for p in Path(tmp).glob("*.tmp")), [])
+            with self.assertRaisesRegex(ValueError, "cannot be merged"):
+                other = SketchCounter.from_budget(memory_mb=0.25, k=10)
+                other.add({"pikachu": 1})
+                other.save(path)
+        self.assertEqual(merged.sketch.total, sum(exact.values()))
+        words = list(exact)
+        estimates = merged.sketch.estimate(words)
+        self.assertTrue((estimates >= np.array([exact[w] for w in words])).all())
+        self.assertEqual([w for w, _ in merged.top(5)], [w for w, _ in exact.most_common(5)])
+
+
+class TestApproximateMode(unittest.TestCase):
+    """Tests for counting and analyzing with the sketch."""
+
+    def setUp(self):
+        """Point the data files to a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        for name, value in (("WORD_COUNTS_JSON", root / "word-counts.json"),
+                            ("SKETCH_NPZ", root / "sketch.npz")):
+            patcher = patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+        self.addCleanup(set_sketch, None)
+        self.addCleanup(remove_sketch)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def test_counts_go_to_sketch(self):
+        """Test that approximate mode feeds the sketch, not the store."""
+        controller = Controller()
+        controller.configure(approximate=True, sketch_mb=1)
+        merge_word_counts({"pikachu": 5, "mew": 2}, page="Pikachu")
+        merge_word_counts({"pikachu": 1}, page="Raichu")
+        self.assertEqual(load_word_counts(), {})
+        self.assertEqual(controller.sketch.top(2), [("pikachu", 6), ("mew", 2)])
+        with patch("builtins.print") as printed, \
+                patch.object(config, "REFERENCE_CACHE_DIR", Path(self.tmp.name)):
+            controller.analyze_relative_word_frequency("article", 2)
+        table = str(printed.call_args_list[-1])
+        self.assertIn("pikachu", table)
+        self.assertIn("mew", table)
+
+    def test_resumed_crawl_counts_pages_once(self):
+        """Test that a resumed approximate crawl skips the pages it counted."""
+        controller = Controller()
+        controller.configure(approximate=True, sketch_mb=1)
+        with self.assertRaises(KeyboardInterrupt), checkpointed("crawl", every_pages=1):
+            merge_word_counts({"pikachu": 5, "mew": 2}, page="Pikachu")
+            raise KeyboardInterrupt
+        self.assertTrue(config.SKETCH_NPZ.exists())
+        with checkpointed("crawl", every_pages=1):
+            self.assertFalse(merge_word_counts({"pikachu": 5, "mew": 2}, page="Pikachu"))
+            self.assertTrue(merge_word_counts({"pikachu": 1}, page="Raichu"))
+        self.assertEqual(load_word_counts(), {})
+        self.assertEqual(controller.sketch.top(2), [("pikachu", 6), ("mew", 2)])
+        self.assertEqual(controller.sketch.sketch.total, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Unit tests for the CLI startup cost: every subcommand imports only what it
+uses (measured with `python -X importtime`, see benchmarks/bench_startup.py).
+"""
+
+import unittest
+
+from benchmarks.bench_startup import COMMANDS, HEAVY_MODULES, heavy, measure
+
+
+class TestStartupImports(unittest.TestCase):
+    """Tests for the modules each subcommand imports."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Run the measured commands once each."""
+        cls.runs = {
+            name: measure(COMMANDS[name])
+            for name in ("--help", "summary", "count_words", "analyze")
+        }
+
+    def test_help_needs_only_the_parser(self):
+        """Test that --help imports neither the controller nor its dependencies."""
+        _, _, modules = self.runs["--help"]
+        self.assertIn("wikiscraper.parser", modules)
+        for name in ("wikiscraper.controller", "requests", "bs4", *HEAVY_MODULES):
+            self.assertNotIn(name, modules)
+
+    def test_short_commands_skip_heavy_modules(self):
+        """Test that summary and count_words load no heavy dependency."""
+        for name in ("summary", "count_words"):
+            _, _, modules = self.runs[name]
+            self.assertIn("wikiscraper.controller", modules)
+            self.assertEqual(heavy(modules), [], name)
+
+    def test_heavy_commands_import_on_demand(self):
+        """Test that analyze still loads what it needs, and costs more to start."""
+        analyze_time, _, modules = self.runs["analyze"]
+        self.assertEqual(heavy(modules), ["numpy", "pandas", "wordfreq"])
+        self.assertNotIn("matplotlib", modules)
+        summary_time, _, _ = self.runs["summary"]
+        self.assertLess(summary_time, analyze_time)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+"""
+Unit tests for the table reader, the table catalog and the all-tables export
+(wikiscraper.tables).
+"""
+
+import contextlib
+import io
+import json
+import re
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from wikiscraper import config
+from wikiscraper.page import Page
+from wikiscraper.tables import read_table, table_info, value_counts, write_tables
+
+TABLES_HTML = """<html><body><div class="mw-content-ltr">
+<table class="navbox"><tr><td>a</td><td>b</td></tr><tr><td>c</td><td>d</td></tr></table>
+<table>
+  <caption>Base <b>stats</b></caption>
+  <tr><th colspan="2">Stat</th><th>Value</th></tr>
+  <tr><td>HP</td><td>base</td><td>35</td></tr>
+  <tr><td>Speed</td><td>base</td><td><table><tr><td>x</td><td>y</td></tr></table></td></tr>
+</table>
+<table><tr><th>Col</th><th>Val</th></tr><tr><td>A</td><td>1</td></tr></table>
+</div></body></html>
+"""
+
+SPANS_HTML = """<table>
+<thead>
+  <tr><th rowspan="2">Name</th><th colspan="2">Stats</th></tr>
+  <tr><th>HP</th><th>Attack<style>.x{}</style></th></tr>
+</thead>
+<tbody>
+  <tr><td>Pikachu<span style="display: none">sortkey</span></td><td>1,035</td><td rowspan="2">55</td></tr>
+  <tr><td>Raichu<br>Alola</td><td>NA</td></tr>
+  <tr style="display:none"><td>Hidden</td><td>1</td><td>2</td></tr>
+  <tr><td>Pichu</td><td>20</td><td>40</td><td>extra</td></tr>
+  <tr><td>Nested <table><tbody><tr><td>in</td><td>ner</td></tr></tbody></table></td>
+      <td>3.5</td><td rowspan="3">x</td></tr>
+</tbody>
+<tfoot><tr><th>Total</th><th>True</th></tr></tfoot>
+</table>"""
+
+
+class TestReadTable(unittest.TestCase):
+    """Tests for tables.read_table."""
+
+    def assert_same_as_read_html(self, html: str, first_row_is_header: bool):
+        """Compare read_table with pd.read_html on a table."""
+        tag = BeautifulSoup(html, "lxml").find("table")
+        expected = pd.read_html(io.StringIO(html),
+                                header=0 if first_row_is_header else None)[0]
+        df = read_table(tag, first_row_is_header)
+        self.assertTrue(expected.equals(df))
+        self.assertEqual(list(expected.columns), list(df.columns))
+        self.assertEqual(list(expected.dtypes), list(df.dtypes))
+
+    def test_spans_sections_and_hidden_cells(self):
+        """Test rowspan, colspan, thead/tfoot, hidden elements and typing."""
+        for first_row_is_header in (False, True):
+            self.assert_same_as_read_html(SPANS_HTML, first_row_is_header)
+            self.assert_same_as_read_html(TABLES_HTML, first_row_is_header)
+
+    def test_fixture_tables(self):
+        """Test every real table of the fixtures against pd.read_html."""
+        for fixture in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+            page = Page("Doc", fixture.read_text(encoding="utf-8"))
+            for tag in page._real_tables():
+                try:
+                    expected = pd.read_html(io.StringIO(str(tag)))[0]
+                except ValueError as e:
+                    with self.assertRaisesRegex(ValueError, re.escape(str(e))):
+                        read_table(tag)
+                    continue
+                self.assertTrue(expected.equals(read_table(tag)), fixture.name)
+
+    def test_value_counts(self):
+        """Test that value counts skip missing cells, most frequent first."""
+        df = pd.DataFrame({"a": ["x", "y", None], "b": ["x", None, "z"]})
+        counts = value_counts(df)
+        self.assertEqual(list(counts.columns), ["Wartość", "Liczba wystąpień"])
+        self.assertEqual(counts.iloc[0].tolist(), ["x", 2])
+        self.assertEqual(int(counts["Liczba wystąpień"].sum()), 4)
+
+
+class TestTableCatalog(unittest.TestCase):
+    """Tests for Page.table_catalog."""
+
+    def test_shape_and_caption(self):
+        """Test rows, columns (with colspan) and captions of the real tables."""
+        for engine in ("soup", "stream"):
+            with patch.object(Page, "engine", engine):
+                catalog = Page("Doc", TABLES_HTML).table_catalog()
+            self.assertEqual([info.index for info in catalog], [1, 2], engine)
+            self.assertEqual(catalog[0].shape, (3, 3), engine)
+            self.assertEqual(catalog[0].caption, "Base stats", engine)
+            self.assertEqual(catalog[1].shape, (2, 2), engine)
+            self.assertEqual(catalog[1].caption, "", engine)
+
+    def test_catalog_matches_table_numbers(self):
+        """Test that the catalog lists exactly the tables `table(n)` accepts."""
+        for fixture in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+            html = fixture.read_text(encoding="utf-8")
+            for engine in ("soup", "stream"):
+                with patch.object(Page, "engine", engine):
+                    page = Page("Doc", html)
+                    count = len(page.table_catalog())
+                    self.assertGreater(count, 0, fixture.name)
+                    with self.assertRaisesRegex(ValueError, f"Found {count} real tables"):
+                        page.table(count + 1)
+
+    def test_stream_tables_encode_html_once(self):
+        """Test that the table slices of the stream engine share one encoding."""
+        with patch.object(Page, "engine", "stream"):
+            page = Page("Doc", TABLES_HTML)
+            self.assertEqual(len(page._real_tables()), 2)
+            encoded = page._html_bytes
+            self.assertEqual(encoded, TABLES_HTML.encode("utf-8"))
+            page._tables = None
+            page._real_tables()
+        self.assertIs(page._html_bytes, encoded)
+
+    def test_catalog_computed_once(self):
+        """Test that the catalog is memoized and survives `release`."""
+        page = Page("Doc", TABLES_HTML)
+        with patch("wikiscraper.tables.table_info", wraps=table_info) as info:
+            first = page.table_catalog()
+            page.release()
+            second = page.table_catalog()
+        self.assertEqual(info.call_count, 2)
+        self.assertEqual(repr(first), repr(second))
+
+
+class TestAllTables(unittest.TestCase):
+    """Tests for Page.tables."""
+
+    def test_writes_csv_and_multi_table_file(self):
+        """Test that every table gets a CSV and all share one file."""
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.dict("sys.modules", {"pyarrow": None}), \
+                contextlib.redirect_stdout(io.StringIO()):
+            page = Page("Doc", TABLES_HTML)
+            frames = page.tables(output_dir=tmp, first_row_is_header=True)
+            single = Page("Doc", TABLES_HTML).table(2, output_dir=tmp,
+                                                    first_row_is_header=True)
+
+            self.assertEqual(sorted(frames), [1, 2])
+            self.assertTrue(frames[2].equals(single))
+            for n in frames:
+                self.assertTrue((Path(tmp) / f"Doc_{n}.csv").exists())
+            document = json.loads((Path(tmp) / "Doc_tables.json").read_text("utf-8"))
+
+        self.assertEqual([t["index"] for t in document["tables"]], [1, 2])
+        self.assertEqual(document["tables"][0]["caption"], "Base stats")
+        second = document["tables"][1]
+        self.assertEqual(second["shape"], [1, 2])
+        self.assertEqual(second["columns"], [
+            {"name": "Col", "values": ["A"]},
+            {"name": "Val", "values": [1]},
+        ])
+
+    def test_unreadable_table_is_skipped(self):
+        """Test that a table pandas cannot read does not stop the export."""
+        html = (config.TESTS_DATA_DIR / "type.html").read_text(encoding="utf-8")
+        out = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.dict("sys.modules", {"pyarrow": None}), \
+                contextlib.redirect_stdout(out):
+            page = Page("Type", html)
+            frames = page.tables(output_dir=tmp)
+            catalog = page.table_catalog()
+            self.assertTrue((Path(tmp) / "Type_tables.json").exists())
+
+        skipped = [info.index for info in catalog if info.index not in frames]
+        self.assertEqual(skipped, [6])
+        self.assertEqual(len(frames) + len(skipped), len(catalog))
+        for index in skipped:
+            self.assertIn(f"Table {index} skipped", out.getvalue())
+
+    def test_parquet_long_format(self):
+        """Test the Parquet cells with pyarrow, also for a page without tables."""
+        written = []
+
+        def to_parquet(frame, target, index=True):
+            written.append(frame)
+            return None
+
+        frames = {2: pd.DataFrame({"Col": ["A", "B"], "Val": [1, 2]})}
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.dict("sys.modules", {"pyarrow": MagicMock()}), \
+                patch.object(pd.DataFrame, "to_parquet", to_parquet):
+            target = write_tables(frames, [], Path(tmp) / "Doc_tables")
+            empty = write_tables({}, [], Path(tmp) / "None_tables")
+
+        self.assertEqual((target.name, empty.name), ("Doc_tables.parquet", "None_tables.parquet"))
+        cells, nothing = written
+        self.assertEqual(list(cells.columns), ["table", "row", "column", "value"])
+        self.assertEqual(cells["row"].tolist(), [0, 0, 1, 1])
+        self.assertEqual(cells["column"].tolist(), ["Col", "Val", "Col", "Val"])
+        self.assertEqual(cells["value"].tolist(), ["A", "1", "B", "2"])
+        self.assertEqual(list(nothing.columns), list(cells.columns))
+        self.assertEqual(len(nothing), 0)
+        self.assertEqual(list(nothing.dtypes), list(cells.dtypes))
+
+
+if __name__ == "__main__":
+    unittest.main()
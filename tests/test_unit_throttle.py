@@ -0,0 +1,197 @@
+"""
+Unit tests for adaptive request pacing and retries (wikiscraper.throttle).
+
+Sleeping is patched out where possible; the crawl test runs against the
+local stand-in wiki from `benchmarks/stand_in_wiki.py` with a server-side
+rate limit.
+"""
+
+import argparse
+import random
+import tempfile
+import unittest
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from benchmarks.stand_in_wiki import StandInWiki
+from wikiscraper import config
+from wikiscraper.cache import PageCache
+from wikiscraper.controller import Controller
+from wikiscraper.scraper import Scraper
+from wikiscraper.throttle import AdaptiveThrottle, FetchError, parse_retry_after
+from wikiscraper.word_counts import remove_word_counts
+
+
+def response(status: int, retry_after: str | None = None) -> MagicMock:
+    """Build a fake response with a status and optional Retry-After header."""
+    headers = {"Retry-After": retry_after} if retry_after is not None else {}
+    return MagicMock(status_code=status, headers=headers, content=b"<html>ok</html>")
+
+
+class TestParseRetryAfter(unittest.TestCase):
+    """Tests for parsing Retry-After headers."""
+
+    def test_seconds(self):
+        """Test a delay given in seconds."""
+        self.assertEqual(parse_retry_after("7"), 7.0)
+
+    def test_http_date(self):
+        """Test a delay given as an HTTP date."""
+        when = datetime.now(timezone.utc) + timedelta(seconds=30)
+        delay = parse_retry_after(format_datetime(when, usegmt=True))
+        self.assertAlmostEqual(delay, 30, delta=2)
+
+    def test_invalid(self):
+        """Test that missing or malformed values are ignored."""
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+
+
+class TestAdaptiveThrottle(unittest.TestCase):
+    """Tests for the AIMD rate control and retry loop."""
+
+    def make_throttle(self, **kwargs) -> AdaptiveThrottle:
+        """Create a fast throttle with deterministic jitter."""
+        options = dict(initial_rate=1000, max_rate=10000, backoff_base=0.01,
+                       max_retries=3, rng=random.Random(0))
+        options.update(kwargs)
+        return AdaptiveThrottle(**options)
+
+    def test_rate_ramps_up_and_backs_off(self):
+        """Test slow start, multiplicative decrease and additive increase."""
+        throttle = AdaptiveThrottle(initial_rate=10, max_rate=100, slow_start=2,
+                                    increase=5, decrease=0.5)
+        throttle.on_success()
+        self.assertEqual(throttle.rate, 20)
+        throttle.on_backoff(started_at=throttle.acquire())
+        self.assertEqual(throttle.rate, 10)
+        throttle.on_success()
+        self.assertAlmostEqual(throttle.rate, 10.5)
+        for _ in range(1000):
+            throttle.on_success()
+        self.assertEqual(throttle.rate, 100)
+
+    def test_one_backoff_per_overload_episode(self):
+        """Test that requests started before a backoff do not back off again."""
+        throttle = self.make_throttle(initial_rate=100, decrease=0.5)
+        starts = [throttle.acquire() for _ in range(5)]
+        for started_at in starts:
+            throttle.on_backoff(started_at)
+        self.assertEqual(throttle.rate, 50)
+        self.assertEqual(throttle.stats()["backoffs"], 1)
+
+    def test_only_overlapping_requests_are_paced(self):
+        """Test that a request alone is not paced and does not ramp the rate."""
+        throttle = self.make_throttle(initial_rate=1, slow_start=2)
+        with patch("wikiscraper.throttle.time.sleep") as sleep:
+            for _ in range(3):
+                throttle.request(MagicMock(return_value=response(200)), what="page")
+        sleep.assert_not_called()
+        self.assertEqual(throttle.rate, 1)
+
+        def send_with_overlap():
+            throttle.request(MagicMock(return_value=response(200)), what="inner")
+            return response(200)
+
+        with patch("wikiscraper.throttle.time.sleep") as sleep:
+            throttle.request(send_with_overlap, what="outer")
+        self.assertAlmostEqual(sleep.call_args.args[0], 1, delta=0.1)
+        self.assertEqual(throttle.rate, 2)
+        self.assertEqual(throttle.stats()["successes"], 5)
+
+    def test_retries_until_success(self):
+        """Test that 503 responses and timeouts are retried."""
+        throttle = self.make_throttle()
+        send = MagicMock(side_effect=[response(503), requests.Timeout(), response(200)])
+        with patch("wikiscraper.throttle.time.sleep"):
+            r = throttle.request(send, what="page")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(send.call_count, 3)
+        stats = throttle.stats()
+        self.assertEqual(stats["retries"], 2)
+        self.assertEqual(stats["successes"], 1)
+
+    def test_jittered_backoff_grows(self):
+        """Test that retry delays are jittered and grow exponentially."""
+        throttle = self.make_throttle(backoff_base=1, backoff_max=8)
+        delays = [throttle.backoff_delay(attempt) for attempt in range(6)]
+        for attempt, delay in enumerate(delays):
+            cap = min(8, 2 ** attempt)
+            self.assertTrue(cap / 2 <= delay <= cap)
+        self.assertNotEqual(delays[4], delays[5])
+
+    def test_retry_after_pauses_all_requests(self):
+        """Test that Retry-After delays the next request start."""
+        throttle = self.make_throttle()
+        send = MagicMock(side_effect=[response(429, "2"), response(200)])
+        with patch("wikiscraper.throttle.time.sleep") as sleep:
+            throttle.request(send, what="page")
+        self.assertAlmostEqual(sleep.call_args_list[-1].args[0], 2, delta=0.1)
+        self.assertEqual(throttle.stats()["retry_after_pauses"], 1)
+
+    def test_gives_up_after_max_retries(self):
+        """Test that FetchError is raised once all retries failed."""
+        throttle = self.make_throttle(max_retries=2)
+        send = MagicMock(return_value=response(502))
+        with patch("wikiscraper.throttle.time.sleep"):
+            with self.assertRaises(FetchError) as ctx:
+                throttle.request(send, what="page")
+        self.assertEqual(ctx.exception.status, 502)
+        self.assertEqual(send.call_count, 3)
+        self.assertEqual(throttle.stats()["failures"], 1)
+
+    def test_scraper_raises_on_missing_page(self):
+        """Test that a 404 is not retried, not a success, and raises FetchError."""
+        throttle = self.make_throttle()
+        with tempfile.TemporaryDirectory() as tmp:
+            session = MagicMock()
+            session.get.return_value = response(404)
+            scraper = Scraper("Missing", session=session, cache=PageCache(tmp),
+                              throttle=throttle)
+            with self.assertRaises(FetchError):
+                scraper.scrape()
+        session.get.assert_called_once()
+        self.assertEqual(throttle.stats()["successes"], 0)
+
+
+class TestThrottledCrawl(unittest.TestCase):
+    """Tests for crawling a wiki that rate-limits requests."""
+
+    def crawl(self, rate_limit: float | None) -> tuple[int, AdaptiveThrottle, int]:
+        """Crawl the stand-in wiki; return cached pages, throttle and 429 count."""
+        with StandInWiki(num_pages=30, latency=0, rate_limit=rate_limit) as wiki, \
+                tempfile.TemporaryDirectory() as tmp, \
+                patch.object(config, "CACHE_DIR", Path(tmp) / "cache"), \
+                patch.object(config, "WORD_COUNTS_JSON", Path(tmp) / "word-counts.json"):
+            controller = Controller(wiki_base_url=wiki.base_url)
+            controller.throttle = AdaptiveThrottle(initial_rate=200, max_rate=200,
+                                                   backoff_base=0.05)
+            with patch("builtins.print"):
+                controller.auto_count_words("Page_0", depth=2, wait=0, concurrency=4)
+            remove_word_counts()
+            return len(controller.cache), controller.throttle, wiki.throttled
+
+    def test_crawl_survives_429(self):
+        """Test that a crawl backs off on 429 and still fetches every page."""
+        expected, _, _ = self.crawl(rate_limit=None)
+        pages, throttle, throttled = self.crawl(rate_limit=10)
+        self.assertGreater(throttled, 0)
+        self.assertGreater(throttle.stats()["backoffs"], 0)
+        self.assertEqual(throttle.stats()["failures"], 0)
+        self.assertEqual(pages, expected)
+
+    def test_run_func_exits_on_fetch_error(self):
+        """Test that the CLI still exits with status 1 if a page is missing."""
+        controller = Controller()
+        args = argparse.Namespace(command="summary", phrase="X")
+        with patch.object(controller, "summary", side_effect=FetchError("gone", 404)), \
+                patch("builtins.print"):
+            with self.assertRaises(SystemExit):
+                controller.run_func(args)
+
+if __name__ == "__main__":
+    unittest.main()
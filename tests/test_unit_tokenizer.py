@@ -0,0 +1,112 @@
+"""
+Unit tests for the word tokenizer (wikiscraper.tokenizer).
+"""
+
+import sys
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+from wikiscraper import config
+from wikiscraper.page import Page
+from wikiscraper.tokenizer import Tokenizer
+
+UNICODE_TEXT = (
+    "ΟΔΟΣ ΟΔΟΣ. Σ ΑΣ ΑΣ ΣΑ İstanbul İİ ǅemal ǲ Straße ﬁne 漢字 "
+    "naïve Pokémon don't 3rd x y a\u0085b c\u000bd e\u001cf "
+    "g​h Ⅻ ½ ² ‐ Mr. mr MR"
+)
+"""str: Text with case mappings and whitespace that are easy to get wrong."""
+
+
+def reference_count(text: str) -> dict[str, int]:
+    """The original per-token loop of `Page.get_dict`."""
+    words_found: dict[str, int] = {}
+    for word in text.split():
+        word = word.lower()
+        if word.isalpha():
+            words_found[word] = words_found.get(word, 0) + 1
+    return words_found
+
+
+class TestDefaultTokenizer(unittest.TestCase):
+    """Tests that the fast path keeps the original semantics."""
+
+    def assert_same(self, text: str):
+        """Compare counts and their order with the reference loop."""
+        expected = reference_count(text)
+        counts = Tokenizer().count(text)
+        self.assertEqual(counts, expected)
+        self.assertEqual(list(counts), list(expected))
+
+    def test_unicode_text(self):
+        """Test case mappings and unusual whitespace."""
+        self.assert_same(UNICODE_TEXT)
+
+    def test_every_whitespace_character(self):
+        """Test that whitespace splits the same before and after lowering."""
+        spaces = [chr(c) for c in range(sys.maxunicode + 1) if chr(c).isspace()]
+        self.assert_same("ΑΣ".join(spaces) + "Σ" + "ǅ".join(spaces))
+
+    def test_fixture_pages(self):
+        """Test the text of the fixture pages."""
+        for fixture in sorted(config.TESTS_DATA_DIR.glob("*.html")):
+            soup = BeautifulSoup(fixture.read_text(encoding="utf-8"), "lxml")
+            self.assert_same(soup.get_text(separator="\n"))
+
+    def test_update(self):
+        """Test accumulating counts over several texts."""
+        counts: Counter = Counter()
+        Tokenizer().update(counts, "a b a")
+        Tokenizer().update(counts, "b c")
+        self.assertEqual(counts, Counter({"a": 2, "b": 2, "c": 1}))
+
+
+class TestNormalizers(unittest.TestCase):
+    """Tests for the optional normalizers."""
+
+    def test_casefold(self):
+        """Test that casefold replaces lower."""
+        counts = Tokenizer(["casefold"]).count("Straße STRASSE ﬁne")
+        self.assertEqual(counts, {"strasse": 2, "fine": 1})
+
+    def test_apostrophes(self):
+        """Test apostrophe unification and edge apostrophes."""
+        counts = Tokenizer(["apostrophes"]).count(
+            "Don't don’t Farfetch'd 'quoted' rock'n'roll ' 90's"
+        )
+        self.assertEqual(counts, {"don't": 2, "farfetch'd": 1, "quoted": 1,
+                                  "rock'n'roll": 1})
+
+    def test_digits(self):
+        """Test that digits become zeros and count as word characters."""
+        counts = Tokenizer(["digits"]).count("Gen1 gen2 1996 3.5 ² ٣ abc")
+        self.assertEqual(counts, {"gen0": 2, "0000": 1, "0": 1, "abc": 1})
+
+    def test_combined(self):
+        """Test several normalizers at once."""
+        counts = Tokenizer(["apostrophes", "digits", "casefold"]).count("90’S 90's")
+        self.assertEqual(counts, {"00's": 2})
+
+    def test_unknown_normalizer(self):
+        """Test that unknown names are rejected."""
+        with self.assertRaisesRegex(ValueError, "Unknown normalizer 'stem'"):
+            Tokenizer(["casefold", "stem"])
+
+    def test_page_engines_agree(self):
+        """Test that both page engines use the selected tokenizer."""
+        html = (config.TESTS_DATA_DIR / "team_rocket.html").read_text(encoding="utf-8")
+        tokenizer = Tokenizer(["casefold", "apostrophes", "digits"])
+        with patch.object(Page, "tokenizer", tokenizer):
+            with patch.object(Page, "engine", "soup"):
+                soup = Page("Team_Rocket", html).get_dict()
+            with patch.object(Page, "engine", "stream"):
+                stream = Page("Team_Rocket", html).get_dict()
+        self.assertEqual(soup, stream)
+        self.assertNotEqual(soup, Page("Team_Rocket", html).get_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
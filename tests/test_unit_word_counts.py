@@ -0,0 +1,216 @@
+"""
+Unit tests for the incremental word count store (wikiscraper.word_counts).
+"""
+
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+from unittest.mock import patch
+
+from wikiscraper import config
+from wikiscraper.word_counts import (
+    CheckpointBuffer,
+    checkpointed,
+    export_word_counts,
+    get_store,
+    load_word_counts,
+    merge_word_counts,
+    remove_word_counts,
+    store_path,
+)
+
+PAGES = [
+    {"pikachu": 3, "electric": 1, "mouse": 1},
+    {"raichu": 2, "electric": 2, "pokémon": 1},
+    {"pikachu": 1, "thunder": 4},
+]
+"""list[dict[str, int]]: Word counts of a few pages, merged in order."""
+
+
+def json_rewrite_merge(path: Path, words: dict[str, int]) -> None:
+    """The whole-file JSON rewrite the store replaces."""
+    raw = path.read_text(encoding="utf-8").strip() if path.exists() else ""
+    data = json.loads(raw) if raw else {}
+    for word, count in words.items():
+        data[word] = data.get(word, 0) + count
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+class TestWordCountStore(unittest.TestCase):
+    """Tests for merging, exporting and migrating word counts."""
+
+    def setUp(self):
+        """Point the word count file to a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.json_path = self.root / "word-counts.json"
+        patcher = patch("wikiscraper.config.WORD_COUNTS_JSON", self.json_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def test_export_matches_json_rewrite(self):
+        """Test that the export is byte-identical to the old JSON file."""
+        reference = self.root / "reference.json"
+        json_rewrite_merge(reference, {"old": 7})
+        self.json_path.write_text(reference.read_text(encoding="utf-8"), encoding="utf-8")
+        for words in PAGES:
+            merge_word_counts(words)
+            json_rewrite_merge(reference, words)
+        export_word_counts()
+        self.assertEqual(self.json_path.read_text(encoding="utf-8"),
+                         reference.read_text(encoding="utf-8"))
+
+    def test_merge_does_not_rewrite_json(self):
+        """Test that merging only touches the store until the export."""
+        self.json_path.write_text("", encoding="utf-8")
+        merge_word_counts(PAGES[0])
+        self.assertEqual(self.json_path.read_text(encoding="utf-8"), "")
+        self.assertEqual(load_word_counts(), PAGES[0])
+        self.assertTrue(store_path(self.json_path).exists())
+
+    def test_migrates_existing_json(self):
+        """Test that a JSON file without a store is imported."""
+        self.json_path.write_text(json.dumps({"b": 2, "a": 1}), encoding="utf-8")
+        merge_word_counts({"a": 1, "c": 1})
+        self.assertEqual(list(load_word_counts().items()), [("b", 2), ("a", 2), ("c", 1)])
+
+    def test_external_json_change_wins(self):
+        """Test that a JSON file changed after the export rebuilds the store."""
+        merge_word_counts({"a": 1})
+        export_word_counts()
+        self.json_path.write_text(json.dumps({"z": 9, "a": 10}), encoding="utf-8")
+        stat = self.json_path.stat()
+        os.utime(self.json_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        self.assertEqual(load_word_counts(), {"z": 9, "a": 10})
+
+    def test_corrupt_json_keeps_counts(self):
+        """Test that an undecodable JSON file does not wipe the store."""
+        merge_word_counts({"a": 1})
+        export_word_counts()
+        self.json_path.write_text('{"a": 1, "b', encoding="utf-8")
+        merge_word_counts({"b": 1})
+        self.assertEqual(load_word_counts(), {"a": 1, "b": 1})
+        export_word_counts()
+        self.assertEqual(json.loads(self.json_path.read_text(encoding="utf-8")),
+                         {"a": 1, "b": 1})
+
+    def test_export_only_when_changed(self):
+        """Test that an unchanged store does not rewrite the JSON file."""
+        merge_word_counts({"a": 1})
+        export_word_counts()
+        self.assertFalse(get_store().dirty)
+        self.json_path.unlink()
+        export_word_counts()
+        self.assertFalse(self.json_path.exists())
+
+    def test_remove(self):
+        """Test that removing the store starts from the JSON file again."""
+        merge_word_counts({"a": 1})
+        remove_word_counts()
+        self.assertFalse(store_path(self.json_path).exists())
+        self.json_path.write_text("", encoding="utf-8")
+        self.assertEqual(load_word_counts(), {})
+
+
+WORKERS = 4
+"""int: Processes of the concurrency stress test."""
+
+WORKER_PAGES = 60
+"""int: Pages every worker counts."""
+
+
+def worker_pages(worker: int) -> list[tuple[str, dict[str, int]]]:
+    """Pages of one worker: shared words, the worker's own words and a tail."""
+    return [
+        (f"Worker{worker} page{p}",
+         {"shared": 1, f"worker{worker}": 2, f"tail{p % 7}": p % 3 + 1})
+        for p in range(WORKER_PAGES)
+    ]
+
+
+def count_in_process(json_path: str, worker: int, mode: str, barrier) -> None:
+    """Count the pages of `worker` like a separate CLI invocation."""
+    config.WORD_COUNTS_JSON = Path(json_path)
+    if mode == "pages":
+        for _, words in worker_pages(worker):
+            merge_word_counts(words)
+    elif mode == "crawl":
+        with checkpointed(f"crawl{worker}", every_pages=7, every_s=3600):
+            for title, words in worker_pages(worker):
+                merge_word_counts(words, page=title)
+    else:
+        # All resume the same interrupted run over the same pages.
+        with checkpointed("shared", every_pages=5, every_s=3600):
+            barrier.wait()
+            for title, words in worker_pages(0):
+                merge_word_counts(words, page=title)
+    export_word_counts()
+
+
+class TestConcurrentProcesses(unittest.TestCase):
+    """Stress test: several processes counting into one data directory."""
+
+    def setUp(self):
+        """Point the word count file to a temp dir."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.json_path = Path(self.tmp.name) / "word-counts.json"
+        self.json_path.write_text("", encoding="utf-8")
+        patcher = patch("wikiscraper.config.WORD_COUNTS_JSON", self.json_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(remove_word_counts)
+
+    def tearDown(self):
+        """Remove the temp dir."""
+        self.tmp.cleanup()
+
+    def run_workers(self, modes: list[str]) -> dict[str, int]:
+        """Run one process per mode and return the exported counts."""
+        get_store()  # Inherited by the forked workers, which must reopen it.
+        context = multiprocessing.get_context("fork")
+        barrier = context.Barrier(len(modes))
+        processes = [
+            context.Process(target=count_in_process,
+                            args=(str(self.json_path), w, mode, barrier))
+            for w, mode in enumerate(modes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(60)
+            self.assertEqual(process.exitcode, 0)
+        exported = json.loads(self.json_path.read_text(encoding="utf-8"))
+        self.assertEqual(exported, load_word_counts())
+        return exported
+
+    def test_exact_totals(self):
+        """Test that no process loses another one's updates."""
+        modes = ["pages", "crawl"] * (WORKERS // 2)
+        expected: Counter = Counter()
+        for worker in range(WORKERS):
+            for _, words in worker_pages(worker):
+                expected.update(words)
+        self.assertEqual(self.run_workers(modes), dict(expected))
+
+    def test_shared_run_counts_each_page_once(self):
+        """Test processes resuming the same interrupted run."""
+        buffer = CheckpointBuffer(get_store(), "shared", every_pages=3, every_s=3600)
+        for title, words in worker_pages(0)[:10]:
+            buffer.add(words, page=title)  # Killed: 9 pages checkpointed.
+        expected: Counter = Counter()
+        for _, words in worker_pages(0):
+            expected.update(words)
+        self.assertEqual(self.run_workers(["shared"] * WORKERS), dict(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,20 @@
 """Stub: wiki_scraper.py"""
-from wikiscraper import config
-from wikiscraper.controller import Controller
-from wikiscraper.parser import Parser
-import time
+import sys
+
+from wikiscraper.client import run_remote
+
+# A running `serve` daemon runs the command in its warm process.
+exit_code = run_remote(sys.argv[1:])
+if exit_code is not None:
+    sys.exit(exit_code)
+
+from wikiscraper.parser import Parser  # noqa: E402
 
 pr = Parser()
+args = pr.parse_args()
+
+# Imported after parsing, so --help and argument errors need no controller.
+from wikiscraper.controller import Controller  # noqa: E402
+
 cl = Controller()
-cl.run_func(pr.parse_args())
\ No newline at end of file
+cl.run_func(args)
@@ -1,8 +1,34 @@
+"""
+Package: wikiscraper
+
+The package's main classes are re-exported here and imported on first
+access (PEP 562), so `import wikiscraper` and the CLI parser load quickly and
+every command imports only the modules it uses.
+"""
+
+import importlib
+
 from . import config
-from .scraper import Scraper
-from .controller import Controller
-from .page import Page
-from .parser import Parser
 
-__all__ = ["config",  "Scraper", "Controller", "Page", "Parser"]
+_EXPORTS = {
+    "Scraper": ".scraper",
+    "Controller": ".controller",
+    "Page": ".page",
+    "Parser": ".parser",
+}
+
+__all__ = ["config", "Scraper", "Controller", "Page", "Parser"]
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    """Import a re-exported class on first access."""
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
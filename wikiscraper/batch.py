@@ -0,0 +1,270 @@
+"""
+Module: batch.py
+
+Provides the `batch` command: many CLI commands run in one process, planned
+so that commands on the same page share one download and one parse, and
+commands on different pages run concurrently.
+
+Commands are given as JSON lines, each an argument list
+(`["table", "Squirtle", "--number", "2"]`) or an object with one
+(`{"argv": [...]}`). The batch is planned in stages:
+
+- Page commands (`summary`, `count_words`, `table` without run options) are
+  grouped by page. The groups of a stage run concurrently, the commands of a
+  group in input order on one parsed page, kept in the controller's page
+  memory (see `Controller.page_memory`). With the "api" backend every page
+  is one `action=parse` request, the representation the commands read (the
+  API parses one title per request, so there is nothing to batch).
+- Every other command (analyses reading all counts, crawls, commands with
+  run options) is a stage of its own, run after all earlier commands and
+  before all later ones, as when the commands run one after another. Run
+  options apply to their own command only (as in separate CLI runs) and
+  are undone afterwards.
+
+Word counts of `count_words` add up in any order, so the stored counts are
+the same as after running the commands one by one. Results are reported in
+input order, each with the command's own output and exit code.
+
+Classes:
+    BatchResult: Outcome of one command of a batch.
+    BatchRunner: Plans and runs a batch on a Controller.
+
+Functions:
+    read_commands: Read the commands of a batch from JSON lines.
+
+Usage Example:
+    runner = BatchRunner(controller, concurrency=8)
+    for result in runner.run(read_commands(open("commands.jsonl"))):
+        print(result.argv, result.exit_code)
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
+from wikiscraper import config
+from wikiscraper.cache import cache_key
+from wikiscraper.parser import Parser
+from wikiscraper.runner import (
+    OutputCapture,
+    exit_code,
+    has_run_options,
+    restore_run_state,
+    run_command,
+    run_state,
+)
+
+PAGE_COMMANDS = ("summary", "count_words", "table")
+"""tuple[str, ...]: Commands that only read one page and can share it with others."""
+
+NOT_BATCHED = ("batch", "serve")
+"""tuple[str, ...]: Commands that cannot be part of a batch."""
+
+
+class BatchResult:
+    """
+    Outcome of one command of a batch.
+
+    Attributes:
+        index (int): Position of the command in the batch.
+        argv (list[str]): CLI arguments of the command.
+        exit_code (int): Exit code the command would have ended the CLI with.
+        stdout (str): Its standard output.
+        stderr (str): Its standard error.
+        seconds (float): Time it took, without waiting for other commands.
+    """
+
+    __slots__ = ("index", "argv", "exit_code", "stdout", "stderr", "seconds")
+
+    def __init__(self, index: int, argv: list[str], exit_code: int,
+                 stdout: str = "", stderr: str = "", seconds: float = 0.0):
+        self.index = index
+        self.argv = argv
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+        self.seconds = seconds
+
+    def to_json(self) -> str:
+        """Return the result as one JSON line."""
+        return json.dumps({name: getattr(self, name) for name in self.__slots__},
+                          ensure_ascii=False)
+
+
+def read_commands(lines: Iterable[str]) -> list[list[str]]:
+    """
+    Read the commands of a batch from JSON lines; blank lines are skipped.
+
+    Args:
+        lines (Iterable[str]): JSON lines, each an argument list or an object
+            with an "argv" argument list.
+
+    Returns:
+        list[list[str]]: The argument list of every command.
+
+    Raises:
+        ValueError: If a line is not valid JSON or holds no argument list.
+    """
+    commands = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            command = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Line {number}: {e}") from None
+        if isinstance(command, dict):
+            command = command.get("argv")
+        if not isinstance(command, list) or not command:
+            raise ValueError(f"Line {number}: expected a list of arguments "
+                             'or an object with "argv"')
+        commands.append([str(arg) for arg in command])
+    return commands
+
+
+class BatchRunner:
+    """
+    Plans and runs a batch of CLI commands on a Controller.
+
+    Attributes:
+        controller (Controller): The controller all commands run on.
+        concurrency (int): Maximum number of pages worked on at once.
+    """
+
+    def __init__(self, controller, concurrency: int = config.BATCH_CONCURRENCY):
+        """
+        Initialize the runner.
+
+        Args:
+            controller (Controller): The controller to run the commands on.
+            concurrency (int): Maximum number of pages worked on at once.
+
+        Raises:
+            ValueError: If `concurrency` is smaller than 1.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.controller = controller
+        self.concurrency = concurrency
+        self._parser = Parser()
+        self._output = OutputCapture()
+
+    def page_of(self, args) -> str | None:
+        """Return the cache key of the page a command only reads, or None."""
+        if args.command not in PAGE_COMMANDS:
+            return None
+        if has_run_options(self.controller, args):
+            return None
+        return cache_key(args.phrase)
+
+    def plan(self, parsed: list) -> list[list[list[int]]]:
+        """
+        Plan a batch in stages (see the module docstring).
+
+        Args:
+            parsed (list): Parsed arguments of every command (None for
+                commands that are not run).
+
+        Returns:
+            list[list[list[int]]]: Stages, each a list of groups of command
+                indices; the groups of a stage may run concurrently.
+        """
+        stages: list[list[list[int]]] = []
+        groups: dict[str, list[int]] = {}
+        for index, args in enumerate(parsed):
+            if args is None:
+                continue
+            page = self.page_of(args)
+            if page is not None:
+                if not groups:
+                    stages.append([])
+                if page not in groups:
+                    groups[page] = []
+                    stages[-1].append(groups[page])
+                groups[page].append(index)
+            else:
+                groups = {}
+                stages.append([[index]])
+        return stages
+
+    def run(
+        self,
+        commands: list[list[str]],
+        on_result: Callable[[BatchResult], None] | None = None,
+    ) -> list[BatchResult]:
+        """
+        Run a batch of commands.
+
+        Args:
+            commands (list[list[str]]): CLI arguments of every command.
+            on_result (Callable, optional): Called with every result in input
+                order, as soon as it and all earlier ones are done.
+
+        Returns:
+            list[BatchResult]: The result of every command, in input order.
+        """
+        results: list[BatchResult | None] = [None] * len(commands)
+        reported = 0
+
+        def report() -> None:
+            nonlocal reported
+            while reported < len(results) and results[reported] is not None:
+                if on_result is not None:
+                    on_result(results[reported])
+                reported += 1
+
+        # Pages in use by the groups of a stage stay parsed until they are done.
+        memory = self.controller.page_memory
+        self.controller.page_memory = max(memory, self.concurrency)
+        self._output.install()
+        try:
+            parsed = [self._parse(i, argv, results) for i, argv in enumerate(commands)]
+            report()
+            with ThreadPoolExecutor(self.concurrency) as pool:
+                for stage in self.plan(parsed):
+                    for group_results in pool.map(
+                        lambda group: [self._run_one(i, commands[i], parsed[i]) for i in group],
+                        stage,
+                    ):
+                        for result in group_results:
+                            results[result.index] = result
+                    report()
+        finally:
+            self._output.uninstall()
+            self.controller.page_memory = memory
+        return results
+
+    def _parse(self, index: int, argv: list[str], results: list):
+        """Parse a command; store a failed result and return None if it cannot run."""
+        code = 2
+        with self._output.capture() as (stdout, stderr):
+            try:
+                args = self._parser.parse_args(argv)
+            except SystemExit as e:  # --help or invalid arguments
+                code, args = exit_code(e), None
+            else:
+                if args.command is None:
+                    print("No command given", file=stderr)
+                    args = None
+                elif args.command in NOT_BATCHED:
+                    print(f"{args.command} cannot be run in a batch", file=stderr)
+                    args = None
+        if args is None:
+            results[index] = BatchResult(index, argv, code, stdout.getvalue(), stderr.getvalue())
+        return args
+
+    def _run_one(self, index: int, argv: list[str], args) -> BatchResult:
+        """Run one command with its output captured, undoing its run options."""
+        start = time.perf_counter()
+        # Commands with run options run alone (see `plan`), so nothing else
+        # sees their state before it is restored.
+        state = run_state(self.controller) if has_run_options(self.controller, args) else None
+        with self._output.capture() as (stdout, stderr):
+            try:
+                code = run_command(self.controller, args)
+            finally:
+                if state is not None:
+                    restore_run_state(self.controller, state)
+        return BatchResult(index, argv, code, stdout.getvalue(), stderr.getvalue(),
+                           time.perf_counter() - start)
@@ -0,0 +1,592 @@
+"""
+Module: cache.py
+
+Provides a disk-based LRU cache for downloaded wiki pages.
+
+Every page is stored as one file in `config.CACHE_DIR`, named after a
+canonical cache key that is shared by lookups and stores. The index (LRU
+order, size of every entry and its HTTP validators) lives in memory, so hit
+checks are a dictionary lookup and never list the directory. It is persisted
+as an append-only journal (`index.jsonl`) that is compacted once it grows
+well beyond the number of entries. Entries are evicted least-recently-used
+first when either the byte budget or the entry budget is exceeded. Cache hits
+only reorder the index in memory; their "use" records are appended in bulk
+with the next journal write, compaction or `PageCache.flush` (the shared
+caches of `get_cache` are flushed when the process exits).
+
+Several processes may share the cache directory. Appends and compactions
+hold the journal's file lock (`filelock.py`). A compaction first applies
+the records other processes appended since this process last read the
+journal, then writes the snapshot through a per-process temporary file and
+renames it; a process whose journal was replaced by another process's
+compaction reloads the index from the new journal before appending to it.
+
+Pages can optionally be stored compressed (see `compression.py`); the codec
+of every entry is recorded in the index, so pages written in any format,
+including the original uncompressed `.html` files, stay readable.
+
+Functions:
+    cache_key: Canonical cache key of a phrase.
+    get_cache: Shared PageCache instance for the current cache directory.
+
+Classes:
+    PageCache: LRU cache of page HTML with hit/miss/eviction counters.
+
+Usage Example:
+    cache = get_cache()
+    cache.put(cache_key("Team Rocket"), html_bytes, etag='"abc"')
+    html_bytes = cache.get(cache_key("Team Rocket"))
+    print(cache.stats())
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import unquote
+
+from wikiscraper import config
+from wikiscraper import compression
+from wikiscraper.filelock import file_lock, temp_path
+
+INDEX_FILENAME = "index.jsonl"
+"""str: Name of the cache index journal inside the cache directory."""
+
+DICTIONARIES_DIRNAME = "dictionaries"
+"""str: Subdirectory holding the trained "zdict" dictionaries."""
+
+MAX_KEY_BYTES = 200
+"""int: Keys longer than this (in UTF-8 bytes) are shortened with a hash."""
+
+
+def cache_key(phrase: str) -> str:
+    """
+    Return the canonical cache key of a phrase.
+
+    The anchor part (`Pikachu#Abilities`) is dropped because it does not
+    change the downloaded page, spaces become underscores as in wiki URLs,
+    and characters that are not allowed in file names are replaced.
+
+    Args:
+        phrase (str): Page name or phrase, possibly URL-quoted.
+
+    Returns:
+        str: Key usable as a file name stem.
+    """
+    page_name = phrase.split("#", 1)[0]
+    key = unquote(page_name).strip().replace(" ", "_").replace("/", "-")
+    key = re.sub(r'[\\/*?:"<>|#]', "_", key)
+    if len(key.encode("utf-8")) > MAX_KEY_BYTES:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        key = key[:64] + "_" + digest
+    return key
+
+
+class PageCache:
+    """
+    Byte- and entry-budgeted LRU cache of page HTML on disk.
+
+    The cache is safe to use from several threads of one process.
+
+    Attributes:
+        directory (Path): Directory holding cached files and the index.
+        max_bytes (int): Maximum total size of cached pages in bytes.
+        max_entries (int): Maximum number of cached pages.
+        compression (str): Codec of newly stored pages (see `compression.CODECS`).
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+        evictions (int): Number of entries evicted to respect the budgets.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str | None = None,
+        max_bytes: int = config.MAX_CACHE_BYTES,
+        max_entries: int = config.MAX_CACHE_SIZE,
+        compression: str | None = None,
+    ):
+        """
+        Initialize the cache and load (or rebuild) its index.
+
+        Args:
+            directory (Path | str, optional): Cache directory. Defaults to
+                `config.CACHE_DIR`.
+            max_bytes (int): Byte budget for cached pages.
+            max_entries (int): Entry budget for cached pages.
+            compression (str, optional): Codec of newly stored pages.
+                Defaults to `config.CACHE_COMPRESSION`.
+        """
+        self.directory = Path(directory if directory is not None else config.CACHE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.compression = compression or config.CACHE_COMPRESSION
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._used: dict[str, None] = {}
+        self._bytes = 0
+        self._raw_bytes = 0
+        self._dictionaries: dict[str, bytes] = {}
+        self._journal = None
+        self._journal_lines = 0
+        self._read_pos = 0
+        self._load_index()
+
+    # ---------------- index ----------------
+
+    @property
+    def index_path(self) -> Path:
+        """Path: Location of the index file."""
+        return self.directory / INDEX_FILENAME
+
+    def path_for(self, key: str, codec: str | None = None) -> Path:
+        """Return the file path that stores the entry `key` with `codec`."""
+        if codec is None:
+            codec = self._entries.get(key, {}).get("codec", "raw")
+        return self.directory / f"{key}{compression.SUFFIXES[codec]}"
+
+    def _load_index(self) -> None:
+        """Replay the index journal, rebuilding it from the directory if missing."""
+        if not self.index_path.exists():
+            self._rebuild_index()
+            return
+        with file_lock(self.index_path):
+            clean = self._sync_journal()
+            if not clean or self._journal_lines > 2 * len(self._entries) + 100:
+                # A torn last line after a crash: rewrite a clean snapshot.
+                self._write_snapshot()
+
+    def _sync_journal(self) -> bool:
+        """
+        Apply the journal records written since this cache last read the
+        journal, by other processes (and by this one). If another process
+        replaced the journal with a compacted one, the index is reloaded
+        from it and the hits not written yet are applied again. The caller
+        holds the journal's file lock.
+
+        Returns:
+            bool: False if a torn line (after a crash) ended the journal.
+        """
+        if self._journal is not None and os.fstat(self._journal.fileno()).st_nlink == 0:
+            self._journal.close()
+            self._journal = None
+            self._entries.clear()
+            self._bytes = 0
+            self._raw_bytes = 0
+        if self._journal is None:
+            try:
+                self._journal = open(self.index_path, "a+b")
+            except OSError:
+                return True
+            self._read_pos = 0
+            self._journal_lines = 0
+        self._journal.seek(self._read_pos)
+        *lines, rest = self._journal.read().split(b"\n")
+        clean = not rest
+        for line in lines:
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                clean = False
+                break
+            self._read_pos += len(line) + 1
+            self._journal_lines += 1
+        for key in self._used:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+        return clean
+
+    def _apply(self, record: dict) -> None:
+        """Apply one journal record to the in-memory index."""
+        key = record["key"]
+        op = record["op"]
+        if op == "put":
+            self._forget(key)
+            entry = {k: v for k, v in record.items() if k not in ("op", "key")}
+            self._remember(key, entry)
+        elif op == "use" and key in self._entries:
+            self._entries.move_to_end(key)
+            if "stored_at" in record:
+                self._entries[key]["stored_at"] = record["stored_at"]
+        elif op == "drop":
+            self._forget(key)
+
+    def _remember(self, key: str, entry: dict) -> None:
+        """Add an entry to the in-memory index as most recently used."""
+        self._entries[key] = entry
+        self._bytes += entry["size"]
+        self._raw_bytes += entry.get("raw_size", entry["size"])
+
+    def _forget(self, key: str) -> dict | None:
+        """Remove an entry from the in-memory index and return it."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry["size"]
+            self._raw_bytes -= entry.get("raw_size", entry["size"])
+        return entry
+
+    def _rebuild_index(self) -> None:
+        """
+        Scan the cache directory once and index every cached page.
+
+        Pages are ordered by modification time (oldest first). Validators
+        stored in `<key>.meta.json` side files are moved into the index.
+        """
+        found = []
+        for path in self.directory.iterdir():
+            for codec, suffix in compression.SUFFIXES.items():
+                if path.name.endswith(suffix):
+                    found.append((path.stat().st_mtime, path, codec, suffix))
+                    break
+
+        for mtime, path, codec, suffix in sorted(found):
+            key = path.name[:-len(suffix)]
+            entry = {"size": path.stat().st_size, "stored_at": mtime}
+            if codec != "raw":
+                entry["codec"] = codec
+            meta_path = path.with_name(f"{key}.meta.json")
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    entry.update(json.load(f))
+                meta_path.unlink()
+            except (OSError, ValueError):
+                pass
+            self._forget(key)
+            self._remember(key, entry)
+        self._enforce_budgets()
+        self._compact()
+
+    def _log(self, record: dict | None = None) -> None:
+        """
+        Append the "use" records of the hits not written yet and `record`
+        (if any) to the index journal, compacting it if needed.
+        """
+        with file_lock(self.index_path):
+            if self._journal is None or os.fstat(self._journal.fileno()).st_nlink == 0:
+                # Reloading the index from another process's journal can undo
+                # the change the record describes; apply it again.
+                self._sync_journal()
+                if record is not None:
+                    self._apply(record)
+                if self._journal is None:
+                    self._journal = open(self.index_path, "a+b")
+            records = [{"op": "use", "key": key} for key in self._used if key in self._entries]
+            self._used.clear()
+            if record is not None:
+                records.append(record)
+            self._journal.seek(0, os.SEEK_END)
+            self._journal.write(b"".join(
+                json.dumps(r, ensure_ascii=False).encode("utf-8") + b"\n" for r in records
+            ))
+            self._journal.flush()
+            self._journal_lines += len(records)
+            if self._journal_lines > 2 * len(self._entries) + 100:
+                self._sync_journal()
+                self._write_snapshot()
+
+    def _compact(self) -> None:
+        """Rewrite the journal as one `put` record per entry (see the module docstring)."""
+        with file_lock(self.index_path):
+            self._sync_journal()
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        """Atomically replace the journal with one `put` record per entry."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        tmp_path = temp_path(self.index_path)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for key, entry in self._entries.items():
+                record = {"op": "put", "key": key, **entry}
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(tmp_path, self.index_path)
+        self._used.clear()
+        self._journal = open(self.index_path, "a+b")
+        self._read_pos = self._journal.seek(0, os.SEEK_END)
+        self._journal_lines = len(self._entries)
+
+    def save(self) -> None:
+        """Compact the index journal into a snapshot of the current entries."""
+        with self._lock:
+            self._compact()
+
+    def flush(self) -> None:
+        """Append the "use" records of the hits not written to the journal yet."""
+        with self._lock:
+            if self._used:
+                self._log()
+
+    def reset(self) -> None:
+        """Forget all entries and counters (after the directory was emptied)."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+            self._entries.clear()
+            self._used.clear()
+            self._bytes = 0
+            self._raw_bytes = 0
+            self._journal_lines = 0
+            self.hits = self.misses = self.evictions = 0
+
+    # ---------------- lookups ----------------
+
+    def __contains__(self, key: str) -> bool:
+        """Return True if `key` is cached (O(1), does not touch the disk)."""
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Return the cached bytes of `key` and mark it most recently used
+        (in memory; see `flush`).
+
+        Returns:
+            bytes | None: Cached content, or None on a miss.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._used.pop(key, None)
+            self._used[key] = None
+            codec = self._entries[key].get("codec", "raw")
+
+        try:
+            data = self._read(key, codec)
+        except (OSError, ValueError, EOFError):
+            with self._lock:
+                self._drop(key)
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def validators(self, key: str) -> dict[str, str]:
+        """Return the stored ETag/Last-Modified of `key` (empty if unknown)."""
+        entry = self._entries.get(key, {})
+        return {k: entry[k] for k in ("etag", "last_modified") if entry.get(k)}
+
+    def is_fresh(self, key: str, max_age: float = config.CACHE_MAX_AGE_S) -> bool:
+        """Return True if `key` was stored or revalidated less than `max_age` ago."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        return time.time() - entry["stored_at"] < max_age
+
+    # ---------------- updates ----------------
+
+    def put(
+        self,
+        key: str,
+        data: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> bool:
+        """
+        Store `data` under `key`, evicting least recently used entries.
+
+        Args:
+            key (str): Cache key (see `cache_key`).
+            data (bytes): Page content.
+            etag (str, optional): ETag header of the response.
+            last_modified (str, optional): Last-Modified header of the response.
+
+        Returns:
+            bool: False if the page alone exceeds the byte budget and was not
+                stored, True otherwise.
+        """
+        codec = self.compression
+        dictionary = self._active_dictionary(data) if codec == "zdict" else None
+        blob = compression.compress(data, codec, dictionary)
+        if len(blob) > self.max_bytes:
+            return False
+
+        path = self.path_for(key, codec)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, path)
+
+        entry = {"size": len(blob), "stored_at": time.time()}
+        if codec != "raw":
+            entry["codec"] = codec
+            entry["raw_size"] = len(data)
+        if etag:
+            entry["etag"] = etag
+        if last_modified:
+            entry["last_modified"] = last_modified
+
+        with self._lock:
+            old = self._forget(key)
+            if old is not None and old.get("codec", "raw") != codec:
+                self._unlink(self.path_for(key, old.get("codec", "raw")))
+            self._remember(key, entry)
+            self._log({"op": "put", "key": key, **entry})
+            self._enforce_budgets()
+        return True
+
+    def touch(self, key: str) -> None:
+        """Mark `key` as fresh and most recently used (e.g. after a 304)."""
+        with self._lock:
+            if key in self._entries:
+                stored_at = time.time()
+                self._entries[key]["stored_at"] = stored_at
+                self._entries.move_to_end(key)
+                self._log({"op": "use", "key": key, "stored_at": stored_at})
+
+    def _drop(self, key: str) -> None:
+        """Remove `key` from the index and delete its file."""
+        entry = self._forget(key)
+        if entry is None:
+            return
+        self._log({"op": "drop", "key": key})
+        self._unlink(self.path_for(key, entry.get("codec", "raw")))
+
+    @staticmethod
+    def _unlink(path: Path) -> None:
+        """Delete a file, ignoring files that are already gone."""
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    # ---------------- compression dictionaries ----------------
+
+    @property
+    def dictionaries_dir(self) -> Path:
+        """Path: Directory holding trained "zdict" dictionaries."""
+        return self.directory / DICTIONARIES_DIRNAME
+
+    def _load_dictionary(self, dict_id: str) -> bytes:
+        """Return the dictionary `dict_id`, reading it from disk once."""
+        dictionary = self._dictionaries.get(dict_id)
+        if dictionary is None:
+            path = self.dictionaries_dir / f"{dict_id}.zdict"
+            dictionary = self._dictionaries[dict_id] = path.read_bytes()
+        return dictionary
+
+    def _active_dictionary(self, data: bytes) -> bytes:
+        """
+        Return the dictionary used for new "zdict" entries.
+
+        The first time it is needed, it is trained on recently cached pages
+        plus `data`, the page being stored.
+        """
+        with self._lock:
+            try:
+                dict_id = (self.dictionaries_dir / "active").read_text().strip()
+                return self._load_dictionary(dict_id)
+            except OSError:
+                pass
+            recent = list(reversed(self._entries))[:config.CACHE_DICT_SAMPLES - 1]
+        samples = [data] + [page for page in map(self.peek, recent) if page]
+        return self.train_dictionary(samples)
+
+    def train_dictionary(self, samples: list[bytes] | None = None) -> bytes:
+        """
+        Train a new "zdict" dictionary and make it the active one.
+
+        Pages stored earlier keep referring to the dictionary they were
+        written with, so they remain readable.
+
+        Args:
+            samples (list[bytes], optional): Sample pages. Defaults to the
+                most recently used cached pages.
+
+        Returns:
+            bytes: The new dictionary.
+        """
+        if samples is None:
+            recent = list(reversed(self._entries))[:config.CACHE_DICT_SAMPLES]
+            samples = [page for page in map(self.peek, recent) if page]
+        dictionary = compression.train_dictionary(samples)
+        dict_id = compression.dictionary_id(dictionary)
+        with self._lock:
+            self.dictionaries_dir.mkdir(exist_ok=True)
+            (self.dictionaries_dir / f"{dict_id}.zdict").write_bytes(dictionary)
+            (self.dictionaries_dir / "active").write_text(dict_id)
+            self._dictionaries[dict_id] = dictionary
+        return dictionary
+
+    def peek(self, key: str) -> bytes | None:
+        """Return the content of `key` without counting a hit or using it."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        try:
+            return self._read(key, entry.get("codec", "raw"))
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def _read(self, key: str, codec: str) -> bytes:
+        """Read and decode the file of `key` stored with `codec`."""
+        blob = self.path_for(key, codec).read_bytes()
+        return compression.decompress(blob, codec, self._load_dictionary)
+
+    def _enforce_budgets(self) -> None:
+        """Evict least recently used entries until both budgets are met."""
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return hit/miss/eviction counters and the current cache usage.
+
+        `bytes` is the size on disk, `raw_bytes` the uncompressed size.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "raw_bytes": self._raw_bytes,
+        }
+
+
+_caches: dict[Path, PageCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache() -> PageCache:
+    """
+    Return the shared PageCache for the current `config.CACHE_DIR`.
+
+    Scrapers and controllers share one instance per directory, so the index is
+    loaded once per process.
+    """
+    directory = Path(config.CACHE_DIR)
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = PageCache(directory)
+        return cache
+
+
+@atexit.register
+def _flush_caches() -> None:
+    """Write the pending hits of the shared caches when the process exits."""
+    for cache in list(_caches.values()):
+        try:
+            cache.flush()
+        except OSError:
+            pass  # the cache directory was removed
@@ -0,0 +1,64 @@
+"""
+Module: client.py
+
+Provides the thin client of the `serve` daemon (`server.py`).
+
+`wiki_scraper.py` hands every command to `run_remote` first. When a daemon
+listens on `config.SERVE_SOCKET` and runs the command, its output is written
+here and the command never starts locally; otherwise (no daemon, a socket
+left behind by one that is gone, or a command the daemon does not run)
+`run_remote` returns None and the command runs in this process as before.
+The client only imports the standard library and `config`.
+
+Functions:
+    run_remote: Run a command on the daemon, if one is serving.
+
+Usage Example:
+    exit_code = run_remote(["summary", "Team Rocket"])
+    if exit_code is None:
+        ...  # run locally
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+from wikiscraper import config
+
+
+def run_remote(argv: list[str], path: Path | None = None) -> int | None:
+    """
+    Run a command on the `serve` daemon and write its output.
+
+    Args:
+        argv (list[str]): CLI arguments, as given to `wiki_scraper.py`.
+        path (Path, optional): Socket of the daemon
+            (`config.SERVE_SOCKET` by default).
+
+    Returns:
+        int | None: The exit code of the command, or None if no daemon ran it.
+    """
+    path = Path(path) if path is not None else config.SERVE_SOCKET
+    if not path.exists():
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            return None
+        request = {"argv": argv, "cwd": os.getcwd()}
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with connection.makefile("rb") as reader:
+            line = reader.readline()
+    if not line:
+        # The command may have run partially, so it is not run again.
+        print(f"The daemon on {path} closed the connection", file=sys.stderr)
+        return 1
+    response = json.loads(line)
+    if response.get("unsupported"):
+        return None
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["exit_code"]
@@ -0,0 +1,155 @@
+"""
+Module: compression.py
+
+Provides the on-disk formats ("codecs") of cached wiki pages.
+
+Codecs:
+    raw:   Uncompressed HTML (`<key>.html`), the original cache format.
+    gzip:  Standard gzip file (`<key>.html.gz`).
+    zdict: Raw deflate stream primed with a shared dictionary trained on wiki
+           markup (`<key>.html.zd`). Wiki pages share most of their skin,
+           scripts and table markup, so a dictionary made of those fragments
+           lets even small pages compress well. Every file starts with a
+           header naming the dictionary it needs, so it stays readable after
+           the dictionary is retrained.
+
+Functions:
+    train_dictionary: Build a preset dictionary from sample pages.
+    compress: Encode page bytes with a codec.
+    decompress: Decode page bytes stored with a codec.
+
+Usage Example:
+    dictionary = train_dictionary([html_1, html_2])
+    blob = compress(html, "zdict", dictionary)
+    html = decompress(blob, "zdict", lambda dict_id: dictionary)
+"""
+
+import gzip
+import hashlib
+import zlib
+from collections import Counter
+from typing import Callable
+
+CODECS = ("raw", "gzip", "zdict")
+"""tuple[str]: Supported cache codecs."""
+
+SUFFIXES = {"raw": ".html", "gzip": ".html.gz", "zdict": ".html.zd"}
+"""dict[str, str]: File name suffix of every codec."""
+
+ZDICT_MAGIC = b"WSZD"
+"""bytes: Magic prefix of files written with the `zdict` codec."""
+
+DICT_ID_LENGTH = 16
+"""int: Length of a dictionary identifier (hex characters)."""
+
+MAX_DICT_SIZE = 32 * 1024
+"""int: Largest useful deflate dictionary (the deflate window size)."""
+
+
+def dictionary_id(dictionary: bytes) -> str:
+    """Return the identifier of a dictionary (a short content hash)."""
+    return hashlib.sha1(dictionary).hexdigest()[:DICT_ID_LENGTH]
+
+
+def train_dictionary(samples: list[bytes], size: int = MAX_DICT_SIZE) -> bytes:
+    """
+    Build a deflate preset dictionary from sample pages.
+
+    Lines that occur in several sample pages (skin, scripts, navigation and
+    footer markup) are kept, preferring lines shared by the most pages and
+    keeping their original order so that long runs of boilerplate match.
+    Any remaining space is filled with the beginning and end of the first
+    sample, where wiki pages carry their page chrome.
+
+    Args:
+        samples (list[bytes]): Sample page contents.
+        size (int): Maximum dictionary size in bytes.
+
+    Returns:
+        bytes: The dictionary (empty if there are no samples).
+    """
+    size = min(size, MAX_DICT_SIZE)
+    if not samples:
+        return b""
+
+    documents: Counter[bytes] = Counter()
+    position: dict[bytes, int] = {}
+    for sample in samples:
+        lines = set(sample.split(b"\n"))
+        documents.update(line for line in lines if len(line) >= 16)
+    for pos, line in enumerate(samples[0].split(b"\n")):
+        position.setdefault(line, pos)
+
+    shared = [line for line, df in documents.items() if df >= 2]
+    shared.sort(key=lambda line: documents[line] * len(line), reverse=True)
+    chosen, used = [], 0
+    for line in shared:
+        if used + len(line) + 1 > size:
+            continue
+        chosen.append(line)
+        used += len(line) + 1
+    chosen.sort(key=lambda line: position.get(line, len(position)))
+    dictionary = b"\n".join(chosen)
+
+    remaining = size - len(dictionary)
+    if remaining > 0:
+        first = samples[0]
+        half = remaining // 2
+        dictionary = first[:remaining - half] + dictionary + first[len(first) - half:]
+    return dictionary[-size:]
+
+
+def compress(data: bytes, codec: str, dictionary: bytes | None = None) -> bytes:
+    """
+    Encode page bytes with `codec`.
+
+    Args:
+        data (bytes): Page content.
+        codec (str): One of `CODECS`.
+        dictionary (bytes, optional): Preset dictionary (required for "zdict").
+
+    Returns:
+        bytes: Encoded content as written to disk.
+    """
+    if codec == "raw":
+        return data
+    if codec == "gzip":
+        return gzip.compress(data, mtime=0)
+    if codec == "zdict":
+        if not dictionary:
+            raise ValueError("The zdict codec requires a trained dictionary.")
+        c = zlib.compressobj(level=9, wbits=-15, zdict=dictionary)
+        header = ZDICT_MAGIC + dictionary_id(dictionary).encode("ascii")
+        return header + c.compress(data) + c.flush()
+    raise ValueError(f"Unknown cache codec {codec!r}, expected one of {CODECS}.")
+
+
+def decompress(
+    blob: bytes,
+    codec: str,
+    load_dictionary: Callable[[str], bytes] | None = None,
+) -> bytes:
+    """
+    Decode page bytes stored with `codec`.
+
+    Args:
+        blob (bytes): Content as read from disk.
+        codec (str): One of `CODECS`.
+        load_dictionary (Callable[[str], bytes], optional): Returns the
+            dictionary for an identifier (required for "zdict").
+
+    Returns:
+        bytes: Original page content.
+    """
+    if codec == "raw":
+        return blob
+    if codec == "gzip":
+        return gzip.decompress(blob)
+    if codec == "zdict":
+        header_length = len(ZDICT_MAGIC) + DICT_ID_LENGTH
+        if not blob.startswith(ZDICT_MAGIC) or load_dictionary is None:
+            raise ValueError("Not a zdict cache file.")
+        dict_id = blob[len(ZDICT_MAGIC):header_length].decode("ascii")
+        d = zlib.decompressobj(wbits=-15, zdict=load_dictionary(dict_id))
+        return d.decompress(blob[header_length:]) + d.flush()
+    raise ValueError(f"Unknown cache codec {codec!r}, expected one of {CODECS}.")
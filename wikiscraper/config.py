@@ -19,6 +19,69 @@ WIKI_BASE_URL = "https://bulbapedia.bulbagarden.net/wiki/"
 WIKI_ARTICLE_HREF_PREFIX = "/wiki/"
 """str: Prefix used to identify internal Bulbapedia article links."""
 
+WIKI_API_PATH = "/w/api.php"
+"""str: Path of the MediaWiki API endpoint, relative to the wiki host."""
+
+FETCH_BACKEND = "html"
+"""str: Default page source: "html" (rendered pages) or "api" (MediaWiki API)."""
+
+API_BATCH_SIZE = 50
+"""int: Maximum number of titles fetched with one MediaWiki API request."""
+
+PARSE_ENGINE = "soup"
+"""str: Page extraction engine: "soup" (BeautifulSoup tree) or "stream" (single pass)."""
+
+TOKEN_NORMALIZERS: tuple[str, ...] = ()
+"""tuple[str, ...]: Word normalizers ("casefold", "apostrophes", "digits"); none by default."""
+
+RECORD_CORPUS = False
+"""bool: Also record per-page word counts in the corpus store (`corpus.py`)."""
+
+REFERENCE_LANGUAGES: tuple[str, ...] = ("en",)
+"""tuple[str, ...]: Languages whose word frequencies articles are compared with."""
+
+REFERENCE_WORDLIST = "small"
+"""str: wordfreq wordlist of the reference frequencies ("small", "large" or "best")."""
+
+SCORING_LANGUAGES: tuple[str, ...] = ("en", "es", "da")
+"""tuple[str, ...]: Languages pages are scored against by `score_pages`."""
+
+SCORING_K_VALUES: tuple[int, ...] = (3, 10, 100, 1000)
+"""tuple[int, ...]: Numbers of most frequent reference words the scores use."""
+
+SCORING_WORDLIST = "best"
+"""str: wordfreq wordlist of the language confidence scores."""
+
+SAMPLE_WALKERS = 8
+"""int: Random walks `sample_pages` runs at once."""
+
+SAMPLE_STEPS = 50
+"""int: Pages every random walk of `sample_pages` scores."""
+
+BATCH_CONCURRENCY = 8
+"""int: Pages the `batch` command works on at once."""
+
+SERVE_PAGE_MEMORY = 128
+"""int: Parsed pages the `serve` daemon keeps in memory (0 disables)."""
+
+SKETCH_EPSILON = 1e-5
+"""float: Error bound of approximate counts, as a fraction of all counted words."""
+
+SKETCH_DELTA = 0.01
+"""float: Probability that an approximate count exceeds the error bound."""
+
+SKETCH_TOP_K = 1000
+"""int: Most frequent words tracked by approximate counting."""
+
+STORE_TIMEOUT_S = 60.0
+"""float: Seconds a process waits for another one's write to the word count store."""
+
+CHECKPOINT_EVERY_PAGES = 100
+"""int: Pages a crawl counts in memory before writing a checkpoint to the word count store."""
+
+CHECKPOINT_EVERY_S = 30.0
+"""float: Maximum seconds between two checkpoints of a crawl."""
+
 
 # --- Project paths ---
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -30,23 +93,83 @@ DATA_DIR = REPO_ROOT / "data"
 CACHE_DIR = DATA_DIR / "cache"
 """Path: Directory for cached data to speed up repeated operations."""
 
+REFERENCE_CACHE_DIR = CACHE_DIR / "wordfreq"
+"""Path: Directory for cached reference frequency tables (`reference.py`)."""
+
 WORD_COUNTS_JSON = DATA_DIR / "word-counts.json"
 """Path: JSON file storing computed word counts."""
 
+CORPUS_NPZ = DATA_DIR / "corpus.npz"
+"""Path: File storing the per-page term-document matrix (`corpus.py`)."""
+
+SKETCH_NPZ = DATA_DIR / "word-counts.sketch.npz"
+"""Path: File storing approximate word counts (`sketch.py`)."""
+
+SERVE_SOCKET = DATA_DIR / "wikiscraper.sock"
+"""Path: Unix socket of the `serve` daemon, also where `wiki_scraper.py` looks for it."""
+
 TESTS_DIR = REPO_ROOT / "tests"
 """Path: Directory containing project tests."""
 
 TESTS_DATA_DIR = TESTS_DIR / "test_data"
 """Path: Directory containing test-specific data files."""
 
-MAX_CACHE_SIZE = 10
-"""int: Maximum number of items to keep in cache."""
+MAX_CACHE_SIZE = 2000
+"""int: Maximum number of pages to keep in cache (entry budget)."""
+
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+"""int: Maximum total size of cached pages in bytes (byte budget)."""
+
+CACHE_COMPRESSION = "raw"
+"""str: On-disk format of newly cached pages: "raw", "gzip" or "zdict"."""
+
+CACHE_DICT_SAMPLES = 16
+"""int: Number of cached pages used to train the "zdict" dictionary."""
 
 
 # --- HTTP settings ---
 DEFAULT_TIMEOUT_S = 15
 """int: Default timeout (in seconds) for HTTP requests."""
 
+HTTP_POOL_SIZE = 16
+"""int: Number of keep-alive connections kept open per host by the session."""
+
+USER_AGENT = "WikiScraper/0.1.0 (+https://github.com/1miqi1/WikiScraper)"
+"""str: User-Agent header sent with every request of the shared session."""
+
+CACHE_MAX_AGE_S = 24 * 60 * 60
+"""int: Age (in seconds) after which a cached page is revalidated with the wiki."""
+
+THROTTLE_INITIAL_RATE = 10.0
+"""float: Starting rate (requests per second) of requests that overlap others."""
+
+THROTTLE_MIN_RATE = 0.2
+"""float: Lowest request rate the throttle backs off to."""
+
+THROTTLE_MAX_RATE = 100.0
+"""float: Highest rate overlapping requests ramp up to."""
+
+THROTTLE_INCREASE = 1.0
+"""float: Rate increase (requests per second) per second of healthy responses."""
+
+THROTTLE_DECREASE = 0.5
+"""float: Factor applied to the request rate on a 429, 5xx or timeout."""
+
+THROTTLE_SLOW_START = 1.1
+"""float: Factor applied to the rate per healthy response until the first backoff."""
+
+FETCH_MAX_RETRIES = 5
+"""int: Retries of a failed request before the page is given up."""
+
+FETCH_BACKOFF_BASE_S = 1.0
+"""float: Delay before the first retry (doubled for every further retry)."""
+
+FETCH_BACKOFF_MAX_S = 60.0
+"""float: Largest delay between two retries of a request."""
+
+FETCH_RETRY_AFTER_MAX_S = 600.0
+"""float: Longest `Retry-After` delay that is honored."""
+
 BAD_PREFIXES = (
     "/wiki/Special:",
     "/wiki/Help:",
@@ -68,6 +191,17 @@ BAD_EXTENSIONS = (
 )
 """tuple[str]: File extensions to ignore when processing links."""
 
+BAD_TABLE_CLASSES = (
+    "navbox",
+    "vertical-navbox",
+    "infobox",
+    "metadata",
+    "toc",
+    "sisterproject",
+    "mbox",
+)
+"""tuple[str]: Classes of layout tables that are not treated as data tables."""
+
 BAD_LINKS = (
     "/wiki/Main_Page",
     "/wiki/Bulbapedia:Editor's_Hub",
@@ -7,28 +7,59 @@ Responsibilities:
     - Fetching pages via Scraper
     - Running CLI commands
     - Clearing cache, data, and JSON files
-    - Counting words recursively across linked pages
+    - Counting words recursively across linked pages, in resumable crawls
+      with budgets (`frontier.py`)
     - Extracting summaries and tables
     - Analyzing and visualizing relative word frequencies
+    - Querying the per-page corpus store
+    - Scoring pages against languages
+    - Sampling pages by concurrent random walks
+    - Running batches of commands that share page fetches (`batch`)
+    - Serving commands from a warm process (`serve`)
+
+Heavy dependencies (numpy, pandas, matplotlib, wordfreq) and the modules
+built on them are imported by the commands that use them, so short commands
+such as `summary` and `count_words` start without loading them.
 """
 
+from __future__ import annotations
+
 import os
 import time
 import shutil
 import random
+import sys
 import json
+import threading
+from collections import OrderedDict
 from queue import Queue
 from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import urljoin
 
-import wordfreq
-import matplotlib.pyplot as plt
-import numpy as np
-import pandas as pd
-
+from wikiscraper.cache import cache_key, get_cache
 from wikiscraper.scraper import Scraper
 from wikiscraper.page import Page
+from wikiscraper.mediawiki_api import ApiBackend
+from wikiscraper.session import make_session
+from wikiscraper.throttle import AdaptiveThrottle, FetchError
+from wikiscraper.tokenizer import Tokenizer
+from wikiscraper.word_counts import (
+    checkpointed,
+    export_word_counts,
+    load_word_counts,
+    remove_word_counts,
+    set_sketch,
+)
 from wikiscraper import config
 
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+    from wikiscraper.batch import BatchResult
+    from wikiscraper.sampler import SampleResult
+
 
 class Controller:
     """
@@ -36,17 +67,40 @@ class Controller:
     and relative word frequency analysis.
     """
 
+    RUN_OPTIONS = (
+        "cache_compression", "backend", "engine", "normalize", "corpus",
+        "approximate", "sketch_mb",
+    )
+    """tuple[str]: CLI options that configure the run instead of the command."""
+
     def __init__(
         self,
         clear_cache: bool = False,
         clear_json: bool = False,
         clear_data: bool = False,
+        wiki_base_url: str = config.BULBAPEDIA_MAIN_PAGE,
     ):
         """
         Initialize the Controller, ensuring necessary directories and files exist.
 
         Optionally clears cached HTML, JSON word counts, and output data.
+        `wiki_base_url` selects the wiki that pages are fetched from. All
+        downloads share one pooled keep-alive HTTP session. Pages come from
+        rendered HTML or the MediaWiki API depending on `backend`
+        (see `configure`), paced by one shared `AdaptiveThrottle`.
+
+        With `page_memory` set (as by `serve`), that many parsed pages are
+        kept in memory, so repeated commands on a page skip reading and
+        parsing it again.
         """
+        self.wiki_base_url = wiki_base_url
+        self.sketch = None
+        self.session = make_session()
+        self.throttle = AdaptiveThrottle()
+        self._pages: OrderedDict[tuple, Page] = OrderedDict()
+        self._pages_lock = threading.Lock()
+        self.page_memory = 0
+
         if not os.path.exists(config.DATA_DIR):
             os.makedirs(config.DATA_DIR)
         
@@ -57,6 +111,15 @@ class Controller:
             with open(config.WORD_COUNTS_JSON, "wb") as file:
                 file.write(b"")
 
+        self.cache = get_cache()
+        self.backend = config.FETCH_BACKEND
+        self.api = ApiBackend(
+            api_url=urljoin(wiki_base_url, config.WIKI_API_PATH),
+            session=self.session,
+            cache=self.cache,
+            throttle=self.throttle,
+        )
+
         if clear_data:
             self.clear_data()
         if clear_cache:
@@ -73,18 +136,118 @@ class Controller:
 
         Returns:
             Any: Return value of the called function.
+
+        Raises:
+            SystemExit: If a page needed by the command cannot be downloaded.
         """
         func_name = args.command
         arg_dict = vars(args).copy()
         arg_dict.pop("command")
+        self.configure(**{
+            name: arg_dict.pop(name) for name in self.RUN_OPTIONS if name in arg_dict
+        })
 
         func = getattr(self, func_name)
-        return func(**arg_dict)
+        try:
+            return func(**arg_dict)
+        except FetchError as e:
+            print(e)
+            sys.exit(1)
+        finally:
+            export_word_counts()
+            # The corpus and the sketch can only have changed if loaded.
+            if "wikiscraper.corpus" in sys.modules:
+                sys.modules["wikiscraper.corpus"].save_corpus()
+            if "wikiscraper.sketch" in sys.modules:
+                sys.modules["wikiscraper.sketch"].save_sketch()
+
+    def configure(
+        self,
+        cache_compression: str | None = None,
+        backend: str | None = None,
+        engine: str | None = None,
+        normalize: list[str] | None = None,
+        corpus: bool | None = None,
+        approximate: bool | None = None,
+        sketch_mb: float | None = None,
+    ) -> None:
+        """
+        Apply run options given before the CLI subcommand.
+
+        Args:
+            cache_compression (str, optional): Codec for newly cached pages
+                ("raw", "gzip" or "zdict"); None keeps the configured default.
+            backend (str, optional): Page source, "html" for rendered pages or
+                "api" for the MediaWiki API; None keeps the current one.
+            engine (str, optional): Page extraction engine, "soup" or
+                "stream" (see `Page.engine`); None keeps the current one.
+            normalize (list[str], optional): Word normalizers of the page
+                tokenizer (see `tokenizer.NORMALIZERS`); None keeps the
+                current ones.
+            corpus (bool, optional): Whether counted pages are also recorded
+                in the corpus store (see `Page.corpus`); None keeps the
+                current setting.
+            approximate (bool, optional): Count words in the bounded-memory
+                sketch (`sketch.py`) instead of exactly; None keeps the
+                current setting.
+            sketch_mb (float, optional): Memory budget of a new sketch in MB;
+                None derives its size from `config.SKETCH_EPSILON`.
+        """
+        if cache_compression is not None:
+            self.cache.compression = cache_compression
+        if backend is not None:
+            self.backend = backend
+        if engine is not None:
+            Page.engine = engine
+        if normalize is not None:
+            Page.tokenizer = Tokenizer(normalize)
+        if corpus is not None:
+            Page.corpus = corpus
+        if approximate is not None:
+            if approximate:
+                from wikiscraper.sketch import get_sketch
+
+                self.sketch = get_sketch(sketch_mb)
+            else:
+                self.sketch = None
+            set_sketch(self.sketch)
+
+    @property
+    def page_memory(self) -> int:
+        """int: Number of parsed pages kept in memory (0 keeps none)."""
+        return self._page_memory
+
+    @page_memory.setter
+    def page_memory(self, size: int) -> None:
+        with self._pages_lock:
+            self._page_memory = size
+            while len(self._pages) > size:
+                self._pages.popitem(last=False)
+
+    @property
+    def batch_size(self) -> int:
+        """int: Number of pages the current backend fetches per request."""
+        return self.api.batch_size if self.backend == "api" else 1
+
+    def needs_download(self, phrases: list[str]) -> bool:
+        """Check if fetching `phrases` requires at least one network request."""
+        if self.backend == "api":
+            return self.api.needs_download(phrases)
+        return not all(
+            self.is_html_in_cache(phrase=p) and self.is_cache_fresh(p)
+            for p in phrases
+        )
 
     def is_html_in_cache(self, phrase: str) -> bool:
         """Check if a cached HTML file exists for a given phrase."""
-        path = config.CACHE_DIR / phrase
-        return os.path.exists(path)
+        return cache_key(phrase) in self.cache
+
+    def is_cache_fresh(self, phrase: str) -> bool:
+        """
+        Check if the cached HTML for a phrase is younger than
+        `config.CACHE_MAX_AGE_S`; stale pages are revalidated with the wiki.
+        """
+        return self.cache.is_fresh(cache_key(phrase), config.CACHE_MAX_AGE_S)
 
     def clear_data(self) -> None:
         """Delete all files in the data directory."""
@@ -109,21 +272,86 @@ class Controller:
                     shutil.rmtree(file_path)
             except Exception as e:
                 print(f"Failed to delete {file_path}. Reason: {e}")
+        self.cache.reset()
 
     def clear_json(self) -> None:
-        """Clear the word count JSON file."""
+        """Clear the word count JSON file, its store and the corpus store."""
+        from wikiscraper.corpus import remove_corpus
+        from wikiscraper.sketch import remove_sketch
+
+        remove_word_counts()
+        remove_corpus()
+        remove_sketch()
         path = config.WORD_COUNTS_JSON
         with open(path, "wb") as file:
             file.write(b"")
 
     def _get_page(self, phrase: str, wait: int = 0) -> Page:
-        """Fetch a Page object for a phrase, using cache if available."""
-        if self.is_html_in_cache(phrase=phrase):
-            sc = Scraper(phrase=phrase, use_local_html_file_instead=True)
-            return sc.scrape()
+        """
+        Fetch a Page object for a phrase, using cache if available.
+
+        Fresh cached pages are read from disk; stale ones are revalidated with
+        a conditional GET through the shared session.
+        """
+        if self.backend == "api":
+            if self.api.needs_download([phrase], batched=False):
+                time.sleep(wait)
+            else:
+                page = self._remembered_page(phrase)
+                if page is not None:
+                    return page
+            return self._remember_page(self.api.fetch(phrase))
+
+        if self.is_html_in_cache(phrase=phrase) and self.is_cache_fresh(phrase):
+            page = self._remembered_page(phrase)
+            if page is not None:
+                return page
+            sc = Scraper(phrase=phrase, wiki_base_url=self.wiki_base_url,
+                         use_local_html_file_instead=True, cache=self.cache)
+            return self._remember_page(sc.scrape())
         time.sleep(wait)
-        sc = Scraper(phrase=phrase, use_local_html_file_instead=False)
-        return sc.scrape()
+        sc = Scraper(phrase=phrase, wiki_base_url=self.wiki_base_url,
+                     use_local_html_file_instead=False, session=self.session,
+                     cache=self.cache, throttle=self.throttle)
+        return self._remember_page(sc.scrape())
+
+    def _page_key(self, phrase: str) -> tuple:
+        """Key of a page in the page memory (memoized words depend on the engine and tokenizer)."""
+        return (cache_key(phrase), self.backend, Page.engine, Page.tokenizer)
+
+    def _remembered_page(self, phrase: str) -> Page | None:
+        """Return the page of `phrase` from the page memory, or None."""
+        if not self.page_memory:
+            return None
+        key = self._page_key(phrase)
+        with self._pages_lock:
+            page = self._pages.get(key)
+            if page is not None:
+                self._pages.move_to_end(key)
+            return page
+
+    def _remember_page(self, page: Page) -> Page:
+        """Keep `page` in the page memory (if enabled), evicting the least recently used."""
+        if not self.page_memory:
+            return page
+        page.shared = True
+        with self._pages_lock:
+            self._pages[self._page_key(page.phrase)] = page
+            self._pages.move_to_end(self._page_key(page.phrase))
+            while len(self._pages) > self._page_memory:
+                self._pages.popitem(last=False)
+        return page
+
+    def _get_pages(self, phrases: list[str]) -> list[Page]:
+        """
+        Fetch several pages, batching requests when the backend supports it.
+
+        Pages that do not exist on the wiki are left out.
+        """
+        if self.backend == "api":
+            pages = self.api.fetch_many(phrases)
+            return [pages[p] for p in phrases if p in pages]
+        return [self._get_page(phrase=p) for p in phrases]
 
     def summary(self, phrase: str):
         """Print the summary of a wiki page."""
@@ -138,14 +366,28 @@ class Controller:
     def table(
         self,
         phrase: str,
-        number: int,
+        number: int | None = None,
         output_dir: str = config.DATA_DIR,
         first_row_is_header: bool = False,
+        all_tables: bool = False,
+        list_tables: bool = False,
     ):
-        """Extract, display, and save the n-th table from a wiki page."""
+        """
+        Extract, display, and save the n-th table from a wiki page; with
+        `list_tables`, print the page's table catalog instead; with
+        `all_tables`, extract every real table at once.
+        """
         page = self._get_page(phrase=phrase)
-        page.table(n=number, output_dir=output_dir,
-                   first_row_is_header=first_row_is_header)
+        if list_tables:
+            for info in page.table_catalog():
+                rows, columns = info.shape
+                print(f"{info.index}\t{rows}x{columns}\t{info.caption}")
+        elif all_tables:
+            page.tables(output_dir=output_dir,
+                        first_row_is_header=first_row_is_header)
+        else:
+            page.table(n=number, output_dir=output_dir,
+                       first_row_is_header=first_row_is_header)
 
     def next_page(self, page: Page, wait: int) -> Page:
         """Navigate to a randomly selected link from the current page."""
@@ -153,11 +395,108 @@ class Controller:
         winner = random.choice(links)
         return self._get_page(phrase=winner, wait=wait)
 
-    def auto_count_words(self, phrase: str, depth: int, wait: int):
-        """Recursively count words on a page and linked pages up to depth."""
+    def auto_count_words(
+        self,
+        phrase: str,
+        depth: int,
+        wait: float,
+        concurrency: int = 1,
+        parse_workers: int = 0,
+        crawl_id: str | None = None,
+        order: str | None = None,
+        max_pages: int | None = None,
+        max_bytes: int | None = None,
+        deadline: float | None = None,
+    ):
+        """
+        Recursively count words on a page and linked pages up to depth.
+
+        With `concurrency` greater than 1 the crawl runs on `AsyncCrawler`,
+        keeping up to `concurrency` fetches in flight; `wait` then becomes the
+        minimum delay between request starts to the wiki host instead of a
+        sleep before every download. The "api" backend always crawls on
+        `AsyncCrawler`, which fetches each BFS level in multi-title batches.
+        With `parse_workers` the pages are parsed in that many worker
+        processes while downloads continue (see `AsyncCrawler`).
+
+        Pages that cannot be downloaded even after the throttle's retries are
+        skipped, so one failing page does not end the crawl.
+
+        Counts are kept in memory and written in checkpoints (see
+        `word_counts.checkpointed`); an interrupted crawl started again with
+        the same phrase and depth skips the pages it already counted.
+
+        With a crawl ID, an ordering or a budget the crawl is resumable (see
+        `frontier.FrontierCrawl`): its frontier and visited pages are saved
+        with the checkpoints, and a crawl stopped by a budget or interrupted
+        continues from its frontier when started again with the same ID.
+
+        Args:
+            phrase (str): Start page.
+            depth (int): Maximum link depth.
+            wait (float): Delay in seconds before downloads.
+            concurrency (int): Maximum number of fetches in flight.
+            parse_workers (int): Number of parsing processes.
+            crawl_id (str, optional): ID of a resumable crawl
+                ("<phrase>:<depth>" by default).
+            order (str, optional): Frontier ordering, one of
+                `frontier.ORDERINGS`.
+            max_pages (int, optional): Pages the whole crawl may count.
+            max_bytes (int, optional): HTML bytes the whole crawl may count.
+            deadline (float, optional): Seconds this run may take.
+
+        Raises:
+            SystemExit: If a resumable crawl cannot be started.
+        """
         if depth <= 0:
             return
 
+        resumable = (crawl_id, order, max_pages, max_bytes, deadline)
+        if all(option is None for option in resumable):
+            with checkpointed(f"auto_count_words:{phrase}:{depth}"):
+                self._crawl_count_words(phrase, depth, wait, concurrency, parse_workers)
+            return
+
+        from wikiscraper.frontier import FrontierCrawl
+
+        crawl_id = crawl_id or f"{phrase}:{depth}"
+        try:
+            if parse_workers:
+                raise ValueError("A resumable crawl parses pages in the crawling process; "
+                                 "leave out --parse-workers.")
+            with checkpointed(f"auto_count_words:{crawl_id}") as buffer:
+                crawl = FrontierCrawl(
+                    self, buffer, phrase, depth, crawl_id, ordering=order,
+                    max_pages=max_pages, max_bytes=max_bytes, deadline=deadline,
+                    concurrency=concurrency, wait=wait,
+                )
+                status = crawl.run(on_page=lambda page: page.count_words())
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        frontier = crawl.frontier
+        print(f"Crawl {crawl_id}: {status}, {frontier.pages} pages "
+              f"({frontier.bytes} bytes) counted, {len(frontier)} left in the frontier")
+        self._report_throttle()
+
+    def _crawl_count_words(
+        self,
+        phrase: str,
+        depth: int,
+        wait: float,
+        concurrency: int,
+        parse_workers: int,
+    ) -> None:
+        """Crawl for `auto_count_words`."""
+        if concurrency > 1 or self.batch_size > 1 or parse_workers:
+            from wikiscraper.crawler import AsyncCrawler
+
+            crawler = AsyncCrawler(self, concurrency=concurrency, wait=wait,
+                                   parse_workers=parse_workers)
+            crawler.crawl(phrase, depth, on_page=lambda page: page.count_words())
+            self._report_throttle()
+            return
+
         visited = set()
         q = Queue()
         q.put((phrase, 0))
@@ -168,69 +507,350 @@ class Controller:
                 continue
             visited.add(current_phrase)
 
-            current_page = self._get_page(phrase=current_phrase, wait=wait)
+            try:
+                current_page = self._get_page(phrase=current_phrase, wait=wait)
+            except FetchError as e:
+                print(f"Skipping {current_phrase}: {e}")
+                continue
             current_page.count_words()
 
-            if current_depth >= depth:
-                continue
+            if current_depth < depth:
+                for link in current_page.links():
+                    q.put((link, current_depth + 1))
+            current_page.release()
+
+        self._report_throttle()
 
-            for link in current_page.links():
-                q.put((link, current_depth + 1))
+    def _report_throttle(self) -> None:
+        """Print throttle statistics if the wiki pushed back during a crawl."""
+        stats = self.throttle.stats()
+        if stats["backoffs"] or stats["failures"]:
+            print(f"Throttle: {stats['rate']:.1f} req/s, {stats['backoffs']} backoffs, "
+                  f"{stats['retries']} retries, {stats['failures']} failed pages")
+
+    def ingest_dump(
+        self,
+        path: str,
+        seed_cache: bool = False,
+        limit: int | None = None,
+    ):
+        """
+        Count words of all articles in a MediaWiki XML dump (optionally bz2
+        or gzip compressed) and merge them into the JSON counts.
+        """
+        from wikiscraper.dump import ingest_dump
+
+        return ingest_dump(path, seed_cache=seed_cache, limit=limit, cache=self.cache)
 
     def normalyze(self, v: list[float]) -> np.ndarray:
         """Normalize a list of numeric values so they sum to 1."""
+        import numpy as np
+
         v = np.array(v)
         return v / np.sum(v)
 
+    def top_words(self, count: int = 10, pages: list[str] | None = None) -> pd.DataFrame:
+        """
+        Print the most frequent words of the corpus store, every page counted
+        once (see `corpus.Corpus.top_words`).
+
+        Args:
+            count (int): Number of words.
+            pages (list[str], optional): Page titles to restrict the counts
+                to; all recorded pages by default.
+
+        Returns:
+            pd.DataFrame: Columns "Word" and "Count".
+        """
+        import pandas as pd
+
+        from wikiscraper.corpus import get_corpus
+
+        corpus = get_corpus()
+        try:
+            top = corpus.top_words(count, titles=pages)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        df = pd.DataFrame(top, columns=["Word", "Count"])
+        print(f"{len(corpus)} pages, {len(corpus.words)} distinct words")
+        print(df.to_string(index=False))
+        return df
+
+    def score_pages(
+        self,
+        pages: list[str] | None = None,
+        languages: list[str] | None = None,
+        k_values: list[int] | None = None,
+        wordlist: str = config.SCORING_WORDLIST,
+        output: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Print the language confidence scores of pages (see `scoring.py`) for
+        every language and k.
+
+        Args:
+            pages (list[str], optional): Titles of the pages to fetch and
+                score; all pages of the corpus store by default.
+            languages (list[str], optional): Language codes
+                (`config.SCORING_LANGUAGES` by default).
+            k_values (list[int], optional): Numbers of most frequent reference
+                words (`config.SCORING_K_VALUES` by default).
+            wordlist (str): wordfreq wordlist of the references.
+            output (str, optional): Path of a CSV file to save the scores to.
+
+        Returns:
+            pd.DataFrame: One row per page, one column "<language>@<k>" per
+                language and k.
+        """
+        from wikiscraper.corpus import get_corpus
+        from wikiscraper.scoring import score_matrix, score_pages, scores_frame
+
+        languages = list(languages or config.SCORING_LANGUAGES)
+        k_values = list(k_values or config.SCORING_K_VALUES)
+        try:
+            if pages:
+                counts = {page.phrase: page.get_dict() for page in self._get_pages(pages)}
+                titles = list(counts)
+                scores = score_pages(counts, languages, k_values, wordlist)
+            else:
+                corpus = get_corpus()
+                indptr, indices, data = corpus.matrix()
+                titles = list(corpus.titles)
+                scores = score_matrix(indptr, indices, data, corpus.words,
+                                      languages, k_values, wordlist)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        df = scores_frame(scores, titles, languages, k_values)
+        print(df.to_string())
+        if output is not None:
+            df.to_csv(output, index_label="Page")
+        return df
+
+    def sample_pages(
+        self,
+        start: str,
+        walkers: int = config.SAMPLE_WALKERS,
+        steps: int = config.SAMPLE_STEPS,
+        language: str = config.SCORING_LANGUAGES[0],
+        k: int = config.SCORING_K_VALUES[-1],
+        wordlist: str = config.SCORING_WORDLIST,
+        seed: int = 0,
+        wait: float = 0.0,
+        trace_output: str | None = None,
+    ) -> SampleResult:
+        """
+        Sample pages by random walks from `start` and print the worst and
+        best matching pages of a language (see `sampler.RandomWalkSampler`).
+
+        Args:
+            start (str): Phrase of the start page.
+            walkers (int): Number of concurrent walks.
+            steps (int): Pages scored per walk.
+            language (str): Language code of the scores.
+            k (int): Number of most frequent reference words of the scores.
+            wordlist (str): wordfreq wordlist of the references.
+            seed (int): Seed of the walks (same seed, same walks).
+            wait (float): Minimum delay in seconds between requests.
+            trace_output (str, optional): Path of a CSV file to save every
+                scored page to.
+
+        Returns:
+            SampleResult: Every scored page, with the worst and best.
+        """
+        import pandas as pd
+
+        from wikiscraper.sampler import RandomWalkSampler
+
+        sampler = RandomWalkSampler(
+            self, walkers=walkers, steps=steps, language=language, k=k,
+            wordlist=wordlist, seed=seed, wait=wait,
+        )
+        try:
+            result = sampler.sample(start)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        print(f"{len(result.trace)} pages scored, {result.pages_fetched} distinct")
+        for name, step in (("Worst", result.worst), ("Best", result.best)):
+            if step is not None:
+                print(f"{name}: {step.phrase} (score {step.score:.4f}, "
+                      f"walker {step.walker}, step {step.step})")
+        if trace_output is not None:
+            pd.DataFrame(
+                [(s.walker, s.step, s.phrase, s.score) for s in result.trace],
+                columns=["Walker", "Step", "Page", "Score"],
+            ).to_csv(trace_output, index=False)
+        return result
+
+    def batch(
+        self,
+        file: str = "-",
+        concurrency: int = config.BATCH_CONCURRENCY,
+        jsonl: bool = False,
+    ) -> list[BatchResult]:
+        """
+        Run the commands of a JSON lines file (see `batch.BatchRunner`),
+        printing their output in input order.
+
+        Args:
+            file (str): Path of the file, "-" for standard input.
+            concurrency (int): Maximum number of pages worked on at once.
+            jsonl (bool): Print one JSON result per command (argv, exit code,
+                output and time) instead of the commands' output.
+
+        Returns:
+            list[BatchResult]: The result of every command.
+
+        Raises:
+            SystemExit: If the file cannot be read or a command failed.
+        """
+        from wikiscraper.batch import BatchRunner, read_commands
+
+        try:
+            if file == "-":
+                commands = read_commands(sys.stdin)
+            else:
+                with open(file, encoding="utf-8") as lines:
+                    commands = read_commands(lines)
+        except (OSError, ValueError) as e:
+            print(e)
+            sys.exit(1)
+
+        def emit(result: BatchResult) -> None:
+            if jsonl:
+                print(result.to_json(), flush=True)
+            else:
+                sys.stdout.write(result.stdout)
+                sys.stderr.write(result.stderr)
+                sys.stdout.flush()
+
+        results = BatchRunner(self, concurrency=concurrency).run(commands, on_result=emit)
+        if any(result.exit_code != 0 for result in results):
+            sys.exit(1)
+        return results
+
+    def serve(
+        self,
+        socket: str | None = None,
+        page_memory: int = config.SERVE_PAGE_MEMORY,
+    ) -> None:
+        """
+        Serve commands over a Unix socket until interrupted (see `server.py`).
+
+        The controller, its caches, the parsed pages and the HTTP connection
+        pool stay warm between requests, which `wiki_scraper.py` sends here
+        when the daemon is running.
+
+        Args:
+            socket (str, optional): Path of the socket
+                (`config.SERVE_SOCKET` by default).
+            page_memory (int): Number of parsed pages kept in memory.
+        """
+        from wikiscraper.server import CommandServer
+
+        self.page_memory = page_memory
+        path = Path(socket) if socket is not None else config.SERVE_SOCKET
+        with CommandServer(self, path) as server:
+            print(f"Serving on {path} (Ctrl+C to stop)", flush=True)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+        print(server.stats_line())
+
     def analyze_relative_word_frequency(
         self,
         mode: str,
         count: int,
         chart: str = None,
+        languages: list[str] | None = None,
+        wordlist: str = config.REFERENCE_WORDLIST,
     ):
-        """Compare and visualize word frequencies in a wiki article vs. language."""
-        language = "en"
-        try:
-            raw = config.WORD_COUNTS_JSON.read_text(encoding="utf-8").strip()
-            data: dict[str, int] = json.loads(raw) if raw else {}
-        except json.JSONDecodeError:
-            data = {}
+        """
+        Compare and visualize word frequencies in a wiki article vs. language.
+
+        The most frequent article words are selected with a partial selection
+        and their frequencies in every language looked up at once in the
+        disk-cached reference tables (`reference.py`). In "language" mode the
+        words are the most frequent ones of the first language.
+
+        With approximate counting (`configure(approximate=True)`) the article
+        counts are the sketch's estimates and "article" mode ranks its top-K
+        words.
+
+        Args:
+            mode (str): "article" or "language": whose most frequent words
+                are compared.
+            count (int): Number of words.
+            chart (str, optional): Path to save a bar chart to.
+            languages (list[str], optional): Reference languages
+                (`config.REFERENCE_LANGUAGES` by default).
+            wordlist (str): wordfreq wordlist of the reference frequencies.
+        """
+        import numpy as np
+        import pandas as pd
+        import wordfreq
+
+        from wikiscraper.reference import get_reference, top_indices
+
+        languages = list(languages or config.REFERENCE_LANGUAGES)
+        if self.sketch is not None:
+            data: dict[str, int] = dict(self.sketch.top(count))
+            if mode == "article" and len(data) < count:
+                print(f"Only {len(data)} words are tracked by the sketch "
+                      f"(top {self.sketch.k}).")
+        else:
+            export_word_counts()
+            try:
+                raw = config.WORD_COUNTS_JSON.read_text(encoding="utf-8").strip()
+                data = json.loads(raw) if raw else {}
+            except json.JSONDecodeError:
+                data = load_word_counts()
 
         if mode == "article":
-            sorted_freqs = sorted(data.items(), key=lambda item: item[1], reverse=True)
-            words = [k for k, _ in sorted_freqs[:count]]
+            keys = list(data)
+            counts = np.fromiter(data.values(), dtype=np.int64, count=len(keys))
+            words = [keys[i] for i in top_indices(counts, count)]
         else:
-            words = wordfreq.top_n_list("en", count)
+            words = wordfreq.top_n_list(languages[0], count)
+            if self.sketch is not None:
+                data = self.sketch.estimates(words)
 
         words.reverse()
-        counts_in_article = []
-        counts_in_language = []
-
-        for word in words:
-            counts_in_language.append(
-                wordfreq.word_frequency(word, language, wordlist="small") or 0
-            )
-            counts_in_article.append(data.get(word, 0))
-
-        freq_in_language = self.normalyze(counts_in_language)
+        counts_in_article = [data.get(word, 0) for word in words]
+        try:
+            freq_in_languages = {
+                language: self.normalyze(get_reference(language, wordlist).lookup(words))
+                for language in languages
+            }
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
         freq_in_article = self.normalyze(counts_in_article)
 
-        df = pd.DataFrame({
-            "Word": words,
-            "Language_Freq": freq_in_language,
-            "Article_Freq": freq_in_article,
-        })
+        columns = {"Word": words}
+        for language, freqs in freq_in_languages.items():
+            name = "Language_Freq" if len(languages) == 1 else f"Language_Freq_{language}"
+            columns[name] = freqs
+        columns["Article_Freq"] = freq_in_article
+        df = pd.DataFrame(columns)
 
         print(df)
 
         if chart is not None:
-            x = np.arange(count)
-            width = 0.35
+            import matplotlib.pyplot as plt
+
+            x = np.arange(len(words))
+            width = 0.7 / (len(languages) + 1)
+            colors = ["red", "green", "orange", "purple", "brown", "gray"]
 
             plt.xticks(rotation=45)
-            plt.bar(x - width / 2, freq_in_language, width,
-                    color="red", label=language)
-            plt.bar(x + width / 2, freq_in_article, width,
+            for n, (language, freqs) in enumerate(freq_in_languages.items()):
+                plt.bar(x + (n - len(languages) / 2) * width, freqs, width,
+                        color=colors[n % len(colors)], label=language)
+            plt.bar(x + len(languages) / 2 * width, freq_in_article, width,
                     color="blue", label="Article")
 
             plt.xticks(x, words)
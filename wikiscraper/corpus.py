@@ -0,0 +1,368 @@
+"""
+Module: corpus.py
+
+Provides the optional corpus store: the word counts of every counted page,
+kept per page in a sparse term-document matrix.
+
+The cumulative counts of `word_counts` only grow: counting the same page
+twice counts its words twice, and they do not tell which pages a word came
+from. The corpus keeps one row per page title, in CSR form (`indptr`,
+`indices`, `data`) over a vocabulary shared by all pages, together with a
+hash of the page content. Counting a page again replaces its row, and an
+unchanged page (same title and content hash) is not recorded again. Totals,
+page vectors and the top words of a set of pages are computed with numpy
+from the matrix.
+
+The corpus is recorded when `Page.corpus` is set (the `--corpus` run option)
+and saved to `config.CORPUS_NPZ` at the end of every CLI command, written to
+a temporary file and renamed, under the file's lock (`filelock.py`). If
+another process saved the file since this one opened or saved it, the pages
+this process recorded are added to the saved corpus (replacing its rows of
+the same pages) before writing, so concurrent runs keep each other's pages.
+
+Classes:
+    Corpus: Per-page word counts in a sparse term-document matrix.
+
+Functions:
+    get_corpus: Shared corpus of the current `config.CORPUS_NPZ`.
+    record_page: Record the word counts of a page in the shared corpus.
+    save_corpus: Save the shared corpus if it changed.
+    remove_corpus: Delete the corpus file.
+
+Usage Example:
+    corpus = get_corpus()
+    corpus.add("Pikachu", page.content_hash(), page.get_dict())
+    corpus.top_words(10, titles=["Pikachu", "Raichu"])
+    save_corpus()
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from . import config
+from .filelock import file_lock, file_stamp, temp_path
+
+
+def _join(strings: list[str]) -> np.ndarray:
+    """Encode strings without line breaks (words, titles, hashes) as bytes."""
+    return np.frombuffer("\n".join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def _split(array: np.ndarray) -> list[str]:
+    """Decode strings encoded by `_join`."""
+    text = array.tobytes().decode("utf-8")
+    return text.split("\n") if text else []
+
+
+class Corpus:
+    """
+    Per-page word counts in a sparse term-document matrix (CSR).
+
+    Row `i` holds the counts of page `titles[i]`, column `j` the word
+    `words[j]`. Rows of pages that were counted again are dropped the next
+    time the matrix is built.
+
+    Attributes:
+        path (Path): The file the corpus is saved to.
+        words (list[str]): The vocabulary, in order of first appearance.
+        vocabulary (dict[str, int]): Column of every word.
+        titles (list[str]): Page title of every row.
+        hashes (list[str]): Content hash of every row.
+        rows (dict[str, int]): Row of every page title.
+        dirty (bool): Whether the corpus changed since it was saved.
+    """
+
+    def __init__(self, path: Path | str):
+        """
+        Open the corpus saved at `path`, or start an empty one.
+
+        Args:
+            path (Path | str): The corpus file (`.npz`).
+        """
+        self.path = Path(path)
+        self.words: list[str] = []
+        self.vocabulary: dict[str, int] = {}
+        self.titles: list[str] = []
+        self.hashes: list[str] = []
+        self.rows: dict[str, int] = {}
+        self.dirty = False
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._indices = np.empty(0, dtype=np.int32)
+        self._data = np.empty(0, dtype=np.int64)
+        self._pending: list[tuple[np.ndarray, np.ndarray]] = []
+        self._replaced: set[int] = set()
+        self._changed: set[str] = set()
+        self._stamp = file_stamp(self.path)
+        self._lock = threading.RLock()
+        if self._stamp is not None:
+            self._load()
+
+    def _load(self) -> None:
+        with np.load(self.path) as arrays:
+            self._indptr = arrays["indptr"]
+            self._indices = arrays["indices"]
+            self._data = arrays["data"]
+            self.words = _split(arrays["words"])
+            self.titles = _split(arrays["titles"])
+            self.hashes = _split(arrays["hashes"])
+        self.vocabulary = {word: j for j, word in enumerate(self.words)}
+        self.rows = {title: i for i, title in enumerate(self.titles)}
+
+    def __len__(self) -> int:
+        """Return the number of pages."""
+        return len(self.rows)
+
+    def __contains__(self, title: str) -> bool:
+        """Check if the corpus has counts of the page `title`."""
+        return title in self.rows
+
+    def add(self, title: str, content_hash: str, words: dict[str, int]) -> bool:
+        """
+        Record the word counts of a page, replacing earlier counts of it.
+
+        Args:
+            title (str): Title of the page.
+            content_hash (str): Hash of the page content (`Page.content_hash`).
+            words (dict[str, int]): Word counts of the page.
+
+        Returns:
+            bool: False if the page was already recorded with the same
+                content hash (nothing changes), True otherwise.
+        """
+        with self._lock:
+            row = self.rows.get(title)
+            if row is not None and self.hashes[row] == content_hash:
+                return False
+            ids = np.empty(len(words), dtype=np.int32)
+            for i, word in enumerate(words):
+                j = self.vocabulary.get(word)
+                if j is None:
+                    j = self.vocabulary[word] = len(self.words)
+                    self.words.append(word)
+                ids[i] = j
+            counts = np.fromiter(words.values(), dtype=np.int64, count=len(words))
+            order = np.argsort(ids, kind="stable")
+            if row is not None:
+                self._replaced.add(row)
+            self.rows[title] = len(self.titles)
+            self.titles.append(title)
+            self.hashes.append(content_hash)
+            self._pending.append((ids[order], counts[order]))
+            self._changed.add(title)
+            self.dirty = True
+            return True
+
+    def matrix(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the term-document matrix, one row per page in `titles`.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: CSR arrays `indptr`
+                (int64, one more than rows), `indices` (int32 columns) and
+                `data` (int64 counts).
+        """
+        with self._lock:
+            if self._pending:
+                lengths = np.fromiter((len(ids) for ids, _ in self._pending), dtype=np.int64)
+                self._indptr = np.concatenate(
+                    (self._indptr, self._indptr[-1] + np.cumsum(lengths))
+                )
+                self._indices = np.concatenate([self._indices] + [i for i, _ in self._pending])
+                self._data = np.concatenate([self._data] + [c for _, c in self._pending])
+                self._pending = []
+            if self._replaced:
+                self._drop_rows(self._replaced)
+                self._replaced = set()
+            return self._indptr, self._indices, self._data
+
+    def _drop_rows(self, rows: set[int]) -> None:
+        """Remove rows (of replaced pages) from the matrix."""
+        keep = np.ones(len(self.titles), dtype=bool)
+        keep[list(rows)] = False
+        lengths = np.diff(self._indptr)
+        entries = np.repeat(keep, lengths)
+        self._indptr = np.concatenate(([0], np.cumsum(lengths[keep])))
+        self._indices = self._indices[entries]
+        self._data = self._data[entries]
+        self.titles = [t for t, k in zip(self.titles, keep) if k]
+        self.hashes = [h for h, k in zip(self.hashes, keep) if k]
+        self.rows = {title: i for i, title in enumerate(self.titles)}
+
+    def _row_entries(self, titles: list[str]) -> np.ndarray:
+        """Return the positions in `indices`/`data` of the rows of `titles`."""
+        indptr, _, _ = self.matrix()
+        try:
+            rows = np.fromiter((self.rows[t] for t in titles), dtype=np.int64, count=len(titles))
+        except KeyError as e:
+            raise ValueError(f"Page {e.args[0]!r} is not in the corpus.") from None
+        starts = indptr[rows]
+        lengths = indptr[rows + 1] - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return offsets + np.arange(lengths.sum())
+
+    def totals(self, titles: list[str] | None = None) -> np.ndarray:
+        """
+        Sum the counts of pages.
+
+        Args:
+            titles (list[str], optional): Pages to sum; all pages by default.
+
+        Returns:
+            np.ndarray: Count of every word of `words` (int64).
+
+        Raises:
+            ValueError: If a title is not in the corpus.
+        """
+        with self._lock:
+            _, indices, data = self.matrix()
+            if titles is not None:
+                entries = self._row_entries(titles)
+                indices, data = indices[entries], data[entries]
+            # Float sums of integer counts are exact below 2**53.
+            totals = np.bincount(indices, weights=data, minlength=len(self.words))
+            return totals.astype(np.int64)
+
+    def word_counts(self) -> dict[str, int]:
+        """
+        Return the corpus totals, each page counted once.
+
+        Returns:
+            dict[str, int]: Word counts, words in order of first appearance.
+        """
+        totals = self.totals()
+        nonzero = np.flatnonzero(totals)
+        return dict(zip((self.words[j] for j in nonzero), totals[nonzero].tolist()))
+
+    def vector(self, title: str) -> dict[str, int]:
+        """
+        Return the word counts of one page.
+
+        Raises:
+            ValueError: If the page is not in the corpus.
+        """
+        with self._lock:
+            _, indices, data = self.matrix()
+            entries = self._row_entries([title])
+            return dict(zip((self.words[j] for j in indices[entries]), data[entries].tolist()))
+
+    def top_words(self, n: int, titles: list[str] | None = None) -> list[tuple[str, int]]:
+        """
+        Return the most frequent words of some pages.
+
+        Args:
+            n (int): Number of words.
+            titles (list[str], optional): Pages to count; all by default.
+
+        Returns:
+            list[tuple[str, int]]: Up to `n` words and counts, most frequent
+                first; ties in order of first appearance.
+
+        Raises:
+            ValueError: If `n` is negative or a title is not in the corpus.
+        """
+        if n < 0:
+            raise ValueError(f"n must be >= 0, got {n}.")
+        totals = self.totals(titles)
+        n = min(n, int(np.count_nonzero(totals)))
+        if n == 0:
+            return []
+        top = np.argpartition(-totals, n - 1)[:n]
+        top = top[np.lexsort((top, -totals[top]))]
+        return [(self.words[j], int(totals[j])) for j in top]
+
+    def pages_with(self, word: str) -> dict[str, int]:
+        """
+        Return the pages a word occurs in.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            dict[str, int]: Count of the word in every page that has it.
+        """
+        with self._lock:
+            indptr, indices, data = self.matrix()
+            j = self.vocabulary.get(word)
+            if j is None:
+                return {}
+            entries = np.flatnonzero(indices == j)
+            rows = np.searchsorted(indptr, entries, side="right") - 1
+            return dict(zip((self.titles[i] for i in rows), data[entries].tolist()))
+
+    def save(self) -> None:
+        """
+        Write the corpus to `path` (temporary file, fsync, rename), first
+        merging the pages another process saved there since this corpus was
+        opened or saved.
+        """
+        with self._lock, file_lock(self.path):
+            stamp = file_stamp(self.path)
+            if stamp is not None and stamp != self._stamp:
+                self._merge_saved()
+            indptr, indices, data = self.matrix()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = temp_path(self.path)
+            with open(tmp, "wb") as file:
+                np.savez(
+                    file, indptr=indptr, indices=indices, data=data,
+                    words=_join(self.words), titles=_join(self.titles),
+                    hashes=_join(self.hashes),
+                )
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp, self.path)
+            self._stamp = file_stamp(self.path)
+            self._changed = set()
+            self.dirty = False
+
+    def _merge_saved(self) -> None:
+        """Add the pages recorded since the last save to the saved corpus and adopt it."""
+        saved = Corpus(self.path)
+        for title in self._changed:
+            saved.add(title, self.hashes[self.rows[title]], self.vector(title))
+        self._indptr, self._indices, self._data = saved.matrix()
+        self.words, self.vocabulary = saved.words, saved.vocabulary
+        self.titles, self.hashes, self.rows = saved.titles, saved.hashes, saved.rows
+        self._pending, self._replaced = [], set()
+
+
+_corpora: dict[Path, Corpus] = {}
+_corpora_lock = threading.Lock()
+
+
+def get_corpus() -> Corpus:
+    """Return the shared Corpus of the current `config.CORPUS_NPZ`."""
+    path = Path(config.CORPUS_NPZ)
+    with _corpora_lock:
+        corpus = _corpora.get(path)
+        if corpus is None:
+            corpus = _corpora[path] = Corpus(path)
+        return corpus
+
+
+def record_page(title: str, content_hash: str, words: dict[str, int]) -> bool:
+    """
+    Record the word counts of a page in the shared corpus (see `Corpus.add`).
+
+    Returns:
+        bool: Whether the corpus changed.
+    """
+    return get_corpus().add(title, content_hash, words)
+
+
+def save_corpus() -> None:
+    """Save the shared corpus if it was opened and changed."""
+    corpus = _corpora.get(Path(config.CORPUS_NPZ))
+    if corpus is not None and corpus.dirty:
+        corpus.save()
+
+
+def remove_corpus() -> None:
+    """Forget the shared corpus and delete its file."""
+    path = Path(config.CORPUS_NPZ)
+    with _corpora_lock:
+        _corpora.pop(path, None)
+    path.unlink(missing_ok=True)
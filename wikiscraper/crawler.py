@@ -0,0 +1,331 @@
+"""
+Module: crawler.py
+
+Provides an asyncio-based crawl engine used by `Controller.auto_count_words`
+when more than one request may be in flight at a time.
+
+Parsing can be moved off the download path into a pool of worker processes:
+downloads run in threads, every downloaded page is queued (bounded) for a
+parse worker, and workers send back only a compact `ParsedPage` with the
+word counts and links instead of a parsed document.
+
+Classes:
+    HostPoliteness: Spaces out request starts per host by a minimum interval.
+    ParsedPage: Word counts and links of a page parsed in a worker process.
+    AsyncCrawler: Breadth-first crawler with bounded concurrency.
+
+Functions:
+    parse_page: Parse a page into a `ParsedPage` (runs in parse workers).
+
+Usage Example:
+    crawler = AsyncCrawler(controller, concurrency=8, wait=0.5, parse_workers=4)
+    crawler.crawl("Team Rocket", depth=2, on_page=lambda page: page.count_words())
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable
+from urllib.parse import urlsplit
+
+from wikiscraper.corpus import record_page
+from wikiscraper.page import Page
+from wikiscraper.throttle import FetchError
+from wikiscraper.word_counts import merge_word_counts
+
+
+class HostPoliteness:
+    """
+    Per-host pacing of outgoing requests.
+
+    Every host gets its own schedule: a request may only start once
+    `min_interval` seconds have passed since the previous request to the
+    same host was started. This replaces the fixed sleep before every fetch.
+
+    Attributes:
+        min_interval (float): Minimum delay in seconds between request starts.
+    """
+
+    def __init__(self, min_interval: float = 0.0):
+        """
+        Initialize the politeness schedule.
+
+        Args:
+            min_interval (float): Minimum delay between two request starts
+                to the same host.
+        """
+        self.min_interval = max(0.0, float(min_interval))
+        self._next_start: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, host: str) -> None:
+        """Wait until a new request to `host` is allowed to start."""
+        if self.min_interval <= 0:
+            return
+
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        loop = asyncio.get_running_loop()
+        async with lock:
+            now = loop.time()
+            start = max(now, self._next_start.get(host, now))
+            if start > now:
+                await asyncio.sleep(start - now)
+            self._next_start[host] = start + self.min_interval
+
+
+class ParsedPage:
+    """
+    Compact result of parsing a page: what a crawl needs, nothing more.
+
+    Offers the `get_dict`, `count_words` and `links` methods of `Page`, so
+    crawl callbacks work with either.
+
+    Attributes:
+        phrase (str): The search phrase of the page.
+        words (dict[str, int]): Word counts (as `Page.get_dict`).
+        link_list (list[str]): Linked phrases (as `Page.links`).
+        content_hash (str | None): Hash of the page content
+            (as `Page.content_hash`).
+    """
+
+    __slots__ = ("phrase", "words", "link_list", "content_hash")
+
+    def __init__(
+        self,
+        phrase: str,
+        words: dict[str, int],
+        link_list: list[str],
+        content_hash: str | None = None,
+    ):
+        self.phrase = phrase
+        self.words = words
+        self.link_list = link_list
+        self.content_hash = content_hash
+
+    def get_dict(self) -> dict[str, int]:
+        """Return the word counts of the page."""
+        return self.words
+
+    def count_words(self) -> list[str]:
+        """Merge the word counts into the JSON file, like `Page.count_words`."""
+        merge_word_counts(self.words, page=self.phrase)
+        if Page.corpus and self.content_hash is not None:
+            record_page(self.phrase, self.content_hash, self.words)
+        return list(self.words.keys())
+
+    def links(self) -> list[str]:
+        """Return the linked phrases of the page."""
+        return self.link_list
+
+    def release(self) -> None:
+        """Nothing to free; present for parity with `Page.release`."""
+
+
+def parse_page(phrase: str, html: str) -> ParsedPage:
+    """
+    Parse a page and keep only its word counts and links.
+
+    Runs in a parse worker process; the returned object is all that is sent
+    back to the crawl.
+
+    Args:
+        phrase (str): The search phrase of the page.
+        html (str): HTML content of the page.
+
+    Returns:
+        ParsedPage: Word counts and links of the page.
+    """
+    page = Page(phrase, html)
+    return ParsedPage(phrase, page.get_dict(), page.links(), page.content_hash())
+
+
+def _warm_up() -> None:
+    """No-op task that makes the pool start its workers."""
+
+
+class AsyncCrawler:
+    """
+    Breadth-first crawler that keeps several page fetches in flight.
+
+    Pages are visited with the same depth and visited-set semantics as the
+    serial crawl in `Controller.auto_count_words`: each phrase is processed at
+    most once, at the smallest depth it can be reached from the start phrase,
+    and links of pages at the maximum depth are not followed. The crawl runs
+    level by level, so the set of processed pages is identical to the serial
+    path regardless of the order in which downloads finish. Batches that
+    cannot be downloaded (`FetchError`) are reported and skipped.
+
+    With `parse_workers` set, pages are parsed in that many worker processes
+    and callbacks receive `ParsedPage` objects. A download slot is only
+    released once its pages have a place in the parse queue (at most
+    `parse_queue` batches waiting or being parsed), so downloads pause while
+    the parse stage is saturated.
+
+    Attributes:
+        controller (Controller): Controller used to fetch pages.
+        concurrency (int): Maximum number of fetches in flight.
+        politeness (HostPoliteness): Per-host request pacing.
+        parse_workers (int): Number of parse processes (0 = parse in the
+            crawl's own process).
+        parse_queue (int): Maximum number of downloaded batches waiting for
+            or being parsed.
+    """
+
+    def __init__(
+        self,
+        controller,
+        concurrency: int = 8,
+        wait: float = 0.0,
+        parse_workers: int = 0,
+        parse_queue: int | None = None,
+    ):
+        """
+        Initialize the crawler.
+
+        Args:
+            controller (Controller): Controller whose `_get_pages` is used to
+                fetch pages (from cache or network).
+            concurrency (int): Maximum number of fetches in flight.
+            wait (float): Minimum delay in seconds between request starts to
+                the same host.
+            parse_workers (int): Number of parse processes; 0 parses pages
+                lazily in the calling process.
+            parse_queue (int, optional): Capacity of the parse queue;
+                defaults to twice the number of parse workers.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be >= 1, got {concurrency}.")
+        if parse_workers < 0:
+            raise ValueError(f"parse_workers must be >= 0, got {parse_workers}.")
+        self.controller = controller
+        self.concurrency = concurrency
+        self.politeness = HostPoliteness(wait)
+        self.parse_workers = parse_workers
+        self.parse_queue = parse_queue or 2 * max(1, parse_workers)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._parse_slots: asyncio.Semaphore | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._parse_pool: ProcessPoolExecutor | None = None
+
+    def crawl(
+        self,
+        phrase: str,
+        depth: int,
+        on_page: Callable[[Page], None],
+    ) -> int:
+        """
+        Crawl from `phrase` up to `depth` and call `on_page` for every page.
+
+        `on_page` always runs on the event loop thread, one page at a time, so
+        it may update shared state (such as the word count file) safely.
+
+        Args:
+            phrase (str): Start phrase.
+            depth (int): Maximum link depth to follow.
+            on_page (Callable[[Page], None]): Callback for every fetched page
+                (a `ParsedPage` when `parse_workers` is set).
+
+        Returns:
+            int: Number of pages processed.
+        """
+        if not self.parse_workers:
+            return asyncio.run(self._crawl(phrase, depth, on_page))
+
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as pool:
+            # Start the workers before any download thread exists.
+            pool.submit(_warm_up).result()
+            self._parse_pool = pool
+            try:
+                return asyncio.run(self._crawl(phrase, depth, on_page))
+            finally:
+                self._parse_pool = None
+
+    async def _crawl(
+        self,
+        phrase: str,
+        depth: int,
+        on_page: Callable[[Page], None],
+    ) -> int:
+        """Run the level-synchronous BFS on the current event loop."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._parse_slots = asyncio.Semaphore(self.parse_queue)
+        visited = {phrase}
+        level = [phrase]
+        processed = 0
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            for current_depth in range(depth + 1):
+                if not level:
+                    break
+                processed += len(level)
+                follow_links = current_depth < depth
+                level = await self._crawl_level(
+                    level, visited, follow_links, on_page
+                )
+
+        return processed
+
+    async def _crawl_level(
+        self,
+        level: list[str],
+        visited: set[str],
+        follow_links: bool,
+        on_page: Callable[[Page], None],
+    ) -> list[str]:
+        """
+        Fetch and process all phrases of one BFS level concurrently, in
+        batches of `controller.batch_size` phrases.
+
+        Returns:
+            list[str]: Newly discovered phrases forming the next level.
+        """
+        size = self.controller.batch_size
+        batches = [level[i:i + size] for i in range(0, len(level), size)]
+        tasks = [asyncio.create_task(self._fetch(batch)) for batch in batches]
+        next_level = []
+        try:
+            for task in asyncio.as_completed(tasks):
+                try:
+                    pages = await task
+                except FetchError as e:
+                    print(f"Skipping pages: {e}")
+                    continue
+                for page in pages:
+                    on_page(page)
+                    if follow_links:
+                        for link in page.links():
+                            if link not in visited:
+                                visited.add(link)
+                                next_level.append(link)
+                    page.release()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return next_level
+
+    async def _fetch(self, phrases: list[str]) -> list[Page] | list[ParsedPage]:
+        """
+        Fetch a batch of pages (a single page unless the backend batches),
+        applying politeness only when a network request is needed, and
+        parse it in the parse pool if there is one.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            if self.controller.needs_download(phrases):
+                host = urlsplit(self.controller.wiki_base_url).netloc
+                await self.politeness.acquire(host)
+            pages = await loop.run_in_executor(
+                self._executor, self.controller._get_pages, phrases
+            )
+            if self._parse_pool is None:
+                return pages
+            await self._parse_slots.acquire()
+
+        try:
+            return await asyncio.gather(*(
+                loop.run_in_executor(self._parse_pool, parse_page, page.phrase, page.html)
+                for page in pages
+            ))
+        finally:
+            self._parse_slots.release()
@@ -0,0 +1,166 @@
+"""
+Module: dump.py
+
+Provides offline ingestion of MediaWiki XML exports (`Special:Export` or
+database dumps, optionally compressed with bz2 or gzip).
+
+The dump is read as a stream with `lxml.etree.iterparse`: every `<page>`
+element is processed and then cleared together with its already processed
+siblings, so memory use does not grow with the size of the dump. The
+wikitext of each page's last revision is rendered with `wikitext.to_html`
+and counted with `Page.get_dict`, so the words are counted exactly like the
+words of a page fetched with the "api" backend. Counts are merged through a
+checkpointed run, so an interrupted ingestion keeps its checkpoints and a
+new ingestion of the same dump resumes it.
+
+Functions:
+    open_dump: Open a plain, bz2- or gzip-compressed dump file.
+    iter_dump_pages: Stream (title, wikitext) pairs from a dump.
+    ingest_dump: Merge word counts of a dump into the word count file.
+
+Usage Example:
+    stats = ingest_dump("bulbapedia-pages-articles.xml.bz2", seed_cache=True)
+    print(stats["pages_per_second"])
+"""
+
+import bz2
+import gzip
+import time
+from pathlib import Path
+from typing import IO, Iterator
+
+from lxml import etree
+
+from wikiscraper.cache import PageCache, cache_key, get_cache
+from wikiscraper.page import Page
+from wikiscraper.wikitext import to_html
+from wikiscraper.word_counts import checkpointed, export_word_counts, merge_word_counts
+
+PROGRESS_EVERY = 1000
+"""int: Print a progress line every this many ingested pages."""
+
+
+def open_dump(path: str | Path) -> IO[bytes]:
+    """
+    Open a dump file for binary streaming, decompressing it on the fly.
+
+    Args:
+        path (str | Path): Path to a `.xml`, `.xml.bz2` or `.xml.gz` file.
+
+    Returns:
+        IO[bytes]: Readable binary stream of XML.
+    """
+    path = Path(path)
+    if path.suffix == ".bz2":
+        return bz2.open(path, "rb")
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def iter_dump_pages(
+    stream: IO[bytes],
+    namespaces: tuple[int, ...] = (0,),
+) -> Iterator[tuple[str, str]]:
+    """
+    Stream the pages of a MediaWiki XML export.
+
+    Redirect pages and pages outside `namespaces` are skipped. For pages with
+    several revisions the last one is used.
+
+    Args:
+        stream (IO[bytes]): XML stream (see `open_dump`).
+        namespaces (tuple[int, ...]): Namespace numbers to include
+            (0 = articles).
+
+    Yields:
+        tuple[str, str]: Page title and wikitext.
+    """
+    pages = etree.iterparse(stream, events=("end",), tag="{*}page", huge_tree=True)
+    for _, page in pages:
+        try:
+            title = page.findtext("{*}title")
+            ns = int(page.findtext("{*}ns") or 0)
+            if ns in namespaces and page.find("{*}redirect") is None:
+                revisions = page.findall("{*}revision")
+                text = revisions[-1].findtext("{*}text") if revisions else None
+                if title and text:
+                    yield title, text
+        finally:
+            page.clear()
+            while page.getprevious() is not None:
+                del page.getparent()[0]
+
+
+def ingest_dump(
+    path: str | Path,
+    seed_cache: bool = False,
+    limit: int | None = None,
+    cache: PageCache | None = None,
+) -> dict[str, float]:
+    """
+    Count the words of every article in a dump and merge them into
+    `config.WORD_COUNTS_JSON`.
+
+    Counts go through a checkpointed run (see `word_counts.checkpointed`),
+    written every `config.CHECKPOINT_EVERY_PAGES` pages, so a crash loses at
+    most one checkpoint of work, and ingesting the same dump again after a
+    crash resumes it without counting a page twice.
+
+    Args:
+        path (str | Path): Dump file (`.xml`, `.xml.bz2` or `.xml.gz`).
+        seed_cache (bool): If True, also store every page in the page cache
+            under the keys the "api" backend reads: the rendered page for
+            page commands and serial crawls (`<key>@parse`), and the
+            wikitext with an empty link list for batched crawls
+            (`<key>@wikitext`, `<key>@links`). The "html" backend does not
+            use them.
+        limit (int, optional): Stop after this many pages.
+        cache (PageCache, optional): Cache to seed; defaults to the shared
+            cache of `config.CACHE_DIR`.
+
+    Returns:
+        dict[str, float]: Number of pages, distinct words, seconds and
+            pages per second.
+    """
+    if seed_cache and cache is None:
+        cache = get_cache()
+
+    words: set[str] = set()
+    pages = 0
+    start = time.perf_counter()
+    with open_dump(path) as stream, \
+            checkpointed(f"ingest_dump:{Path(path).resolve()}") as buffer:
+        for title, wikitext in iter_dump_pages(stream):
+            html = None
+            if title not in buffer.counted:
+                html = to_html(wikitext)
+                counts = Page(title, html).get_dict()
+                merge_word_counts(counts, page=title)
+                words.update(counts)
+            if seed_cache:
+                key = cache_key(title)
+                # Dump links are rendered from the wikitext itself; links
+                # added by templates are not known without the wiki.
+                cache.put(f"{key}@parse", (html or to_html(wikitext)).encode("utf-8"))
+                cache.put(f"{key}@wikitext", wikitext.encode("utf-8"))
+                cache.put(f"{key}@links", b"")
+
+            pages += 1
+            if pages % PROGRESS_EVERY == 0:
+                rate = pages / (time.perf_counter() - start)
+                print(f"{pages} pages ingested ({rate:.1f} pages/s)")
+            if limit is not None and pages >= limit:
+                break
+
+    export_word_counts()
+    elapsed = time.perf_counter() - start
+    stats = {
+        "pages": pages,
+        "words": len(words),
+        "seconds": elapsed,
+        "pages_per_second": pages / elapsed if elapsed > 0 else 0.0,
+    }
+    print(f"Ingested {pages} pages ({len(words)} distinct words) in "
+          f"{elapsed:.1f} s, {stats['pages_per_second']:.1f} pages/s")
+    return stats
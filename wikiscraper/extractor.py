@@ -0,0 +1,339 @@
+"""
+Module: extractor.py
+
+Provides a single-pass streaming extraction engine for wiki pages.
+
+Instead of building a BeautifulSoup tree, the HTML is fed once through lxml's
+HTML parser with a parser target that receives SAX-style events (start tag,
+end tag, text, comment). From that single pass it produces everything the
+crawl and the CLI commands need:
+
+    - the word counts (same semantics as `Page.get_dict`),
+    - the wiki links of the content root (same rules as `Page.links`),
+    - the first non-empty paragraph of the content root (`Page.summary`),
+    - the byte offsets of the real tables of the content root
+      (`Page.is_real_table`), so one table can be sliced out of the page
+      without parsing it again.
+
+BeautifulSoup consumes the same lxml events, so both engines see the same
+document. Text inside `script`, `style`, `template`, `rt` and `rp` elements
+and comments are skipped like `get_text` skips them.
+
+Classes:
+    Extraction: Result of one pass over a page.
+
+Functions:
+    wiki_link_target: Filter an href like `Page.links` does.
+    extract: Run the single-pass extraction over a page's HTML.
+
+Usage Example:
+    result = extract(html)
+    print(result.summary, len(result.links), result.table_offsets)
+"""
+
+import re
+
+from lxml import etree
+
+from wikiscraper import config
+from wikiscraper.tokenizer import Tokenizer
+
+STRING_CONTAINERS = frozenset({"script", "style", "template", "rt", "rp"})
+"""frozenset[str]: Tags whose text BeautifulSoup's `get_text` leaves out."""
+
+_TABLE_TAG_RE = re.compile(
+    rb"<!--.*?-->"
+    rb"|<(script|style)\b.*?</\1\s*>"
+    rb"|<(/?)table\b[^>]*>",
+    re.S | re.I,
+)
+
+
+def wiki_link_target(href: str) -> str | None:
+    """
+    Return the linked phrase of an article link, or None if the link is
+    filtered out (non-article link or one of the `config.BAD_*` rules).
+    """
+    if not href.startswith("/wiki/"):
+        return None
+    if any(href.startswith(prefix) for prefix in config.BAD_PREFIXES):
+        return None
+    if any(href.endswith(ext) for ext in config.BAD_EXTENSIONS):
+        return None
+    if href in config.BAD_LINKS:
+        return None
+    return href.removeprefix("/wiki/")
+
+
+class Extraction:
+    """
+    Everything extracted from a page in one pass.
+
+    Attributes:
+        words (dict[str, int]): Word counts of the whole document.
+        links (list[str]): Distinct linked phrases of the content root.
+        summary (str): Text of the first non-empty paragraph of the content
+            root (not wrapped), or "" if there is none.
+        table_count (int): Number of real tables in the content root.
+        table_offsets (list[tuple[int, int]] | None): UTF-8 byte offsets
+            `(start, end)` of the real tables in the content root, or None
+            if the tables could not be located in the source reliably.
+        has_content (bool): Whether a content root was found.
+    """
+
+    __slots__ = ("words", "links", "summary", "table_count", "table_offsets",
+                 "has_content")
+
+    def __init__(
+        self,
+        words: dict[str, int],
+        links: list[str],
+        summary: str,
+        table_count: int,
+        table_offsets: list[tuple[int, int]] | None,
+        has_content: bool,
+    ):
+        self.words = words
+        self.links = links
+        self.summary = summary
+        self.table_count = table_count
+        self.table_offsets = table_offsets
+        self.has_content = has_content
+
+
+class _Table:
+    """Running state of one `<table>` element."""
+
+    __slots__ = ("index", "bad_class", "rows", "good")
+
+    def __init__(self, index: int, bad_class: bool):
+        self.index = index
+        self.bad_class = bad_class
+        self.rows = 0
+        self.good = False
+
+    @property
+    def is_real(self) -> bool:
+        """Same decision as `Page.is_real_table`."""
+        return not self.bad_class and self.rows >= 2 and self.good
+
+
+class _Row:
+    """Running state of one `<tr>` element."""
+
+    __slots__ = ("cells", "open_cells", "has_text")
+
+    def __init__(self):
+        self.cells = 0
+        self.open_cells = 0
+        self.has_text = False
+
+
+class _Root:
+    """Collects links, paragraphs and tables inside one content root candidate."""
+
+    __slots__ = ("depth", "closed", "links", "paragraphs", "summary_order",
+                 "summary", "tables")
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self.closed = False
+        self.links: list[str] = []
+        self.paragraphs: list[tuple[int, list[str]]] = []
+        self.summary_order: int | None = None
+        self.summary = ""
+        self.tables: list[_Table] = []
+
+
+class _Target:
+    """lxml parser target that extracts everything in one pass."""
+
+    def __init__(self):
+        self.depth = 0
+        self.containers = 0
+        self.text: list[str] = []
+        self.pending: list[str] = []
+        self.paragraph_count = 0
+        self.tables: list[_Table] = []
+        self.open_tables: list[_Table] = []
+        self.open_rows: list[_Row] = []
+        self.container_depths: list[int] = []
+        self.ltr: _Root | None = None
+        self.content_text: _Root | None = None
+
+    def _open_roots(self) -> list[_Root]:
+        return [root for root in (self.ltr, self.content_text)
+                if root is not None and not root.closed]
+
+    def _flush(self) -> None:
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending.clear()
+        if self.containers:
+            return
+        self.text.append(text)
+        stripped = text.strip()
+        if not stripped:
+            return
+        for row in self.open_rows:
+            if row.open_cells:
+                row.has_text = True
+        for root in self._open_roots():
+            for _, parts in root.paragraphs:
+                parts.append(stripped)
+
+    def start(self, tag, attrib):
+        self._flush()
+        roots = self._open_roots()
+
+        if tag == "a" and "href" in attrib:
+            target = wiki_link_target(attrib["href"])
+            if target is not None:
+                for root in roots:
+                    root.links.append(target)
+        elif tag == "p":
+            order = self.paragraph_count
+            self.paragraph_count += 1
+            for root in roots:
+                root.paragraphs.append((order, []))
+        elif tag == "table":
+            classes = attrib.get("class", "").split()
+            table = _Table(
+                len(self.tables),
+                any(cls in classes for cls in config.BAD_TABLE_CLASSES),
+            )
+            self.tables.append(table)
+            self.open_tables.append(table)
+            for root in roots:
+                root.tables.append(table)
+        elif tag == "tr":
+            for table in self.open_tables:
+                table.rows += 1
+            self.open_rows.append(_Row())
+        elif tag in ("td", "th"):
+            for row in self.open_rows:
+                row.cells += 1
+                row.open_cells += 1
+
+        if tag in STRING_CONTAINERS:
+            self.containers += 1
+            self.container_depths.append(self.depth)
+
+        if self.ltr is None and tag == "div" and \
+                "mw-content-ltr" in attrib.get("class", "").split():
+            self.ltr = _Root(self.depth)
+        if self.content_text is None and attrib.get("id") == "mw-content-text":
+            self.content_text = _Root(self.depth)
+        self.depth += 1
+
+    def end(self, tag):
+        self._flush()
+        self.depth -= 1
+
+        if self.container_depths and self.container_depths[-1] == self.depth:
+            self.container_depths.pop()
+            self.containers -= 1
+
+        if tag == "p":
+            for root in self._open_roots():
+                if root.paragraphs:
+                    order, parts = root.paragraphs.pop()
+                    if parts and (root.summary_order is None or order < root.summary_order):
+                        root.summary_order = order
+                        root.summary = " ".join(parts)
+        elif tag == "table" and self.open_tables:
+            self.open_tables.pop()
+        elif tag == "tr" and self.open_rows:
+            row = self.open_rows.pop()
+            if row.cells >= 2 and row.has_text:
+                for table in self.open_tables:
+                    table.good = True
+        elif tag in ("td", "th"):
+            for row in self.open_rows:
+                if row.open_cells:
+                    row.open_cells -= 1
+
+        for root in self._open_roots():
+            if root.depth == self.depth:
+                root.closed = True
+
+    def data(self, data):
+        self.pending.append(data)
+
+    def comment(self, text):
+        self._flush()
+
+    def pi(self, target, data=None):
+        self._flush()
+
+    def doctype(self, *args):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return self
+
+
+def _table_source_offsets(html_bytes: bytes) -> list[tuple[int, int]]:
+    """
+    Locate the `<table>` elements in the source, in document order.
+
+    Comments, scripts and styles are skipped. Tables without a closing tag
+    end where their parent table ends (or at the end of the document).
+    """
+    starts: list[int] = []
+    ends: dict[int, int] = {}
+    open_tables: list[int] = []
+    for match in _TABLE_TAG_RE.finditer(html_bytes):
+        closing = match.group(2)
+        if closing is None:
+            continue
+        if not closing:
+            open_tables.append(len(starts))
+            starts.append(match.start())
+        elif open_tables:
+            ends[open_tables.pop()] = match.end()
+    for index in open_tables:
+        ends[index] = len(html_bytes)
+    return [(start, ends[i]) for i, start in enumerate(starts)]
+
+
+def extract(html: str, tokenizer: Tokenizer | None = None) -> Extraction:
+    """
+    Extract words, links, summary and table offsets from a page in one pass.
+
+    Args:
+        html (str): HTML content of the page.
+        tokenizer (Tokenizer, optional): Word tokenizer; defaults to the
+            default tokenization.
+
+    Returns:
+        Extraction: The extracted data.
+    """
+    target = _Target()
+    parser = etree.HTMLParser(target=target, recover=True)
+    if html:
+        parser.feed(html)
+    parser.close()
+
+    words = (tokenizer or Tokenizer()).count("\n".join(target.text))
+
+    root = target.ltr or target.content_text
+    if root is None:
+        return Extraction(words, [], "", 0, [], False)
+
+    real = [table for table in root.tables if table.is_real]
+    offsets = None
+    source = _table_source_offsets(html.encode("utf-8"))
+    if len(source) == len(target.tables):
+        offsets = [source[table.index] for table in real]
+
+    return Extraction(
+        words=words,
+        links=list(set(root.links)),
+        summary=root.summary,
+        table_count=len(real),
+        table_offsets=offsets,
+        has_content=True,
+    )
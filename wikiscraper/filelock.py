@@ -0,0 +1,93 @@
+"""
+Module: filelock.py
+
+Provides advisory file locks and per-process temporary file names for data
+files that several CLI processes may rewrite at once (the approximate
+counter, the corpus store and the page cache index). A process that rewrites
+such a file takes the file's lock, reads what other processes wrote since
+it last looked, merges and writes through its own temporary file.
+
+Locks are `fcntl.flock` locks on a `<name>.lock` file next to the data
+file, kept open by the process; they are released when the block ends or
+the process dies. Where
+`fcntl` is not available (Windows) the lock only serializes threads of one
+process.
+
+Functions:
+    file_lock: Hold the lock of a data file for a block.
+    temp_path: Temporary file of the calling process next to a data file.
+    file_stamp: Identity of a file's current version.
+
+Usage Example:
+    with file_lock(path):
+        merged = merge(load(path), pending)
+        tmp = temp_path(path)
+        write(tmp, merged)
+        os.replace(tmp, path)
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+_thread_locks: dict[Path, threading.Lock] = {}
+_thread_locks_lock = threading.Lock()
+_lock_files: dict[tuple[int, Path], int] = {}
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold the exclusive lock of a data file for the block.
+
+    Args:
+        path (Path): The data file (it need not exist); the lock file is
+            `<path>.lock`.
+    """
+    path = Path(path)
+    with _thread_locks_lock:
+        local = _thread_locks.setdefault(path, threading.Lock())
+    with local:
+        if fcntl is None:
+            yield
+            return
+        # Keyed by pid: a forked child must not share the parent's open file,
+        # or their flock locks would not exclude each other.
+        key = (os.getpid(), path)
+        fd = _lock_files.get(key)
+        if fd is not None and os.fstat(fd).st_nlink == 0:
+            # The lock file was deleted (e.g. by clear_cache); lock a new one.
+            os.close(fd)
+            fd = None
+        if fd is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd = _lock_files[key] = os.open(
+                path.with_name(f"{path.name}.lock"), os.O_RDWR | os.O_CREAT, 0o644
+            )
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def temp_path(path: Path) -> Path:
+    """Return the calling process's temporary file for rewriting `path`."""
+    path = Path(path)
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+
+def file_stamp(path: Path) -> tuple[int, int, int] | None:
+    """Return (inode, size, mtime in ns) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
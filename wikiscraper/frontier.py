@@ -0,0 +1,383 @@
+"""
+Module: frontier.py
+
+Provides resumable crawls for `Controller.auto_count_words`: a crawl keeps
+its frontier, its visited pages with their depth, and the pages it already
+counted in the word count store (`word_counts.py`) under a crawl ID. A crawl
+that was interrupted, or stopped by a budget, continues where it stopped
+when it is started again with the same ID.
+
+The state is saved with the word count checkpoints, in the same transaction
+(see `CheckpointBuffer.state`), so it always matches the stored counts. A
+checkpoint writes only the pages whose state changed since the previous
+one, never the whole frontier, so its cost grows with the pages crawled in
+between, not with the size of the crawl.
+
+Frontier orderings (`ORDERINGS`):
+    - "bfs": breadth first, pages closest to the start first (as the other
+      crawls of `auto_count_words`).
+    - "depth": depth first, the deepest and most recently found pages first.
+    - "inlinks": pages linked from the most crawled pages first.
+
+All orderings stay within `depth` links of the start page. With "depth" and
+"inlinks" a page is crawled at the depth it was first reached by, which may
+be deeper than its shortest path; a shorter path found while the page is
+still in the frontier lowers its depth.
+
+Budgets stop a crawl cleanly, after the pages already fetched are counted
+and with a final checkpoint: `max_pages` and `max_bytes` (HTML of the
+counted pages) apply to the whole crawl across resumes, `deadline` (seconds)
+to one run.
+
+Classes:
+    Frontier: Priority frontier and visited pages of a crawl, with changes
+        tracked for checkpoints.
+    FrontierCrawl: Runs a resumable crawl with budgets.
+
+Usage Example:
+    with checkpointed("auto_count_words:Pikachu:2") as buffer:
+        crawl = FrontierCrawl(controller, buffer, "Pikachu", depth=2,
+                              crawl_id="Pikachu:2", ordering="inlinks", max_pages=500)
+        crawl.run(on_page=lambda page: page.count_words())
+"""
+
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from wikiscraper.cache import cache_key
+from wikiscraper.page import Page
+from wikiscraper.throttle import FetchError
+from wikiscraper.word_counts import CheckpointBuffer, CrawlChanges
+
+ORDERINGS = ("bfs", "depth", "inlinks")
+"""tuple[str, ...]: Orderings of the frontier."""
+
+QUEUED, COUNTED, FAILED = 0, 1, 2
+"""int: States of a page of a crawl (in the frontier, counted, failed to download)."""
+
+_POPPED = 3
+"""int: State of a page taken from the frontier and not done yet (saved as QUEUED)."""
+
+
+class Frontier:
+    """
+    Priority frontier and visited pages of a crawl.
+
+    Every page ever added is kept with its depth, discovery number, in-link
+    count and state. The frontier is a heap of the queued pages, ordered by
+    `ordering`; entries whose priority changed are pushed again and stale
+    ones skipped when popped.
+
+    Attributes:
+        crawl_id (str): ID of the crawl.
+        phrase (str): Start page.
+        depth (int): Maximum link depth.
+        ordering (str): One of `ORDERINGS`.
+        status (str): "running", "finished" or "stopped: <budget>".
+        pages (int): Pages counted so far.
+        bytes (int): HTML bytes of the counted pages.
+    """
+
+    def __init__(self, crawl_id: str, phrase: str, depth: int, ordering: str = "bfs"):
+        """
+        Start a new crawl with `phrase` in the frontier.
+
+        Raises:
+            ValueError: If `ordering` is not one of `ORDERINGS`.
+        """
+        if ordering not in ORDERINGS:
+            raise ValueError(f"Unknown ordering {ordering!r}, expected one of {ORDERINGS}.")
+        self.crawl_id = crawl_id
+        self.phrase = phrase
+        self.depth = depth
+        self.ordering = ordering
+        self.status = "running"
+        self.pages = 0
+        self.bytes = 0
+        self._entries: dict[str, list[int]] = {}  # page -> [depth, seq, inlinks, state]
+        self._heap: list[tuple[tuple, str]] = []
+        self._queued = 0
+        self._changed: set[str] = set()
+        self.add(phrase, 0, linked=False)
+
+    @classmethod
+    def load(cls, saved: CrawlChanges, ordering: str | None = None) -> "Frontier":
+        """
+        Restore a crawl from its saved state (`WordCountStore.load_crawl`).
+
+        Args:
+            saved (CrawlChanges): The crawl's row and the rows of its pages.
+            ordering (str, optional): New ordering of the frontier; the saved
+                one by default.
+        """
+        (crawl_id, phrase, depth, saved_ordering, status, pages, size), rows = saved
+        frontier = cls(crawl_id, phrase, depth, ordering or saved_ordering)
+        frontier.status, frontier.pages, frontier.bytes = status, pages, size
+        frontier._entries = {page: [d, seq, inlinks, state]
+                             for page, d, seq, inlinks, state in rows}
+        frontier._queued = sum(entry[3] == QUEUED for entry in frontier._entries.values())
+        frontier._heap = [(frontier._key(entry), page)
+                          for page, entry in frontier._entries.items() if entry[3] == QUEUED]
+        heapq.heapify(frontier._heap)
+        frontier._changed = set()
+        return frontier
+
+    def __len__(self) -> int:
+        """Number of pages in the frontier."""
+        return self._queued
+
+    def __contains__(self, page: str) -> bool:
+        """Whether a page was ever added (queued, counted or failed)."""
+        return page in self._entries
+
+    def _key(self, entry: list[int]) -> tuple:
+        depth, seq, inlinks, _ = entry
+        if self.ordering == "depth":
+            return (-depth, -seq)
+        if self.ordering == "inlinks":
+            return (-inlinks, depth, seq)
+        return (depth, seq)
+
+    def add(self, page: str, depth: int, linked: bool = True) -> None:
+        """
+        Add a page found at `depth`, or a link to a page already known.
+
+        Args:
+            page (str): The page.
+            depth (int): Its depth on the path it was found by.
+            linked (bool): Whether it was found as a link (counts an in-link).
+        """
+        entry = self._entries.get(page)
+        if entry is None:
+            entry = self._entries[page] = [depth, len(self._entries), int(linked), QUEUED]
+            self._queued += 1
+        elif entry[3] == QUEUED:
+            entry[0] = min(entry[0], depth)
+            entry[2] += int(linked)
+        else:
+            return
+        heapq.heappush(self._heap, (self._key(entry), page))
+        self._changed.add(page)
+
+    def pop(self) -> tuple[str, int] | None:
+        """Remove and return the next page and its depth, or None if the frontier is empty."""
+        while self._heap:
+            key, page = heapq.heappop(self._heap)
+            entry = self._entries[page]
+            if entry[3] == QUEUED and key == self._key(entry):
+                entry[3] = _POPPED
+                self._queued -= 1
+                return page, entry[0]
+        return None
+
+    def done(self, page: str, size: int | None) -> None:
+        """
+        Record a popped page as counted (`size` bytes of HTML), or as failed
+        to download (`size` None).
+        """
+        entry = self._entries[page]
+        if size is None:
+            entry[3] = FAILED
+        else:
+            entry[3] = COUNTED
+            self.pages += 1
+            self.bytes += size
+        self._changed.add(page)
+
+    def take_changes(self) -> CrawlChanges:
+        """Return the crawl's row and the rows changed since the last call."""
+        # Popped pages not done yet are saved as queued, to be crawled on resume.
+        rows = []
+        for page in self._changed:
+            depth, seq, inlinks, state = self._entries[page]
+            rows.append((page, depth, seq, inlinks, QUEUED if state == _POPPED else state))
+        self._changed = set()
+        return ((self.crawl_id, self.phrase, self.depth, self.ordering, self.status,
+                 self.pages, self.bytes), rows)
+
+
+class FrontierCrawl:
+    """
+    Resumable crawl with a persisted frontier and budgets.
+
+    Pages are taken from the frontier in waves of up to `concurrency` fetches
+    (of `controller.batch_size` pages each), fetched in threads and counted
+    in frontier order on the calling thread.
+
+    Attributes:
+        controller (Controller): Controller used to fetch pages.
+        buffer (CheckpointBuffer): Checkpoints of the crawl's counts, which
+            also save its state.
+        frontier (Frontier): State of the crawl.
+        resumed (bool): Whether the crawl continues an earlier run.
+        max_pages (int | None): Pages the whole crawl may count.
+        max_bytes (int | None): HTML bytes the whole crawl may count.
+        deadline (float | None): Seconds this run may take.
+        concurrency (int): Maximum number of fetches in flight.
+        wait (float): Delay in seconds before every wave that downloads.
+    """
+
+    def __init__(
+        self,
+        controller,
+        buffer: CheckpointBuffer,
+        phrase: str,
+        depth: int,
+        crawl_id: str,
+        ordering: str | None = None,
+        max_pages: int | None = None,
+        max_bytes: int | None = None,
+        deadline: float | None = None,
+        concurrency: int = 1,
+        wait: float = 0.0,
+    ):
+        """
+        Start the crawl `crawl_id`, or resume it if it is saved and did not
+        finish (a finished crawl starts over).
+
+        Args:
+            controller (Controller): Controller used to fetch pages.
+            buffer (CheckpointBuffer): Checkpoints of the crawl's counts.
+            phrase (str): Start page.
+            depth (int): Maximum link depth.
+            crawl_id (str): ID the crawl is saved under.
+            ordering (str, optional): Frontier ordering (see `ORDERINGS`);
+                a resumed crawl keeps its ordering unless one is given, a new
+                one uses "bfs".
+            max_pages (int, optional): Pages the whole crawl may count.
+            max_bytes (int, optional): HTML bytes the whole crawl may count.
+            deadline (float, optional): Seconds this run may take.
+            concurrency (int): Maximum number of fetches in flight.
+            wait (float): Delay in seconds before every wave that downloads.
+
+        Raises:
+            ValueError: If the saved crawl has another start page or depth,
+                or an argument is invalid.
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be >= 1, got {concurrency}.")
+        self.controller = controller
+        self.buffer = buffer
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.deadline = deadline
+        self.concurrency = concurrency
+        self.wait = wait
+
+        saved = buffer.store.load_crawl(crawl_id)
+        self.resumed = saved is not None and saved[0][4] != "finished"
+        if self.resumed:
+            _, saved_phrase, saved_depth = saved[0][:3]
+            if (saved_phrase, saved_depth) != (phrase, depth):
+                raise ValueError(
+                    f"Crawl {crawl_id!r} started from {saved_phrase!r} with depth "
+                    f"{saved_depth}; use another crawl ID for {phrase!r} with depth {depth}."
+                )
+            self.frontier = Frontier.load(saved, ordering)
+            self.frontier.status = "running"
+        else:
+            if saved is not None:
+                buffer.store.remove_crawl(crawl_id)
+            self.frontier = Frontier(crawl_id, phrase, depth, ordering or "bfs")
+
+    def budget_spent(self, started: float) -> str | None:
+        """Return the name of the first budget that is spent, or None."""
+        frontier = self.frontier
+        if self.max_pages is not None and frontier.pages >= self.max_pages:
+            return "max pages"
+        if self.max_bytes is not None and frontier.bytes >= self.max_bytes:
+            return "max bytes"
+        if self.deadline is not None and time.monotonic() - started >= self.deadline:
+            return "deadline"
+        return None
+
+    def run(self, on_page: Callable[[Page], None]) -> str:
+        """
+        Crawl until the frontier is empty or a budget is spent.
+
+        Pages that cannot be downloaded are reported and skipped. The state
+        is saved with every checkpoint of `buffer` (at its cadence) and once
+        more at the end, also when the crawl is interrupted.
+
+        Args:
+            on_page (Callable[[Page], None]): Callback counting a page.
+
+        Returns:
+            str: The crawl's status ("finished" or "stopped: <budget>").
+        """
+        frontier, buffer = self.frontier, self.buffer
+        buffer.state = frontier
+        started = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                while True:
+                    spent = self.budget_spent(started)
+                    if spent is not None:
+                        frontier.status = f"stopped: {spent}"
+                        break
+                    wave = self._next_wave()
+                    if not wave:
+                        frontier.status = "finished"
+                        break
+                    for phrase, depth, page, error in self._fetch(executor, wave):
+                        if page is None:
+                            print(f"Skipping {phrase}: {error}")
+                            frontier.done(phrase, None)
+                            continue
+                        # Counted first: a checkpoint never records a page as
+                        # counted without its counts. A page counted but not
+                        # recorded is fetched again on resume, and the
+                        # buffer skips its counts.
+                        on_page(page)
+                        if depth < frontier.depth:
+                            for link in page.links():
+                                frontier.add(link, depth + 1)
+                        frontier.done(phrase, len(page.html.encode("utf-8")))
+                        page.release()
+        finally:
+            buffer.flush()
+            buffer.state = None
+        return frontier.status
+
+    def _next_wave(self) -> list[tuple[str, int]]:
+        """Pop the pages of the next wave of fetches, within the page budget."""
+        size = self.concurrency * self.controller.batch_size
+        if self.max_pages is not None:
+            size = min(size, self.max_pages - self.frontier.pages)
+        wave = []
+        while len(wave) < size:
+            entry = self.frontier.pop()
+            if entry is None:
+                break
+            wave.append(entry)
+        return wave
+
+    def _fetch(self, executor: ThreadPoolExecutor, wave: list[tuple[str, int]]) -> list[tuple]:
+        """
+        Fetch the pages of a wave, `controller.batch_size` per request.
+
+        Returns:
+            list[tuple]: (phrase, depth, page, error) for every page of the
+                wave, in wave order; page is None if it could not be fetched.
+        """
+        phrases = [phrase for phrase, _ in wave]
+        if self.wait and self.controller.needs_download(phrases):
+            time.sleep(self.wait)
+        size = self.controller.batch_size
+        batches = [phrases[i:i + size] for i in range(0, len(phrases), size)]
+
+        def fetch(batch: list[str]) -> tuple[dict[str, Page], str]:
+            try:
+                pages = self.controller._get_pages(batch)
+                return {cache_key(page.phrase): page for page in pages}, ""
+            except FetchError as e:
+                return {}, str(e)
+
+        fetched, errors = {}, {}
+        for batch, (pages, error) in zip(batches, executor.map(fetch, batches)):
+            fetched.update(pages)
+            errors.update((phrase, error or "missing") for phrase in batch)
+        return [(phrase, depth, fetched.get(cache_key(phrase)), errors[phrase])
+                for phrase, depth in wave]
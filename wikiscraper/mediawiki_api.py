@@ -0,0 +1,252 @@
+"""
+Module: mediawiki_api.py
+
+Provides a page source that uses the MediaWiki API (`api.php`) instead of
+downloading skin-rendered HTML pages.
+
+Two request types are used:
+    - `action=parse` for a single page: returns only the rendered article
+      content (no skin, menus or footer), used for summaries, tables and
+      single-page word counts.
+    - `action=query&prop=revisions|links` for many pages at once: returns
+      the wikitext and the links of up to `config.API_BATCH_SIZE` titles
+      per request, rendered locally by `wikitext.to_html`. Used by crawls.
+
+MediaWiki cannot parse several pages in one request, so the two paths
+render a page differently. Links are the same: the query's `prop=links`
+lists every link of the parsed page, including those added by templates
+(navboxes, infoboxes), and they are added to the rendered wikitext, so
+crawls with either backend reach the same pages. Words are not: the local
+renderer drops templates, so text that templates render (infobox fields,
+navbox labels) is missing from batched pages, and word counts of a crawl
+can differ slightly from `count_words` of the same page.
+
+The responses are stored in the page cache under their own keys
+(`<key>@parse`, `<key>@wikitext` and `<key>@links`), so they never mix with
+cached HTML pages. Requests are paced and retried by an `AdaptiveThrottle`.
+
+Classes:
+    ApiBackend: Fetches `Page` objects through the MediaWiki API.
+
+Usage Example:
+    backend = ApiBackend("https://bulbapedia.bulbagarden.net/w/api.php")
+    page = backend.fetch("Pikachu")
+    pages = backend.fetch_many(["Pikachu", "Raichu", "Pichu"])
+"""
+
+from urllib.parse import unquote
+
+import requests
+
+from wikiscraper import config
+from wikiscraper.cache import PageCache, cache_key, get_cache
+from wikiscraper.page import Page
+from wikiscraper.throttle import AdaptiveThrottle, FetchError
+from wikiscraper.wikitext import to_html
+
+
+class ApiBackend:
+    """
+    MediaWiki API page source with multi-title batches.
+
+    Attributes:
+        api_url (str): URL of the wiki's `api.php`.
+        session (requests.Session | None): Shared HTTP session.
+        cache (PageCache): Page cache for API responses.
+        timeout (float): Timeout in seconds for HTTP requests.
+        batch_size (int): Maximum number of titles per query request.
+        throttle (AdaptiveThrottle): Request pacing and retry policy.
+        requests_made (int): Number of API requests sent.
+        bytes_received (int): Number of response bytes received.
+    """
+
+    def __init__(
+        self,
+        api_url: str,
+        session: requests.Session | None = None,
+        cache: PageCache | None = None,
+        timeout: float = config.DEFAULT_TIMEOUT_S,
+        batch_size: int = config.API_BATCH_SIZE,
+        throttle: AdaptiveThrottle | None = None,
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            api_url (str): URL of the wiki's `api.php`.
+            session (requests.Session, optional): Shared HTTP session.
+            cache (PageCache, optional): Page cache; defaults to the shared
+                cache of `config.CACHE_DIR`.
+            timeout (float): Timeout in seconds for HTTP requests.
+            batch_size (int): Maximum number of titles per query request.
+            throttle (AdaptiveThrottle, optional): Throttle shared with other
+                downloads from the same wiki; defaults to a new one.
+        """
+        self.api_url = api_url
+        self.session = session
+        self.cache = cache if cache is not None else get_cache()
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.throttle = throttle if throttle is not None else AdaptiveThrottle()
+        self.requests_made = 0
+        self.bytes_received = 0
+
+    @staticmethod
+    def api_title(phrase: str) -> str:
+        """Convert a phrase or link target to a wiki title (`Team_Rocket` -> `Team Rocket`)."""
+        return unquote(phrase.split("#", 1)[0]).replace("_", " ").strip()
+
+    @staticmethod
+    def _key(phrase: str, kind: str) -> str:
+        """Return the cache key of an API response of `kind` for `phrase`."""
+        return f"{cache_key(phrase)}@{kind}"
+
+    def _is_cached(self, key: str) -> bool:
+        """Check if `key` is cached and fresh."""
+        return key in self.cache and self.cache.is_fresh(key, config.CACHE_MAX_AGE_S)
+
+    def needs_download(self, phrases: list[str], batched: bool = True) -> bool:
+        """Check if fetching `phrases` requires at least one API request."""
+        kinds = ("wikitext", "links") if batched else ("parse",)
+        return not all(self._is_cached(self._key(p, kind)) for p in phrases for kind in kinds)
+
+    def _call(self, params: dict) -> dict:
+        """
+        Send one API request and return the decoded JSON response.
+
+        Raises:
+            FetchError: If the request fails or the API reports an error.
+        """
+        params = {**params, "format": "json", "formatversion": "2"}
+        http = self.session if self.session is not None else requests
+
+        def send() -> requests.Response:
+            r = http.get(self.api_url, params=params, timeout=self.timeout)
+            self.requests_made += 1
+            self.bytes_received += len(r.content)
+            return r
+
+        r = self.throttle.request(send, what=self.api_url)
+        if r.status_code != 200:
+            raise FetchError(
+                f"Cannot download contents from API: HTTP {r.status_code}",
+                status=r.status_code,
+            )
+        data = r.json()
+        if "error" in data:
+            raise FetchError(
+                f"MediaWiki API error: {data['error'].get('info', data['error'])}"
+            )
+        return data
+
+    def fetch(self, phrase: str) -> Page:
+        """
+        Fetch the rendered article content of one page (`action=parse`).
+
+        Args:
+            phrase (str): Page name or phrase.
+
+        Returns:
+            Page: Page whose HTML is the article content only.
+        """
+        key = self._key(phrase, "parse")
+        if self._is_cached(key):
+            data = self.cache.get(key)
+            if data is not None:
+                return Page(phrase=cache_key(phrase), html=data.decode("utf-8"))
+
+        data = self._call({
+            "action": "parse",
+            "page": self.api_title(phrase),
+            "prop": "text",
+            "redirects": "1",
+            "disableeditsection": "1",
+            "disablelimitreport": "1",
+        })
+        html = data["parse"]["text"]
+        self.cache.put(key, html.encode("utf-8"))
+        return Page(phrase=cache_key(phrase), html=html)
+
+    def fetch_many(self, phrases: list[str]) -> dict[str, Page]:
+        """
+        Fetch many pages with as few requests as possible.
+
+        Cached pages are read from the cache; the rest are requested in
+        batches of `batch_size` titles (`action=query&prop=revisions|links`).
+        Pages that do not exist are left out of the result.
+
+        Args:
+            phrases (list[str]): Page names or link targets.
+
+        Returns:
+            dict[str, Page]: Pages keyed by the requested phrase.
+        """
+        pages: dict[str, Page] = {}
+        to_download = []
+        for phrase in phrases:
+            keys = self._key(phrase, "wikitext"), self._key(phrase, "links")
+            cached = [self.cache.get(key) if self._is_cached(key) else None for key in keys]
+            if None not in cached:
+                wikitext, links = (data.decode("utf-8") for data in cached)
+                pages[phrase] = self._wikitext_page(phrase, wikitext, links.split("\n"))
+            else:
+                to_download.append(phrase)
+
+        for start in range(0, len(to_download), self.batch_size):
+            batch = to_download[start:start + self.batch_size]
+            for phrase, (wikitext, links) in self._query_wikitext(batch).items():
+                self.cache.put(self._key(phrase, "wikitext"), wikitext.encode("utf-8"))
+                self.cache.put(self._key(phrase, "links"), "\n".join(links).encode("utf-8"))
+                pages[phrase] = self._wikitext_page(phrase, wikitext, links)
+        return pages
+
+    def _query_wikitext(self, phrases: list[str]) -> dict[str, tuple[str, list[str]]]:
+        """Request the wikitext and links of up to `batch_size` phrases with one query."""
+        titles = {phrase: self.api_title(phrase) for phrase in phrases}
+        params = {
+            "action": "query",
+            "prop": "revisions|links",
+            "rvprop": "content",
+            "rvslots": "main",
+            "plnamespace": "0",
+            "pllimit": "max",
+            "redirects": "1",
+            "titles": "|".join(dict.fromkeys(titles.values())),
+        }
+
+        renamed: dict[str, str] = {}
+        contents: dict[str, str] = {}
+        links: dict[str, list[str]] = {}
+        while True:
+            data = self._call(params)
+            query = data.get("query", {})
+            for item in query.get("normalized", []) + query.get("redirects", []):
+                renamed[item["from"]] = item["to"]
+            for page in query.get("pages", []):
+                if page.get("missing"):
+                    continue
+                revisions = page.get("revisions")
+                if revisions:
+                    contents[page["title"]] = revisions[0]["slots"]["main"]["content"]
+                # Links of a page can be split over several continuations.
+                links.setdefault(page["title"], []).extend(
+                    link["title"] for link in page.get("links", [])
+                )
+            if "continue" not in data:
+                break
+            params.update(data["continue"])
+
+        result = {}
+        for phrase, title in titles.items():
+            seen = set()
+            while title in renamed and title not in seen:
+                seen.add(title)
+                title = renamed[title]
+            if title in contents:
+                result[phrase] = contents[title], links.get(title, [])
+        return result
+
+    @staticmethod
+    def _wikitext_page(phrase: str, wikitext: str, links: list[str]) -> Page:
+        """Build a Page from wikitext and the links of the parsed page."""
+        return Page(phrase=cache_key(phrase), html=to_html(wikitext, [title for title in links if title]))
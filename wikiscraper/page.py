@@ -4,6 +4,23 @@ Module: models.py
 Provides the Page class for processing HTML content of wiki pages.
 Includes methods for extracting summaries, tables, word counts, and links.
 
+The HTML is parsed lazily, at most once per page: the document, its content
+root, the link list and the word counts are memoized, so any combination of
+`summary`, `table`, `links` and `get_dict` costs a single parse. `release`
+drops the parse tree to free memory once it is no longer needed.
+
+With `Page.engine` set to "stream", words, links, the summary and the table
+positions come from the single-pass extractor (`extractor.py`) instead of a
+BeautifulSoup tree; a table is then parsed from its slice of the HTML only.
+
+With `Page.corpus` set, `count_words` also records the page's counts in the
+corpus store (`corpus.py`) under its title and `content_hash`.
+
+Tables are read from the parsed `<table>` tag by `tables.read_table`, which
+gives the same DataFrame as `pd.read_html` without parsing the table again.
+pandas (through `tables.py`) and the corpus store are only imported by the
+methods that use them, so summaries and word counts start without them.
+
 Classes:
     Page: Represents a wiki page and provides methods to interact with its content.
 
@@ -11,20 +28,31 @@ Usage Example:
     page = Page("Pikachu", html_content)
     page.summary()  # Print the first paragraph
     df = page.table(1, first_row_is_header=True)  # Extract first table
+    catalog = page.table_catalog()  # Index, shape and caption of every table
+    frames = page.tables()  # Extract all tables at once
     words = page.count_words()  # Count words
-    links = page.links()  # Get all wiki links
+    links = page.links()  # Get all wiki links (no second parse)
+    page.release()  # Free the parse tree
 """
 
-import io
-import json
+from __future__ import annotations
+
+import hashlib
 import textwrap
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING
 
-import pandas as pd
 from bs4 import BeautifulSoup
 
 from . import config
+from .extractor import Extraction, extract, wiki_link_target
+from .tokenizer import Tokenizer
+from .word_counts import merge_word_counts
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .tables import TableInfo
 
 
 class Page:
@@ -35,14 +63,29 @@ class Page:
         - Extracting the main content
         - Printing a summary paragraph
         - Extracting tables as DataFrames and saving them to CSV
+        - Listing the real tables of the page (table catalog)
         - Counting words and updating a JSON word count file
         - Extracting valid wiki links
 
     Attributes:
         phrase (str): The search phrase corresponding to the wiki page.
-        html (str): The HTML content of the page.
+        html (str): The HTML content of the page. Assigning new HTML drops
+            everything memoized from the old one.
+        engine (str): Extraction engine of all pages, "soup" or "stream"
+            (class attribute, defaults to `config.PARSE_ENGINE`).
+        tokenizer (Tokenizer): Word tokenizer of all pages (class attribute,
+            with the normalizers of `config.TOKEN_NORMALIZERS`).
+        corpus (bool): Whether `count_words` also records the page in the
+            corpus store (class attribute, defaults to `config.RECORD_CORPUS`).
+        shared (bool): Set on pages kept in a controller's page memory, which
+            other threads may be reading: `release` then keeps the tree.
     """
 
+    engine: str = config.PARSE_ENGINE
+    tokenizer: Tokenizer = Tokenizer(config.TOKEN_NORMALIZERS)
+    corpus: bool = config.RECORD_CORPUS
+    shared: bool = False
+
     def __init__(self, phrase: str, html: str):
         """
         Initialize the Page object.
@@ -54,6 +97,53 @@ class Page:
         self.phrase = phrase
         self.html = html
 
+    @property
+    def html(self) -> str:
+        """str: The HTML content of the page."""
+        return self._html
+
+    @html.setter
+    def html(self, html: str) -> None:
+        self._html = html
+        self._html_bytes: bytes | None = None
+        self._soup: BeautifulSoup | None = None
+        self._content = None
+        self._content_found = False
+        self._links: list[str] | None = None
+        self._words: dict[str, int] | None = None
+        self._extraction: Extraction | None = None
+        self._tables: list | None = None
+        self._catalog: list[TableInfo] | None = None
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        """BeautifulSoup: The parsed document, built on first access."""
+        if self._soup is None:
+            self._soup = BeautifulSoup(self._html, "lxml")
+        return self._soup
+
+    def extraction(self) -> Extraction:
+        """Return the memoized result of the single-pass extractor."""
+        if self._extraction is None:
+            self._extraction = extract(self._html, self.tokenizer)
+        return self._extraction
+
+    def release(self) -> None:
+        """
+        Free the parse tree and the encoded HTML. Memoized links and word
+        counts are kept; methods that need the tree again parse the HTML
+        again. Shared pages keep it.
+        """
+        if self.shared:
+            return
+        if self._soup is not None:
+            self._soup.decompose()
+        self._soup = None
+        self._html_bytes = None
+        self._tables = None
+        self._content = None
+        self._content_found = False
+
     def get_content(self) -> BeautifulSoup:
         """
         Extract the main content div from the HTML.
@@ -63,9 +153,12 @@ class Page:
         Returns:
             BeautifulSoup tag or None: The main content of the page.
         """
-        soup = BeautifulSoup(self.html, "lxml")
-        return soup.select_one("div.mw-content-ltr") or \
-            soup.select_one("#mw-content-text")
+        if not self._content_found:
+            soup = self.soup
+            self._content = soup.select_one("div.mw-content-ltr") or \
+                soup.select_one("#mw-content-text")
+            self._content_found = True
+        return self._content
 
     def summary(self) -> str:
         """
@@ -74,13 +167,17 @@ class Page:
         Returns:
             str: The first paragraph text or empty string if none found.
         """
-        content = self.get_content()
-        if not content:
-            print("")
-            return ""
-
-        for p in content.find_all("p", recursive=True):
-            text = p.get_text(" ", strip=True)
+        if self.engine == "stream":
+            texts = [self.extraction().summary]
+        else:
+            content = self.get_content()
+            if not content:
+                print("")
+                return ""
+            texts = (p.get_text(" ", strip=True)
+                     for p in content.find_all("p", recursive=True))
+
+        for text in texts:
             if text:
                 summary = "\n".join(
                     textwrap.wrap(text, width=150)
@@ -101,11 +198,8 @@ class Page:
         Returns:
             bool: True if the table is likely meaningful, False otherwise.
         """
-        bad_classes = (
-            "navbox", "vertical-navbox", "infobox", "metadata",
-            "toc", "sisterproject", "mbox"
-        )
-        if any(cls in table_tag.get("class", []) for cls in bad_classes):
+        classes = table_tag.get("class", [])
+        if any(cls in classes for cls in config.BAD_TABLE_CLASSES):
             return False
 
         rows = table_tag.find_all("tr", recursive=True)
@@ -119,6 +213,95 @@ class Page:
 
         return False
 
+    def _real_tables(self) -> list:
+        """
+        Return the real tables of the content root as `<table>` tags, in
+        document order (memoized until `release`).
+
+        With the stream engine only the slices of the real tables are parsed.
+        """
+        if self._tables is None:
+            offsets = self.extraction().table_offsets if self.engine == "stream" else None
+            if offsets is not None:
+                self._tables = [
+                    BeautifulSoup(self._table_html(start, end), "lxml").find("table")
+                    for start, end in offsets
+                ]
+            else:
+                content = self.get_content()
+                tables = content.find_all("table") if content is not None else []
+                self._tables = [t for t in tables if self.is_real_table(t)]
+        return self._tables
+
+    def _table_html(self, start: int, end: int) -> str:
+        """Return the HTML between two UTF-8 byte offsets of the page."""
+        if self._html_bytes is None:
+            self._html_bytes = self._html.encode("utf-8")
+        return self._html_bytes[start:end].decode("utf-8")
+
+    def table_catalog(self) -> list[TableInfo]:
+        """
+        Return the catalog of the page's real tables: index (as used by
+        `table`), shape and caption of each. Computed once per page.
+
+        Returns:
+            list[TableInfo]: One entry per real table, in document order.
+        """
+        from .tables import table_info
+
+        if self._catalog is None:
+            self._catalog = [
+                table_info(tag, index)
+                for index, tag in enumerate(self._real_tables(), start=1)
+            ]
+        return list(self._catalog)
+
+    def _table_tag(self, n: int):
+        """
+        Return the `<table>` tag of the n-th real table.
+
+        With the stream engine only the slice of that table is parsed.
+
+        Raises:
+            ValueError: If n is not within the number of tables found.
+        """
+        offsets = self.extraction().table_offsets if self.engine == "stream" else None
+        if offsets is not None and self._tables is None:
+            cnt = len(offsets)
+            if 1 <= n <= cnt:
+                html = self._table_html(*offsets[n - 1])
+                return BeautifulSoup(html, "lxml").find("table")
+        else:
+            tables = self._real_tables()
+            cnt = len(tables)
+            if 1 <= n <= cnt:
+                return tables[n - 1]
+        raise ValueError(f"Found {cnt} real tables, but chosen number {n}.")
+
+    def _read_table(self, n: int, first_row_is_header: bool) -> pd.DataFrame | None:
+        """
+        Read the n-th real table into a DataFrame with flat column names.
+
+        Raises:
+            ValueError: If n is not within the number of tables found.
+        """
+        import pandas as pd
+
+        from .tables import read_table
+
+        df = read_table(self._table_tag(n), first_row_is_header)
+        if df is None:
+            return None
+
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = [
+                "_".join(
+                    str(level) for level in col if "Unnamed" not in str(level)
+                )
+                for col in df.columns
+            ]
+        return df
+
     def table(
         self,
         n: int,
@@ -140,60 +323,71 @@ class Page:
         Raises:
             ValueError: If n is not within the number of tables found.
         """
-        content = self.get_content()
-        tables = content.find_all("table")
+        from .tables import value_counts
 
-
-        cnt = 0
-        target_table_html = None
-        for table in tables:
-            if not self.is_real_table(table):
-                continue
-            cnt += 1
-            if cnt == n:
-                target_table_html = str(table)
-                break
-
-        if target_table_html is None:
-            raise ValueError(f"Found {cnt} real tables, but chosen number {n}.")
-
-        header = 0 if first_row_is_header else None
-        dfs = pd.read_html(io.StringIO(target_table_html), header=header)
-        if not dfs:
+        df = self._read_table(n, first_row_is_header)
+        if df is None:
             return None
-        df = dfs[0]
-
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = [
-                "_".join(
-                    str(level) for level in col if "Unnamed" not in str(level)
-                )
-                for col in df.columns
-            ]
 
         filename = f"{self.phrase}_{n}.csv"
         filepath = Path(output_dir) / filename
         df.to_csv(filepath, index=False)
 
-        all_values = df.to_numpy().flatten()
-        all_values = [v for v in all_values if pd.notna(v)]
-        counts = pd.Series(all_values).value_counts().reset_index()
-        counts.columns = ["Wartość", "Liczba wystąpień"]
-        print(counts.to_string(index=False))
+        print(value_counts(df).to_string(index=False))
         print(df)
 
         return df
 
+    def tables(
+        self,
+        output_dir: str = config.DATA_DIR,
+        first_row_is_header: bool = False
+    ) -> dict[int, pd.DataFrame]:
+        """
+        Extract every real table of the page in one pass.
+
+        Each table is saved to its own CSV file (as `table` does), and all
+        of them together to one multi-table file (`<phrase>_tables.parquet`,
+        or `<phrase>_tables.json` without pyarrow). Tables that pandas cannot
+        read are reported and skipped.
+
+        Args:
+            output_dir (str | Path): Directory to save the files.
+            first_row_is_header (bool): Treat first row as header if True.
+
+        Returns:
+            dict[int, pd.DataFrame]: The extracted tables keyed by index.
+        """
+        from .tables import write_tables
+
+        catalog = self.table_catalog()
+        frames: dict[int, pd.DataFrame] = {}
+        for info in catalog:
+            try:
+                df = self._read_table(info.index, first_row_is_header)
+            except ValueError as e:
+                print(f"Table {info.index} skipped: {e}")
+                continue
+            if df is None:
+                continue
+            df.to_csv(Path(output_dir) / f"{self.phrase}_{info.index}.csv", index=False)
+            frames[info.index] = df
+
+        target = write_tables(frames, catalog, Path(output_dir) / f"{self.phrase}_tables")
+        print(f"Saved {len(frames)} of {len(catalog)} tables to {target}")
+        return frames
+
     def get_dict(self) -> dict[str, int]:
         """Return a dictionary of word counts from the page content."""
-        soup = BeautifulSoup(self.html, "lxml")
-        text = soup.get_text(separator="\n")
-        words_found: dict[str, int] = {}
-        for word in text.split():
-            word = word.lower()
-            if word.isalpha():
-                words_found[word] = words_found.get(word, 0) + 1
-        return words_found
+        if self._words is None and self.engine == "stream":
+            self._words = self.extraction().words
+        if self._words is None:
+            self._words = self.tokenizer.count(self.soup.get_text(separator="\n"))
+        return dict(self._words)
+
+    def content_hash(self) -> str:
+        """Return a hash of the HTML content (hex), identifying its version."""
+        return hashlib.blake2b(self.html.encode("utf-8"), digest_size=16).hexdigest()
 
     def count_words(self) -> list[str]:
         """
@@ -202,24 +396,12 @@ class Page:
         Returns:
             list[str]: List of words found in the page.
         """
-        path = Path(config.WORD_COUNTS_JSON)
-        if not path.exists():
-            path.write_text("{}", encoding="utf-8")
-
-        try:
-            raw = path.read_text(encoding="utf-8").strip()
-            data: dict[str, Any] = json.loads(raw) if raw else {}
-        except json.JSONDecodeError:
-            data = {}
-
         words_found = self.get_dict()
-        for word, count in words_found.items():
-            data[word] = data.get(word, 0) + count
+        merge_word_counts(words_found, page=self.phrase)
+        if self.corpus:
+            from .corpus import record_page
 
-        path.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding="utf-8"
-        )
+            record_page(self.phrase, self.content_hash(), words_found)
         return list(words_found.keys())
 
     def links(self) -> list[str]:
@@ -229,18 +411,18 @@ class Page:
         Returns:
             list[str]: List of linked phrases on the wiki page.
         """
+        if self._links is not None:
+            return list(self._links)
+        if self.engine == "stream":
+            self._links = self.extraction().links
+            return list(self._links)
+
         content = self.get_content()
         links = []
         for a in content.find_all("a", href=True):
-            link = a["href"]
-            if not link.startswith("/wiki/"):
-                continue
-            if any(link.startswith(prefix) for prefix in config.BAD_PREFIXES):
-                continue
-            if any(link.endswith(ext) for ext in config.BAD_EXTENSIONS):
-                continue
-            if link in config.BAD_LINKS:
-                continue
-            links.append(link.removeprefix("/wiki/"))
+            link = wiki_link_target(a["href"])
+            if link is not None:
+                links.append(link)
 
-        return list(set(links))
+        self._links = list(set(links))
+        return list(self._links)
@@ -8,9 +8,15 @@ using argparse.
 Supported commands:
     - summary: Get a summary of a wiki article.
     - count_words: Count words in a wiki article.
-    - table: Find the n-th table in a wiki article.
+    - table: Find the n-th table in a wiki article, list or extract all tables.
     - analyze_relative_word_frequency: Analyze relative word frequency in an article or language.
     - auto_count_words: Automatically count words in articles up to a given depth.
+    - ingest_dump: Count words of all articles in a MediaWiki XML dump.
+    - top_words: Most frequent words of the per-page corpus store.
+    - score_pages: Language confidence scores of pages, as in analysis.ipynb.
+    - sample_pages: Worst and best language matches found by random walks.
+    - batch: Run many commands at once, fetching and parsing every page once.
+    - serve: Keep a warm process serving the other commands over a Unix socket.
 
 Usage Example:
     parser = Parser()
@@ -21,6 +27,8 @@ Usage Example:
 
 import argparse
 
+from wikiscraper import config
+
 
 class Parser:
     """
@@ -33,6 +41,49 @@ class Parser:
     def __init__(self):
         """Initialize the CLI parser and define all subcommands and arguments."""
         self.parser = argparse.ArgumentParser(description="Wiki scraper CLI")
+
+        # ---------------- run options (before the command) ----------------
+        self.parser.add_argument(
+            "--cache-compression",
+            choices=["raw", "gzip", "zdict"],
+            help="On-disk format for newly cached pages",
+        )
+        self.parser.add_argument(
+            "--backend",
+            choices=["html", "api"],
+            help="Fetch rendered HTML pages or use the MediaWiki API",
+        )
+        self.parser.add_argument(
+            "--engine",
+            choices=["soup", "stream"],
+            help="Extract page data with BeautifulSoup or the single-pass "
+                 "streaming extractor",
+        )
+        self.parser.add_argument(
+            "--normalize",
+            action="append",
+            choices=["casefold", "apostrophes", "digits"],
+            help="Word normalizer for counting words (repeatable)",
+        )
+        self.parser.add_argument(
+            "--corpus",
+            action="store_const",
+            const=True,
+            help="Also record per-page word counts in the corpus store",
+        )
+        self.parser.add_argument(
+            "--approximate",
+            action="store_const",
+            const=True,
+            help="Count words in a bounded-memory count-min sketch with "
+                 "top-K words instead of exactly",
+        )
+        self.parser.add_argument(
+            "--sketch-mb",
+            type=float,
+            help="Memory budget of a new approximate-count sketch in MB",
+        )
+
         subparsers = self.parser.add_subparsers(dest="command")
 
         # ---------------- summary ----------------
@@ -50,8 +101,19 @@ class Parser:
             "table", help="Finding n-th table in an article"
         )
         table.add_argument("phrase", help="Phrase to look for")
-        table.add_argument(
-            "--number", "-n", help="Number of a table", type=int, required=True
+        which = table.add_mutually_exclusive_group(required=True)
+        which.add_argument("--number", "-n", help="Number of a table", type=int)
+        which.add_argument(
+            "--all",
+            dest="all_tables",
+            help="Extract every real table of the article at once",
+            action="store_true",
+        )
+        which.add_argument(
+            "--list",
+            dest="list_tables",
+            help="List the real tables of the article (index, shape, caption)",
+            action="store_true",
         )
         table.add_argument(
             "--first-row-is-header",
@@ -78,6 +140,18 @@ class Parser:
                 raise argparse.ArgumentTypeError(f"{value} is not > 0")
             return value
 
+        def positive_float(value):
+            value = float(value)
+            if not value > 0:
+                raise argparse.ArgumentTypeError(f"{value} is not > 0")
+            return value
+
+        def non_negative_int(value):
+            value = int(value)
+            if value < 0:
+                raise argparse.ArgumentTypeError(f"{value} is not >= 0")
+            return value
+
         analyze.add_argument(
             "--count",
             help="How many words will be displayed",
@@ -87,6 +161,100 @@ class Parser:
         analyze.add_argument(
             "--chart", help="Optional path to save chart"
         )
+        analyze.add_argument(
+            "--language",
+            dest="languages",
+            action="append",
+            metavar="CODE",
+            help="Reference language, e.g. en or pl (repeatable; default "
+                 f"{' '.join(config.REFERENCE_LANGUAGES)})",
+        )
+        analyze.add_argument(
+            "--wordlist",
+            choices=["small", "large", "best"],
+            default=config.REFERENCE_WORDLIST,
+            help="wordfreq wordlist of the reference frequencies",
+        )
+
+        # ---------------- top_words ----------------
+        top_words = subparsers.add_parser(
+            "top_words", help="Most frequent words of the corpus store"
+        )
+        top_words.add_argument(
+            "--count", help="Number of words", type=positive_int, default=10
+        )
+        top_words.add_argument(
+            "--pages", nargs="+", metavar="TITLE",
+            help="Only count these pages (default: all recorded pages)",
+        )
+
+        # ---------------- score_pages ----------------
+        score_pages = subparsers.add_parser(
+            "score_pages", help="Language confidence scores of pages"
+        )
+        score_pages.add_argument(
+            "pages", nargs="*", metavar="TITLE",
+            help="Pages to score (default: all pages of the corpus store)",
+        )
+        score_pages.add_argument(
+            "--language",
+            dest="languages",
+            action="append",
+            metavar="CODE",
+            help="Language to score against (repeatable; default "
+                 f"{' '.join(config.SCORING_LANGUAGES)})",
+        )
+        score_pages.add_argument(
+            "--k", dest="k_values", nargs="+", type=positive_int, metavar="K",
+            help="Numbers of most frequent reference words (default "
+                 f"{' '.join(map(str, config.SCORING_K_VALUES))})",
+        )
+        score_pages.add_argument(
+            "--wordlist",
+            choices=["small", "large", "best"],
+            default=config.SCORING_WORDLIST,
+            help="wordfreq wordlist of the references",
+        )
+        score_pages.add_argument(
+            "--output", help="Optional path to save the scores as CSV"
+        )
+
+        # ---------------- sample_pages ----------------
+        sample_pages = subparsers.add_parser(
+            "sample_pages", help="Worst/best language matches by random walks"
+        )
+        sample_pages.add_argument("start", help="Phrase of the start page")
+        sample_pages.add_argument(
+            "--walkers", help="Number of concurrent walks",
+            type=positive_int, default=config.SAMPLE_WALKERS,
+        )
+        sample_pages.add_argument(
+            "--steps", help="Pages scored per walk",
+            type=positive_int, default=config.SAMPLE_STEPS,
+        )
+        sample_pages.add_argument(
+            "--language", help="Language of the scores",
+            default=config.SCORING_LANGUAGES[0],
+        )
+        sample_pages.add_argument(
+            "--k", help="Most frequent reference words of the scores",
+            type=positive_int, default=config.SCORING_K_VALUES[-1],
+        )
+        sample_pages.add_argument(
+            "--wordlist",
+            choices=["small", "large", "best"],
+            default=config.SCORING_WORDLIST,
+            help="wordfreq wordlist of the references",
+        )
+        sample_pages.add_argument(
+            "--seed", help="Seed of the walks", type=int, default=0
+        )
+        sample_pages.add_argument(
+            "--wait", help="Delay between requests in seconds", type=float, default=0.0
+        )
+        sample_pages.add_argument(
+            "--trace-output", help="Optional path to save every scored page as CSV"
+        )
 
         # ---------------- auto_count_words ----------------
         auto_count_words = subparsers.add_parser(
@@ -99,12 +267,105 @@ class Parser:
         auto_count_words.add_argument(
             "--wait", help="Delay between searches in seconds", type=float, required=True
         )
+        auto_count_words.add_argument(
+            "--concurrency",
+            help="Number of pages fetched in parallel (1 = serial crawl)",
+            type=positive_int,
+            default=1,
+        )
+        auto_count_words.add_argument(
+            "--parse-workers",
+            help="Number of processes parsing pages while downloads continue "
+                 "(0 = parse in the crawling process)",
+            type=non_negative_int,
+            default=0,
+        )
+        auto_count_words.add_argument(
+            "--crawl-id",
+            help="Save the crawl's frontier under this ID and resume it if it did not "
+                 "finish (default with --order or a budget: <phrase>:<depth>)",
+        )
+        auto_count_words.add_argument(
+            "--order",
+            choices=["bfs", "depth", "inlinks"],
+            help="Frontier ordering of a resumable crawl (default: bfs, or the saved one)",
+        )
+        auto_count_words.add_argument(
+            "--max-pages",
+            help="Stop the crawl after counting this many pages in total",
+            type=positive_int,
+        )
+        auto_count_words.add_argument(
+            "--max-bytes",
+            help="Stop the crawl after counting this many bytes of HTML in total",
+            type=positive_int,
+        )
+        auto_count_words.add_argument(
+            "--deadline",
+            help="Stop this run of the crawl after this many seconds",
+            type=positive_float,
+        )
+
+        # ---------------- batch ----------------
+        batch = subparsers.add_parser(
+            "batch", help="Run commands from a JSON lines file, sharing page fetches"
+        )
+        batch.add_argument(
+            "file", nargs="?", default="-",
+            help="JSON lines file, one argument list per line (default: stdin)",
+        )
+        batch.add_argument(
+            "--concurrency",
+            help="Maximum number of pages worked on at once",
+            type=positive_int,
+            default=config.BATCH_CONCURRENCY,
+        )
+        batch.add_argument(
+            "--jsonl",
+            help="Print one JSON result per command instead of the commands' output",
+            action="store_true",
+        )
+
+        # ---------------- serve ----------------
+        serve = subparsers.add_parser(
+            "serve", help="Serve commands from a warm process over a Unix socket"
+        )
+        serve.add_argument(
+            "--socket", help="Path of the Unix socket (default: data/wikiscraper.sock)"
+        )
+        serve.add_argument(
+            "--page-memory",
+            help="Number of parsed pages kept in memory",
+            type=non_negative_int,
+            default=config.SERVE_PAGE_MEMORY,
+        )
+
+        # ---------------- ingest_dump ----------------
+        ingest_dump = subparsers.add_parser(
+            "ingest_dump", help="Count words in a MediaWiki XML dump"
+        )
+        ingest_dump.add_argument(
+            "path", help="Path to a .xml, .xml.bz2 or .xml.gz dump file"
+        )
+        ingest_dump.add_argument(
+            "--seed-cache",
+            help="Also store the pages in the cache, for the api backend only "
+            "(commands and crawls; the html backend does not read them)",
+            action="store_true",
+        )
+        ingest_dump.add_argument(
+            "--limit", help="Maximum number of pages to ingest", type=positive_int
+        )
 
-    def parse_args(self):
+    def parse_args(self, argv: list[str] | None = None):
         """
         Parse the command-line arguments.
 
+        Args:
+            argv (list[str], optional): Arguments to parse instead of
+                `sys.argv[1:]` (e.g. a request to the `serve` daemon).
+
         Returns:
             argparse.Namespace: The parsed arguments as a namespace object.
         """
-        return self.parser.parse_args()
+        return self.parser.parse_args(argv)
@@ -0,0 +1,212 @@
+"""
+Module: reference.py
+
+Provides reference word frequencies of a language (from `wordfreq`) as
+arrays, cached on disk, for vectorized lookups.
+
+`wordfreq.word_frequency` tokenizes and normalizes its argument on every
+call, which dominates `analyze_relative_word_frequency` when thousands of
+words are compared. A `ReferenceFrequencies` table holds every word of a
+wordlist in a sorted array together with `wordfreq.word_frequency` of that
+word, so looking up many words is one `np.searchsorted` gather. Words that
+are not in the wordlist (which `wordfreq` may still split into known tokens)
+fall back to `wordfreq.word_frequency`, so the results are identical.
+
+The tables also keep the raw values of `wordfreq.get_frequency_dict` and
+every word's rank in it (descending frequency), which the language scores
+of `scoring.py` use. They are built once per language, wordlist and
+wordfreq version and saved in `config.REFERENCE_CACHE_DIR`.
+
+Classes:
+    ReferenceFrequencies: Word frequencies of one language and wordlist.
+
+Functions:
+    get_reference: Shared, disk-cached table of a language and wordlist.
+    top_indices: Indices of the largest values, ordered like a stable sort.
+
+Usage Example:
+    reference = get_reference("en", "small")
+    reference.lookup(["pokémon", "the", "xyzzy"])  # array([...])
+"""
+
+import os
+import threading
+from importlib.metadata import version
+from pathlib import Path
+
+import numpy as np
+import wordfreq
+
+from . import config
+
+
+def top_indices(values: np.ndarray, n: int) -> np.ndarray:
+    """
+    Return the indices of the `n` largest values, largest first, ties in
+    index order (as a stable descending sort), with a partial selection.
+
+    Args:
+        values (np.ndarray): Values to rank.
+        n (int): Number of indices.
+
+    Returns:
+        np.ndarray: Up to `n` indices.
+    """
+    n = min(n, len(values))
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    if n < len(values):
+        threshold = np.partition(values, len(values) - n)[len(values) - n]
+        # All values above the n-th largest, plus the first ties at it.
+        above = np.flatnonzero(values > threshold)
+        ties = np.flatnonzero(values == threshold)[:n - len(above)]
+        candidates = np.concatenate((above, ties))
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+class ReferenceFrequencies:
+    """
+    Word frequencies of one language and wordlist as sorted arrays.
+
+    Attributes:
+        language (str): Language code.
+        wordlist (str): wordfreq wordlist ("small", "large" or "best").
+        words (np.ndarray): Words of the wordlist, sorted (unicode array).
+        frequencies (np.ndarray): `wordfreq.word_frequency` of every word.
+        dict_frequencies (np.ndarray): `wordfreq.get_frequency_dict` value of
+            every word.
+        ranks (np.ndarray): Position of every word in the frequency dict
+            sorted by descending frequency (a stable sort), from 0.
+    """
+
+    def __init__(
+        self,
+        language: str,
+        wordlist: str,
+        words: np.ndarray,
+        frequencies: np.ndarray,
+        dict_frequencies: np.ndarray,
+        ranks: np.ndarray,
+    ):
+        self.language = language
+        self.wordlist = wordlist
+        self.words = words
+        self.frequencies = frequencies
+        self.dict_frequencies = dict_frequencies
+        self.ranks = ranks
+
+    @classmethod
+    def build(cls, language: str, wordlist: str) -> "ReferenceFrequencies":
+        """
+        Build the table from wordfreq.
+
+        Raises:
+            ValueError: If wordfreq has no such wordlist for the language.
+        """
+        try:
+            freq_dict = wordfreq.get_frequency_dict(language, wordlist)
+        except (LookupError, ValueError) as e:
+            raise ValueError(
+                f"No {wordlist!r} wordlist for language {language!r}: {e}"
+            ) from None
+        listed = np.fromiter(freq_dict.values(), dtype=np.float64, count=len(freq_dict))
+        ranks = np.empty(len(listed), dtype=np.int64)
+        ranks[np.argsort(-listed, kind="stable")] = np.arange(len(listed))
+        order = np.argsort(np.array(list(freq_dict), dtype=str), kind="stable")
+        words = np.array(list(freq_dict), dtype=str)[order]
+        frequencies = np.fromiter(
+            (wordfreq.word_frequency(w, language, wordlist=wordlist) for w in words.tolist()),
+            dtype=np.float64, count=len(words),
+        )
+        return cls(language, wordlist, words, frequencies, listed[order], ranks[order])
+
+    @staticmethod
+    def path(language: str, wordlist: str) -> Path:
+        """Return the cache file of a language and wordlist."""
+        name = f"{language}_{wordlist}_wordfreq-{version('wordfreq')}.npz"
+        return Path(config.REFERENCE_CACHE_DIR) / name
+
+    def save(self) -> None:
+        """Write the table to its cache file (temporary file and rename)."""
+        path = self.path(self.language, self.wordlist)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as file:
+            np.savez(file, words=self.words, frequencies=self.frequencies,
+                     dict_frequencies=self.dict_frequencies, ranks=self.ranks)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, language: str, wordlist: str) -> "ReferenceFrequencies | None":
+        """Read the cached table, or None if it is not cached."""
+        try:
+            with np.load(cls.path(language, wordlist)) as arrays:
+                return cls(language, wordlist, arrays["words"], arrays["frequencies"],
+                           arrays["dict_frequencies"], arrays["ranks"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def positions(self, words: list[str]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Find words in the table (exact matches only).
+
+        Args:
+            words (list[str]): Words to find.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Position of every word in `words`
+                (clipped, only valid where found) and whether it was found.
+        """
+        if not words or not len(self.words):
+            return np.zeros(len(words), dtype=np.int64), np.zeros(len(words), dtype=bool)
+        query = np.array(words, dtype=str)
+        positions = np.minimum(np.searchsorted(self.words, query), len(self.words) - 1)
+        return positions, self.words[positions] == query
+
+    def lookup(self, words: list[str]) -> np.ndarray:
+        """
+        Return `wordfreq.word_frequency(word, language, wordlist=wordlist)`
+        of every word.
+
+        Args:
+            words (list[str]): Words to look up.
+
+        Returns:
+            np.ndarray: Frequencies (float64), 0 for unknown words.
+        """
+        if not words or not len(self.words):
+            return np.array(
+                [wordfreq.word_frequency(w, self.language, wordlist=self.wordlist) for w in words],
+                dtype=np.float64,
+            )
+        positions, found = self.positions(words)
+        result = np.where(found, self.frequencies[positions], 0.0)
+        for i in np.flatnonzero(~found).tolist():
+            result[i] = wordfreq.word_frequency(words[i], self.language, wordlist=self.wordlist)
+        return result
+
+
+_references: dict[tuple[str, str], ReferenceFrequencies] = {}
+_references_lock = threading.Lock()
+
+
+def get_reference(language: str, wordlist: str = config.REFERENCE_WORDLIST) -> ReferenceFrequencies:
+    """
+    Return the table of a language and wordlist, from memory, the disk cache
+    or built (and cached) from wordfreq.
+
+    Raises:
+        ValueError: If wordfreq has no such wordlist for the language.
+    """
+    key = (language, wordlist)
+    with _references_lock:
+        reference = _references.get(key)
+        if reference is None:
+            reference = ReferenceFrequencies.load(language, wordlist)
+            if reference is None:
+                reference = ReferenceFrequencies.build(language, wordlist)
+                reference.save()
+            _references[key] = reference
+        return reference
@@ -0,0 +1,158 @@
+"""
+Module: runner.py
+
+Helpers for running several CLI commands inside one process, as the `serve`
+daemon (`server.py`) and the `batch` command (`batch.py`) do: every command
+gets its own captured output and exit code, even when commands run at once
+in different threads.
+
+Output is captured per thread: while an `OutputCapture` is installed,
+`sys.stdout` and `sys.stderr` write to the buffers of the calling thread's
+`capture` block, and to the original streams outside of one. Output of
+threads a command starts itself is not captured.
+
+Classes:
+    OutputCapture: Per-thread capture of standard output and error.
+
+Run options (`Controller.RUN_OPTIONS`) change process-wide state through
+`Controller.configure`; `run_state` and `restore_run_state` snapshot and undo
+it, so a command's run options do not carry over to the next command.
+
+Functions:
+    run_command: Run parsed CLI arguments on a controller, returning the exit code.
+    exit_code: Exit code of a `SystemExit`.
+    has_run_options: Whether parsed CLI arguments set run options.
+    run_state: Snapshot the state that `Controller.configure` changes.
+    restore_run_state: Restore a snapshot taken by `run_state`.
+
+Usage Example:
+    output = OutputCapture()
+    output.install()
+    with output.capture() as (stdout, stderr):
+        code = run_command(controller, args)
+    output.uninstall()
+"""
+
+import io
+import sys
+import threading
+import traceback
+from contextlib import contextmanager
+from typing import Iterator
+
+from wikiscraper.page import Page
+from wikiscraper.word_counts import set_sketch
+
+
+class _ThreadOutput(io.TextIOBase):
+    """Text stream writing to the calling thread's buffer, if set, else to `fallback`."""
+
+    def __init__(self, fallback, local: threading.local, name: str):
+        self.fallback = fallback
+        self._local = local
+        self._name = name
+
+    def _target(self):
+        buffer = getattr(self._local, self._name, None)
+        return buffer if buffer is not None else self.fallback
+
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+    def writable(self) -> bool:
+        return True
+
+
+class OutputCapture:
+    """
+    Per-thread capture of `sys.stdout` and `sys.stderr`.
+
+    Attributes:
+        stdout: The standard output replaced by `install` (where output
+            outside of `capture` blocks goes).
+        stderr: The standard error replaced by `install`.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self.stdout = sys.stdout
+        self.stderr = sys.stderr
+        self._proxies: tuple[_ThreadOutput, _ThreadOutput] | None = None
+
+    def install(self) -> None:
+        """Replace `sys.stdout` and `sys.stderr` with per-thread streams."""
+        self.stdout, self.stderr = sys.stdout, sys.stderr
+        self._proxies = (_ThreadOutput(self.stdout, self._local, "stdout"),
+                         _ThreadOutput(self.stderr, self._local, "stderr"))
+        sys.stdout, sys.stderr = self._proxies
+
+    def uninstall(self) -> None:
+        """Restore the streams replaced by `install` (unless replaced since)."""
+        if self._proxies is not None and sys.stdout is self._proxies[0]:
+            sys.stdout, sys.stderr = self.stdout, self.stderr
+        self._proxies = None
+
+    @contextmanager
+    def capture(self) -> Iterator[tuple[io.StringIO, io.StringIO]]:
+        """Capture the calling thread's output for the block; yield the buffers."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        self._local.stdout, self._local.stderr = stdout, stderr
+        try:
+            yield stdout, stderr
+        finally:
+            self._local.stdout = self._local.stderr = None
+
+
+def run_command(controller, args) -> int:
+    """
+    Run parsed CLI arguments with `Controller.run_func`.
+
+    Exceptions are printed to standard error instead of propagating, so one
+    failing command does not stop the others.
+
+    Args:
+        controller (Controller): The controller to run the command on.
+        args (argparse.Namespace): Parsed CLI arguments.
+
+    Returns:
+        int: The exit code the command would have ended the CLI with.
+    """
+    try:
+        controller.run_func(args)
+        return 0
+    except SystemExit as e:
+        return exit_code(e)
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+def exit_code(exit: SystemExit) -> int:
+    """Exit code of a `SystemExit`, as the interpreter would report it."""
+    if exit.code is None:
+        return 0
+    if isinstance(exit.code, int):
+        return exit.code
+    print(exit.code, file=sys.stderr)
+    return 1
+
+
+def has_run_options(controller, args) -> bool:
+    """Whether parsed CLI arguments set any of the controller's run options."""
+    return any(getattr(args, name, None) is not None for name in controller.RUN_OPTIONS)
+
+
+def run_state(controller) -> tuple:
+    """Snapshot the state that `Controller.configure` changes."""
+    return (controller.cache.compression, controller.backend, Page.engine,
+            Page.tokenizer, Page.corpus, controller.sketch)
+
+
+def restore_run_state(controller, state: tuple) -> None:
+    """Undo the run options applied since `run_state` returned `state`."""
+    (controller.cache.compression, controller.backend, Page.engine,
+     Page.tokenizer, Page.corpus, controller.sketch) = state
+    set_sketch(controller.sketch)
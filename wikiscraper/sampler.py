@@ -0,0 +1,272 @@
+"""
+Module: sampler.py
+
+Provides a random-walk page sampler for finding the pages that match a
+language worst or best (the `get_worst_page` search of `analysis.ipynb`).
+
+The notebook walks serially: it scores a page, picks a random link, sleeps,
+fetches the linked page and only then scores it. `RandomWalkSampler` runs
+many independent walks at once on an asyncio event loop, with downloads in
+threads (like `crawler.AsyncCrawler`):
+
+- Every walker draws its links from its own `random.Random`, seeded from the
+  sampler's seed and the walker's number, so a seed always gives the same
+  walks and the same trace, whatever order downloads finish in.
+- A walker picks its next link as soon as a page's links are known and
+  starts downloading it before the page is scored (prefetch). Scores are
+  computed in threads, off the event loop, so scoring overlaps the next
+  download and other walkers keep running.
+- Walkers share downloads and scores: a page visited by several walkers, or
+  several times, is fetched and scored once.
+
+Scores are the language confidence scores of `scoring.py`.
+
+Classes:
+    WalkStep: One scored page of a walk.
+    SampleResult: All scored pages of a sample, with the worst and best.
+    RandomWalkSampler: Runs seeded random walks concurrently.
+
+Usage Example:
+    sampler = RandomWalkSampler(controller, walkers=8, steps=50, language="en")
+    result = sampler.sample("Team Rocket")
+    result.worst.phrase, result.worst.score
+"""
+
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from wikiscraper import config
+from wikiscraper.crawler import HostPoliteness
+from wikiscraper.reference import get_reference
+from wikiscraper.scoring import score_pages
+from wikiscraper.throttle import FetchError
+
+
+class WalkStep:
+    """
+    One scored page of a walk.
+
+    Attributes:
+        walker (int): Number of the walker.
+        step (int): Position of the page in the walk (the start page is 0).
+        phrase (str): The page's search phrase.
+        score (float): Its language confidence score.
+    """
+
+    __slots__ = ("walker", "step", "phrase", "score")
+
+    def __init__(self, walker: int, step: int, phrase: str, score: float):
+        self.walker = walker
+        self.step = step
+        self.phrase = phrase
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"WalkStep({self.walker}, {self.step}, {self.phrase!r}, {self.score!r})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, WalkStep) and (
+            (self.walker, self.step, self.phrase, self.score)
+            == (other.walker, other.step, other.phrase, other.score)
+        )
+
+
+class SampleResult:
+    """
+    Scored pages of a sample.
+
+    Attributes:
+        trace (list[WalkStep]): Every scored page, ordered by walker and step.
+        pages_fetched (int): Number of distinct pages fetched.
+    """
+
+    def __init__(self, trace: list[WalkStep], pages_fetched: int):
+        self.trace = trace
+        self.pages_fetched = pages_fetched
+
+    @property
+    def worst(self) -> WalkStep | None:
+        """WalkStep | None: The lowest-scored page (first one on ties)."""
+        return min(self.trace, key=lambda step: step.score, default=None)
+
+    @property
+    def best(self) -> WalkStep | None:
+        """WalkStep | None: The highest-scored page (first one on ties)."""
+        return max(self.trace, key=lambda step: step.score, default=None)
+
+
+class RandomWalkSampler:
+    """
+    Concurrent, seeded random walks that score every visited page.
+
+    A walk starts at the start page and follows `steps - 1` random links, so
+    it scores up to `steps` pages. It ends early at a page without links or
+    one that cannot be fetched (`FetchError` or missing).
+
+    Attributes:
+        controller (Controller): Controller used to fetch pages.
+        walkers (int): Number of walks.
+        steps (int): Pages scored per walk.
+        language (str): Language code of the scores.
+        k (int): Number of most frequent reference words of the scores.
+        wordlist (str): wordfreq wordlist of the scores.
+        seed (int): Seed of the walks.
+        prefetch (bool): Whether the next page is fetched while the current
+            one is scored.
+        concurrency (int): Maximum number of fetches in flight.
+        politeness (HostPoliteness): Per-host request pacing.
+    """
+
+    def __init__(
+        self,
+        controller,
+        walkers: int = config.SAMPLE_WALKERS,
+        steps: int = config.SAMPLE_STEPS,
+        language: str = config.SCORING_LANGUAGES[0],
+        k: int = config.SCORING_K_VALUES[-1],
+        wordlist: str = config.SCORING_WORDLIST,
+        seed: int = 0,
+        wait: float = 0.0,
+        prefetch: bool = True,
+        concurrency: int | None = None,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            controller (Controller): Controller whose `_get_pages` is used to
+                fetch pages (from cache or network).
+            walkers (int): Number of walks.
+            steps (int): Pages scored per walk.
+            language (str): Language code of the scores.
+            k (int): Number of most frequent reference words.
+            wordlist (str): wordfreq wordlist of the references.
+            seed (int): Seed of the walks.
+            wait (float): Minimum delay in seconds between request starts to
+                the wiki.
+            prefetch (bool): Fetch the next page while scoring the current one.
+            concurrency (int, optional): Maximum number of fetches in flight;
+                defaults to one per walker.
+
+        Raises:
+            ValueError: If a count is not positive.
+        """
+        for name, value in (("walkers", walkers), ("steps", steps), ("k", k)):
+            if value < 1:
+                raise ValueError(f"{name} must be >= 1, got {value}.")
+        self.controller = controller
+        self.walkers = walkers
+        self.steps = steps
+        self.language = language
+        self.k = k
+        self.wordlist = wordlist
+        self.seed = seed
+        self.prefetch = prefetch
+        self.concurrency = concurrency or walkers
+        self.politeness = HostPoliteness(wait)
+        self._fetches: dict[str, asyncio.Task] = {}
+        self._scores: dict[str, asyncio.Future] = {}
+        self._semaphore: asyncio.Semaphore | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._scorer: ThreadPoolExecutor | None = None
+
+    def sample(self, start: str) -> SampleResult:
+        """
+        Run all walks from `start`.
+
+        Args:
+            start (str): Phrase of the start page.
+
+        Returns:
+            SampleResult: Every scored page, with the worst and best.
+
+        Raises:
+            ValueError: If wordfreq has no such wordlist for the language.
+        """
+        # Load the reference before the walks, and fail early if there is none.
+        get_reference(self.language, self.wordlist)
+        return asyncio.run(self._sample(start))
+
+    async def _sample(self, start: str) -> SampleResult:
+        """Run the walks on the current event loop."""
+        self._fetches = {}
+        self._scores = {}
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # Scores are computed off the loop, so prefetches and other walkers
+        # keep running meanwhile.
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor, \
+                ThreadPoolExecutor(max_workers=self.walkers) as scorer:
+            self._executor, self._scorer = executor, scorer
+            walks = await asyncio.gather(*(
+                self._walk(walker, start) for walker in range(self.walkers)
+            ))
+        self._executor = self._scorer = None
+        trace = [step for walk in walks for step in walk]
+        return SampleResult(trace, len(self._fetches))
+
+    async def _walk(self, walker: int, phrase: str) -> list[WalkStep]:
+        """Run one walk and return its scored pages."""
+        rng = random.Random(f"{self.seed}/{walker}")
+        trace = []
+        fetched = await self._fetch(phrase)
+        for step in range(self.steps):
+            if fetched is None:
+                break
+            words, links = fetched
+            next_phrase = rng.choice(links) if links and step + 1 < self.steps else None
+            if next_phrase is not None and self.prefetch:
+                self._fetch(next_phrase)
+            trace.append(WalkStep(walker, step, phrase, await self._score(phrase, words)))
+            if next_phrase is None:
+                break
+            fetched = await self._fetch(next_phrase)
+            phrase = next_phrase
+        return trace
+
+    def _fetch(self, phrase: str) -> asyncio.Task:
+        """Return the (shared) download of a page, starting it if needed."""
+        task = self._fetches.get(phrase)
+        if task is None:
+            task = self._fetches[phrase] = asyncio.create_task(self._download(phrase))
+        return task
+
+    async def _download(self, phrase: str) -> tuple[dict[str, int], list[str]] | None:
+        """Fetch and parse a page; None if it cannot be fetched."""
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            if self.controller.needs_download([phrase]):
+                await self.politeness.acquire(urlsplit(self.controller.wiki_base_url).netloc)
+            try:
+                return await loop.run_in_executor(self._executor, self._read, phrase)
+            except FetchError as e:
+                print(f"Skipping page: {e}")
+                return None
+
+    def _read(self, phrase: str) -> tuple[dict[str, int], list[str]] | None:
+        """Fetch a page and keep its word counts and links (download thread)."""
+        pages = self.controller._get_pages([phrase])
+        if not pages:
+            return None
+        page = pages[0]
+        # Page.links is in set order, which varies between processes; sort
+        # so that a seed gives the same walks in every run.
+        words, links = page.get_dict(), sorted(page.links())
+        page.release()
+        return words, links
+
+    def _score(self, phrase: str, words: dict[str, int]) -> asyncio.Future:
+        """Return the (shared) score of a page, computing it in a scoring thread."""
+        score = self._scores.get(phrase)
+        if score is None:
+            loop = asyncio.get_running_loop()
+            score = self._scores[phrase] = loop.run_in_executor(
+                self._scorer, self._compute_score, phrase, words
+            )
+        return score
+
+    def _compute_score(self, phrase: str, words: dict[str, int]) -> float:
+        """Score a page (scoring thread)."""
+        scores = score_pages({phrase: words}, [self.language], [self.k], self.wordlist)
+        return float(scores[0, 0, 0])
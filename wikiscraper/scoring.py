@@ -0,0 +1,199 @@
+"""
+Module: scoring.py
+
+Provides language confidence scores of pages, as defined in
+`analysis.ipynb`, computed for many pages, languages and k at once.
+
+The score of a page for a language and `k` is
+
+    1000 * sum over the page's words w of  p(w) * f_k(w)
+
+where `p(w)` is the word's share of the page's words and `f_k(w)` its
+frequency in `wordfreq.get_frequency_dict(language, wordlist)` if it is
+among the `k` most frequent words of that dict, else 0
+(`lang_confidence_score` of the notebook, with the notebook's `lang_refs`).
+
+`score_pages` puts the pages in a sparse matrix over their shared
+vocabulary (CSR, one row per page, shares as values) and all references in
+one dense matrix (one row per vocabulary word, one column per language and
+k, from the disk-cached tables of `reference.py`), and computes all scores
+as one sparse-dense product, in blocks of rows. The scores equal the
+notebook's up to floating-point summation order (relative difference below
+1e-12).
+
+Functions:
+    lang_confidence_score: The notebook's score of one page (reference).
+    score_matrix: Scores of the rows of a CSR matrix of word counts.
+    score_pages: Scores of many pages for several languages and k.
+    scores_frame: Scores as a DataFrame, one column per language and k.
+
+Usage Example:
+    scores = score_pages({"Pikachu": page.get_dict()}, ["en", "es"], [10, 1000])
+    scores[0, 1, 0]  # Pikachu, "es", k=10
+"""
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from . import config
+from .reference import get_reference
+
+BLOCK_ENTRIES = 1 << 18
+"""int: Page-word entries multiplied per block (bounds temporary memory)."""
+
+
+def lang_confidence_score(word_counts: dict, language_words_with_frequency: dict) -> float:
+    """
+    Calculate how well word counts match a language (the notebook's formula).
+
+    Args:
+        word_counts (dict): {word: count} of the text.
+        language_words_with_frequency (dict): {word: frequency} of the
+            language's reference words.
+
+    Returns:
+        float: The confidence score (0 if nothing matches).
+    """
+    if not word_counts or not language_words_with_frequency:
+        return 0.0
+    words = list(word_counts.keys())
+    counts = np.array([word_counts[w] for w in words], dtype=float)
+    total = counts.sum()
+    if total == 0:
+        return 0.0
+    text_probs = counts / total
+    ref_probs = np.array([language_words_with_frequency.get(w, 0.0) for w in words], dtype=float)
+    raw_score = np.sum(text_probs * ref_probs) * 1000
+    if raw_score == 0:
+        return 0.0
+    return float(raw_score)
+
+
+def _page_matrix(pages: list[dict[str, int]]) -> tuple[np.ndarray, np.ndarray, np.ndarray, list[str]]:
+    """Word counts of the pages as CSR arrays over their shared vocabulary."""
+    lengths = np.fromiter((len(words) for words in pages), dtype=np.int64, count=len(pages))
+    indptr = np.concatenate(([0], np.cumsum(lengths)))
+    all_words = list(chain.from_iterable(pages))
+    vocabulary = list(dict.fromkeys(all_words))
+    columns = dict(zip(vocabulary, range(len(vocabulary))))
+    indices = np.fromiter(map(columns.__getitem__, all_words), dtype=np.int64, count=len(all_words))
+    counts = np.fromiter(chain.from_iterable(words.values() for words in pages),
+                         dtype=np.float64, count=len(all_words))
+    return indptr, indices, counts, vocabulary
+
+
+def _reference_matrix(
+    vocabulary: list[str], languages: list[str], k_values: list[int], wordlist: str
+) -> np.ndarray:
+    """Top-k reference frequencies of the vocabulary, shape (words, languages * k)."""
+    matrix = np.zeros((len(vocabulary), len(languages) * len(k_values)), dtype=np.float64)
+    for l, language in enumerate(languages):
+        reference = get_reference(language, wordlist)
+        positions, found = reference.positions(vocabulary)
+        frequencies = np.where(found, reference.dict_frequencies[positions], 0.0)
+        ranks = np.where(found, reference.ranks[positions], np.iinfo(np.int64).max)
+        for n, k in enumerate(k_values):
+            matrix[:, l * len(k_values) + n] = np.where(ranks < k, frequencies, 0.0)
+    return matrix
+
+
+def score_matrix(
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+    vocabulary: list[str],
+    languages: list[str],
+    k_values: list[int],
+    wordlist: str = config.SCORING_WORDLIST,
+) -> np.ndarray:
+    """
+    Compute the language confidence scores of the rows of a CSR matrix of
+    word counts (e.g. `corpus.Corpus.matrix`).
+
+    Args:
+        indptr (np.ndarray): Row boundaries in `indices` and `data`.
+        indices (np.ndarray): Column (word in `vocabulary`) of every entry.
+        data (np.ndarray): Count of every entry.
+        vocabulary (list[str]): Word of every column.
+        languages (list[str]): Language codes.
+        k_values (list[int]): Numbers of most frequent reference words.
+        wordlist (str): wordfreq wordlist of the references (the notebook
+            uses "best").
+
+    Returns:
+        np.ndarray: Scores, shape (rows, languages, k values).
+
+    Raises:
+        ValueError: If a k is not positive or wordfreq has no such wordlist
+            for a language.
+    """
+    if any(k < 1 for k in k_values):
+        raise ValueError(f"k values must be >= 1, got {list(k_values)}.")
+    rows = len(indptr) - 1
+    lengths = np.diff(indptr)
+    counts = np.asarray(data, dtype=np.float64)
+    totals = np.zeros(rows, dtype=np.float64)
+    nonempty = lengths > 0
+    totals[nonempty] = np.add.reduceat(counts, indptr[:-1][nonempty])
+    row_of_entry = np.repeat(np.arange(rows), lengths)
+    entry_totals = totals[row_of_entry]
+    shares = np.divide(counts, entry_totals, out=np.zeros_like(counts), where=entry_totals != 0)
+
+    # Only the words the pages use get a row of reference frequencies.
+    used, columns = np.unique(indices, return_inverse=True)
+    references = _reference_matrix([vocabulary[j] for j in used.tolist()],
+                                   languages, k_values, wordlist)
+    scores = np.zeros((rows, references.shape[1]), dtype=np.float64)
+    for start in range(0, len(columns), BLOCK_ENTRIES):
+        stop = min(start + BLOCK_ENTRIES, len(columns))
+        weighted = shares[start:stop, None] * references[columns[start:stop]]
+        # Segmented sum over the rows in the block (a row may span blocks).
+        block_rows = np.arange(row_of_entry[start], row_of_entry[stop - 1] + 1)
+        starts = np.clip(indptr[block_rows], start, stop) - start
+        ends = np.clip(indptr[block_rows + 1], start, stop) - start
+        present = ends > starts
+        scores[block_rows[present]] += np.add.reduceat(weighted, starts[present])
+    return (scores * 1000).reshape(rows, len(languages), len(k_values))
+
+
+def score_pages(
+    pages: dict[str, dict[str, int]],
+    languages: list[str],
+    k_values: list[int],
+    wordlist: str = config.SCORING_WORDLIST,
+) -> np.ndarray:
+    """
+    Compute the language confidence score of every page, language and k.
+
+    Args:
+        pages (dict[str, dict[str, int]]): Word counts of every page.
+        languages (list[str]): Language codes.
+        k_values (list[int]): Numbers of most frequent reference words.
+        wordlist (str): wordfreq wordlist of the references.
+
+    Returns:
+        np.ndarray: Scores, shape (pages, languages, k values), in the order
+            of the arguments.
+
+    Raises:
+        ValueError: If a k is not positive or wordfreq has no such wordlist
+            for a language.
+    """
+    indptr, indices, counts, vocabulary = _page_matrix(list(pages.values()))
+    return score_matrix(indptr, indices, counts, vocabulary, languages, k_values, wordlist)
+
+
+def scores_frame(
+    scores: np.ndarray, titles: list[str], languages: list[str], k_values: list[int]
+) -> pd.DataFrame:
+    """
+    Arrange scores of `score_pages` or `score_matrix` in a DataFrame.
+
+    Returns:
+        pd.DataFrame: One row per page (index: title), one column per
+            language and k, named "<language>@<k>".
+    """
+    columns = [f"{language}@{k}" for language in languages for k in k_values]
+    return pd.DataFrame(scores.reshape(len(titles), -1), index=list(titles), columns=columns)
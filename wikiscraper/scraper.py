@@ -5,6 +5,13 @@ This module provides a `Scraper` class for fetching and caching HTML content
 from a wiki page (defaulting to Bulbapedia). It can either download the page
 from the internet or read it from a local cached HTML file.
 
+Downloads go through a shared keep-alive `requests.Session` when one is
+given, and cached pages are revalidated with conditional GETs
+(`If-None-Match` / `If-Modified-Since`) so an unchanged page costs a cheap
+`304 Not Modified` instead of a full download. Requests are paced by an
+`AdaptiveThrottle`, which retries 429/5xx responses and timeouts with
+backoff; a page that still cannot be downloaded raises `FetchError`.
+
 Classes:
     Scraper: Handles constructing the page URL, downloading or reading the page,
              and returning a `Page` object containing the HTML content.
@@ -15,14 +22,15 @@ Usage Example:
     print(page.html)  # Access the raw HTML content of the page
 """
 
-import os
 import re
 import sys
 from urllib.parse import unquote, urljoin
 
 import requests
 from wikiscraper import config
+from wikiscraper.cache import PageCache, cache_key, get_cache
 from wikiscraper.page import Page
+from wikiscraper.throttle import AdaptiveThrottle, FetchError
 
 
 class Scraper:
@@ -34,6 +42,12 @@ class Scraper:
         wiki_base_url (str): Base URL of the wiki to fetch pages from.
         use_local_html_file_instead (bool): Whether to skip downloading and use
             the local cached HTML file.
+        session (requests.Session | None): Shared HTTP session; if None, every
+            download opens a new connection through `requests.get`.
+        timeout (float): Timeout in seconds for HTTP requests.
+        key (str): Canonical cache key of the page (see `cache.cache_key`).
+        cache (PageCache): Page cache used to store and read the HTML.
+        throttle (AdaptiveThrottle): Request pacing and retry policy.
     """
 
     def __init__(
@@ -41,6 +55,10 @@ class Scraper:
         phrase: str = None,
         wiki_base_url: str = config.BULBAPEDIA_MAIN_PAGE,
         use_local_html_file_instead: bool = False,
+        session: requests.Session | None = None,
+        timeout: float = config.DEFAULT_TIMEOUT_S,
+        cache: PageCache | None = None,
+        throttle: AdaptiveThrottle | None = None,
     ):
         """
         Initialize a Scraper instance.
@@ -52,6 +70,13 @@ class Scraper:
                 Bulbapedia's main page.
             use_local_html_file_instead (bool, optional): If True, skip downloading
                 the page and use cached HTML.
+            session (requests.Session, optional): Shared session used for
+                downloads (see `wikiscraper.session.make_session`).
+            timeout (float, optional): Timeout in seconds for HTTP requests.
+            cache (PageCache, optional): Page cache; defaults to the shared
+                cache of `config.CACHE_DIR`.
+            throttle (AdaptiveThrottle, optional): Throttle shared with other
+                downloads from the same wiki; defaults to a new one.
         """
         if "#" in phrase:
             page_name, _ = phrase.split("#", 1)
@@ -66,6 +91,23 @@ class Scraper:
         self.title = re.sub(r'[\\/*?:"<>|#]', "_", title)
 
         self.use_local_html_file_instead = use_local_html_file_instead
+        self.session = session
+        self.timeout = timeout
+        self.key = cache_key(phrase)
+        self.cache = cache if cache is not None else get_cache()
+        self.throttle = throttle if throttle is not None else AdaptiveThrottle()
+
+    def _conditional_headers(self) -> dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers for a cached page."""
+        if self.key not in self.cache:
+            return {}
+        validators = self.cache.validators(self.key)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
 
     def scrape(self) -> Page:
         """
@@ -78,29 +120,46 @@ class Scraper:
 
         Returns:
             Page: A Page object containing the HTML content of the page.
-                  Returns None if the page does not exist (HTTP 404).
 
         Raises:
-            SystemExit: If the HTML file cannot be downloaded or read locally.
+            FetchError: If the page cannot be downloaded (for example HTTP
+                404, or 429/5xx after all retries).
+            SystemExit: If the HTML file cannot be read locally.
         """
-        path = config.CACHE_DIR / f"{self.title}.html"
-
         if not self.use_local_html_file_instead:
-            r = requests.get(self.url)
-            if r.status_code == 200:
-                num_files = len(os.listdir(config.CACHE_DIR))
-                if num_files < config.MAX_CACHE_SIZE:
-                    with open(path, "wb") as f:
-                        f.write(r.content)
-                else:
-                    return Page(phrase=self.title, html=r.content)
+            headers = self._conditional_headers()
+            http = self.session if self.session is not None else requests
+            r = self.throttle.request(
+                lambda: http.get(self.url, headers=headers, timeout=self.timeout),
+                what=self.url,
+            )
+            if r.status_code == 304 and headers:
+                # Cached copy is still valid; mark it fresh again.
+                self.cache.touch(self.key)
+            elif r.status_code == 200:
+                etag = r.headers.get("ETag")
+                last_modified = r.headers.get("Last-Modified")
+                self.cache.put(
+                    self.key,
+                    r.content,
+                    etag=etag if isinstance(etag, str) else None,
+                    last_modified=last_modified if isinstance(last_modified, str) else None,
+                )
+                return Page(phrase=self.title, html=self._decode(r.content))
             else:
-                print(f"Cannot download contents from page: {r.status_code}")
-                sys.exit(1)
-
-        if os.path.exists(path):
-            with open(path, "r") as f:
-                return Page(phrase=self.title, html=f.read())
+                raise FetchError(
+                    f"Cannot download contents from {self.url}: HTTP {r.status_code}",
+                    status=r.status_code,
+                )
+
+        data = self.cache.get(self.key)
+        if data is not None:
+            return Page(phrase=self.title, html=self._decode(data))
         else:
             print("Failed to download HTML file contents")
             sys.exit(1)
+
+    @staticmethod
+    def _decode(data: bytes) -> str:
+        """Decode downloaded or cached page bytes to text."""
+        return data.decode("utf-8", errors="replace")
@@ -0,0 +1,226 @@
+"""
+Module: server.py
+
+Provides the `serve` daemon: one warm process that runs CLI commands sent
+over a Unix socket, and keeps the Controller, the page cache index, the
+parsed pages (`Controller.page_memory`), reference tables and the pooled HTTP
+session alive between them. `wiki_scraper.py` sends its command here when
+the daemon is running (see `client.py`), so a short command costs a socket
+round trip instead of starting Python and importing its dependencies.
+
+Protocol: a client connects, sends one JSON line
+`{"argv": [...], "cwd": "..."}` and reads one JSON line back:
+`{"exit_code": 0, "stdout": "...", "stderr": "...", "latency_ms": 1.2}`, or
+`{"unsupported": true}` for commands the daemon does not run (those not in
+`SERVED`, or a client in another working directory, whose relative paths
+would resolve differently). The client then runs the command itself.
+
+Requests run concurrently, one thread each. Output is captured per request
+thread (`runner.OutputCapture`); output of threads a command starts itself
+goes to the daemon's own output. Commands that change process-wide state run alone: those given run
+options (`Controller.RUN_OPTIONS`, restored afterwards), charts (pyplot has
+one global figure) and crawls with parse workers (forking while other
+requests hold locks is unsafe).
+
+Classes:
+    CommandServer: Threaded Unix socket server running CLI commands.
+
+Usage Example:
+    with CommandServer(Controller(), config.SERVE_SOCKET) as server:
+        server.serve_forever()
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+from wikiscraper.parser import Parser
+from wikiscraper.runner import (
+    OutputCapture,
+    exit_code,
+    has_run_options,
+    restore_run_state,
+    run_command,
+    run_state,
+)
+
+SERVED = (
+    "summary", "count_words", "table", "analyze_relative_word_frequency",
+    "auto_count_words", "top_words", "score_pages", "sample_pages",
+)
+"""tuple[str, ...]: Commands the daemon runs; the client runs any other itself."""
+
+
+class _SharedLock:
+    """
+    Lock held by any number of shared holders or by one exclusive holder;
+    waiting exclusive holders go first.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._shared = 0
+        self._exclusive = False
+        self._waiting = 0
+
+    def acquire(self, exclusive: bool) -> None:
+        with self._condition:
+            if exclusive:
+                self._waiting += 1
+                self._condition.wait_for(lambda: not self._exclusive and not self._shared)
+                self._waiting -= 1
+                self._exclusive = True
+            else:
+                self._condition.wait_for(lambda: not self._exclusive and not self._waiting)
+                self._shared += 1
+
+    def release(self, exclusive: bool) -> None:
+        with self._condition:
+            if exclusive:
+                self._exclusive = False
+            else:
+                self._shared -= 1
+            self._condition.notify_all()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads one request line, runs it and writes the response line."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line)
+            argv = [str(arg) for arg in request["argv"]]
+            cwd = request.get("cwd")
+        except (ValueError, KeyError, TypeError):
+            response = {"exit_code": 2, "stdout": "", "stderr": "Bad request\n", "latency_ms": 0.0}
+        else:
+            response = self.server.execute(argv, cwd)
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class CommandServer(socketserver.ThreadingUnixStreamServer):
+    """
+    Threaded Unix socket server running CLI commands on one Controller.
+
+    A socket file left behind by a daemon that is gone is replaced; one that
+    a daemon still listens on raises `OSError`. The socket is removed and
+    standard output restored by `server_close`.
+
+    Attributes:
+        controller (Controller): The controller all commands run on.
+        path (Path): Path of the socket.
+        latencies (list[float]): Latency in milliseconds of every request.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, controller, path: Path):
+        """
+        Bind the socket and start capturing output per request thread.
+
+        Args:
+            controller (Controller): The controller to run commands on.
+            path (Path): Path of the socket.
+
+        Raises:
+            OSError: If another daemon is listening on `path`.
+        """
+        self.controller = controller
+        self.path = Path(path)
+        self.latencies: list[float] = []
+        self._parser = Parser()
+        self._lock = _SharedLock()
+        self._stats_lock = threading.Lock()
+        self._remove_stale_socket()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.path), _RequestHandler)
+        self._output = OutputCapture()
+        self._output.install()
+
+    def _remove_stale_socket(self) -> None:
+        """Remove a socket file nobody listens on."""
+        if not self.path.exists():
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(self.path))
+            except (ConnectionRefusedError, FileNotFoundError):
+                self.path.unlink(missing_ok=True)
+                return
+        raise OSError(f"A daemon is already serving on {self.path}")
+
+    def server_close(self):
+        """Close and remove the socket, and restore standard output."""
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+        self._output.uninstall()
+
+    def exclusive(self, args) -> bool:
+        """Whether a command changes process-wide state, so has to run alone."""
+        options = vars(args)
+        return (
+            has_run_options(self.controller, args)
+            or options.get("chart") is not None
+            or bool(options.get("parse_workers"))
+        )
+
+    def execute(self, argv: list[str], cwd: str | None) -> dict:
+        """
+        Run one command and capture its output.
+
+        Args:
+            argv (list[str]): CLI arguments, as given to `wiki_scraper.py`.
+            cwd (str, optional): Working directory of the client.
+
+        Returns:
+            dict: The response (see the module docstring).
+        """
+        if cwd is not None and os.path.realpath(cwd) != os.path.realpath(os.getcwd()):
+            return {"unsupported": True}
+        start = time.perf_counter()
+        with self._output.capture() as (stdout, stderr):
+            code = self._run(argv)
+        if code is None:
+            return {"unsupported": True}
+        latency_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            self.latencies.append(latency_ms)
+        print(f"{' '.join(argv)} -> {code} in {latency_ms:.1f} ms",
+              file=self._output.stderr, flush=True)
+        return {"exit_code": code, "stdout": stdout.getvalue(),
+                "stderr": stderr.getvalue(), "latency_ms": latency_ms}
+
+    def _run(self, argv: list[str]) -> int | None:
+        """Parse and run a command; return its exit code, or None if it is not served."""
+        try:
+            args = self._parser.parse_args(argv)
+        except SystemExit as e:  # --help or invalid arguments
+            return exit_code(e)
+        if args.command not in SERVED:
+            return None
+        exclusive = self.exclusive(args)
+        self._lock.acquire(exclusive)
+        state = run_state(self.controller) if exclusive else None
+        try:
+            return run_command(self.controller, args)
+        finally:
+            if state is not None:
+                restore_run_state(self.controller, state)
+            self._lock.release(exclusive)
+
+    def stats_line(self) -> str:
+        """Return a summary of the request latencies."""
+        with self._stats_lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return "No requests served"
+        median = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (f"{len(latencies)} requests, latency median {median:.1f} ms, "
+                f"p95 {p95:.1f} ms, max {latencies[-1]:.1f} ms")
+
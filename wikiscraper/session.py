@@ -0,0 +1,37 @@
+"""
+Module: session.py
+
+Provides a factory for the shared HTTP session used to download wiki pages.
+
+A single `requests.Session` keeps TCP (and TLS) connections alive between
+requests, so consecutive pages from the same wiki reuse an open connection
+instead of paying a new handshake every time.
+
+Usage Example:
+    session = make_session()
+    scraper = Scraper("Pikachu", session=session)
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from wikiscraper import config
+
+
+def make_session(pool_size: int = config.HTTP_POOL_SIZE) -> requests.Session:
+    """
+    Create a pooled, keep-alive HTTP session.
+
+    Args:
+        pool_size (int): Maximum number of connections kept open per host.
+            Should be at least the number of concurrent downloads.
+
+    Returns:
+        requests.Session: Session with connection pooling for HTTP and HTTPS.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": config.USER_AGENT})
+    return session
@@ -0,0 +1,380 @@
+"""
+Module: sketch.py
+
+Provides bounded-memory approximate word counts for very large crawls: a
+count-min sketch of all words plus a top-K table of the most frequent ones.
+
+The exact counts (`word_counts`) keep every distinct word, and on broad
+crawls most of them are a long tail of junk tokens. With the `--approximate`
+run option the counts go into a `SketchCounter` instead, whose memory is
+fixed when it is created:
+
+- `CountMinSketch`: `depth` rows of `width` counters. A word is counted in
+  one counter per row, chosen by hashing; its estimate is the smallest of its
+  counters. Estimates never fall below the true count and, with conservative
+  update, exceed it by at most `epsilon * total` with probability
+  `1 - delta`, where `width = ceil(e / epsilon)` and
+  `depth = ceil(ln(1 / delta))`.
+- the top-K table: the `k` words with the highest estimates seen so far, as
+  needed by `analyze_relative_word_frequency --mode article`.
+
+The counter is saved to `config.SKETCH_NPZ` at the end of every CLI command.
+Several processes may count into the same file: besides the sketch, a
+counter keeps the counts it added since it was loaded or saved in a plain
+(not conservative) count-min table, and saving under the file's lock
+(`filelock.py`) adds that table to the sketch another process saved in the
+meantime and re-ranks the top-K words of both. Plain counts add up, so the
+merged estimates are still never below the true counts. This pending table
+is why a counter takes twice the memory of its sketch.
+
+Classes:
+    CountMinSketch: Count-min sketch with conservative update.
+    SketchCounter: Count-min sketch plus top-K words.
+
+Functions:
+    get_sketch: Shared counter of the current `config.SKETCH_NPZ`.
+    save_sketch: Save the shared counter if it changed.
+    remove_sketch: Delete the counter file.
+
+Usage Example:
+    counter = SketchCounter.from_budget(memory_mb=16)
+    counter.add({"pikachu": 3, "electric": 1})
+    counter.top(10)  # [("pikachu", 3), ("electric", 1)]
+"""
+
+import heapq
+import math
+import os
+import threading
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from . import config
+from .filelock import file_lock, file_stamp, temp_path
+
+_TOP_ENTRY_BYTES = 120
+"""int: Approximate memory of one top-K entry (dict slot, str, int)."""
+
+
+def _hashes(words: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Two independent 32-bit hashes of every word (stable across runs)."""
+    encoded = [word.encode("utf-8") for word in words]
+    first = np.fromiter((zlib.crc32(b) for b in encoded), dtype=np.uint64, count=len(words))
+    second = np.fromiter(
+        (zlib.adler32(b) for b in encoded), dtype=np.uint64, count=len(words)
+    )
+    return first, second * np.uint64(0x9E3779B1) | np.uint64(1)
+
+
+class CountMinSketch:
+    """
+    Count-min sketch with conservative update.
+
+    Attributes:
+        table (np.ndarray): Counters, shape (depth, width), int64.
+        total (int): Sum of all counts added.
+    """
+
+    def __init__(self, width: int, depth: int):
+        """
+        Create an empty sketch.
+
+        Args:
+            width (int): Counters per row.
+            depth (int): Rows (hash functions).
+
+        Raises:
+            ValueError: If width or depth is smaller than 1.
+        """
+        if width < 1 or depth < 1:
+            raise ValueError(f"width and depth must be >= 1, got {width} and {depth}.")
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        self.total = 0
+
+    @property
+    def width(self) -> int:
+        """int: Counters per row."""
+        return self.table.shape[1]
+
+    @property
+    def depth(self) -> int:
+        """int: Rows of the sketch."""
+        return self.table.shape[0]
+
+    @property
+    def epsilon(self) -> float:
+        """float: Error bound as a fraction of the total (`e / width`)."""
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        """float: Probability of exceeding the error bound (`e ** -depth`)."""
+        return math.exp(-self.depth)
+
+    def _cells(self, words: list[str]) -> np.ndarray:
+        """Flat indices of the counters of every word, shape (depth, n)."""
+        first, second = _hashes(words)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        columns = (first[None, :] + rows * second[None, :]) % np.uint64(self.width)
+        return (columns + rows * np.uint64(self.width)).astype(np.int64)
+
+    def add(
+        self, words: list[str], counts: np.ndarray, pending: np.ndarray | None = None
+    ) -> np.ndarray:
+        """
+        Count words (each at most once per call).
+
+        Args:
+            words (list[str]): Distinct words.
+            counts (np.ndarray): Count of every word.
+            pending (np.ndarray, optional): Table of the same shape the counts
+                are also added to, without conservative update.
+
+        Returns:
+            np.ndarray: Estimates of the words after the update.
+        """
+        cells = self._cells(words)
+        if pending is not None:
+            np.add.at(pending.reshape(-1), cells.ravel(),
+                      np.broadcast_to(counts, cells.shape).ravel())
+        flat = self.table.reshape(-1)
+        # Conservative update: raise each counter only as far as needed.
+        estimates = flat[cells].min(axis=0) + counts
+        np.maximum.at(flat, cells.ravel(), np.broadcast_to(estimates, cells.shape).ravel())
+        self.total += int(counts.sum())
+        return estimates
+
+    def estimate(self, words: list[str]) -> np.ndarray:
+        """Return the estimated counts of words (int64 array)."""
+        if not words:
+            return np.empty(0, dtype=np.int64)
+        return self.table.reshape(-1)[self._cells(words)].min(axis=0)
+
+
+class SketchCounter:
+    """
+    Approximate word counts: a count-min sketch plus the top-K words.
+
+    Attributes:
+        sketch (CountMinSketch): Estimates of all words.
+        k (int): Number of most frequent words kept.
+        top_counts (dict[str, int]): Estimates of the current top words.
+        dirty (bool): Whether the counter changed since it was saved.
+        pending (np.ndarray): Plain count-min table of the counts added since
+            the counter was loaded or saved.
+        pending_total (int): Sum of those counts.
+    """
+
+    def __init__(self, sketch: CountMinSketch, k: int = config.SKETCH_TOP_K):
+        """
+        Args:
+            sketch (CountMinSketch): The sketch to count in.
+            k (int): Number of most frequent words kept.
+        """
+        if k < 1:
+            raise ValueError(f"k must be >= 1, got {k}.")
+        self.sketch = sketch
+        self.k = k
+        self.top_counts: dict[str, int] = {}
+        self.dirty = False
+        self.pending = np.zeros_like(sketch.table)
+        self.pending_total = 0
+        self._stamp: tuple[int, int, int] | None = None
+        self._threshold = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_budget(
+        cls,
+        memory_mb: float | None = None,
+        epsilon: float = config.SKETCH_EPSILON,
+        delta: float = config.SKETCH_DELTA,
+        k: int = config.SKETCH_TOP_K,
+    ) -> "SketchCounter":
+        """
+        Create a counter from an error bound or a memory budget.
+
+        Args:
+            memory_mb (float, optional): Memory budget of the sketch, its
+                pending table and the top-K table in MB; overrides `epsilon`
+                (the width is as large as the budget allows).
+            epsilon (float): Error bound as a fraction of the total count.
+            delta (float): Probability of exceeding the error bound.
+            k (int): Number of most frequent words kept.
+
+        Returns:
+            SketchCounter: An empty counter.
+
+        Raises:
+            ValueError: If the budget is too small for the top-K table or the
+                bounds are not in (0, 1).
+        """
+        if not (0 < epsilon < 1 and 0 < delta < 1):
+            raise ValueError(f"epsilon and delta must be in (0, 1), got {epsilon} and {delta}.")
+        depth = math.ceil(math.log(1 / delta))
+        if memory_mb is None:
+            width = math.ceil(math.e / epsilon)
+        else:
+            available = memory_mb * 1e6 - k * _TOP_ENTRY_BYTES
+            width = int(available // (depth * 2 * 8))
+            if width < 1:
+                raise ValueError(f"{memory_mb} MB is too small for a top-{k} table.")
+        return cls(CountMinSketch(width, depth), k)
+
+    @property
+    def memory_bytes(self) -> int:
+        """int: Memory ceiling of the counter (sketch, pending table, full top-K table)."""
+        return 2 * self.sketch.table.nbytes + self.k * _TOP_ENTRY_BYTES
+
+    def add(self, words: dict[str, int]) -> None:
+        """
+        Count the words of a page.
+
+        Args:
+            words (dict[str, int]): Word counts to add.
+        """
+        if not words:
+            return
+        keys = list(words)
+        counts = np.fromiter(words.values(), dtype=np.int64, count=len(keys))
+        with self._lock:
+            estimates = self.sketch.add(keys, counts, self.pending)
+            self.pending_total += int(counts.sum())
+            candidates = np.flatnonzero(estimates >= self._threshold)
+            top = self.top_counts
+            for i in candidates.tolist():
+                top[keys[i]] = int(estimates[i])
+            if len(top) > self.k:
+                kept = heapq.nlargest(self.k, top.items(), key=lambda item: item[1])
+                self.top_counts = dict(kept)
+            if len(self.top_counts) >= self.k:
+                self._threshold = min(self.top_counts.values())
+            self.dirty = True
+
+    def top(self, n: int) -> list[tuple[str, int]]:
+        """
+        Return the most frequent words.
+
+        Args:
+            n (int): Number of words (at most `k` are known).
+
+        Returns:
+            list[tuple[str, int]]: Words and estimated counts, most frequent
+                first.
+        """
+        with self._lock:
+            return sorted(self.top_counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+    def estimates(self, words: list[str]) -> dict[str, int]:
+        """Return the estimated counts of words."""
+        with self._lock:
+            return dict(zip(words, self.sketch.estimate(words).tolist()))
+
+    def save(self, path: Path) -> None:
+        """
+        Write the counter to `path` (temporary file, fsync, rename), first
+        merging the counts another process saved there since this counter
+        was loaded or saved (see the module docstring).
+
+        Raises:
+            ValueError: If the saved counter has a differently sized sketch.
+        """
+        with self._lock, file_lock(path):
+            path.parent.mkdir(parents=True, exist_ok=True)
+            stamp = file_stamp(path)
+            if stamp is not None and stamp != self._stamp:
+                self._merge(SketchCounter.load(path), path)
+            tmp = temp_path(path)
+            with open(tmp, "wb") as file:
+                np.savez(
+                    file,
+                    table=self.sketch.table,
+                    total=np.int64(self.sketch.total),
+                    k=np.int64(self.k),
+                    top_words=np.frombuffer(
+                        "\n".join(self.top_counts).encode("utf-8"), dtype=np.uint8
+                    ),
+                    top_counts=np.fromiter(self.top_counts.values(), dtype=np.int64),
+                )
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp, path)
+            self._stamp = file_stamp(path)
+            self.pending[:] = 0
+            self.pending_total = 0
+            self.dirty = False
+
+    def _merge(self, saved: "SketchCounter", path: Path) -> None:
+        """Replace the sketch with `saved` plus the pending counts and re-rank the top words."""
+        if saved.sketch.table.shape != self.sketch.table.shape:
+            raise ValueError(
+                f"{path} holds a sketch of shape {saved.sketch.table.shape}, this process "
+                f"counted into one of shape {self.sketch.table.shape}; they cannot be merged."
+            )
+        self.sketch.table = saved.sketch.table + self.pending
+        self.sketch.total = saved.sketch.total + self.pending_total
+        words = list(set(saved.top_counts) | set(self.top_counts))
+        estimates = self.sketch.estimate(words).tolist()
+        kept = heapq.nlargest(self.k, zip(words, estimates), key=lambda item: item[1])
+        self.top_counts = dict(kept)
+        self._threshold = min(self.top_counts.values()) if len(self.top_counts) >= self.k else 0
+
+    @classmethod
+    def load(cls, path: Path) -> "SketchCounter":
+        """Read a counter written by `save`."""
+        stamp = file_stamp(path)
+        with np.load(path) as arrays:
+            sketch = CountMinSketch(1, 1)
+            sketch.table = arrays["table"]
+            sketch.total = int(arrays["total"])
+            counter = cls(sketch, int(arrays["k"]))
+            text = arrays["top_words"].tobytes().decode("utf-8")
+            words = text.split("\n") if text else []
+            counter.top_counts = dict(zip(words, arrays["top_counts"].tolist()))
+        counter._stamp = stamp
+        if len(counter.top_counts) >= counter.k:
+            counter._threshold = min(counter.top_counts.values())
+        return counter
+
+
+_counters: dict[Path, SketchCounter] = {}
+_counters_lock = threading.Lock()
+
+
+def get_sketch(memory_mb: float | None = None) -> SketchCounter:
+    """
+    Return the shared SketchCounter of the current `config.SKETCH_NPZ`.
+
+    Args:
+        memory_mb (float, optional): Memory budget of a new counter (see
+            `SketchCounter.from_budget`); a saved counter keeps its size.
+    """
+    path = Path(config.SKETCH_NPZ)
+    with _counters_lock:
+        counter = _counters.get(path)
+        if counter is None:
+            if path.exists():
+                with file_lock(path):
+                    counter = SketchCounter.load(path)
+            else:
+                counter = SketchCounter.from_budget(memory_mb)
+            _counters[path] = counter
+        return counter
+
+
+def save_sketch() -> None:
+    """Save the shared counter if it was opened and changed."""
+    path = Path(config.SKETCH_NPZ)
+    counter = _counters.get(path)
+    if counter is not None and counter.dirty:
+        counter.save(path)
+
+
+def remove_sketch() -> None:
+    """Forget the shared counter and delete its file."""
+    path = Path(config.SKETCH_NPZ)
+    with _counters_lock:
+        _counters.pop(path, None)
+    path.unlink(missing_ok=True)
@@ -0,0 +1,376 @@
+"""
+Module: tables.py
+
+Provides the table catalog of a page, a native table reader and the export
+of many tables at once.
+
+`read_table` turns an already-parsed `<table>` tag into a DataFrame without
+serializing it back to HTML for `pd.read_html`. It follows the rules of
+pandas' lxml reader, so the result is the same DataFrame:
+
+    - header rows come from `<thead>`, else from the leading rows made of
+      `<th>` cells only; body rows from `<tbody>` (nested tables included,
+      as lxml's `.//tbody//tr` does) and direct `<tr>` children; footer
+      rows from `<tfoot>`,
+    - `colspan`/`rowspan` copy the cell text into the spanned cells and
+      short rows are padded with empty cells,
+    - elements styled `display:none` and `<style>` elements are left out
+      and `<br>` becomes a line break,
+    - the rows of text are typed by pandas' `TextParser`, the engine
+      `pd.read_html` itself uses (numbers with "," thousands separators,
+      NA markers, duplicate column names, multi-row headers).
+
+Classes:
+    TableInfo: Index, shape and caption of one real table of a page.
+
+Functions:
+    table_info: Describe a parsed `<table>` tag.
+    read_table: Read a parsed `<table>` tag into a DataFrame.
+    value_counts: Count the non-missing cell values of a table.
+    write_tables: Write several tables into one multi-table file.
+
+Usage Example:
+    for info in page.table_catalog():
+        print(info.index, info.shape, info.caption)
+"""
+
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from bs4.element import NavigableString, PreformattedString, Tag
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
+
+_SPAN_RE = re.compile(r"\d+")
+_WHITESPACE_RE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def span(cell, attribute: str) -> int:
+    """
+    Return the `colspan`/`rowspan` of a cell tag; missing or malformed values
+    count as 1.
+    """
+    match = _SPAN_RE.match(str(cell.get(attribute, "")).strip())
+    return max(1, int(match.group())) if match else 1
+
+
+def table_rows(table_tag) -> list:
+    """Return the `<tr>` tags of a table, without rows of nested tables."""
+    return [tr for tr in table_tag.find_all("tr")
+            if tr.find_parent("table") is table_tag]
+
+
+class TableInfo:
+    """
+    Catalog entry of a real table.
+
+    Attributes:
+        index (int): Number of the table among the page's real tables
+            (1-based, as used by `Page.table`).
+        rows (int): Number of rows of the table (nested tables excluded).
+        columns (int): Width of the widest row, counting `colspan`.
+        caption (str): Text of the table's `<caption>`, or "".
+    """
+
+    __slots__ = ("index", "rows", "columns", "caption")
+
+    def __init__(self, index: int, rows: int, columns: int, caption: str):
+        self.index = index
+        self.rows = rows
+        self.columns = columns
+        self.caption = caption
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        """tuple[int, int]: Rows and columns of the table."""
+        return self.rows, self.columns
+
+    def __repr__(self) -> str:
+        return (f"TableInfo(index={self.index}, shape={self.shape}, "
+                f"caption={self.caption!r})")
+
+
+def table_info(table_tag, index: int) -> TableInfo:
+    """
+    Describe a parsed `<table>` tag.
+
+    Args:
+        table_tag (bs4.element.Tag): The table.
+        index (int): Number of the table among the page's real tables.
+
+    Returns:
+        TableInfo: The table's catalog entry.
+    """
+    rows = table_rows(table_tag)
+    columns = max(
+        (sum(span(cell, "colspan") for cell in tr.find_all(["td", "th"], recursive=False))
+         for tr in rows),
+        default=0,
+    )
+    caption = table_tag.find("caption", recursive=False)
+    text = caption.get_text(" ", strip=True) if caption is not None else ""
+    return TableInfo(index, len(rows), columns, text)
+
+
+def _is_hidden(tag: Tag) -> bool:
+    """Check if a tag is styled `display:none` (pandas' `displayed_only`)."""
+    return "display:none" in str(tag.get("style", "")).replace(" ", "")
+
+
+def _dropped_tags(table_tag: Tag) -> set[int]:
+    """Return the ids of the `<style>` and hidden elements inside a table."""
+    return {id(tag) for tag in table_tag.find_all(True)
+            if tag.name == "style" or _is_hidden(tag)}
+
+
+def _is_dropped(tag: Tag, table_tag: Tag, dropped: set[int]) -> bool:
+    """Check if a tag is, or lies inside, a dropped element of the table."""
+    while tag is not None and tag is not table_tag:
+        if id(tag) in dropped:
+            return True
+        tag = tag.parent
+    return False
+
+
+def _text(tag: Tag, dropped: set[int], parts: list[str]) -> None:
+    """Collect the text of a tag like lxml's `text_content`."""
+    for child in tag.children:
+        if isinstance(child, Tag):
+            if child.name == "br":
+                parts.append("\n")
+            if id(child) not in dropped:
+                _text(child, dropped, parts)
+        elif isinstance(child, NavigableString) and \
+                not isinstance(child, PreformattedString):
+            parts.append(child)
+
+
+def _cells(row: Tag, dropped: set[int]) -> list[Tag]:
+    """Return the visible `<td>`/`<th>` children of a row."""
+    return [cell for cell in row.find_all(["td", "th"], recursive=False)
+            if id(cell) not in dropped]
+
+
+def _section_rows(table_tag: Tag, dropped: set[int]) -> tuple[list, list, list]:
+    """Split the visible rows of a table into header, body and footer rows."""
+    head: list[Tag] = []
+    body: list[Tag] = []
+    root: list[Tag] = []
+    foot: list[Tag] = []
+    for tag in table_tag.find_all(["thead", "tr"]):
+        if _is_dropped(tag, table_tag, dropped):
+            continue
+        if tag.name == "thead":
+            head.extend(tr for tr in tag.find_all("tr", recursive=False)
+                        if id(tr) not in dropped)
+            # A <thead> with cells but no <tr> acts as a row (as in pandas).
+            if _cells(tag, dropped):
+                head.append(tag)
+            continue
+        if tag.parent is table_tag:
+            root.append(tag)
+        parent = tag.parent
+        in_body = in_foot = False
+        while parent is not None and parent is not table_tag:
+            in_body = in_body or parent.name == "tbody"
+            in_foot = in_foot or parent.name == "tfoot"
+            parent = parent.parent
+        if in_body:
+            body.append(tag)
+        if in_foot:
+            foot.append(tag)
+    body.extend(root)
+
+    if not head:
+        while body and all(cell.name == "th" for cell in _cells(body[0], dropped)):
+            head.append(body.pop(0))
+    return head, body, foot
+
+
+def _expand_spans(
+    rows: list[Tag],
+    dropped: set[int],
+    remainder: list[tuple[int, str, int]],
+    overflow: bool,
+) -> tuple[list[list[str]], list[tuple[int, str, int]]]:
+    """
+    Turn rows into lists of cell texts, copying `colspan`/`rowspan` cells.
+    Returns the rows and the spans still pending (only with `overflow`).
+    """
+    texts_of_rows = []
+    for tr in rows:
+        texts: list[str] = []
+        next_remainder = []
+        index = 0
+        for cell in _cells(tr, dropped):
+            while remainder and remainder[0][0] <= index:
+                prev_i, prev_text, prev_rowspan = remainder.pop(0)
+                texts.append(prev_text)
+                if prev_rowspan > 1:
+                    next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+                index += 1
+
+            parts: list[str] = []
+            _text(cell, dropped, parts)
+            text = _WHITESPACE_RE.sub(" ", "".join(parts).strip())
+            rowspan = int(cell.get("rowspan") or 1)
+            colspan = int(cell.get("colspan") or 1)
+            for _ in range(colspan):
+                texts.append(text)
+                if rowspan > 1:
+                    next_remainder.append((index, text, rowspan - 1))
+                index += 1
+
+        for prev_i, prev_text, prev_rowspan in remainder:
+            texts.append(prev_text)
+            if prev_rowspan > 1:
+                next_remainder.append((prev_i, prev_text, prev_rowspan - 1))
+        texts_of_rows.append(texts)
+        remainder = next_remainder
+
+    if not overflow:
+        while remainder:
+            texts_of_rows.append([text for _, text, _ in remainder])
+            remainder = [(i, text, rowspan - 1)
+                         for i, text, rowspan in remainder if rowspan > 1]
+        return texts_of_rows, []
+    return texts_of_rows, remainder
+
+
+def read_table(table_tag: Tag, first_row_is_header: bool = False) -> pd.DataFrame | None:
+    """
+    Read a parsed `<table>` tag into a DataFrame, like
+    `pd.read_html(str(table_tag), header=...)[0]` but without the second
+    parse.
+
+    Args:
+        table_tag (bs4.element.Tag): The table.
+        first_row_is_header (bool): Use the first row as the header;
+            otherwise the header is inferred from `<thead>`/`<th>` rows.
+
+    Returns:
+        pd.DataFrame | None: The table, or None if it has no rows.
+
+    Raises:
+        ValueError: If a `colspan`/`rowspan` value is not a number.
+    """
+    dropped = _dropped_tags(table_tag)
+    head_rows, body_rows, foot_rows = _section_rows(table_tag, dropped)
+
+    head, remainder = _expand_spans(head_rows, dropped, [], overflow=True)
+    body, remainder = _expand_spans(body_rows, dropped, remainder,
+                                    overflow=bool(foot_rows))
+    foot, _ = _expand_spans(foot_rows, dropped, remainder, overflow=False)
+
+    header = 0 if first_row_is_header else None
+    if head:
+        body = head + body
+        if header is None:
+            header = 0 if len(head) == 1 else \
+                [i for i, row in enumerate(head) if any(row)]
+    body += foot
+    if not body:
+        return None
+
+    width = max(len(row) for row in body)
+    for row in body:
+        row.extend([""] * (width - len(row)))
+
+    try:
+        with TextParser(body, header=header, skiprows=0, thousands=",") as parser:
+            return parser.read()
+    except EmptyDataError:
+        return None
+
+
+def value_counts(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Count how often each non-missing cell value occurs in a table.
+
+    Returns:
+        pd.DataFrame: Values and counts, most frequent first, with the
+            columns "Wartość" and "Liczba wystąpień".
+    """
+    values = df.to_numpy().ravel()
+    counts = pd.Series(values[pd.notna(values)]).value_counts().reset_index()
+    counts.columns = ["Wartość", "Liczba wystąpień"]
+    return counts
+
+
+def _json_value(value):
+    """Convert a cell value to a JSON-serializable value (NaN -> None)."""
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+
+def write_tables(
+    frames: dict[int, pd.DataFrame],
+    catalog: list[TableInfo],
+    path: Path,
+) -> Path:
+    """
+    Write several tables of a page into one file.
+
+    With `pyarrow` installed, a Parquet file (`<path>.parquet`) in long
+    format is written: one row per cell with the columns `table`, `row`,
+    `column` and `value`. Otherwise a JSON file (`<path>.json`) is written
+    that stores every table column-wise together with its catalog entry.
+
+    Args:
+        frames (dict[int, pd.DataFrame]): Tables keyed by their index.
+        catalog (list[TableInfo]): Catalog of the page.
+        path (Path): Output path without suffix.
+
+    Returns:
+        Path: The written file.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        pyarrow = None
+
+    if pyarrow is not None:
+        parts = [
+            pd.DataFrame({
+                "table": index,
+                "row": np.repeat(np.arange(df.shape[0]), df.shape[1]),
+                "column": np.tile(df.columns.astype(str).to_numpy(), df.shape[0]),
+                "value": pd.array(df.to_numpy().ravel(), dtype="string"),
+            })
+            for index, df in frames.items()
+        ]
+        if parts:
+            cells = pd.concat(parts, ignore_index=True)
+        else:
+            # No readable table: an empty file with the same columns.
+            cells = pd.DataFrame({
+                "table": np.empty(0, dtype=np.int64),
+                "row": np.empty(0, dtype=np.int64),
+                "column": np.empty(0, dtype=str),
+                "value": pd.array([], dtype="string"),
+            })
+        target = path.parent / f"{path.name}.parquet"
+        cells.to_parquet(target, index=False)
+        return target
+
+    info = {entry.index: entry for entry in catalog}
+    document = {"tables": [
+        {
+            "index": index,
+            "caption": info[index].caption if index in info else "",
+            "shape": list(df.shape),
+            "columns": [
+                {"name": str(name), "values": [_json_value(v) for v in df.iloc[:, i]]}
+                for i, name in enumerate(df.columns)
+            ],
+        }
+        for index, df in frames.items()
+    ]}
+    target = path.parent / f"{path.name}.json"
+    target.write_text(json.dumps(document, ensure_ascii=False, indent=2),
+                      encoding="utf-8")
+    return target
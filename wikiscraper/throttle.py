@@ -0,0 +1,327 @@
+"""
+Module: throttle.py
+
+Provides adaptive pacing and retrying of HTTP requests to the wiki.
+
+The rate spaces out requests that overlap (concurrent crawls, batches,
+sampler walks, `serve`); a request that runs alone starts right away, paced
+only by its caller (`--wait`), and does not change the rate. The rate is
+controlled like TCP congestion control (AIMD):
+    - slow start: until the server first pushes back, every healthy (`2xx`
+      or `304`) overlapping response multiplies the rate by `slow_start`;
+    - additive increase: afterwards the rate grows by `increase` requests per
+      second for every second of healthy responses;
+    - multiplicative decrease: a `429`, a `5xx` response, a timeout or a
+      connection error multiplies the rate by `decrease`. Only requests
+      started after the previous decrease can trigger another one, so a burst
+      of errors from one overload episode backs off once.
+
+Failed requests are retried with jittered exponential backoff. A
+`Retry-After` header pauses all requests of the throttle for the given time.
+
+Classes:
+    FetchError: Raised when a page cannot be downloaded.
+    AdaptiveThrottle: Thread-safe AIMD rate controller with retries.
+
+Usage Example:
+    throttle = AdaptiveThrottle()
+    response = throttle.request(lambda: session.get(url), what=url)
+    print(throttle.stats())
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable
+
+import requests
+
+from wikiscraper import config
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+"""tuple[int]: HTTP statuses that mean "slow down and try again"."""
+
+NOT_MODIFIED = 304
+"""int: Status of a successful conditional request."""
+
+
+class FetchError(Exception):
+    """
+    Raised when a page cannot be downloaded, either because the server
+    answered with a non-retryable status or because all retries failed.
+
+    Attributes:
+        status (int | None): Last HTTP status, or None if no response arrived.
+    """
+
+    def __init__(self, message: str, status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a `Retry-After` header (delay in seconds or an HTTP date).
+
+    Args:
+        value (str | None): Header value.
+
+    Returns:
+        float | None: Delay in seconds (capped at
+            `config.FETCH_RETRY_AFTER_MAX_S`), or None if absent or invalid.
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    value = value.strip()
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        delay = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(0.0, delay), config.FETCH_RETRY_AFTER_MAX_S)
+
+
+class AdaptiveThrottle:
+    """
+    AIMD request-rate controller with jittered retries.
+
+    All methods are thread-safe; one throttle is shared by every download
+    thread that talks to the same wiki.
+
+    Attributes:
+        rate (float): Current request rate limit in requests per second.
+        min_rate (float): Lowest rate the throttle backs off to.
+        max_rate (float): Highest rate the throttle ramps up to.
+        increase (float): Additive increase in requests per second, per
+            second of healthy responses.
+        decrease (float): Factor applied to the rate on every backoff.
+        slow_start (float): Factor applied to the rate on every healthy
+            response until the first backoff.
+        max_retries (int): Retries of one request before giving up.
+        backoff_base (float): First retry delay in seconds (before jitter).
+        backoff_max (float): Largest retry delay in seconds (before jitter).
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = config.THROTTLE_INITIAL_RATE,
+        min_rate: float = config.THROTTLE_MIN_RATE,
+        max_rate: float = config.THROTTLE_MAX_RATE,
+        increase: float = config.THROTTLE_INCREASE,
+        decrease: float = config.THROTTLE_DECREASE,
+        slow_start: float = config.THROTTLE_SLOW_START,
+        max_retries: int = config.FETCH_MAX_RETRIES,
+        backoff_base: float = config.FETCH_BACKOFF_BASE_S,
+        backoff_max: float = config.FETCH_BACKOFF_MAX_S,
+        rng: random.Random | None = None,
+    ):
+        """
+        Initialize the throttle.
+
+        Args:
+            initial_rate (float): Starting rate in requests per second.
+            min_rate (float): Lowest rate in requests per second.
+            max_rate (float): Highest rate in requests per second.
+            increase (float): Additive increase per second of healthy responses.
+            decrease (float): Multiplicative decrease factor (0 < decrease < 1).
+            slow_start (float): Multiplicative increase before the first backoff.
+            max_retries (int): Retries of one request before giving up.
+            backoff_base (float): First retry delay in seconds.
+            backoff_max (float): Largest retry delay in seconds.
+            rng (random.Random, optional): Source of jitter.
+        """
+        if not 0 < min_rate <= max_rate:
+            raise ValueError(f"Invalid rate bounds: {min_rate} to {max_rate}.")
+        if not 0 < decrease < 1:
+            raise ValueError(f"decrease must be between 0 and 1, got {decrease}.")
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = min(max(initial_rate, min_rate), max_rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_start = slow_start
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rng = rng if rng is not None else random.Random()
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._in_slow_start = True
+        self._in_flight = 0
+        self._requests = 0
+        self._successes = 0
+        self._backoffs = 0
+        self._retries = 0
+        self._failures = 0
+        self._retry_after_pauses = 0
+        self._waited_s = 0.0
+
+    def acquire(self, paced: bool = True) -> float:
+        """
+        Block until the next request may start.
+
+        Args:
+            paced (bool): Wait for the next start slot of the current rate;
+                if False, only a `Retry-After` pause delays the request.
+
+        Returns:
+            float: Start time of the request (`time.monotonic()` clock), to be
+                passed to `on_backoff`.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            if paced:
+                start = max(start, self._next_start)
+            self._next_start = start + 1.0 / self.rate
+            self._requests += 1
+            self._waited_s += start - now
+        if start > now:
+            time.sleep(start - now)
+        return start
+
+    def on_success(self, ramp: bool = True) -> None:
+        """
+        Record a healthy response and ramp the rate up.
+
+        Args:
+            ramp (bool): Whether the response adapts the rate (False for a
+                request that ran alone).
+        """
+        with self._lock:
+            self._successes += 1
+            if not ramp:
+                return
+            if self._in_slow_start:
+                self.rate *= self.slow_start
+            else:
+                self.rate += self.increase / self.rate
+            self.rate = min(self.rate, self.max_rate)
+
+    def on_backoff(self, started_at: float, retry_after: float | None = None) -> None:
+        """
+        Record an overload signal and back off.
+
+        Args:
+            started_at (float): Start time returned by `acquire` for the
+                failed request.
+            retry_after (float, optional): Server-requested delay in seconds.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if started_at >= self._last_decrease:
+                self._backoffs += 1
+                self._in_slow_start = False
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._last_decrease = now
+            if retry_after is not None and now + retry_after > self._paused_until:
+                self._retry_after_pauses += 1
+                self._paused_until = now + retry_after
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Return the jittered delay before retry number `attempt` (0-based):
+        between half and all of `backoff_base * 2**attempt`, capped at
+        `backoff_max`.
+        """
+        delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        with self._lock:
+            return delay / 2 + self._rng.uniform(0, delay / 2)
+
+    def request(
+        self,
+        send: Callable[[], requests.Response],
+        what: str,
+    ) -> requests.Response:
+        """
+        Send a request at the throttled rate, retrying overload responses.
+
+        Responses with a status outside `RETRY_STATUSES` (including 304 and
+        404) are returned to the caller, which decides what they mean; only
+        `2xx` and `304` responses count as healthy. Requests that overlap
+        others are paced by the rate and adapt it; a request that runs alone
+        is not paced (see the module docstring).
+
+        Args:
+            send (Callable[[], requests.Response]): Sends the request once.
+            what (str): Description of the request used in error messages.
+
+        Returns:
+            requests.Response: First response that is not an overload signal.
+
+        Raises:
+            FetchError: If every attempt failed.
+        """
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._request(send, what)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _request(self, send: Callable[[], requests.Response], what: str) -> requests.Response:
+        """Retry loop of `request` (the request is counted in flight)."""
+        status, reason = None, "no response"
+        for attempt in range(self.max_retries + 1):
+            # Racy read: it only decides whether this start is paced.
+            overlapping = self._in_flight > 1
+            started_at = self.acquire(paced=overlapping)
+            try:
+                r = send()
+            except (requests.Timeout, requests.ConnectionError) as e:
+                status, reason, retry_after = None, type(e).__name__, None
+            else:
+                if r.status_code not in RETRY_STATUSES:
+                    if 200 <= r.status_code < 300 or r.status_code == NOT_MODIFIED:
+                        self.on_success(ramp=overlapping)
+                    return r
+                status, reason = r.status_code, f"HTTP {r.status_code}"
+                retry_after = parse_retry_after(r.headers.get("Retry-After"))
+
+            self.on_backoff(started_at, retry_after)
+            if attempt == self.max_retries:
+                break
+            with self._lock:
+                self._retries += 1
+            if retry_after is None:
+                time.sleep(self.backoff_delay(attempt))
+
+        with self._lock:
+            self._failures += 1
+        raise FetchError(
+            f"Cannot download contents from {what}: {reason} "
+            f"after {self.max_retries + 1} attempts",
+            status=status,
+        )
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return throttle statistics.
+
+        Returns:
+            dict[str, float]: Current rate (requests per second), number of
+                requests, successes, backoffs, retries, failures and
+                Retry-After pauses, and total seconds spent waiting for a
+                start slot.
+        """
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "requests": self._requests,
+                "successes": self._successes,
+                "backoffs": self._backoffs,
+                "retries": self._retries,
+                "failures": self._failures,
+                "retry_after_pauses": self._retry_after_pauses,
+                "waited_s": self._waited_s,
+            }
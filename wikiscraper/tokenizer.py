@@ -0,0 +1,172 @@
+"""
+Module: tokenizer.py
+
+Provides the word tokenizer behind `Page.get_dict` and the stream extractor.
+
+The default tokenization is the one the project has always used: the text is
+split on whitespace (`str.split`), every token is lowercased and only tokens
+made of letters (`str.isalpha`) count as words. The fast path splits the text
+and counts the raw tokens with `collections.Counter` (both in C), then
+lowercases, normalizes and checks only the distinct tokens, adding up the
+counts of tokens that become the same word. Lowercasing a token gives the
+same result as lowercasing it within the text, because the only
+context-dependent mapping (the final Greek sigma) never looks across
+whitespace.
+
+Optional normalizers, selected by name at run time, are applied to the
+distinct tokens and change what counts as a word:
+
+    - "casefold": `str.casefold` instead of `str.lower` ("Straße" -> "strasse"),
+    - "apostrophes": typographic apostrophes become "'" and words with an
+      apostrophe between letters count ("don't", "Farfetch'd"); apostrophes
+      at the edge of a token are dropped,
+    - "digits": every digit becomes "0" (as in wordfreq) and tokens made of
+      letters and digits count ("Gen1" -> "gen0", "1996" -> "0000").
+
+Classes:
+    Normalizer: A named text normalization step.
+    Tokenizer: Counts the words of a text.
+
+Usage Example:
+    tokenizer = Tokenizer(["casefold", "apostrophes"])
+    counts = tokenizer.count("Don't stop don’t STOP")  # {"don't": 2, "stop": 2}
+"""
+
+import re
+from collections import Counter
+from typing import Callable, Iterable
+
+APOSTROPHES = "’‘ʼ`´′"
+"""str: Characters the "apostrophes" normalizer turns into "'"."""
+
+_APOSTROPHE_TABLE = str.maketrans({char: "'" for char in APOSTROPHES})
+_APOSTROPHE_RE = re.compile("['" + APOSTROPHES + "]")
+_EDGE_APOSTROPHE_RE = re.compile(r"'(?:(?!\w)|(?<!\w'))")
+_DIGIT_RE = re.compile(r"\d")
+
+
+def _apostrophes(token: str) -> str:
+    """Unify apostrophes and drop those not between two word characters."""
+    if _APOSTROPHE_RE.search(token) is None:
+        return token
+    return _EDGE_APOSTROPHE_RE.sub("", token.translate(_APOSTROPHE_TABLE))
+
+
+def _digits(token: str) -> str:
+    """Replace every decimal digit with "0"."""
+    return token if token.isalpha() else _DIGIT_RE.sub("0", token)
+
+
+class Normalizer:
+    """
+    A named token normalization step.
+
+    Attributes:
+        name (str): Name used to select the normalizer.
+        apply (Callable[[str], str] | None): Function applied to every
+            distinct lowercased token, or None.
+        word_chars (str): Characters a word may contain besides letters.
+    """
+
+    __slots__ = ("name", "apply", "word_chars")
+
+    def __init__(self, name: str, apply: Callable[[str], str] | None, word_chars: str = ""):
+        self.name = name
+        self.apply = apply
+        self.word_chars = word_chars
+
+
+NORMALIZERS: dict[str, Normalizer] = {
+    "casefold": Normalizer("casefold", None),
+    "apostrophes": Normalizer("apostrophes", _apostrophes, "'"),
+    "digits": Normalizer("digits", _digits, "0"),
+}
+"""dict[str, Normalizer]: Available normalizers by name."""
+
+
+class Tokenizer:
+    """
+    Counts the words of a text.
+
+    Attributes:
+        normalizers (tuple[str, ...]): Names of the enabled normalizers, in
+            the order they are applied.
+    """
+
+    __slots__ = ("normalizers", "_steps", "_casefold", "_strip_table")
+
+    def __init__(self, normalizers: Iterable[str] = ()):
+        """
+        Initialize the tokenizer.
+
+        Args:
+            normalizers (Iterable[str]): Names of normalizers to enable
+                (keys of `NORMALIZERS`); none keeps the default tokenization.
+
+        Raises:
+            ValueError: If a normalizer name is unknown.
+        """
+        names = tuple(dict.fromkeys(normalizers))
+        for name in names:
+            if name not in NORMALIZERS:
+                raise ValueError(
+                    f"Unknown normalizer {name!r}, choose from {', '.join(NORMALIZERS)}."
+                )
+        self.normalizers = names
+        self._steps = [NORMALIZERS[name].apply for name in names
+                       if NORMALIZERS[name].apply is not None]
+        self._casefold = "casefold" in names
+        word_chars = "".join(NORMALIZERS[name].word_chars for name in names)
+        self._strip_table = str.maketrans("", "", word_chars) if word_chars else None
+
+    def __repr__(self) -> str:
+        return f"Tokenizer({list(self.normalizers)!r})"
+
+    def word(self, token: str) -> str | None:
+        """
+        Turn one whitespace-free token into a word.
+
+        Args:
+            token (str): The token.
+
+        Returns:
+            str | None: The lowercased, normalized word, or None if the
+                token is not a word.
+        """
+        word = token.casefold() if self._casefold else token.lower()
+        for step in self._steps:
+            word = step(word)
+        if self._strip_table is None:
+            return word if word.isalpha() else None
+        letters = word.translate(self._strip_table)
+        if letters.isalpha() if letters else word:
+            return word
+        return None
+
+    def count(self, text: str) -> dict[str, int]:
+        """
+        Count the words of a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            dict[str, int]: Word counts, in order of first occurrence.
+        """
+        counts: dict[str, int] = {}
+        word_of = self.word
+        for token, n in Counter(text.split()).items():
+            word = word_of(token)
+            if word is not None:
+                counts[word] = counts.get(word, 0) + n
+        return counts
+
+    def update(self, counts: Counter, text: str) -> None:
+        """
+        Add the words of a text to running counts (for many texts in a row).
+
+        Args:
+            counts (Counter): Counts to update in place.
+            text (str): The text.
+        """
+        counts.update(self.count(text))
@@ -0,0 +1,189 @@
+"""
+Module: wikitext.py
+
+Converts MediaWiki wikitext into a minimal HTML document that the `Page`
+class can process like a rendered article.
+
+Only the markup that matters for this project is rendered: paragraphs,
+headings, lists, internal links (as `/wiki/...` anchors), external link
+labels and simple tables. Templates, references, comments, files and
+categories are dropped, since their rendered text comes from other pages.
+HTML tags in the wikitext are dropped too (their text is kept), and the
+text is HTML-escaped before it is wrapped in markup, so `<`, `>` and `&` in
+an article stay text.
+
+Links that templates add to the rendered page (navboxes, infoboxes) are not
+in the wikitext; callers that know them (from the API's `prop=links`) pass
+them to `to_html`, which adds them as anchors without text.
+
+Functions:
+    to_html: Render wikitext to a content div understood by `Page`.
+
+Usage Example:
+    html = to_html("'''Pikachu''' is an [[Electric (type)|Electric]]-type Pokémon.")
+    page = Page("Pikachu", html)
+"""
+
+import html as html_lib
+import re
+from urllib.parse import quote
+
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.S)
+_REF_RE = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>", re.S | re.I)
+_TEMPLATE_RE = re.compile(r"\{\{(?:[^{}]|\{(?!\{)|\}(?!\}))*\}\}", re.S)
+_DROPPED_LINK_RE = re.compile(
+    r"\[\[\s*(?:File|Image|Category|Media)\s*:(?:[^\[\]]|\[\[[^\[\]]*\]\])*\]\]",
+    re.I,
+)
+_LINK_RE = re.compile(r"\[\[([^\[\]|]+)(?:\|([^\[\]]*))?\]\]([a-z]*)")
+_EXTERNAL_RE = re.compile(r"\[(?:https?:)?//[^\s\]]+(?:\s+([^\]]*))?\]")
+_FORMAT_RE = re.compile(r"'{2,5}")
+_HEADING_RE = re.compile(r"^(={1,6})\s*(.*?)\s*\1\s*$")
+_BEHAVIOR_SWITCH_RE = re.compile(r"__[A-Z]+__")
+_TAG_RE = re.compile(r"</?[A-Za-z][^<>]*>")
+
+HREF_SAFE = ";@$!*(),/~:"
+"""str: Characters MediaWiki leaves unescaped in article URLs."""
+
+
+def _strip_templates(text: str) -> str:
+    """Remove (nested) templates and parser functions."""
+    previous = None
+    while previous != text:
+        previous = text
+        text = _TEMPLATE_RE.sub("", text)
+    return text
+
+
+def _render_link(match: re.Match) -> str:
+    """Render an internal link as an anchor like the wiki does."""
+    target, label, trail = match.group(1), match.group(2), match.group(3)
+    target = target.strip()
+    if label is None or not label.strip():
+        label = target.lstrip(":")
+    # The text is already escaped; the href is built from the raw title.
+    return f'<a href="{_href(html_lib.unescape(target).lstrip(":"))}">{label}{trail}</a>'
+
+
+def _href(title: str) -> str:
+    """Return the escaped `/wiki/...` href of a title."""
+    return html_lib.escape("/wiki/" + quote(title.replace(" ", "_"), safe=HREF_SAFE + "#"))
+
+
+def _render_inline(text: str) -> str:
+    """Render links and drop formatting quotes within a line."""
+    text = _DROPPED_LINK_RE.sub("", text)
+    text = _LINK_RE.sub(_render_link, text)
+    text = _EXTERNAL_RE.sub(lambda m: m.group(1) or "", text)
+    return _FORMAT_RE.sub("", text)
+
+
+def _render_cell(cell: str) -> str:
+    """Return the content of a table cell without its attributes."""
+    if "|" in cell and "[[" not in cell.split("|", 1)[0]:
+        attributes, content = cell.split("|", 1)
+        if "=" in attributes or not attributes.strip():
+            cell = content
+    return _render_inline(cell.strip())
+
+
+def _render_table(lines: list[str]) -> str:
+    """Render the lines of a `{| ... |}` table."""
+    rows: list[list[str]] = []
+    for line in lines[1:]:
+        stripped = line.strip()
+        if stripped.startswith("|}"):
+            break
+        if stripped.startswith("|-"):
+            rows.append([])
+        elif stripped.startswith("|+"):
+            continue
+        elif stripped.startswith("!") or stripped.startswith("|"):
+            tag = "th" if stripped.startswith("!") else "td"
+            separator = "!!" if tag == "th" else "||"
+            if not rows:
+                rows.append([])
+            for cell in stripped[1:].split(separator):
+                rows[-1].append(f"<{tag}>{_render_cell(cell)}</{tag}>")
+        elif rows and rows[-1]:
+            # Continuation of the previous cell's content.
+            last = rows[-1][-1]
+            end = last.rindex("</")
+            rows[-1][-1] = last[:end] + " " + _render_inline(stripped) + last[end:]
+
+    body = "".join(f"<tr>{''.join(row)}</tr>" for row in rows if row)
+    return f'<table class="wikitable">{body}</table>'
+
+
+def to_html(wikitext: str, links: list[str] | None = None) -> str:
+    """
+    Render wikitext to HTML.
+
+    Args:
+        wikitext (str): Source of an article.
+        links (list[str], optional): Titles the rendered page links to
+            (e.g. from the API's `prop=links`), added as anchors without
+            text, so links of templates are kept.
+
+    Returns:
+        str: HTML wrapped in a `div.mw-content-ltr` content element.
+    """
+    text = _COMMENT_RE.sub("", wikitext)
+    text = _REF_RE.sub("", text)
+    text = _strip_templates(text)
+    text = _BEHAVIOR_SWITCH_RE.sub("", text)
+    text = html_lib.escape(_TAG_RE.sub("", text), quote=False)
+
+    blocks: list[str] = []
+    paragraph: list[str] = []
+    lines = text.split("\n")
+
+    def flush_paragraph():
+        if paragraph:
+            blocks.append(f"<p>{' '.join(paragraph)}</p>")
+            paragraph.clear()
+
+    i = 0
+    while i < len(lines):
+        stripped = lines[i].strip()
+        i += 1
+
+        if not stripped:
+            flush_paragraph()
+            continue
+
+        if stripped.startswith("{|"):
+            flush_paragraph()
+            table_lines = [stripped]
+            depth = 1
+            while i < len(lines) and depth:
+                inner = lines[i].strip()
+                depth += inner.startswith("{|") - inner.startswith("|}")
+                table_lines.append(inner)
+                i += 1
+            blocks.append(_render_table(table_lines))
+            continue
+
+        heading = _HEADING_RE.match(stripped)
+        if heading:
+            flush_paragraph()
+            level = len(heading.group(1))
+            blocks.append(f"<h{level}>{_render_inline(heading.group(2))}</h{level}>")
+            continue
+
+        if stripped[0] in "*#:;":
+            flush_paragraph()
+            item = stripped.lstrip("*#:;").strip()
+            if item:
+                blocks.append(f"<ul><li>{_render_inline(item)}</li></ul>")
+            continue
+
+        rendered = _render_inline(stripped).strip()
+        if rendered:
+            paragraph.append(rendered)
+
+    flush_paragraph()
+    if links:
+        anchors = "".join(f'<a href="{_href(title)}"></a>' for title in links)
+        blocks.append(f'<div class="wikitext-links">{anchors}</div>')
+    return f'<div class="mw-content-ltr mw-parser-output">{"".join(blocks)}</div>'
@@ -0,0 +1,711 @@
+"""
+Module: word_counts.py
+
+Provides the cumulative word counts: an incremental store and its export to
+the JSON file (`config.WORD_COUNTS_JSON`) read by
+`analyze_relative_word_frequency` and the notebook.
+
+The counts live in a SQLite database next to the JSON file
+(`word-counts.sqlite` for `word-counts.json`). Adding the counts of a page is
+one batched UPSERT in one transaction, so it costs time proportional to the
+page, not to the vocabulary. The JSON file is written by `export_word_counts`
+(called at the end of every CLI command), in the same format and word order
+as before: `{"word": count, ...}`, indented, words in order of first
+appearance.
+
+The JSON file stays the interchange format: when the store is opened and the
+JSON file was changed by someone else since the last export (or the store
+does not exist yet, e.g. for JSON files written by earlier versions), the
+store is rebuilt from the JSON file. The export writes a temporary file and
+renames it over the JSON file, so a crash never leaves a truncated file, and
+a JSON file that cannot be decoded never replaces the counts of the store.
+
+Crawls aggregate counts in memory (`checkpointed`) and write them to the
+store every `config.CHECKPOINT_EVERY_PAGES` pages or
+`config.CHECKPOINT_EVERY_S` seconds. A checkpoint is one transaction that
+adds the counts and records which pages they include, under the name of the
+crawl run. If a run with the same name did not finish (the process crashed
+or was killed), the next run resumes it: pages recorded by its checkpoints
+are not counted again, and pages after the last checkpoint were never
+written, so they are counted once. Runs that finished start over, so
+repeating a crawl adds its counts again, as it always did.
+
+Resumable crawls (`frontier.py`) keep their state in the same store: the
+frontier, the visited pages and the budget counters. Each checkpoint saves
+the state's changes in the same transaction as the counts, so a resumed
+crawl never skips a page whose counts were lost.
+
+Several processes (parallel CLI invocations, crawls) can count into the same
+data directory. SQLite's file locks serialize their writes: every write is
+one `BEGIN IMMEDIATE` transaction that takes the write lock before reading
+anything it modifies (merge-on-write UPSERTs, the change counter, the pages
+of a run), so no update is lost and other processes wait for at most
+`config.STORE_TIMEOUT_S` seconds. Pages are tokenized in parallel; only the
+short transactions are serialized. The export writes the JSON file while
+holding the write lock, so it always matches the counts recorded as
+exported, and a process that finds the JSON file changed by another
+process's export does not mistake it for a hand-edited file.
+
+With a sketch set (`set_sketch`, the `--approximate` run option), counts go
+to a bounded-memory `sketch.SketchCounter` instead of the store. Inside a
+crawl run they still pass through the run's buffer: a checkpoint records
+the pages (without their counts) in the store, adds the counts of the pages
+the run had not recorded yet to the sketch and saves it, so a resumed
+approximate crawl does not count a page twice either. A crash between the
+two writes can leave the pages of one checkpoint out of the sketch, but
+never counts them twice.
+
+Classes:
+    WordCountStore: SQLite store of cumulative word counts.
+    CheckpointBuffer: In-memory counts of a crawl run, written in checkpoints.
+
+Functions:
+    store_path: Path of the store that belongs to a JSON file.
+    get_store: Shared store of the current `config.WORD_COUNTS_JSON`.
+    load_word_counts: Read all cumulative word counts.
+    merge_word_counts: Add new counts to the cumulative word counts.
+    export_word_counts: Write the counts to the JSON file if they changed.
+    remove_word_counts: Delete the store of the JSON file.
+    checkpointed: Aggregate `merge_word_counts` calls of a crawl run.
+    set_sketch: Send counts to an approximate counter instead of the store.
+
+Usage Example:
+    merge_word_counts({"pikachu": 3, "electric": 1})
+    counts = load_word_counts()
+    export_word_counts()
+
+    with checkpointed("auto_count_words:Pikachu:2"):
+        merge_word_counts({"pikachu": 3}, page="Pikachu")
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
+
+from wikiscraper import config
+
+if TYPE_CHECKING:
+    from wikiscraper.sketch import SketchCounter
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT NOT NULL UNIQUE,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    id INTEGER PRIMARY KEY,
+    run INTEGER NOT NULL REFERENCES runs (id),
+    created REAL NOT NULL,
+    pages INTEGER NOT NULL,
+    words INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    run INTEGER NOT NULL REFERENCES runs (id),
+    page TEXT NOT NULL,
+    checkpoint INTEGER NOT NULL REFERENCES checkpoints (id),
+    PRIMARY KEY (run, page)
+);
+CREATE TABLE IF NOT EXISTS crawls (
+    id TEXT PRIMARY KEY,
+    phrase TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    ordering TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pages INTEGER NOT NULL,
+    bytes INTEGER NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS crawl_pages (
+    crawl TEXT NOT NULL REFERENCES crawls (id),
+    page TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    inlinks INTEGER NOT NULL,
+    state INTEGER NOT NULL,
+    PRIMARY KEY (crawl, page)
+) WITHOUT ROWID;
+"""
+
+CrawlChanges = tuple[tuple, list[tuple]]
+"""
+Type of the crawl state saved with a checkpoint (see `frontier.Frontier`):
+the crawl's row (id, phrase, depth, ordering, status, pages, bytes) and the
+rows of its pages changed since the last checkpoint (page, depth, seq,
+inlinks, state).
+"""
+
+_UPSERT = (
+    "INSERT INTO words (word, count) VALUES (?, ?) "
+    "ON CONFLICT (word) DO UPDATE SET count = count + excluded.count"
+)
+
+
+def store_path(json_path: Path) -> Path:
+    """Return the path of the store that belongs to a word count JSON file."""
+    return Path(json_path).with_suffix(".sqlite")
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    """Write a file through a temporary file, fsync and rename."""
+    tmp = path.with_name(f"{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp, path)
+
+
+def _json_stamp(path: Path) -> tuple[int, int] | None:
+    """Return the modification time and size of a file, or None if missing."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class WordCountStore:
+    """
+    SQLite store of cumulative word counts, exported to a JSON file.
+
+    Words keep the order in which they were first added (row order), so the
+    export matches the JSON the project always wrote.
+
+    Attributes:
+        json_path (Path): The JSON file the store exports to.
+        path (Path): The SQLite database file.
+    """
+
+    def __init__(self, json_path: Path):
+        """
+        Open (or create) the store of a JSON file and bring it in sync with
+        the JSON file.
+
+        Args:
+            json_path (Path): Path of the word count JSON file.
+        """
+        self.json_path = Path(json_path)
+        self.path = store_path(self.json_path)
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.path, timeout=config.STORE_TIMEOUT_S,
+            isolation_level=None, check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._transaction():
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    self._db.execute(statement)
+        self.sync()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        """
+        Run statements in one transaction that holds the write lock of the
+        database from its start, so other processes cannot interleave.
+        """
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _get_meta(self, key: str) -> int | None:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: int | None) -> None:
+        self._db.execute("DELETE FROM meta WHERE key = ?", (key,))
+        if value is not None:
+            self._db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _set_stamp(self) -> None:
+        """Remember the JSON file's state as the one the store matches."""
+        stamp = _json_stamp(self.json_path) or (None, None)
+        self._set_meta("json_mtime_ns", stamp[0])
+        self._set_meta("json_size", stamp[1])
+        self._set_meta("exported", self._get_meta("generation") or 0)
+
+    def _changed(self) -> None:
+        """Count a change of the counts (see `dirty`)."""
+        self._set_meta("generation", (self._get_meta("generation") or 0) + 1)
+
+    @property
+    def dirty(self) -> bool:
+        """bool: Whether the counts changed since the JSON file was written."""
+        with self._lock:
+            return (self._get_meta("generation") or 0) != (self._get_meta("exported") or 0)
+
+    def sync(self) -> bool:
+        """
+        Rebuild the store from the JSON file if the file changed since the
+        store last exported or imported it. A JSON file that cannot be
+        decoded leaves the store unchanged.
+
+        Returns:
+            bool: Whether the store was rebuilt.
+        """
+        with self._lock:
+            if not self._json_changed():
+                return False
+            with self._transaction():
+                # Checked again under the write lock: another process may
+                # have just exported the file.
+                if not self._json_changed():
+                    return False
+                try:
+                    raw = self.json_path.read_text(encoding="utf-8").strip()
+                    data = json.loads(raw) if raw else {}
+                except json.JSONDecodeError:
+                    return False
+                self._db.execute("DELETE FROM words")
+                self._db.executemany(_UPSERT, data.items())
+                self._changed()
+                self._set_stamp()
+            return True
+
+    def _json_changed(self) -> bool:
+        """Check if the JSON file differs from the one last exported or imported."""
+        stamp = _json_stamp(self.json_path)
+        known = (self._get_meta("json_mtime_ns"), self._get_meta("json_size"))
+        return stamp is not None and stamp != known
+
+    def add(self, words: dict[str, int]) -> None:
+        """
+        Add counts to the store (one transaction).
+
+        Args:
+            words (dict[str, int]): Counts to add.
+        """
+        if not words:
+            return
+        with self._lock, self._transaction():
+            self._db.executemany(_UPSERT, words.items())
+            self._changed()
+
+    def start_run(self, name: str) -> tuple[int, set[str]]:
+        """
+        Start a crawl run, or resume the unfinished run of the same name.
+
+        Args:
+            name (str): Name of the run (the same for the same crawl).
+
+        Returns:
+            tuple[int, set[str]]: Id of the run and the pages its
+                checkpoints already include.
+        """
+        with self._lock, self._transaction():
+            row = self._db.execute(
+                "SELECT id FROM runs WHERE name = ? AND finished IS NULL "
+                "ORDER BY id DESC LIMIT 1", (name,)
+            ).fetchone()
+            if row is None:
+                run = self._db.execute(
+                    "INSERT INTO runs (name, started) VALUES (?, ?)", (name, time.time())
+                ).lastrowid
+                return run, set()
+            run = row[0]
+            pages = self._db.execute("SELECT page FROM pages WHERE run = ?", (run,))
+            return run, {page for page, in pages}
+
+    def checkpoint(
+        self,
+        run: int,
+        pages: dict[str, dict[str, int]],
+        crawl: CrawlChanges | None = None,
+    ) -> list[str]:
+        """
+        Add the counts of some pages of a run and record the pages, in one
+        transaction. Pages that the run already recorded (counted by another
+        process resuming the same run) are left out.
+
+        Args:
+            run (int): Id of the run.
+            pages (dict[str, dict[str, int]]): Word counts of every page.
+            crawl (CrawlChanges, optional): Changes of the crawl state, saved
+                in the same transaction, so the state never records a page
+                as counted whose counts were not written.
+
+        Returns:
+            list[str]: The pages that were added.
+        """
+        with self._lock, self._transaction():
+            if crawl is not None:
+                self._save_crawl(*crawl)
+            added = [
+                page for page in pages
+                if self._db.execute(
+                    "SELECT 1 FROM pages WHERE run = ? AND page = ?", (run, page)
+                ).fetchone() is None
+            ]
+            words: Counter[str] = Counter()
+            for page in added:
+                words.update(pages[page])
+            checkpoint = self._db.execute(
+                "INSERT INTO checkpoints (run, created, pages, words) VALUES (?, ?, ?, ?)",
+                (run, time.time(), len(added), len(words)),
+            ).lastrowid
+            self._db.executemany(_UPSERT, words.items())
+            self._db.executemany(
+                "INSERT INTO pages (run, page, checkpoint) VALUES (?, ?, ?)",
+                ((run, page, checkpoint) for page in added),
+            )
+            self._changed()
+            return added
+
+    def _save_crawl(self, crawl: tuple, pages: list[tuple]) -> None:
+        """Save a crawl's row and changed page rows (inside a transaction)."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO crawls (id, phrase, depth, ordering, status, pages, "
+            "bytes, updated) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (*crawl, time.time())
+        )
+        self._db.executemany(
+            "INSERT OR REPLACE INTO crawl_pages (crawl, page, depth, seq, inlinks, state) "
+            "VALUES (?, ?, ?, ?, ?, ?)", ((crawl[0], *row) for row in pages)
+        )
+
+    def load_crawl(self, crawl_id: str) -> CrawlChanges | None:
+        """
+        Return the saved state of a crawl.
+
+        Args:
+            crawl_id (str): Id of the crawl.
+
+        Returns:
+            CrawlChanges | None: The crawl's row and the rows of all its
+                pages, or None if the crawl is unknown.
+        """
+        with self._lock:
+            crawl = self._db.execute(
+                "SELECT id, phrase, depth, ordering, status, pages, bytes FROM crawls "
+                "WHERE id = ?", (crawl_id,)
+            ).fetchone()
+            if crawl is None:
+                return None
+            pages = self._db.execute(
+                "SELECT page, depth, seq, inlinks, state FROM crawl_pages WHERE crawl = ?",
+                (crawl_id,),
+            ).fetchall()
+            return crawl, pages
+
+    def remove_crawl(self, crawl_id: str) -> None:
+        """Forget the saved state of a crawl."""
+        with self._lock, self._transaction():
+            self._db.execute("DELETE FROM crawl_pages WHERE crawl = ?", (crawl_id,))
+            self._db.execute("DELETE FROM crawls WHERE id = ?", (crawl_id,))
+
+    def finish_run(self, run: int) -> None:
+        """Mark a run as finished; a run of the same name starts over."""
+        with self._lock, self._transaction():
+            self._db.execute("UPDATE runs SET finished = ? WHERE id = ?", (time.time(), run))
+
+    def run_checkpoints(self, name: str) -> list[tuple[int, int, int]]:
+        """
+        Return the checkpoints of the latest run of a name.
+
+        Returns:
+            list[tuple[int, int, int]]: Id, number of pages and number of
+                distinct words of every checkpoint, oldest first.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT c.id, c.pages, c.words FROM checkpoints c "
+                "WHERE c.run = (SELECT MAX(id) FROM runs WHERE name = ?) ORDER BY c.id",
+                (name,),
+            ).fetchall()
+
+    def counts(self) -> dict[str, int]:
+        """Return all counts, in order of first appearance."""
+        with self._lock:
+            return dict(self._db.execute("SELECT word, count FROM words ORDER BY rowid"))
+
+    def export(self) -> bool:
+        """
+        Write all counts to the JSON file in the established format
+        (atomically: temporary file, fsync, rename), unless another process
+        exported them already.
+
+        Returns:
+            bool: Whether the file was written.
+        """
+        with self._lock, self._transaction():
+            if self._get_meta("generation") == self._get_meta("exported") \
+                    and self.json_path.exists():
+                return False
+            data = dict(self._db.execute("SELECT word, count FROM words ORDER BY rowid"))
+            _atomic_write_text(self.json_path, json.dumps(data, indent=2, ensure_ascii=False))
+            self._set_stamp()
+            return True
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._db.close()
+
+
+_stores: dict[Path, WordCountStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store() -> WordCountStore:
+    """
+    Return the shared WordCountStore for the current `config.WORD_COUNTS_JSON`.
+
+    The store is opened once per process and JSON file.
+    """
+    path = Path(config.WORD_COUNTS_JSON)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is not None and store.pid != os.getpid():
+            # Inherited through fork: SQLite connections must not be shared.
+            store = None
+        if store is None or not store.path.exists():
+            if store is not None:
+                store.close()
+            store = _stores[path] = WordCountStore(path)
+        return store
+
+
+def load_word_counts() -> dict[str, int]:
+    """
+    Read the cumulative word counts.
+
+    Returns:
+        dict[str, int]: Word counts; empty if there are none yet.
+    """
+    store = get_store()
+    store.sync()
+    return store.counts()
+
+
+class CheckpointBuffer:
+    """
+    In-memory word counts of a crawl run, written to the store in
+    checkpoints.
+
+    Attributes:
+        name (str): Name of the run.
+        every_pages (int): Pages per checkpoint.
+        every_s (float): Maximum seconds between checkpoints.
+        counted (set[str]): Pages already included in a checkpoint of this
+            run (from an interrupted earlier attempt, or written since).
+        checkpoints (int): Number of checkpoints written by this buffer.
+        state (frontier.Frontier | None): Crawl state whose changes every
+            checkpoint saves with the counts (set by `frontier.FrontierCrawl`).
+    """
+
+    def __init__(
+        self,
+        store: WordCountStore,
+        name: str,
+        every_pages: int | None = None,
+        every_s: float | None = None,
+    ):
+        """
+        Start or resume the run `name` in `store`.
+
+        Args:
+            store (WordCountStore): Store the checkpoints are written to.
+            name (str): Name of the run.
+            every_pages (int, optional): Pages per checkpoint
+                (`config.CHECKPOINT_EVERY_PAGES` by default).
+            every_s (float, optional): Maximum seconds between checkpoints
+                (`config.CHECKPOINT_EVERY_S` by default).
+        """
+        every_pages = config.CHECKPOINT_EVERY_PAGES if every_pages is None else every_pages
+        every_s = config.CHECKPOINT_EVERY_S if every_s is None else every_s
+        if every_pages < 1:
+            raise ValueError(f"every_pages must be >= 1, got {every_pages}.")
+        self.store = store
+        self.name = name
+        self.every_pages = every_pages
+        self.every_s = every_s
+        self.run, self.counted = store.start_run(name)
+        self.checkpoints = 0
+        self.state = None
+        self._pages: dict[str, dict[str, int]] = {}
+        self._unnamed = 0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, words: dict[str, int], page: str | None = None) -> bool:
+        """
+        Add the counts of a page, unless the run already counted it.
+
+        Args:
+            words (dict[str, int]): Counts of the page.
+            page (str, optional): Name of the page; pages without a name are
+                always counted.
+
+        Returns:
+            bool: Whether the counts were added.
+        """
+        with self._lock:
+            if page is None:
+                self._unnamed += 1
+                page = f"#{self._unnamed}"
+            elif page in self.counted:
+                return False
+            self.counted.add(page)
+            self._pages[page] = words
+            due = len(self._pages) >= self.every_pages or \
+                time.monotonic() - self._last >= self.every_s
+        if due:
+            self.flush()
+        return True
+
+    def flush(self) -> None:
+        """
+        Write the pending counts and crawl state changes as one checkpoint
+        (with a sketch set, the counts go to the sketch; see the module
+        docstring).
+        """
+        with self._lock:
+            crawl = self.state.take_changes() if self.state is not None else None
+            if self._pages or crawl is not None:
+                sketch = _sketch
+                if sketch is None:
+                    self.store.checkpoint(self.run, self._pages, crawl)
+                else:
+                    added = self.store.checkpoint(
+                        self.run, {page: {} for page in self._pages}, crawl
+                    )
+                    for page in added:
+                        sketch.add(self._pages[page])
+                    if added:
+                        from wikiscraper.sketch import save_sketch
+                        save_sketch()
+                self.checkpoints += 1
+                self._pages = {}
+            self._last = time.monotonic()
+
+    def finish(self) -> None:
+        """Write the pending counts and mark the run as finished."""
+        self.flush()
+        self.store.finish_run(self.run)
+
+
+_runs = threading.local()
+"""threading.local: `buffer` is the CheckpointBuffer of the thread's current run."""
+
+
+@contextmanager
+def checkpointed(
+    name: str,
+    every_pages: int | None = None,
+    every_s: float | None = None,
+) -> Iterator[CheckpointBuffer]:
+    """
+    Aggregate the `merge_word_counts` calls of a crawl run in memory and
+    write them in checkpoints (see `CheckpointBuffer`).
+
+    Pending counts are written when the block ends, also on an exception;
+    the run is only marked finished when the block completes.
+
+    The run belongs to the calling thread: counts merged by other threads
+    (such as concurrent commands of `serve`) do not go to its buffer.
+
+    Args:
+        name (str): Name of the run; an unfinished run of the same name is
+            resumed.
+        every_pages (int, optional): Pages per checkpoint.
+        every_s (float, optional): Maximum seconds between checkpoints.
+
+    Yields:
+        CheckpointBuffer: The buffer of the run.
+    """
+    buffer = CheckpointBuffer(get_store(), name, every_pages, every_s)
+    previous = getattr(_runs, "buffer", None)
+    _runs.buffer = buffer
+    try:
+        yield buffer
+    except BaseException:
+        buffer.flush()
+        raise
+    else:
+        buffer.finish()
+    finally:
+        _runs.buffer = previous
+
+
+_sketch: SketchCounter | None = None
+
+
+def set_sketch(counter: SketchCounter | None) -> None:
+    """
+    Send all counts to an approximate counter instead of the store.
+
+    Args:
+        counter (SketchCounter | None): The counter; None counts exactly.
+    """
+    global _sketch
+    _sketch = counter
+
+
+def merge_word_counts(words: dict[str, int], page: str | None = None) -> bool:
+    """
+    Add `words` to the cumulative word counts (in time proportional to
+    `words`; see `export_word_counts` for the JSON file). Inside
+    `checkpointed`, the counts go to the run's buffer instead, and with
+    `set_sketch` to the approximate counter (through the buffer, if any).
+
+    Args:
+        words (dict[str, int]): Counts to add.
+        page (str, optional): Name of the page the counts belong to.
+
+    Returns:
+        bool: Whether the counts were added (False for a page the current
+            run already counted).
+    """
+    buffer = getattr(_runs, "buffer", None)
+    if buffer is not None:
+        return buffer.add(words, page)
+    if _sketch is not None:
+        _sketch.add(words)
+        return True
+    get_store().add(words)
+    return True
+
+
+def export_word_counts() -> None:
+    """Write the cumulative word counts to the JSON file if they changed."""
+    path = Path(config.WORD_COUNTS_JSON)
+    store = _stores.get(path)
+    if store is not None and store.pid == os.getpid() and store.dirty:
+        store.export()
+
+
+def remove_word_counts() -> None:
+    """Delete the store of the current JSON file (the JSON file is kept)."""
+    path = Path(config.WORD_COUNTS_JSON)
+    with _stores_lock:
+        store = _stores.pop(path, None)
+        if store is not None:
+            store.close()
+        base = store_path(path)
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(f"{base}{suffix}")
+            except FileNotFoundError:
+                pass